@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_action import T1CloudActionBase
+
+
+class ActionModule(T1CloudActionBase):
+    """
+    Action plugin shared by the modules of the t1_cloud action group.
+
+    The modules are routed here through ``plugin_routing`` in meta/runtime.yml.
+    """
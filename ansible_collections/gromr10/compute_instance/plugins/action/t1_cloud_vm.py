@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.utils.display import Display
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_action import (
+    DEFAULT_BASE_URL,
+    T1CloudActionBase,
+)
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_info_cache import (
+    DEFAULT_INFO_CACHE_SIZE,
+    DEFAULT_INFO_CACHE_TTL,
+    RuntimeInfoCache,
+    default_info_cache_path,
+)
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_registry import REGISTRY
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_state import (
+    VMStateStore,
+    order_item_id,
+)
+
+display = Display()
+
+
+class ActionModule(T1CloudActionBase):
+    """
+    Action plugin for the t1_cloud_vm module.
+
+    Resolves the VM order on the controller through a shared, already
+    authenticated client and passes it to the module as ``resolved_vm``,
+    so the module skips its own orders listing. Falls back to plain module
+    execution when the controller cannot resolve the VM.
+
+    Runtime information gathered by the module is kept in a controller-side
+    cache shared by all tasks of the run and passed back to the module as
+    ``resolved_runtime_info``, so repeated reads of a VM do not query the
+    compute instances API again. Write operations drop the VM's entry.
+
+    With a state store configured (``state_store_path`` or the
+    ``T1_CLOUD_STATE_STORE`` environment variable of the controller), the
+    order ID of the VM recorded by an earlier run is used to fetch the
+    order directly; the orders listing is only needed on a miss or when
+    ``state_store_refresh`` is set. With a local orders index (``index_path``
+    or ``T1_CLOUD_INDEX``) the module looks the VM up itself.
+
+    Credentials and the deadline are handled by T1CloudActionBase.
+    """
+
+    def _run_module(self, module_args, task_vars):
+        """
+        Execute the module with the VM resolved on the controller.
+
+        :param module_args: Module arguments with the resolved API token
+        :type module_args: dict
+        :param task_vars: Task variables
+        :type task_vars: dict
+        :return: Module result
+        :rtype: dict
+        """
+        base_url = module_args.get('base_url') or DEFAULT_BASE_URL
+        project_id = module_args.get('project_id')
+        api_token = module_args.get('api_token')
+        name = module_args.get('name')
+
+        state_store = VMStateStore.from_args(module_args) if project_id and name else None
+
+        context = None
+        use_index = module_args.get('index_path') or os.environ.get('T1_CLOUD_INDEX')
+        if project_id and api_token and name and 'resolved_vm' not in module_args and not use_index:
+            context = (base_url, project_id, api_token)
+            try:
+                resolved_vm = None
+                if state_store and not boolean(module_args.get('state_store_refresh', False), strict=False):
+                    client = REGISTRY.get_client(*context, token_provider=self._token_provider)
+                    resolved_vm = state_store.resolve_vm(client, base_url, project_id, name)
+                module_args['resolved_vm'] = (resolved_vm or REGISTRY.resolve_vm(
+                    *context, name, token_provider=self._token_provider) or {})
+            except Exception as e:
+                display.vvv(f"t1_cloud_vm: controller-side VM resolution failed, module will look it up: {e}")
+                context = None
+
+        info_cache = None
+        info_cache_ttl = float(module_args.get('info_cache_ttl', DEFAULT_INFO_CACHE_TTL))
+        if project_id and name and 'resolved_runtime_info' not in module_args:
+            info_cache = RuntimeInfoCache(
+                default_info_cache_path(),
+                ttl=info_cache_ttl,
+                max_entries=int(module_args.get('info_cache_size', DEFAULT_INFO_CACHE_SIZE))
+            )
+            if info_cache_ttl > 0 and boolean(module_args.get('gather_info', True), strict=False):
+                cached_info = info_cache.get(base_url, project_id, name)
+                if cached_info is not None:
+                    module_args['resolved_runtime_info'] = cached_info
+
+        result = self._execute(module_args, task_vars)
+
+        if context and result.get('changed'):
+            if result.get('failed') or self._task.async_val:
+                REGISTRY.invalidate(*context)
+            elif module_args.get('state') == 'absent':
+                REGISTRY.update_vm(*context, name, None)
+            elif isinstance(result.get('vm'), dict) and result['vm'].get('id'):
+                REGISTRY.update_vm(*context, name, result['vm'])
+            else:
+                REGISTRY.invalidate(*context)
+
+        if state_store is not None and not result.get('failed') and not self._play_context.check_mode:
+            self._record_state(state_store, base_url, project_id, name, module_args, result)
+
+        if info_cache is not None:
+            if result.get('changed') or result.get('failed') or self._task.async_val:
+                info_cache.invalidate(base_url, project_id, name)
+            elif info_cache_ttl > 0 and result.get('runtime_info') and 'resolved_runtime_info' not in module_args:
+                info_cache.put(base_url, project_id, name, result['runtime_info'])
+
+        return result
+
+    @staticmethod
+    def _record_state(state_store, base_url, project_id, name, module_args, result):
+        """
+        Record the IDs and status of the VM after a successful module run.
+
+        :param state_store: State store of the task
+        :type state_store: VMStateStore
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param name: VM name
+        :type name: str
+        :param module_args: Module arguments
+        :type module_args: dict
+        :param result: Module result
+        :type result: dict
+        """
+        vm = result.get('vm')
+        if module_args.get('state') == 'absent':
+            state_store.remove(base_url, project_id, name)
+        elif isinstance(vm, dict) and vm.get('id'):
+            runtime_info = result.get('runtime_info') or {}
+            state_store.put(base_url, project_id, name, vm['id'],
+                            item_id=runtime_info.get('item_id') or order_item_id(vm),
+                            status=vm.get('status'),
+                            power_status=runtime_info.get('power_status'))
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+name: t1_cloud_order_events
+author: T1 Cloud Module Contributors
+version_added: "1.1.0"
+type: aggregate
+short_description: Display T1 Cloud order status transitions
+description:
+  - Displays the order status transitions (C(pending) -> C(running) -> C(success)) returned as I(order_events)
+    by the modules of this collection, with the time spent in every status.
+  - At the end of the playbook, summarizes the time spent in every order status over all orders of the run,
+    to help tuning I(wait_timeout) and I(poll_interval).
+  - Optionally appends the events, tagged with host and task, to a JSON lines file on the controller.
+requirements:
+  - Enable the callback with C(callbacks_enabled = gromr10.compute_instance.t1_cloud_order_events) in ansible.cfg
+options:
+  events_file:
+    description:
+      - Path on the controller to append order events to, one JSON object per line.
+    type: path
+    env:
+      - name: T1_CLOUD_ORDER_EVENTS_LOG
+    ini:
+      - section: callback_t1_cloud_order_events
+        key: events_file
+notes:
+  - Modules report events when they return, to follow a running task use the I(order_events_file) module option.
+'''
+
+import json
+import os
+
+from ansible.plugins.callback import CallbackBase
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_watch import order_phases
+
+
+class CallbackModule(CallbackBase):
+    """
+    Callback plugin displaying order status transitions of T1 Cloud modules.
+    """
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'gromr10.compute_instance.t1_cloud_order_events'
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args, **kwargs):
+        super(CallbackModule, self).__init__(*args, **kwargs)
+        # Time spent per status over all orders of the run: status -> list of seconds
+        self.phase_times = {}
+
+    def _record(self, result):
+        """Display and log the order events of a task result"""
+        events = result._result.get('order_events')
+        if not events:
+            return
+
+        host = result._host.get_name()
+        task = result._task.get_name()
+        phases = result._result.get('order_phases') or order_phases(events)
+
+        for event in events:
+            self._display.display(
+                f"[{host}] order {event['order_id']}: {event.get('previous') or 'new'} -> {event['status']}"
+                f" at {event['timestamp']}"
+            )
+        for order_id, durations in phases.items():
+            spent = ", ".join(f"{status} {seconds:.1f}s" for status, seconds in durations.items() if status != 'total')
+            self._display.display(f"[{host}] order {order_id}: {spent or 'no transitions'}"
+                                  f" (total {durations.get('total', 0):.1f}s)")
+            for status, seconds in durations.items():
+                if status != 'total':
+                    self.phase_times.setdefault(status, []).append(seconds)
+
+        events_file = self.get_option('events_file')
+        if events_file:
+            lines = ''.join(json.dumps(dict(event, host=host, task=task), separators=(',', ':')) + '\n'
+                            for event in events)
+            try:
+                with open(os.path.expanduser(events_file), 'a') as f:
+                    f.write(lines)
+            except OSError as e:
+                self._display.warning(f"Could not write order events to {events_file}: {e}")
+
+    def v2_runner_on_ok(self, result):
+        self._record(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result)
+
+    def v2_runner_item_on_ok(self, result):
+        self._record(result)
+
+    def v2_runner_item_on_failed(self, result):
+        self._record(result)
+
+    def v2_playbook_on_stats(self, stats):
+        if not self.phase_times:
+            return
+        self._display.banner("T1 CLOUD ORDER PHASES")
+        for status, times in sorted(self.phase_times.items()):
+            self._display.display(
+                f"{status}: {len(times)} orders, mean {sum(times) / len(times):.1f}s, max {max(times):.1f}s"
+            )
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    DOCUMENTATION = r'''
+options:
+    api_token:
+        description:
+            - T1 Cloud API token for authentication.
+            - Required unless I(client_id) and I(client_secret) or I(key_file) are given.
+        required: false
+        type: str
+        no_log: true
+    client_id:
+        description:
+            - Service account client ID, exchanged for I(api_token) on the controller.
+            - Usually set once for all modules through C(module_defaults) of the
+              C(group/gromr10.compute_instance.t1_cloud) action group.
+            - Ignored when I(api_token) is set.
+        required: false
+        type: str
+    client_secret:
+        description:
+            - Service account client secret, used with I(client_id).
+            - Never sent to the managed host.
+        required: false
+        type: str
+    key_file:
+        description:
+            - Path on the controller to a service account key file with C(client_id) and C(client_secret),
+              as an alternative to I(client_id) and I(client_secret).
+        required: false
+        type: path
+    auth_endpoint:
+        description:
+            - T1 Cloud authorization endpoint URL.
+            - Defaults to C(https://auth.t1.cloud/auth/realms/Portal/protocol/openid-connect/token).
+        required: false
+        type: str
+    auth_scope:
+        description:
+            - OAuth2 scope of the requested token, C(openid) by default.
+        required: false
+        type: str
+notes:
+    - The token is requested once per run on the controller, cached per client ID and scope, and shared by all tasks.
+'''
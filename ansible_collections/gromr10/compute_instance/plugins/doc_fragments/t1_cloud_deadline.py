@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Options of DEADLINE_OPTIONS (module_utils/t1_cloud_deadline.py)
+    DOCUMENTATION = r'''
+options:
+    deadline:
+        description:
+            - End-to-end time budget of the module run in seconds, including retries, status polling
+              and, for tasks going through an action plugin, the time spent on the controller.
+            - Every request attempt gets at most the remaining budget, retries stop when their delay would not fit,
+              and the task fails promptly with I(time_breakdown) once the budget is used up.
+            - Can also be set with the C(T1_CLOUD_DEADLINE) environment variable of the managed host.
+            - Unlimited by default, only the timeouts of the module bound the waiting.
+        required: false
+        type: float
+    deadline_spent:
+        description:
+            - Seconds of the I(deadline) already spent by category before the module started.
+            - Set automatically by action plugins, there is normally no need to pass it explicitly.
+        required: false
+        type: dict
+'''
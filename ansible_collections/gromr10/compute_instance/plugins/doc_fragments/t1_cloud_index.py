@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Options of INDEX_OPTIONS (module_utils/t1_cloud_index.py)
+    DOCUMENTATION = r'''
+options:
+    index_path:
+        description:
+            - Path to a local SQLite mirror of the orders and compute instances of the project, kept across runs.
+            - The first run pages through all orders and instances; later runs only fetch, per project, the orders
+              updated since the previous sync (most recently updated first) and the instances of those orders,
+              and answer VM lookups and listings from the mirror.
+            - M(gromr10.compute_instance.t1_cloud_vm) still reads the power state it acts on from the compute API, since
+              a guest shutdown does not update the order.
+            - Defaults to the C(T1_CLOUD_INDEX) environment variable of the host running the module.
+        required: false
+        type: path
+    index_refresh:
+        description:
+            - Whether to rebuild the mirror in I(index_path) from all orders and instances of the project.
+        required: false
+        type: bool
+        default: false
+'''
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Options of JOURNAL_OPTIONS (module_utils/t1_cloud_journal.py)
+    DOCUMENTATION = r'''
+options:
+    journal_path:
+        description:
+            - Path on the managed host of a write-ahead journal of submitted orders.
+            - Every VM creation and VM action is recorded with its order ID before waiting for it. When a run is
+              interrupted, a rerun with the same journal resumes waiting on the orders still in flight instead
+              of submitting them again, even before new VMs show up in the orders listing.
+            - Defaults to the C(T1_CLOUD_JOURNAL) environment variable.
+        required: false
+        type: path
+'''
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Options of PROFILE_OPTIONS (module_utils/t1_cloud_profile.py)
+    DOCUMENTATION = r'''
+options:
+    profile:
+        description:
+            - Whether to profile the module run with cProfile and return a summary as I(profile).
+            - Can also be enabled with the C(T1_CLOUD_PROFILE) environment variable of the managed host,
+              for example through the task's C(environment) keyword.
+        required: false
+        type: bool
+        default: false
+    profile_top:
+        description:
+            - Number of functions with the highest cumulative time included in the profile summary.
+        required: false
+        type: int
+        default: 20
+    profile_output:
+        description:
+            - Path on the managed host to write the raw profile to, in C(pstats) format
+              (for example for C(snakeviz) or C(python -m pstats)).
+            - Defaults to the C(T1_CLOUD_PROFILE_OUTPUT) environment variable. Only used when I(profile) is enabled.
+        required: false
+        type: path
+'''
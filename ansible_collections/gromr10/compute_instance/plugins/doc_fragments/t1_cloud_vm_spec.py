@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Options of VM_SPEC_OPTIONS (module_utils/t1_cloud.py) except name
+    DOCUMENTATION = r'''
+options:
+    description:
+        description:
+            - Description of the virtual machine.
+        required: false
+        type: str
+        default: ""
+    image_id:
+        description:
+            - ID of the image to use for VM creation.
+            - Required to create a VM.
+            - Mutually exclusive with image_name.
+        required: false
+        type: str
+    image_name:
+        description:
+            - Name of the image to use for VM creation.
+            - Required to create a VM.
+            - Mutually exclusive with image_id.
+        required: false
+        type: str
+    flavor_id:
+        description:
+            - ID of the flavor (VM configuration) to use.
+            - Required to create a VM.
+            - Mutually exclusive with flavor_name.
+        required: false
+        type: str
+    flavor_name:
+        description:
+            - Name of the flavor (VM configuration) to use.
+            - Required to create a VM.
+            - Mutually exclusive with flavor_id.
+        required: false
+        type: str
+    flavor_ram:
+        description:
+            - RAM capacity in MB
+        required: false
+        type: int
+    flavor_vcpus:
+        description:
+            - Number of processors
+        required: false
+        type: int
+    region_id:
+        description:
+            - ID of the region where VM should be created.
+        required: false
+        type: str
+        default: "0c530dd3-eaae-4216-8f9d-9b5710a7cc30"
+    region_name:
+        description:
+            - Name of the region where VM should be created.
+        required: false
+        type: str
+        default: "ru-central1"
+    availability_zone_id:
+        description:
+            - ID of the availability zone where VM should be created.
+        required: false
+        type: str
+        default: "d3p1k01"
+    availability_zone_name:
+        description:
+            - Name of the availability zone where VM should be created.
+        required: false
+        type: str
+        default: "ru-central1-a"
+    disk_size:
+        description:
+            - Size of the boot disk in GB.
+        required: false
+        type: int
+        default: 10
+    disk_type_id:
+        description:
+            - ID of the disk type to use.
+        required: false
+        type: str
+        default: "076482c0-0367-4dee-a16f-2c6673a97f7f"
+    disk_type_name:
+        description:
+            - Name of the disk type to use.
+        required: false
+        type: str
+        default: "POD2_Average"
+    extra_disks:
+        description:
+            - List of additional disks to attach to VM.
+            - Each disk should be a dictionary with name, size, and type.
+        required: false
+        type: list
+        elements: dict
+        default: []
+    network_id:
+        description:
+            - ID of the network to connect VM to.
+            - Required to create a VM.
+        required: false
+        type: str
+    subnet_id:
+        description:
+            - ID of the subnet to connect VM to.
+            - Required to create a VM.
+        required: false
+        type: str
+    subnet_cidr:
+        description:
+            - CIDR of the subnet.
+        required: false
+        type: str
+        default: "10.128.0.0/24"
+    subnet_name:
+        description:
+            - Name of the subnet.
+        required: false
+        type: str
+        default: "default-ru-central1-a"
+    assign_public_ip:
+        description:
+            - Whether to assign public IP to VM.
+        required: false
+        type: bool
+        default: false
+    toggle_shared_network:
+        description:
+            - Specify true if you want to connect the server to a subnet of another project (not the one in which the server is ordered)
+        required: false
+        type: bool
+        default: false
+    create_public_ip:
+        description:
+            - Whether to create new public IP or use existing one.
+            - Only used when assign_public_ip is true.
+        required: false
+        type: bool
+        default: false
+    public_ip_bandwidth:
+        description:
+            - Bandwidth limit for public IP in Mbps.
+            - Only used when assign_public_ip and create_public_ip are true.
+            - Must be multiple of 100, from 100 to 10000.
+        required: false
+        type: int
+        default: 1000
+    requested_ip:
+        description:
+            - Specific internal IP address to assign to VM.
+            - If not specified, IP will be assigned automatically.
+        required: false
+        type: str
+    security_groups:
+        description:
+            - List of security group IDs to apply to VM.
+        required: false
+        type: list
+        elements: str
+        default: []
+    ssh_keys:
+        description:
+            - List of SSH key IDs to add to VM.
+            - Used for Linux VMs.
+        required: false
+        type: list
+        elements: str
+        default: []
+    user_data:
+        description:
+            - Cloud-init user data script.
+            - Maximum 16384 bytes.
+        required: false
+        type: str
+        default: ""
+    preemptible:
+        description:
+            - Whether VM should be preemptible (may be stopped after 24h).
+        required: false
+        type: bool
+        default: false
+    labels:
+        description:
+            - Key-value labels to assign to VM.
+        required: false
+        type: dict
+        default: {}
+'''
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Options of WATCH_OPTIONS (module_utils/t1_cloud_watch.py)
+    DOCUMENTATION = r'''
+options:
+    order_events_file:
+        description:
+            - Path on the managed host to append order status transition events to, one JSON object per line,
+              as they are observed (for example to follow a long run with C(tail -f)).
+            - Defaults to the C(T1_CLOUD_ORDER_EVENTS_FILE) environment variable.
+            - The events are returned as I(order_events) in any case.
+        required: false
+        type: path
+'''
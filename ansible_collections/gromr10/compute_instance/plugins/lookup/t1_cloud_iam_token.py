@@ -71,6 +71,14 @@ options:
     required: false
     type: str
     default: "client_credentials"
+  refresh_ahead:
+    description:
+      - Fraction of the token lifetime after which a cached token is renewed in the background
+      - The cached token keeps being returned until the renewed one is available
+      - Set to 0 to disable background renewal
+    required: false
+    type: float
+    default: 0.75
 requirements:
   - python >= 3.6
   - requests
@@ -78,6 +86,9 @@ notes:
   - Service account API keys can be created in T1 Cloud console
   - Access tokens are valid for 1 hour
   - Tokens are automatically refreshed when expired
+  - Tokens are cached for the duration of the playbook run in Ansible's local temporary directory, shared by all tasks
+  - Set the C(T1_CLOUD_TRACE_FILE) environment variable on the controller to append tracing spans of lookups
+    and token requests to that file in OTLP JSON format
 '''
 
 EXAMPLES = r'''
@@ -123,183 +134,21 @@ expires_in:
   returned: success
 '''
 
-import json
-from datetime import datetime, timedelta
-from urllib.parse import urlencode
-
-try:
-    import requests
-    HAS_REQUESTS = True
-except ImportError:
-    HAS_REQUESTS = False
-
 from ansible.errors import AnsibleError
 from ansible.plugins.lookup import LookupBase
 from ansible.utils.display import Display
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_tracing import TRACER
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_auth import (
+    DEFAULT_AUTH_ENDPOINT,
+    DEFAULT_REFRESH_AHEAD,
+    HAS_REQUESTS,
+    T1CloudAuth,  # noqa: F401 -- re-exported for code importing it from the lookup
+    get_auth_client,
+)
 
 display = Display()
 
 
-class T1CloudAuth:
-    """
-    Class for obtaining access tokens from T1 Cloud authorization service.
-
-    :param endpoint: T1 Cloud authorization endpoint URL
-    :type endpoint: str
-    """
-
-    def __init__(self, endpoint="https://auth.t1.cloud/auth/realms/Portal/protocol/openid-connect/token"):
-        """
-        Initialize T1CloudAuth instance.
-
-        :param endpoint: Authorization service endpoint URL
-        :type endpoint: str
-        """
-        self.endpoint = endpoint
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'Accept': 'application/json'
-        })
-        # Token cache to avoid unnecessary requests
-        self._token_cache = {}
-
-    def _is_token_expired(self, token_info):
-        """
-        Check if cached token is expired.
-
-        :param token_info: Token information dictionary
-        :type token_info: dict
-        :return: True if token is expired, False otherwise
-        :rtype: bool
-        """
-        if not token_info or 'expires_at' not in token_info:
-            return True
-
-        # Add 5 minute buffer before actual expiration
-        buffer_time = 300  # 5 minutes
-        return datetime.now() >= (token_info['expires_at'] - timedelta(seconds=buffer_time))
-
-    def get_token_with_credentials(self, client_id, client_secret, scope="openid", grant_type="client_credentials"):
-        """
-        Get access token using service account credentials.
-
-        :param client_id: Service account client ID
-        :type client_id: str
-        :param client_secret: Service account client secret
-        :type client_secret: str
-        :param scope: OAuth2 scope
-        :type scope: str
-        :param grant_type: OAuth2 grant type
-        :type grant_type: str
-        :return: Access token information
-        :rtype: dict
-        :raises: Exception if token retrieval fails
-        """
-        # Check cache first
-        cache_key = f"{client_id}:{scope}:{grant_type}"
-        if cache_key in self._token_cache:
-            cached_token = self._token_cache[cache_key]
-            if not self._is_token_expired(cached_token):
-                display.vvv(f"Using cached token for client_id: {client_id}")
-                return cached_token
-
-        try:
-            # Prepare request data
-            data = {
-                'client_id': client_id,
-                'client_secret': client_secret,
-                'grant_type': grant_type,
-                'scope': scope
-            }
-
-            display.vvv(f"Requesting token for client_id: {client_id}")
-
-            response = self.session.post(
-                self.endpoint,
-                data=urlencode(data),
-                timeout=30
-            )
-            response.raise_for_status()
-
-            result = response.json()
-
-            if 'access_token' not in result:
-                raise Exception("No access_token in response")
-
-            # Prepare token info
-            token_info = {
-                'access_token': result['access_token'],
-                'token_type': result.get('token_type', 'Bearer'),
-                'expires_in': result.get('expires_in', 3600),
-                'scope': result.get('scope', scope),
-                'expires_at': datetime.now() + timedelta(seconds=result.get('expires_in', 3600))
-            }
-
-            # Cache the token
-            self._token_cache[cache_key] = token_info
-
-            display.vvv(f"Successfully obtained token, expires in {token_info['expires_in']} seconds")
-            return token_info
-
-        except requests.exceptions.HTTPError as e:
-            error_msg = f"HTTP error {e.response.status_code}"
-            try:
-                error_details = e.response.json()
-                if 'error_description' in error_details:
-                    error_msg += f": {error_details['error_description']}"
-                elif 'error' in error_details:
-                    error_msg += f": {error_details['error']}"
-            except:
-                error_msg += f": {e.response.text}"
-            raise Exception(error_msg)
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Failed to get access token: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Error processing token request: {str(e)}")
-
-    def get_token_from_file(self, key_file_path, scope="openid", grant_type="client_credentials"):
-        """
-        Get access token using service account key file.
-
-        :param key_file_path: Path to service account key file
-        :type key_file_path: str
-        :param scope: OAuth2 scope
-        :type scope: str
-        :param grant_type: OAuth2 grant type
-        :type grant_type: str
-        :return: Access token information
-        :rtype: dict
-        :raises: Exception if token retrieval fails
-        """
-        try:
-            # Read service account key file
-            with open(key_file_path, 'r', encoding='utf-8') as f:
-                key_data = json.load(f)
-
-            # Extract required fields
-            client_id = key_data.get('client_id')
-            client_secret = key_data.get('client_secret')
-
-            if not client_id or not client_secret:
-                raise Exception("Service account key file must contain 'client_id' and 'client_secret' fields")
-
-            # Validate client_id format
-            if not client_id.startswith('sa_proj-'):
-                display.warning(f"Client ID format may be incorrect: {client_id}. Expected format: sa_proj-<uuid>")
-
-            return self.get_token_with_credentials(client_id, client_secret, scope, grant_type)
-
-        except FileNotFoundError:
-            raise Exception(f"Service account key file not found: {key_file_path}")
-        except json.JSONDecodeError:
-            raise Exception(f"Invalid JSON in service account key file: {key_file_path}")
-        except Exception as e:
-            if "Service account key file" in str(e) or "client_id" in str(e):
-                raise
-            raise Exception(f"Error reading service account key file: {str(e)}")
-
-
 class LookupModule(LookupBase):
     """
     Ansible lookup plugin for T1 Cloud access tokens.
@@ -334,9 +183,10 @@ class LookupModule(LookupBase):
         client_id = kwargs.get('client_id')
         client_secret = kwargs.get('client_secret')
         key_file = kwargs.get('key_file')
-        endpoint = kwargs.get('endpoint', 'https://auth.t1.cloud/auth/realms/Portal/protocol/openid-connect/token')
+        endpoint = kwargs.get('endpoint', DEFAULT_AUTH_ENDPOINT)
         scope = kwargs.get('scope', 'openid')
         grant_type = kwargs.get('grant_type', 'client_credentials')
+        refresh_ahead = float(kwargs.get('refresh_ahead', DEFAULT_REFRESH_AHEAD))
 
         # Validate input parameters
         if not key_file and (not client_id or not client_secret):
@@ -349,21 +199,26 @@ class LookupModule(LookupBase):
                 "Use either 'key_file' parameter or 'client_id'/'client_secret' parameters, not both"
             )
 
-        try:
-            auth_client = T1CloudAuth(endpoint=endpoint)
-
-            if key_file:
-                display.vvv(f"Getting access token using service account key file: {key_file}")
-                token_info = auth_client.get_token_from_file(key_file, scope, grant_type)
-            else:
-                display.vvv(f"Getting access token using client credentials: {client_id}")
-                token_info = auth_client.get_token_with_credentials(client_id, client_secret, scope, grant_type)
-
-            if not token_info or 'access_token' not in token_info:
-                raise AnsibleError("Failed to obtain access token")
-
-            display.vvv("Successfully obtained access token")
-            return [token_info['access_token']]
-
-        except Exception as e:
-            raise AnsibleError(f"T1 Cloud access token lookup failed: {str(e)}")
+        with TRACER.span('t1_cloud_iam_token.LookupModule.run',
+                         **{'t1.auth.endpoint': endpoint, 't1.auth.key_file': bool(key_file)}):
+            try:
+                # Shared per endpoint, so repeated lookups reuse the session and cached token
+                auth_client = get_auth_client(endpoint)
+
+                if key_file:
+                    display.vvv(f"Getting access token using service account key file: {key_file}")
+                    token_info = auth_client.get_token_from_file(key_file, scope, grant_type,
+                                                                 refresh_ahead=refresh_ahead)
+                else:
+                    display.vvv(f"Getting access token using client credentials: {client_id}")
+                    token_info = auth_client.get_token_with_credentials(client_id, client_secret, scope, grant_type,
+                                                                        refresh_ahead=refresh_ahead)
+
+                if not token_info or 'access_token' not in token_info:
+                    raise AnsibleError("Failed to obtain access token")
+
+                display.vvv("Successfully obtained access token")
+                return [token_info['access_token']]
+
+            except Exception as e:
+                raise AnsibleError(f"T1 Cloud access token lookup failed: {str(e)}")
@@ -0,0 +1,260 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+name: t1_cloud_vm_find
+author: T1 Cloud Module Contributors
+version_added: "1.1.0"
+short_description: Find T1 Cloud VMs by IP, MAC, label, flavor or availability zone
+description:
+  - Finds the compute instances of a project owning an IP or MAC address, having a label, flavor or
+    availability zone, or with a given name or ID
+  - The instances listing of the project is fetched once per index and turned into reverse indexes,
+    so every query is a dictionary lookup
+  - The indexes can be kept in a file between runs with I(cache_path)
+options:
+  _terms:
+    description:
+      - Queries in the form C(field=value), all of which the returned VMs must match
+      - Fields are C(ip), C(mac), C(label) (C(label=key) or C(label=key=value)), C(flavor) and
+        C(availability_zone) (C(az)) by name or ID, C(name), C(instance_id) and C(order_id)
+      - A query without a field is an IP address
+      - Without queries all VMs of the project are returned
+    required: false
+    type: list
+    elements: str
+  api_token:
+    description:
+      - T1 Cloud API token
+      - Alternatively set I(client_id) and I(client_secret) or I(key_file) to obtain a token
+    required: false
+    type: str
+  client_id:
+    description:
+      - Service account client ID
+    required: false
+    type: str
+  client_secret:
+    description:
+      - Service account client secret (API key)
+    required: false
+    type: str
+  key_file:
+    description:
+      - Path to service account key file (JSON format)
+    required: false
+    type: str
+  auth_endpoint:
+    description:
+      - T1 Cloud authorization endpoint URL
+    required: false
+    type: str
+  auth_scope:
+    description:
+      - OAuth2 scope for token request
+    required: false
+    type: str
+  project_id:
+    description:
+      - Project ID
+    required: true
+    type: str
+  base_url:
+    description:
+      - Base URL of the T1 Cloud API
+    required: false
+    type: str
+    default: "https://api.t1.cloud"
+  cache_path:
+    description:
+      - File to keep the indexes of projects in between runs
+      - Defaults to the C(T1_CLOUD_REVERSE_INDEX) environment variable on the controller, indexes are
+        kept in memory for the run only when neither is set
+    required: false
+    type: path
+  cache_ttl:
+    description:
+      - Seconds the indexes of a project are used before the instances are listed again
+    required: false
+    type: float
+    default: 300
+  refresh:
+    description:
+      - Whether to list the instances again even if the indexes are still valid
+    required: false
+    type: bool
+    default: false
+requirements:
+  - python >= 3.6
+  - requests
+notes:
+  - Queries answered from indexes still valid do not reflect changes made since they were built,
+    set I(refresh) after changing VMs in the same run
+'''
+
+EXAMPLES = r'''
+- name: Which VM owns 10.9.60.17?
+  debug:
+    msg: "{{ query('gromr10.compute_instance.t1_cloud_vm_find', '10.9.60.17',
+                   api_token=t1_token, project_id='proj-xxxxxxxxxx') | map(attribute='name') }}"
+
+- name: Production database VMs in zone ru-central1-a, indexes kept between runs
+  set_fact:
+    db_vms: "{{ query('gromr10.compute_instance.t1_cloud_vm_find', 'label=role=db', 'label=env=prod',
+                      'az=ru-central1-a', key_file='/path/to/service_account.json',
+                      project_id='proj-xxxxxxxxxx', cache_path='~/.cache/t1_cloud/reverse_index.json') }}"
+
+- name: VM with a MAC address
+  debug:
+    msg: "{{ query('gromr10.compute_instance.t1_cloud_vm_find', 'mac=02:78:A5:7D:97:16',
+                   api_token=t1_token, project_id='proj-xxxxxxxxxx') }}"
+'''
+
+RETURN = r'''
+_list:
+  description:
+    - Runtime information of the matching VMs, as the C(runtime_info) of M(gromr10.compute_instance.t1_cloud_vm),
+      with the C(labels) and C(project_id) of the VM
+  type: list
+  elements: dict
+  returned: success
+'''
+
+import os
+import time
+
+from ansible.errors import AnsibleError
+from ansible.plugins.lookup import LookupBase
+from ansible.utils.display import Display
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import AUTH_OPTIONS, HAS_REQUESTS
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_tracing import TRACER
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_action import (
+    DEFAULT_BASE_URL,
+    credentials_token_provider,
+    resolve_api_token,
+)
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_registry import REGISTRY
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_reverse_index import (
+    DEFAULT_REVERSE_INDEX_TTL,
+    REVERSE_INDEX_ENV,
+    InstanceReverseIndex,
+)
+
+display = Display()
+
+# (base_url, project_id) -> index, shared by the lookups of a controller process
+_INDEXES = {}
+
+
+def parse_query(term):
+    """
+    Split a lookup term into the indexed field and the value.
+
+    :param term: Query, ``field=value`` or an IP address
+    :type term: str
+    :return: (field, value)
+    :rtype: tuple
+    :raises: ValueError if the field is not indexed
+    """
+    field, separator, value = str(term).strip().partition('=')
+    if not separator:
+        return 'ip', field
+    return InstanceReverseIndex.field(field.strip().lower()), value.strip()
+
+
+class LookupModule(LookupBase):
+    """
+    Ansible lookup plugin finding T1 Cloud VMs through reverse indexes.
+    """
+
+    def run(self, terms, variables=None, **kwargs): # type: ignore
+        """
+        Main lookup method.
+
+        :param terms: Queries
+        :type terms: list
+        :param variables: Ansible variables
+        :type variables: dict or None
+        :param kwargs: Additional keyword arguments
+        :type kwargs: dict
+        :return: Matching VMs
+        :rtype: list
+        :raises: AnsibleError if lookup fails
+        """
+        if not HAS_REQUESTS:
+            raise AnsibleError("The 'requests' library is required for this lookup plugin")
+
+        project_id = kwargs.get('project_id')
+        if not project_id:
+            raise AnsibleError("t1_cloud_vm_find lookup requires project_id")
+        base_url = kwargs.get('base_url') or DEFAULT_BASE_URL
+        cache_path = kwargs.get('cache_path') or os.environ.get(REVERSE_INDEX_ENV)
+        cache_ttl = float(kwargs.get('cache_ttl', DEFAULT_REVERSE_INDEX_TTL))
+        refresh = bool(kwargs.get('refresh', False))
+
+        try:
+            queries = [parse_query(term) for term in terms or []]
+        except ValueError as e:
+            raise AnsibleError(f"t1_cloud_vm_find lookup: {e}")
+
+        with TRACER.span('t1_cloud_vm_find.LookupModule.run',
+                         **{'t1.project_id': project_id, 't1.queries': len(queries)}):
+            try:
+                index = None if refresh else self._cached_index(base_url, project_id, cache_path, cache_ttl)
+                if index is None:
+                    auth_args = {name: kwargs.get(name) for name in AUTH_OPTIONS}
+                    auth_args['api_token'] = kwargs.get('api_token')
+                    token_provider = credentials_token_provider(auth_args)
+                    api_token = resolve_api_token(dict(auth_args))['api_token']
+                    if not api_token:
+                        raise AnsibleError("api_token is required, or client_id and client_secret or key_file")
+
+                    display.vvv(f"Building reverse indexes of the instances of project {project_id}")
+                    client = REGISTRY.get_client(base_url, project_id, api_token, token_provider=token_provider)
+                    index = InstanceReverseIndex.from_instances(client.list_vm_instances(), project_id=project_id)
+                    _INDEXES[(base_url.rstrip('/'), project_id)] = index
+                    if cache_path:
+                        index.save(cache_path, base_url, project_id)
+
+                return index.find_all(queries)
+
+            except AnsibleError:
+                raise
+            except Exception as e:
+                raise AnsibleError(f"T1 Cloud VM lookup failed: {str(e)}")
+
+    @staticmethod
+    def _cached_index(base_url, project_id, cache_path, cache_ttl):
+        """
+        Get the index of a project built earlier in this process or saved by an earlier run.
+
+        :return: Index still valid, None if it has to be built
+        :rtype: InstanceReverseIndex or None
+        """
+        key = (base_url.rstrip('/'), project_id)
+        index = _INDEXES.get(key)
+        if index is not None and time.time() - index.built_at <= cache_ttl:
+            return index
+        if cache_path:
+            index = InstanceReverseIndex.load(cache_path, base_url, project_id, max_age=cache_ttl)
+            if index is not None:
+                display.vvv(f"Reverse indexes of project {project_id} loaded from {cache_path}")
+                _INDEXES[key] = index
+                return index
+        return None
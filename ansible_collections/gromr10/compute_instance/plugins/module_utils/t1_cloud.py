@@ -0,0 +1,1203 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import copy
+import fnmatch
+import time
+import json
+import gzip
+import sys
+import threading
+from urllib.parse import urljoin
+
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_deadline import tracked
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_tracing import (
+    SPAN_KIND_CLIENT,
+    TRACER,
+)
+
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+    requests = None
+
+try:
+    import brotli  # noqa: F401 -- lets urllib3 decode 'br' responses
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+# Only advertise brotli when urllib3 is able to decode it
+ACCEPT_ENCODING = 'br, gzip, deflate' if HAS_BROTLI else 'gzip, deflate'
+
+# Request bodies smaller than this are sent uncompressed
+COMPRESS_MIN_SIZE = 8192
+
+# Order statuses after which an operation is complete
+FINAL_ORDER_STATUSES = ('success', 'failure', 'creation_error', 'validation_error',
+                        'deprovisioned', 'deprovisioned_error')
+
+# Order statuses of VMs that no longer exist
+DEPROVISIONED_STATUSES = ('deprovisioned', 'deprovisioned_error')
+
+# Options describing a single VM, shared by modules that order VMs
+VM_SPEC_OPTIONS = dict(
+    name=dict(type='str', required=True),
+    description=dict(type='str', default=''),
+    image_id=dict(type='str', default=''),
+    image_name=dict(type='str', default=''),
+    flavor_id=dict(type='str'),
+    flavor_name=dict(type='str'),
+    flavor_ram=dict(type='int'),   # Объём оперативной памяти в МБ
+    flavor_vcpus=dict(type='int'), # Количество процессоров
+    region_id=dict(type='str', default='0c530dd3-eaae-4216-8f9d-9b5710a7cc30'),
+    region_name=dict(type='str', default='ru-central1'),
+    availability_zone_id=dict(type='str', default='d3p1k01'),
+    availability_zone_name=dict(type='str', default='ru-central1-a'),
+    disk_size=dict(type='int', default=10),
+    disk_type_id=dict(type='str', default='076482c0-0367-4dee-a16f-2c6673a97f7f'),
+    disk_type_name=dict(type='str', default='POD2_Average'),
+    extra_disks=dict(type='list', elements='dict', default=[]),
+    network_id=dict(type='str'),
+    subnet_id=dict(type='str'),
+    subnet_cidr=dict(type='str', default='10.128.0.0/24'),
+    subnet_name=dict(type='str', default='default-ru-central1-a'),
+    toggle_shared_network=dict(type='bool', default=False),
+    assign_public_ip=dict(type='bool', default=False),
+    create_public_ip=dict(type='bool', default=False),
+    public_ip_bandwidth=dict(type='int', default=1000),
+    requested_ip=dict(type='str', default=''),
+    security_groups=dict(type='list', elements='str', default=[]),
+    ssh_keys=dict(type='list', elements='str', default=[]),
+    user_data=dict(type='str', default=''),
+    preemptible=dict(type='bool', default=False),
+    labels=dict(type='dict', default={})
+)
+
+# Service account credentials, exchanged for api_token by the action plugins on the controller
+AUTH_OPTIONS = dict(
+    client_id=dict(type='str'),
+    client_secret=dict(type='str', no_log=True),
+    key_file=dict(type='path'),
+    auth_endpoint=dict(type='str'),
+    auth_scope=dict(type='str'),
+)
+
+
+def check_api_token(module):
+    """
+    Fail the module run if no API token was given or resolved.
+
+    :param module: Module with api_token in its argument spec
+    :type module: AnsibleModule
+    """
+    if not module.params.get('api_token'):
+        module.fail_json(msg="api_token is required, or client_id and client_secret or key_file "
+                             "for the action plugin to obtain one")
+
+
+class T1CloudAPIError(Exception):
+    """
+    Failed T1 Cloud API request.
+
+    :param message: Error message
+    :type message: str
+    :param status_code: HTTP status code, None if no response was received
+    :type status_code: int or None
+    """
+
+    def __init__(self, message, status_code=None):
+        super(T1CloudAPIError, self).__init__(message)
+        self.status_code = status_code
+
+
+class _Credentials:
+    """
+    API token of a client and the clients sharing its session, replaced under a lock.
+
+    :param api_token: T1 Cloud API token
+    :type api_token: str
+    """
+
+    def __init__(self, api_token):
+        self.token = api_token
+        self._lock = threading.Lock()
+
+    def replace(self, api_token):
+        with self._lock:
+            self.token = api_token
+
+    def refresh(self, rejected, token_provider):
+        """
+        Get a fresh token after ``rejected`` got HTTP 401.
+
+        Only the first of many threads rejected with the same token calls
+        the token provider; the others get the token it returned.
+
+        :param rejected: Token the API rejected
+        :type rejected: str
+        :param token_provider: Callable returning a fresh API token
+        :type token_provider: callable
+        :return: Current token
+        :rtype: str
+        """
+        with self._lock:
+            if self.token == rejected:
+                self.token = token_provider()
+            return self.token
+
+
+class T1CloudVM:
+    """
+    Class for managing T1 Cloud VMs via REST API.
+
+    A client can be used from many threads at once, for example by the
+    workers of a ``ThreadPoolExecutor``. The session and its headers are not
+    changed after initialization: the API token is sent with every request
+    and replaced under a lock, shared with the ``for_project`` clients, and
+    the connection pool keeps up to ``pool_maxsize`` connections, which
+    should be at least the number of threads.
+
+    :param api_token: T1 Cloud API token
+    :type api_token: str
+    :param project_id: Project ID where VM should be managed
+    :type project_id: str
+    """
+
+    def __init__(self, api_token, project_id, base_url="https://api.t1.cloud",
+                 compress_requests=False, compress_min_size=COMPRESS_MIN_SIZE, token_provider=None,
+                 pool_maxsize=10, watcher=None, deadline=None, index=None, journal=None):
+        """
+        Initialize T1CloudVM instance.
+
+        :param api_token: T1 Cloud API token for authentication
+        :type api_token: str
+        :param project_id: Project ID where VM operations will be performed
+        :type project_id: str
+        :param compress_requests: Gzip request bodies larger than compress_min_size
+        :type compress_requests: bool
+        :param compress_min_size: Minimum request body size in bytes to compress
+        :type compress_min_size: int
+        :param token_provider: Callable returning a fresh API token, used once when a request gets HTTP 401
+        :type token_provider: callable or None
+        :param pool_maxsize: Maximum number of kept-alive connections, at least the number of threads using the client
+        :type pool_maxsize: int
+        :param watcher: Recorder of order status transitions observed while waiting
+        :type watcher: OrderWatcher or None
+        :param deadline: Time budget of the whole run, bounding request timeouts, retries and waits
+        :type deadline: Deadline or None
+        :param index: Local mirror of orders and instances answering lookups by name and listings
+        :type index: OrdersIndex or None
+        :param journal: Write-ahead journal of submitted orders, resumed instead of submitting them again
+        :type journal: OrderJournal or None
+        """
+        self._credentials = _Credentials(api_token)
+        self.watcher = watcher
+        self.deadline = deadline
+        self.index = index
+        self.journal = journal
+        self.token_provider = token_provider
+        self.project_id = project_id
+        self.base_url = base_url.rstrip('/')
+        self.compress_requests = compress_requests
+        self.compress_min_size = compress_min_size
+        # Sent with every request, the API token is added per request
+        self.headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'User-Agent': 'ansible-t1-cloud/1.0.0'
+        }
+
+        if requests is not None:
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+
+            # Configure retry strategy
+            from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_deadline import DeadlineRetry
+            from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_fixtures import http_adapter
+
+            retry_strategy = DeadlineRetry(
+                total=3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                backoff_factor=1,
+                deadline=deadline
+            )
+
+            # Regular adapter unless HTTP fixtures are recorded or replayed
+            adapter = http_adapter(max_retries=retry_strategy, pool_maxsize=pool_maxsize)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+        else:
+            raise Exception("requests library is required")
+
+    def for_project(self, project_id):
+        """
+        Get a client for another project sharing this client's session, connection pool and token.
+
+        :param project_id: Project ID
+        :type project_id: str
+        :return: Client bound to the project
+        :rtype: T1CloudVM
+        """
+        client = copy.copy(self)
+        client.project_id = project_id
+        return client
+
+    @property
+    def api_token(self):
+        """
+        API token sent with requests, shared with the ``for_project`` clients.
+
+        :rtype: str
+        """
+        return self._credentials.token
+
+    def set_token(self, api_token):
+        """
+        Replace API token used for subsequent requests.
+
+        :param api_token: T1 Cloud API token
+        :type api_token: str
+        """
+        self._credentials.replace(api_token)
+
+    def _encode_body(self, data):
+        """
+        Serialize request body to JSON, gzip-compressing it when enabled
+        and the body is large enough to benefit.
+
+        :param data: Request body data
+        :type data: dict or list
+        :return: Encoded body and extra request headers
+        :rtype: tuple
+        """
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        if self.compress_requests and len(body) >= self.compress_min_size:
+            return gzip.compress(body, compresslevel=6), {'Content-Encoding': 'gzip'}
+        return body, {}
+
+    def _make_request(self, method, endpoint, data=None, params=None, timeout=30):
+        """
+        Make HTTP request to T1 Cloud API.
+
+        :param method: HTTP method (GET, POST, DELETE, etc.)
+        :type method: str
+        :param endpoint: API endpoint path
+        :type endpoint: str
+        :param data: Request body data
+        :type data: dict or None
+        :param params: URL query parameters
+        :type params: dict or None
+        :param timeout: Request timeout in seconds, shrunk to the remaining deadline
+        :type timeout: float
+        :return: Response object or None
+        :rtype: requests.Response or None
+        """
+        url = urljoin(self.base_url, endpoint)
+        activity = f"requesting {method} {endpoint}"
+
+        body = None
+        headers = {}
+        if data is not None:
+            body, headers = self._encode_body(data)
+
+        with TRACER.span('T1CloudVM._make_request', SPAN_KIND_CLIENT,
+                         **{'http.request.method': method, 'url.full': url}) as span:
+            try:
+                if requests is None:
+                    raise Exception("requests library is not available")
+
+                token = self.api_token
+                with tracked(self.deadline, 'requests'):
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        data=body,
+                        params=params,
+                        headers=dict(headers, Authorization=f'Bearer {token}'),
+                        timeout=self._timeout(timeout, activity)
+                    )
+                if response.status_code == 401 and self.token_provider is not None:
+                    # Token expired or revoked mid-run: fetch a fresh one and retry once
+                    span.set_attribute('t1.token_refreshed', True)
+                    token = self._credentials.refresh(token, self.token_provider)
+                    with tracked(self.deadline, 'requests'):
+                        response = self.session.request(
+                            method=method,
+                            url=url,
+                            data=body,
+                            params=params,
+                            headers=dict(headers, Authorization=f'Bearer {token}'),
+                            timeout=self._timeout(timeout, activity)
+                        )
+                span.set_attribute('http.response.status_code', response.status_code)
+                response.raise_for_status()
+                return response
+            except requests.exceptions.RequestException as e: # type: ignore
+                if self.deadline is not None and self.deadline.expired:
+                    raise self.deadline.exceeded(activity) from e
+                error_message = None
+                status_code = None
+                if isinstance(e.response, requests.Response): # type: ignore
+                  status_code = e.response.status_code
+                  try:
+                      error_message = e.response.json().get('message', e.response.text)
+                  except (ValueError, AttributeError):
+                      error_message = e.response.text or f"HTTP {e.response.status_code}"
+                raise T1CloudAPIError(f"API request failed: {str(e)}\n Error message:{str(error_message)}", status_code)
+
+    def _timeout(self, timeout, activity):
+        """Fit a request timeout into the remaining deadline, again for every retry"""
+        if self.deadline is None:
+            return timeout
+        return self.deadline.request_timeout(timeout, activity)
+
+    def _poll_sleep(self, poll_interval, activity):
+        """
+        Sleep between status polls, cut short by the deadline.
+
+        :raises DeadlineExceeded: If the deadline passed
+        """
+        if self.deadline is None:
+            time.sleep(poll_interval)
+            return
+        with self.deadline.track('polling'):
+            time.sleep(max(0.0, min(poll_interval, self.deadline.remaining())))
+        if self.deadline.expired:
+            raise self.deadline.exceeded(activity)
+
+    def get_vm_by_name(self, name):
+        """
+        Get VM information by name.
+
+        :param name: VM name to search for
+        :type name: str
+        :return: VM information or None if not found
+        :rtype: dict or None
+        """
+        if self._synced_index() is not None:
+            return self.index.get_vm_by_name(self.base_url, self.project_id, name)
+
+        endpoint = f"/order-service/api/v1/projects/{self.project_id}/orders"
+        params = {
+            "per_page": 100,
+            "f[product_name][]": "compute_instance"
+        }
+
+        response = self._make_request('GET', endpoint, params=params)
+        if response and response.status_code == 200:
+            data = response.json()
+            orders = data.get('list', [])
+            for order in orders:
+                if order.get('attrs', {}).get('name') == name:
+                    return order
+        return None
+
+    def list_vms(self, per_page=100):
+        """
+        Get all VM orders of the project, following pagination.
+
+        :param per_page: Number of orders per page
+        :type per_page: int
+        :return: List of VM orders
+        :rtype: list
+        """
+        if self._synced_index() is not None:
+            return self.index.list_vms(self.base_url, self.project_id)
+
+        return [order for batch in self.iter_vm_pages(per_page) for order in batch]
+
+    def iter_vm_pages(self, per_page=100, params=None):
+        """
+        Iterate over pages of VM orders of the project from the API.
+
+        :param per_page: Number of orders per page
+        :type per_page: int
+        :param params: Further query parameters, for example the sort order
+        :type params: dict or None
+        :return: Generator of lists of VM orders
+        :rtype: generator
+        """
+        endpoint = f"/order-service/api/v1/projects/{self.project_id}/orders"
+        page = 1
+
+        while True:
+            query = dict(params or {}, per_page=per_page, page=page)
+            query["f[product_name][]"] = "compute_instance"
+            response = self._make_request('GET', endpoint, params=query)
+            if not response or response.status_code != 200:
+                break
+            batch = response.json().get('list', [])
+            yield batch
+            if len(batch) < per_page:
+                break
+            page += 1
+
+    def _index_changed(self, order_ids=()):
+        """
+        Make the next lookup resync the index after a write operation or a finished order.
+
+        :param order_ids: IDs of the orders written to or finished
+        :type order_ids: iterable
+        """
+        if self.index is not None:
+            self.index.mark_stale(self.base_url, self.project_id, order_ids)
+
+    def _journaled_order(self, order_id):
+        """
+        Fetch an order recorded in the journal, None if it no longer exists.
+        """
+        try:
+            return self.get_vm_by_id(order_id)
+        except T1CloudAPIError as e:
+            if e.status_code != 404:
+                raise
+            return None
+
+    def _resume_create(self, name, count=1):
+        """
+        Get the orders of a VM creation submitted by an interrupted run.
+
+        A creation is resumed while all its orders still exist and were not
+        deleted; otherwise it is dropped from the journal to be submitted again.
+
+        :param name: VM name (the base name of multi-count orders)
+        :type name: str
+        :param count: Number of VMs ordered at once
+        :type count: int
+        :return: Orders to wait for, None if the creation is not in flight
+        :rtype: list or None
+        """
+        order_ids = self.journal.in_flight_create(self.base_url, self.project_id, name, count)
+        if not order_ids:
+            return None
+        orders = [self._journaled_order(order_id) for order_id in order_ids]
+        if all(order and order.get('status') not in DEPROVISIONED_STATUSES for order in orders):
+            self.journal.resumed_waiting(order_ids)
+            return orders
+        self.journal.finished(order_ids)
+        return None
+
+    def _synced_index(self):
+        """
+        Get the index after syncing the project into it, None without an index.
+
+        :rtype: OrdersIndex or None
+        """
+        if self.index is None:
+            return None
+        self.index.ensure_synced(self)
+        return self.index
+
+    def get_vm_by_id(self, vm_id):
+        """
+        Get VM information by ID.
+
+        :param vm_id: VM ID to search for
+        :type vm_id: str
+        :return: VM information or None if not found
+        :rtype: dict or None
+        """
+        endpoint = f"/order-service/api/v1/projects/{self.project_id}/orders/{vm_id}"
+
+        response = self._make_request('GET', endpoint)
+        if response and response.status_code == 200:
+            return response.json()
+        return None
+
+    def create_vm(self, vm_config, count=1):
+        """
+        Create a new virtual machine.
+
+        :param vm_config: VM configuration dictionary
+        :type vm_config: dict
+        :param count: Number of identical VMs to order at once
+        :type count: int
+        :return: Created VM orders
+        :rtype: list
+        """
+        endpoint = f"/order-service/api/v1/projects/{self.project_id}/orders"
+
+        order_data = {
+            "order": {
+                "project_name": f"{self.project_id}",
+                "product_name": "compute_instance",
+                "product_id": "e6fa78c9-2ee1-4f9e-b86c-5d7246f38526",  # OpenStack VM product ID
+                "count": count,
+                "attrs": vm_config
+            }
+        }
+
+        if self.journal is not None:
+            resumed = self._resume_create(vm_config.get('name'), count)
+            if resumed:
+                return resumed
+
+        response = self._make_request('POST', endpoint, data=order_data)
+        self._index_changed()
+        if response and response.status_code in [200, 201]:
+            orders = response.json()
+            if self.journal is not None:
+                self.journal.submitted(self.base_url, self.project_id, 'create', [o.get('id') for o in orders],
+                                       name=vm_config.get('name'), count=count)
+            return orders
+        else:
+            raise Exception(f"Failed to create VM: {response.text if response else 'No response'}")
+
+    def delete_vm(self, vm_id):
+        """
+        Delete a virtual machine.
+
+        :param vm_id: ID of the VM to delete
+        :type vm_id: str
+        :return: Deletion operation result
+        :rtype: dict
+        """
+        vm_order = self.get_vm_by_id(vm_id)
+        if not vm_order:
+            raise Exception(f"VM with ID {vm_id} not found")
+
+        item_id = self.get_vm_instance_item_id(vm_order)
+        if not item_id:
+            raise Exception(f"Could not find instance item_id for VM {vm_id}")
+
+        return self.execute_vm_action(vm_id, item_id, "compute_instance_delete")
+
+    def wait_for_operation(self, order_id, timeout=600, poll_interval=10):
+        """
+        Wait for operation to complete.
+
+        :param order_id: ID of the order to wait for
+        :type order_id: str
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: int
+        :param poll_interval: Delay between status checks in seconds
+        :type poll_interval: float
+        :return: Final operation status
+        :rtype: dict
+        """
+        start_time = time.time()
+
+        with TRACER.span('T1CloudVM.wait_for_operation', **{'t1.order_id': order_id}) as wait_span:
+            iteration = 0
+            while time.time() - start_time < timeout:
+                iteration += 1
+                with TRACER.span('T1CloudVM.wait_for_operation.poll',
+                                 **{'t1.order_id': order_id, 't1.poll.iteration': iteration}) as span:
+                    endpoint = f"/order-service/api/v1/projects/{self.project_id}/orders/{order_id}"
+                    response = self._make_request('GET', endpoint)
+
+                    if response and response.status_code == 200:
+                        order = response.json()
+                        status = order.get('status', 'unknown')
+                        span.set_attribute('t1.order.status', status)
+                        if self.watcher:
+                            self.watcher.observe(order_id, status)
+
+                        if status in FINAL_ORDER_STATUSES:
+                            wait_span.set_attribute('t1.order.status', status)
+                            wait_span.set_attribute('t1.poll.iterations', iteration)
+                            self._index_changed([order_id])
+                            if self.journal is not None:
+                                self.journal.finished([order_id], status)
+                            return order
+
+                self._poll_sleep(poll_interval, f"waiting for order {order_id}")
+
+            raise Exception(f"Operation timeout after {timeout} seconds")
+
+    def wait_for_operations(self, order_ids, timeout=600, poll_interval=10):
+        """
+        Wait for many operations to complete with one shared poller.
+
+        Every poll round checks all unfinished orders at once, with an orders
+        listing when it takes fewer requests (pages) than one GET per
+        unfinished order.
+
+        :param order_ids: IDs of the orders to wait for
+        :type order_ids: list
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: int
+        :param poll_interval: Delay between poll rounds in seconds
+        :type poll_interval: float
+        :return: Final orders by ID; orders that did not complete in time or within the deadline are missing
+        :rtype: dict
+        """
+        start_time = time.time()
+        pending = set(order_ids)
+        finished = {}
+        per_page = 100
+        # Requests needed for one orders listing, known after the first one
+        listing_pages = 1
+
+        with TRACER.span('T1CloudVM.wait_for_operations', **{'t1.orders': len(pending)}):
+            while pending:
+                with TRACER.span('T1CloudVM.wait_for_operations.poll', **{'t1.orders.pending': len(pending)}):
+                    orders = {}
+                    if len(pending) > listing_pages:
+                        listing = self.list_vms(per_page)
+                        listing_pages = len(listing) // per_page + 1
+                        orders = {order.get('id'): order for order in listing if order.get('id') in pending}
+                    for order_id in pending - orders.keys():
+                        order = self.get_vm_by_id(order_id)
+                        if order:
+                            orders[order_id] = order
+
+                    for order_id, order in orders.items():
+                        if self.watcher:
+                            self.watcher.observe(order_id, order.get('status', 'unknown'))
+                        if order.get('status') in FINAL_ORDER_STATUSES:
+                            finished[order_id] = order
+                            pending.discard(order_id)
+
+                if not pending or time.time() - start_time + poll_interval >= timeout:
+                    break
+                if self.deadline is not None and self.deadline.remaining() <= poll_interval:
+                    # Leave the remaining budget to the caller to report unfinished orders
+                    break
+                with tracked(self.deadline, 'polling'):
+                    time.sleep(poll_interval)
+
+        if finished:
+            self._index_changed(finished)
+            if self.journal is not None:
+                self.journal.finished(finished)
+        return finished
+
+    def resume_in_flight(self, timeout=600, poll_interval=10):
+        """
+        Wait for the orders of the project that an interrupted earlier run left in flight.
+
+        Does nothing without a journal. Orders that no longer exist are dropped from it.
+
+        :param timeout: Maximum time to wait in seconds
+        :type timeout: int
+        :param poll_interval: Delay between poll rounds in seconds
+        :type poll_interval: float
+        :return: Final orders by ID; orders that did not complete in time are missing
+        :rtype: dict
+        """
+        order_ids = self.journal.in_flight(self.base_url, self.project_id) if self.journal is not None else []
+        if not order_ids:
+            return {}
+
+        self.journal.resumed_waiting(order_ids)
+        try:
+            return self.wait_for_operations(order_ids, timeout, poll_interval)
+        except T1CloudAPIError as e:
+            if e.status_code != 404:
+                raise
+        gone = [order_id for order_id in order_ids if self._journaled_order(order_id) is None]
+        self.journal.finished(gone)
+        return self.wait_for_operations([order_id for order_id in order_ids if order_id not in gone],
+                                        timeout, poll_interval)
+
+    def get_vm_status(self, vm_id):
+        """
+        Get current VM status.
+
+        :param vm_id: VM ID to check
+        :type vm_id: str
+        :return: VM status information
+        :rtype: dict
+        """
+        endpoint = f"/order-service/api/v1/projects/{self.project_id}/compute/instances/{vm_id}"
+
+        response = self._make_request('GET', endpoint)
+        if response and response.status_code == 200:
+            return response.json()
+        return None
+
+    def get_vm_instances(self, filters=None):
+        """
+        Get list of VM instances from compute service.
+
+        :param filters: Optional filters for the request
+        :type filters: dict or None
+        :return: List of VM instances or None
+        :rtype: list or None
+        """
+        endpoint = f"/order-service/api/v1/projects/{self.project_id}/compute/instances"
+        params = filters or {}
+
+        response = self._make_request('GET', endpoint, params=params)
+        if response and response.status_code == 200:
+            data = response.json()
+            return data.get('list', [])
+        return None
+
+    def list_vm_instances(self, per_page=100):
+        """
+        Get all VM instances of the project from compute service, following pagination.
+
+        :param per_page: Number of instances per page
+        :type per_page: int
+        :return: List of VM instances
+        :rtype: list
+        """
+        if self._synced_index() is not None:
+            return self.index.list_vm_instances(self.base_url, self.project_id)
+
+        return [instance for batch in self.iter_vm_instance_pages(per_page) for instance in batch]
+
+    def iter_vm_instance_pages(self, per_page=100):
+        """
+        Iterate over pages of VM instances of the project from the API.
+
+        :param per_page: Number of instances per page
+        :type per_page: int
+        :return: Generator of lists of VM instances
+        :rtype: generator
+        """
+        page = 1
+
+        while True:
+            batch = self.get_vm_instances({"per_page": per_page, "page": page})
+            if not batch:
+                break
+            yield batch
+            if len(batch) < per_page:
+                break
+            page += 1
+
+    def get_vm_instance_by_id(self, instance_id, with_actions=True, with_children=False):
+        """
+        Get detailed VM instance information by ID.
+
+        :param instance_id: VM instance ID
+        :type instance_id: str
+        :param with_actions: Include available actions
+        :type with_actions: bool
+        :param with_children: Include child resources
+        :type with_children: bool
+        :return: VM instance details or None
+        :rtype: dict or None
+        """
+        endpoint = f"/order-service/api/v1/projects/{self.project_id}/compute/instances/{instance_id}"
+        params = {
+            "with_actions": str(with_actions).lower(),
+            "with_children": str(with_children).lower()
+        }
+
+        response = self._make_request('GET', endpoint, params=params)
+        if response and response.status_code == 200:
+            return response.json()
+        return None
+
+    def get_vm_instance_by_name(self, name, live=False):
+        """
+        Get VM instance information by name from compute service.
+
+        :param name: VM name to search for
+        :type name: str
+        :param live: Query the compute API even with a local orders index,
+            whose copy of the power state is not updated by a guest shutdown
+        :type live: bool
+        :return: VM instance information or None
+        :rtype: dict or None
+        """
+        if not live and self._synced_index() is not None:
+            return self.index.get_vm_instance_by_name(self.base_url, self.project_id, name)
+
+        instances = self.get_vm_instances({"name": name})
+        if instances:
+            for instance in instances:
+                if instance.get('data', {}).get('config', {}).get('name') == name:
+                    return instance
+        return None
+
+    def get_vm_runtime_info(self, vm_name_or_id, live=False):
+        """
+        Get comprehensive runtime information about VM including IP addresses,
+        power status, and other dynamic parameters.
+
+        :param vm_name_or_id: VM name or instance ID
+        :type vm_name_or_id: str
+        :param live: Bypass the local orders index (see ``get_vm_instance_by_name``)
+        :type live: bool
+        :return: Dictionary with runtime information
+        :rtype: dict
+        """
+        # First try to get by name from compute instances
+        instance = self.get_vm_instance_by_name(vm_name_or_id, live=live)
+
+        # If not found by name, try as instance ID
+        if not instance:
+            instance = self.get_vm_instance_by_id(vm_name_or_id)
+
+        if not instance:
+            return None
+
+        return runtime_info_from_instance(instance)
+
+    def get_vm_instance_item_id(self, vm_order):
+        """
+        Get instance item_id from VM order.
+
+        :param vm_order: VM order data
+        :type vm_order: dict
+        :return: Instance item_id or None
+        :rtype: str or None
+        """
+        preview_items = vm_order.get('attrs', {}).get('preview_items', [])
+        for item in preview_items:
+            if item.get('type') == 'instance':
+                return item.get('item_id')
+        return None
+
+    def execute_vm_action(self, vm_id, item_id, action_name, attrs=None):
+        """
+        Execute action on VM.
+
+        :param vm_id: VM order ID
+        :type vm_id: str
+        :param item_id: VM instance item ID
+        :type item_id: str
+        :param action_name: Action to execute
+        :type action_name: str
+        :param attrs: Additional attributes for action
+        :type attrs: dict or None
+        :return: Action result
+        :rtype: dict
+        """
+        endpoint = f"/order-service/api/v1/projects/{self.project_id}/orders/{vm_id}/actions/{action_name}"
+
+        action_data = {
+            "item_id": item_id,
+            "order": {
+                "attrs": attrs or {}
+            }
+        }
+
+        if self.journal is not None:
+            order_id = self.journal.in_flight_action(self.base_url, self.project_id, vm_id, action_name)
+            order = self._journaled_order(order_id) if order_id else None
+            if order is not None and order.get('status') not in FINAL_ORDER_STATUSES:
+                self.journal.resumed_waiting([order_id])
+                return order
+            if order_id:
+                self.journal.finished([order_id], order.get('status') if order else None)
+
+        response = self._make_request('PATCH', endpoint, data=action_data)
+        self._index_changed([vm_id])
+        if response and response.status_code in [200, 201]:
+            result = response.json()
+            if self.journal is not None:
+                self.journal.submitted(self.base_url, self.project_id, 'action', [result.get('id', vm_id)],
+                                       vm_id=vm_id, action=action_name)
+            return result
+        else:
+            raise Exception(f"Failed to execute action '{action_name}': {response.text if response else 'No response'}")
+
+    def start_vm(self, vm_id):
+        """
+        Start a virtual machine.
+
+        :param vm_id: ID of the VM to start
+        :type vm_id: str
+        :return: Operation result
+        :rtype: dict
+        """
+        vm_order = self.get_vm_by_id(vm_id)
+        if not vm_order:
+            raise Exception(f"VM with ID {vm_id} not found")
+
+        item_id = self.get_vm_instance_item_id(vm_order)
+        if not item_id:
+            raise Exception(f"Could not find instance item_id for VM {vm_id}")
+
+        return self.execute_vm_action(vm_id, item_id, "start_compute_vm")
+
+    def stop_vm(self, vm_id):
+        """
+        Stop a virtual machine.
+
+        :param vm_id: ID of the VM to stop
+        :type vm_id: str
+        :return: Operation result
+        :rtype: dict
+        """
+        vm_order = self.get_vm_by_id(vm_id)
+        if not vm_order:
+            raise Exception(f"VM with ID {vm_id} not found")
+
+        item_id = self.get_vm_instance_item_id(vm_order)
+        if not item_id:
+            raise Exception(f"Could not find instance item_id for VM {vm_id}")
+
+        return self.execute_vm_action(vm_id, item_id, "stop_compute_vm")
+
+
+def runtime_info_from_instance(instance):
+    """
+    Extract runtime information (IP addresses, power status and other
+    dynamic parameters) from a compute instance record.
+
+    :param instance: Compute instance from the compute instances API
+    :type instance: dict
+    :return: Dictionary with runtime information
+    :rtype: dict
+    """
+    return runtime_info_from_instances([instance])[0]
+
+
+def _interned(value):
+    """Intern a string value, return other values as is"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _shared_value(value, shared):
+    """
+    Get the first seen dict equal to a flat dict, so equal flavors, images
+    and zones of many instances are kept once.
+    """
+    if not value:
+        return value
+    try:
+        key = tuple(sorted(value.items()))
+        return shared.setdefault(key, value)
+    except TypeError:
+        # Nested or unorderable values, keep the dict of the instance
+        return value
+
+
+def runtime_info_from_instances(instances):
+    """
+    Extract the runtime information of many compute instance records in one pass.
+
+    Produces the same records as ``runtime_info_from_instance`` for the
+    whole ``list`` of a compute instances listing. Strings repeated across
+    instances (power states, network names, address types) are interned
+    and equal flavor, image and availability zone dicts are shared between
+    records instead of kept once per instance, which keeps listings of
+    thousands of instances small. Shared values must not be modified.
+
+    :param instances: Compute instances from the compute instances API
+    :type instances: list
+    :return: Runtime information of every instance, in listing order
+    :rtype: list
+    """
+    intern = sys.intern
+    shared = {}
+    records = []
+    append = records.append
+    for instance in instances:
+        data = instance.get('data') or {}
+        config = data.get('config') or {}
+        state = _interned(data.get('state', 'unknown'))
+
+        ip_addresses = {}
+        for network_name, ips in (config.get('addresses') or {}).items():
+            ip_addresses[intern(network_name)] = [
+                {
+                    'addr': ip_info.get('addr'),
+                    'version': ip_info.get('version'),
+                    'type': _interned(ip_info.get('OS-EXT-IPS:type')),
+                    'mac_addr': ip_info.get('OS-EXT-IPS-MAC:mac_addr'),
+                }
+                for ip_info in ips
+            ]
+
+        append({
+            'instance_id': config.get('id'),
+            'name': config.get('name'),
+            'status': state,
+            'power_status': state,
+            'description': config.get('description', ''),
+            'created_at': instance.get('created_row_dt'),
+            'order_id': instance.get('order_id'),
+            'item_id': instance.get('item_id'),
+            'ip_addresses': ip_addresses,
+            'flavor': _shared_value(config.get('flavor', {}), shared),
+            'image': _shared_value(config.get('source_image', {}), shared),
+            'availability_zone': _shared_value(config.get('availability_zone', {}), shared),
+            'volumes': [],
+            'network_interfaces': [],
+            'primary_ipv4': config.get('accessIPv4', ''),
+            'primary_ipv6': config.get('accessIPv6', ''),
+        })
+    return records
+
+
+def select_instances(instances, labels=None, name_pattern=None):
+    """
+    Select compute instances matching labels and name pattern.
+
+    :param instances: Compute instances listing
+    :type instances: list
+    :param labels: Labels the instance must have
+    :type labels: dict or None
+    :param name_pattern: Shell-style name pattern
+    :type name_pattern: str or None
+    :return: Matching instances
+    :rtype: list
+    """
+    selected = []
+    for instance in instances:
+        config = instance.get('data', {}).get('config', {})
+        name = config.get('name') or ''
+        if name_pattern and not fnmatch.fnmatchcase(name, name_pattern):
+            continue
+        if labels:
+            vm_labels = config.get('labels') or {}
+            if any(str(vm_labels.get(key)) != str(value) for key, value in labels.items()):
+                continue
+        selected.append(instance)
+    return selected
+
+
+def build_vm_config(module):
+    """
+    Build VM configuration from module parameters.
+
+    :param module: Ansible module instance
+    :type module: AnsibleModule
+    :return: VM configuration dictionary
+    :rtype: dict
+    """
+    params = module.params
+
+    config = {
+        "name": params['name'],
+        "description": params['description'],
+        "region": {
+            "id": params['region_id'],
+            "name": params['region_name'],
+            "description": ""
+        },
+        "availability_zone": {
+            "id": params['availability_zone_id'],
+            "name": params['availability_zone_name'],
+            "description": ""
+        }
+    }
+
+    # Image configuration
+    if params['image_id']:
+        config["image"] = {
+            "id": params['image_id'],
+            "name": params.get('image_name', ''),
+            "os_distro": "windows",
+        }
+    elif params['image_name']:
+        # In real implementation, we would need to look up image ID by name
+        config["image"] = {
+            "id": "",  # Would be resolved by API call
+            "name": params['image_name'],
+            "os_distro": "windows",
+        }
+
+    # Flavor configuration
+    if params['flavor_id']:
+        config["flavor"] = {
+            "id": params['flavor_id'],
+            "name": params.get('flavor_name', ''),
+            "ram": params.get('flavor_ram', 4096),  # Default values
+            "vcpus": params.get('flavor_vcpus', 2),  # Default values
+            "gpus": 0
+        }
+    elif params['flavor_name']:
+        config["flavor"] = {
+            "id": "",  # Would be resolved by API call
+            "name": params['flavor_name'],
+            "ram": params.get('flavor_ram', 4096),  # Default values
+            "vcpus": params.get('flavor_vcpus', 2),  # Default values
+            "gpus": 0
+        }
+
+    config["volumes_config"] = {}
+    # Disk configuration
+    config["volumes_config"] = {
+        "boot_volume": {
+            "size": params['disk_size'],
+            "volume_type": {
+                "id": params['disk_type_id'],
+                "name": params['disk_type_name'],
+                "extra_specs": {}
+            }
+        },
+        "extra_volumes": []
+    }
+
+    # Extra disks
+    if params['extra_disks']:
+        config["volumes_config"]["extra_volumes"] = []
+        for disk in params['extra_disks']:
+            extra_disk = {
+                "name": disk.get('name', 'extra-disk'),
+                "size": disk['size'],
+                "volume_type": {
+                    "id": disk.get('type_id', 'cb4724f6-e53e-4632-ac78-f83c4332add3'),
+                    "name": disk.get('type_name', 'ceph_hdd'),
+                    "extra_specs": {}
+                }
+            }
+            config["volumes_config"]["extra_volumes"].append(extra_disk)
+
+    # Network configuration
+    config["network_configuration"] = {
+        "subnet": {
+            "id": params['subnet_id'],
+            "cidr": params['subnet_cidr'],
+            "name": params['subnet_name']
+        },
+        "set_ip_address": bool(params['requested_ip']),
+        "toggle_shared_network": bool(params['toggle_shared_network']),
+        "use_external_network": False
+    }
+
+    if params['requested_ip']:
+        config["network_configuration"]["requested_ip"] = params['requested_ip']
+
+    # Public IP configuration
+    config["add_public_ip"] = params['assign_public_ip']
+    if params['assign_public_ip']:
+        config["create_public_ip"] = params['create_public_ip']
+        if params['create_public_ip']:
+            config["public_ip_bandwidth"] = params['public_ip_bandwidth']
+
+    # Security groups
+    if params['security_groups']:
+        config["security_groups"] = [
+            {"id": sg_id, "name": "default"} for sg_id in params['security_groups']
+        ]
+
+    # SSH keys
+    if params['ssh_keys']:
+        config["ssh_keys"] = params['ssh_keys']
+
+    # User data
+    config["add_user_data"] = bool(params['user_data'])
+    if params['user_data']:
+        config["user_data"] = params['user_data']
+
+    # Other settings
+    config["preemptible"] = params['preemptible']
+    config["add_placement_policy"] = False
+
+    # Add labels if provided
+    if params['labels']:
+        config["labels"] = params['labels']
+
+    return config
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+import time
+from contextlib import contextmanager
+
+from ansible.module_utils.basic import env_fallback
+
+try:
+    from urllib3.exceptions import MaxRetryError, ResponseError
+    from urllib3.util import Retry, Timeout
+    HAS_URLLIB3 = True
+except ImportError:
+    HAS_URLLIB3 = False
+
+# Module options of the end-to-end deadline, shared by modules of this collection
+DEADLINE_OPTIONS = dict(
+    deadline=dict(type='float', fallback=(env_fallback, ['T1_CLOUD_DEADLINE'])),
+    deadline_spent=dict(type='dict'),
+)
+
+
+class DeadlineExceeded(Exception):
+    """
+    Module run took longer than its deadline.
+
+    :param message: Error message
+    :type message: str
+    :param breakdown: Where the time went, see Deadline.breakdown
+    :type breakdown: dict
+    """
+
+    def __init__(self, message, breakdown):
+        super(DeadlineExceeded, self).__init__(message)
+        self.breakdown = breakdown
+
+
+class Deadline:
+    """
+    Time budget of a whole module run.
+
+    ``T1CloudVM`` shrinks the timeout of every request attempt to the
+    remaining budget, stops retrying when the next backoff or Retry-After
+    delay would not fit and cuts the sleeps between status polls, so a task fails promptly with
+    ``DeadlineExceeded`` instead of running far past its budget. Time is
+    accounted per category (``requests``, ``polling`` and whatever was
+    spent before the module started, such as ``controller``) to report
+    where it went. Concurrent requests are accounted in full, so the
+    categories may add up to more than the elapsed time.
+
+    :param budget: Budget in seconds
+    :type budget: float
+    :param spent: Seconds already spent by category before the deadline was created
+    :type spent: dict or None
+    :param clock: Monotonic clock function
+    :type clock: callable
+    """
+
+    def __init__(self, budget, spent=None, clock=time.monotonic):
+        """
+        Initialize Deadline instance.
+
+        :param budget: Budget in seconds
+        :type budget: float
+        :param spent: Seconds already spent by category before the deadline was created
+        :type spent: dict or None
+        :param clock: Monotonic clock function
+        :type clock: callable
+        """
+        self.budget = budget
+        self.clock = clock
+        self._start = clock()
+        self._preceding = {category: float(seconds) for category, seconds in (spent or {}).items()}
+        self._spent = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def attach(cls, module):
+        """
+        Create the deadline of a module run if its ``deadline`` option is set.
+
+        Failures of the module then carry the time breakdown as ``time_breakdown``.
+
+        :param module: Module with DEADLINE_OPTIONS in its argument spec
+        :type module: AnsibleModule
+        :return: Deadline to pass to T1CloudVM, None if no deadline is set
+        :rtype: Deadline or None
+        """
+        budget = module.params.get('deadline')
+        if not budget:
+            return None
+
+        deadline = cls(budget, spent=module.params.get('deadline_spent'))
+        fail_json = module.fail_json
+
+        def deadline_fail_json(msg, **kwargs):
+            kwargs['time_breakdown'] = deadline.breakdown()
+            fail_json(msg=msg, **kwargs)
+
+        module.fail_json = deadline_fail_json
+        if deadline.expired:
+            module.fail_json(msg=f"Deadline of {budget} seconds exceeded before the module started")
+        return deadline
+
+    def elapsed(self):
+        """
+        Get seconds spent so far, including the preceding time.
+
+        :rtype: float
+        """
+        return sum(self._preceding.values()) + self.clock() - self._start
+
+    def remaining(self):
+        """
+        Get seconds left in the budget, negative once exceeded.
+
+        :rtype: float
+        """
+        return self.budget - self.elapsed()
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout(self, default, activity='waiting'):
+        """
+        Fit a timeout into the remaining budget.
+
+        :param default: Timeout to use when the budget allows it
+        :type default: float
+        :param activity: What the timeout is for, used in the error message
+        :type activity: str
+        :return: Smaller of the default and the remaining budget
+        :rtype: float
+        :raises DeadlineExceeded: If the budget is used up
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.exceeded(activity)
+        return min(default, remaining)
+
+    def request_timeout(self, default, activity='requesting'):
+        """
+        Get the timeout of an HTTP request, fitted into the remaining budget
+        again for every retry of the request.
+
+        :param default: Timeout to use when the budget allows it
+        :type default: float
+        :param activity: What the request is for, used in the error message
+        :type activity: str
+        :return: urllib3 timeout, the fitted seconds without urllib3
+        :rtype: DeadlineTimeout or float
+        :raises DeadlineExceeded: If the budget is used up
+        """
+        if not HAS_URLLIB3:
+            return self.timeout(default, activity)
+        return DeadlineTimeout(self, default, activity)
+
+    @contextmanager
+    def track(self, category):
+        """
+        Account the time spent in a block of code to a category.
+
+        :param category: Category name
+        :type category: str
+        """
+        start = self.clock()
+        try:
+            yield
+        finally:
+            spent = self.clock() - start
+            with self._lock:
+                self._spent[category] = self._spent.get(category, 0.0) + spent
+
+    def breakdown(self):
+        """
+        Get where the time went.
+
+        :return: Budget, elapsed seconds and seconds per category, with the
+            unaccounted rest as 'other'
+        :rtype: dict
+        """
+        with self._lock:
+            categories = dict(self._preceding)
+            for category, seconds in self._spent.items():
+                categories[category] = categories.get(category, 0.0) + seconds
+        elapsed = self.elapsed()
+        categories['other'] = max(0.0, elapsed - sum(categories.values()))
+        return dict(
+            {category: round(seconds, 3) for category, seconds in categories.items()},
+            budget=self.budget,
+            elapsed=round(elapsed, 3),
+        )
+
+    def exceeded(self, activity):
+        """
+        Build the error raised when the budget is used up.
+
+        :param activity: What was being done when the deadline passed
+        :type activity: str
+        :rtype: DeadlineExceeded
+        """
+        breakdown = self.breakdown()
+        spent = ", ".join(f"{category} {seconds}s" for category, seconds in breakdown.items()
+                          if category not in ('budget', 'elapsed'))
+        return DeadlineExceeded(
+            f"Deadline of {self.budget} seconds exceeded while {activity} after {breakdown['elapsed']}s ({spent})",
+            breakdown
+        )
+
+
+@contextmanager
+def tracked(deadline, category):
+    """
+    Account the time spent in a block of code to a category of a deadline, if any.
+
+    :param deadline: Deadline of the run
+    :type deadline: Deadline or None
+    :param category: Category name
+    :type category: str
+    """
+    if deadline is None:
+        yield
+        return
+    with deadline.track(category):
+        yield
+
+
+# Non-idempotent methods still retried on HTTP 429, which the API answers
+# before acting on the request
+RATE_LIMITED_RETRY_METHODS = frozenset(['POST', 'PATCH'])
+
+
+if HAS_URLLIB3:
+    class DeadlineRetry(Retry):
+        """
+        urllib3 retry strategy that gives up once the next backoff would not fit the deadline.
+
+        Besides the idempotent methods retried by Retry, POST and PATCH
+        requests are retried when rate limited with HTTP 429, after the
+        Retry-After delay if the response has one.
+
+        :param deadline: Deadline of the run, None to retry like Retry
+        :type deadline: Deadline or None
+        """
+
+        def __init__(self, *args, deadline=None, **kwargs):
+            super(DeadlineRetry, self).__init__(*args, **kwargs)
+            self.deadline = deadline
+
+        def new(self, **kwargs):
+            retry = super(DeadlineRetry, self).new(**kwargs)
+            retry.deadline = self.deadline
+            return retry
+
+        def is_retry(self, method, status_code, has_retry_after=False):
+            if status_code == 429 and method.upper() in RATE_LIMITED_RETRY_METHODS:
+                return True
+            return super(DeadlineRetry, self).is_retry(method, status_code, has_retry_after)
+
+        def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+            retry = super(DeadlineRetry, self).increment(method, url, response=response, error=error,
+                                                         _pool=_pool, _stacktrace=_stacktrace)
+            if self.deadline is None:
+                return retry
+            # The sleep before the retry is the Retry-After delay if the response has one;
+            # the retry itself gets the timeout fitted into what is left (DeadlineTimeout)
+            wait = retry.get_backoff_time()
+            if response is not None and retry.respect_retry_after_header:
+                wait = max(wait, retry.get_retry_after(response) or 0)
+            if wait >= self.deadline.remaining():
+                reason = error or ResponseError(f"no time left in the deadline to retry HTTP {getattr(response, 'status', '')}")
+                raise MaxRetryError(_pool, url, reason)
+            return retry
+
+    class DeadlineTimeout(Timeout):
+        """
+        urllib3 timeout of a request, shrunk to the remaining deadline for every attempt.
+
+        urllib3 clones the timeout of a request for each attempt, so retries
+        get what is left of the budget instead of the timeout of the first
+        attempt.
+
+        :param deadline: Deadline of the run
+        :type deadline: Deadline
+        :param default: Timeout to use when the budget allows it
+        :type default: float
+        :param activity: What the request is for, used in the error message
+        :type activity: str
+        """
+
+        def __init__(self, deadline, default, activity='requesting'):
+            seconds = deadline.timeout(default, activity)
+            super(DeadlineTimeout, self).__init__(connect=seconds, read=seconds)
+            self.deadline = deadline
+            self.default = default
+            self.activity = activity
+
+        def clone(self):
+            seconds = self.deadline.timeout(self.default, self.activity)
+            return Timeout(connect=seconds, read=seconds)
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fcntl
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+try:
+    from requests import Response
+    from requests.adapters import BaseAdapter, HTTPAdapter
+    from requests.exceptions import ConnectionError as RequestsConnectionError
+    from requests.structures import CaseInsensitiveDict
+except ImportError:
+    HTTPAdapter = BaseAdapter = object
+
+# Path of a fixture file (JSON lines) to append the HTTP interactions of T1CloudVM clients to
+RECORD_ENV = 'T1_CLOUD_HTTP_RECORD'
+
+# Path of a fixture file to answer the requests of T1CloudVM clients from, without any network
+REPLAY_ENV = 'T1_CLOUD_HTTP_REPLAY'
+
+# Factor applied to the recorded response times when replaying (0 replays instantly)
+REPLAY_LATENCY_ENV = 'T1_CLOUD_HTTP_REPLAY_LATENCY'
+
+# Body fields whose values never reach a fixture file
+REDACTED_FIELDS = frozenset(('access_token', 'refresh_token', 'id_token', 'api_token', 'token',
+                             'client_secret', 'private_key', 'password'))
+
+REDACTED = 'REDACTED'
+
+# Response headers kept in fixtures, the body is stored decoded
+KEPT_HEADERS = ('Content-Type', 'Retry-After', 'Location')
+
+# Order, item and instance IDs in request paths
+ID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+
+def redact(value):
+    """
+    Replace the values of secret fields in a decoded JSON body.
+
+    :param value: Decoded JSON value
+    :return: Copy with every field of REDACTED_FIELDS set to 'REDACTED'
+    """
+    if isinstance(value, dict):
+        return {key: REDACTED if key in REDACTED_FIELDS and item is not None else redact(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def request_key(method, url):
+    """
+    Get the host-independent key of a request: method, path and sorted query.
+
+    :param method: HTTP method
+    :type method: str
+    :param url: Request URL
+    :type url: str
+    :rtype: str
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {parts.path}" + (f"?{query}" if query else '')
+
+
+def request_route(key):
+    """
+    Get the route of a request key: method and path with IDs replaced by '{id}', without the query.
+
+    :param key: Request key (see ``request_key``)
+    :type key: str
+    :rtype: str
+    """
+    return ID_PATTERN.sub('{id}', key.split('?', 1)[0])
+
+
+def _decode_body(body, content_type=''):
+    """Decode a request or response body for storage, JSON when possible"""
+    if body is None or body == b'' or body == '':
+        return None
+    if isinstance(body, bytes):
+        if body[:2] == b'\x1f\x8b':
+            import gzip
+            body = gzip.decompress(body)
+        try:
+            body = body.decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+    if 'json' in content_type or body[:1] in ('{', '['):
+        try:
+            return redact(json.loads(body))
+        except ValueError:
+            pass
+    return body
+
+
+class HTTPFixture:
+    """
+    Recorded HTTP interactions of T1 Cloud API clients.
+
+    Interactions are kept in recording order with the request key (method,
+    path and query, see ``request_key``), the request body, the response
+    status, headers and body, and the response time. Secret values of
+    bodies are redacted and request headers, which carry the API token, are
+    not kept. Replaying serves the interactions of a request key in their
+    recorded order, preferring the one with the same request body, so
+    concurrent clients and repeated polls get the responses they got when
+    recorded.
+
+    The fixture file holds one JSON interaction per line. Recording appends
+    each interaction under an exclusive lock of the file, so clients of
+    parallel module runs (forks) can record into the same file.
+
+    Safe to use from several threads.
+
+    :param path: Fixture file path
+    :type path: str
+    """
+
+    def __init__(self, path=None):
+        """
+        Initialize HTTPFixture instance, loading the fixture file if it exists.
+
+        :param path: Fixture file path, None to keep interactions in memory only
+        :type path: str or None
+        """
+        self.path = path
+        self.interactions = []
+        self._lock = threading.Lock()
+        self._pending = None
+        # Number of requests replayed by route (see ``request_route``)
+        self.replayed = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self.interactions.append(json.loads(line))
+                    except ValueError:
+                        # Line cut short by an interrupted write
+                        continue
+
+    def record(self, request, response, elapsed):
+        """
+        Add an interaction, appending it to the fixture file.
+
+        :param request: Sent request
+        :type request: requests.PreparedRequest
+        :param response: Received response
+        :type response: requests.Response
+        :param elapsed: Response time in seconds
+        :type elapsed: float
+        """
+        content_type = request.headers.get('Content-Type', '')
+        interaction = {
+            'request': {
+                'key': request_key(request.method, request.url),
+                'body': _decode_body(request.body, content_type),
+            },
+            'response': {
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+                'body': _decode_body(response.content, response.headers.get('Content-Type', '')),
+            },
+            'elapsed': round(elapsed, 4),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+        if self.path:
+            self._append(interaction)
+
+    def _append(self, interaction):
+        """Append an interaction to the fixture file under its lock"""
+        data = (json.dumps(interaction, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    def save(self, path=None):
+        """
+        Write all interactions to a fixture file atomically.
+
+        :param path: Fixture file path, defaults to the one of the fixture
+        :type path: str or None
+        """
+        path = path or self.path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.t1_cloud_fixture_')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(interaction, ensure_ascii=False, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, path)
+
+    def counts(self):
+        """
+        Get the number of recorded interactions by route.
+
+        :return: Count by route (see ``request_route``)
+        :rtype: dict
+        """
+        counts = {}
+        for interaction in self.interactions:
+            route = request_route(interaction['request']['key'])
+            counts[route] = counts.get(route, 0) + 1
+        return counts
+
+    def total_elapsed(self):
+        """
+        Get the sum of the recorded response times in seconds.
+
+        :rtype: float
+        """
+        return round(sum(interaction['elapsed'] for interaction in self.interactions), 4)
+
+    def replay(self, request):
+        """
+        Take the recorded interaction answering a request.
+
+        :param request: Request to answer
+        :type request: requests.PreparedRequest
+        :return: Recorded interaction
+        :rtype: dict
+        :raises: KeyError if no recorded interaction is left for the request
+        """
+        key = request_key(request.method, request.url)
+        body = _decode_body(request.body, request.headers.get('Content-Type', ''))
+        with self._lock:
+            if self._pending is None:
+                self._pending = {}
+                for interaction in self.interactions:
+                    self._pending.setdefault(interaction['request']['key'], []).append(interaction)
+            queue = self._pending.get(key) or []
+            if not queue:
+                raise KeyError(f"No recorded response left for {key}")
+            match = next((i for i, interaction in enumerate(queue) if interaction['request']['body'] == body), 0)
+            route = request_route(key)
+            self.replayed[route] = self.replayed.get(route, 0) + 1
+            return queue.pop(match)
+
+    def unused(self):
+        """
+        Get the number of recorded interactions not replayed yet.
+
+        :rtype: int
+        """
+        with self._lock:
+            if self._pending is None:
+                return len(self.interactions)
+            return sum(len(queue) for queue in self._pending.values())
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Transport adapter sending requests over the network and recording them into a fixture.
+
+    :param fixture: Fixture to record into
+    :type fixture: HTTPFixture
+    """
+
+    def __init__(self, fixture, **kwargs):
+        self.fixture = fixture
+        super(RecordingAdapter, self).__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        start = time.monotonic()
+        response = super(RecordingAdapter, self).send(request, **kwargs)
+        self.fixture.record(request, response, time.monotonic() - start)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter answering requests from a fixture, without any network.
+
+    Each response is delayed by its recorded response time multiplied by
+    ``latency``. A request without a recorded response left fails like an
+    unreachable host.
+
+    :param fixture: Fixture to replay
+    :type fixture: HTTPFixture
+    :param latency: Factor applied to the recorded response times
+    :type latency: float
+    """
+
+    def __init__(self, fixture, latency=1.0):
+        super(ReplayAdapter, self).__init__()
+        self.fixture = fixture
+        self.latency = latency
+
+    def send(self, request, **kwargs):
+        try:
+            interaction = self.fixture.replay(request)
+        except KeyError as e:
+            raise RequestsConnectionError(str(e.args[0]), request=request)
+
+        if self.latency > 0 and interaction['elapsed'] > 0:
+            time.sleep(interaction['elapsed'] * self.latency)
+
+        recorded = interaction['response']
+        response = Response()
+        response.status_code = recorded['status']
+        response.reason = recorded.get('reason')
+        response.headers = CaseInsensitiveDict(recorded.get('headers') or {})
+        body = recorded.get('body')
+        if body is None:
+            response._content = b''
+        elif isinstance(body, str):
+            response._content = body.encode('utf-8')
+        else:
+            response._content = json.dumps(body).encode('utf-8')
+            response.headers.setdefault('Content-Type', 'application/json')
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def http_adapter(**kwargs):
+    """
+    Get the transport adapter of a T1CloudVM client session.
+
+    A regular ``HTTPAdapter`` unless the ``T1_CLOUD_HTTP_REPLAY`` environment
+    variable names a fixture file to answer requests from (scaling recorded
+    response times by ``T1_CLOUD_HTTP_REPLAY_LATENCY``, 1 by default) or
+    ``T1_CLOUD_HTTP_RECORD`` names a fixture file to record requests into.
+
+    :param kwargs: HTTPAdapter arguments (max_retries, pool_maxsize)
+    :return: Transport adapter
+    :rtype: requests.adapters.BaseAdapter
+    """
+    replay_path = os.environ.get(REPLAY_ENV)
+    if replay_path:
+        return ReplayAdapter(HTTPFixture(replay_path), latency=float(os.environ.get(REPLAY_LATENCY_ENV, 1.0)))
+    record_path = os.environ.get(RECORD_ENV)
+    if record_path:
+        return RecordingAdapter(HTTPFixture(record_path), **kwargs)
+    return HTTPAdapter(**kwargs)
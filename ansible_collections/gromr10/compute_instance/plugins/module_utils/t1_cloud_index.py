@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+from ansible.module_utils.basic import env_fallback
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+    DEPROVISIONED_STATUSES,
+    T1CloudAPIError,
+)
+
+# Module options of the local orders index, shared by modules of this collection
+INDEX_OPTIONS = dict(
+    index_path=dict(type='path', fallback=(env_fallback, ['T1_CLOUD_INDEX'])),
+    index_refresh=dict(type='bool', default=False),
+)
+
+# Query parameters listing orders most recently updated first
+ORDERS_SORT = {'sort': 'updated_at', 'order': 'desc'}
+
+# Above this many changed orders an incremental sync relists all instances
+# instead of fetching the instance of every changed order
+INSTANCES_RELIST_THRESHOLD = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    scope TEXT NOT NULL,
+    order_id TEXT NOT NULL,
+    name TEXT,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (scope, order_id)
+);
+CREATE INDEX IF NOT EXISTS orders_name ON orders (scope, name);
+CREATE INDEX IF NOT EXISTS orders_status ON orders (scope, status);
+CREATE TABLE IF NOT EXISTS order_labels (
+    scope TEXT NOT NULL,
+    order_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (scope, order_id, key)
+);
+CREATE INDEX IF NOT EXISTS order_labels_key_value ON order_labels (scope, key, value);
+CREATE TABLE IF NOT EXISTS instances (
+    scope TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    order_id TEXT,
+    name TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (scope, item_id)
+);
+CREATE INDEX IF NOT EXISTS instances_name ON instances (scope, name);
+CREATE INDEX IF NOT EXISTS instances_order ON instances (scope, order_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at REAL
+);
+"""
+
+
+class OrdersIndex:
+    """
+    Local SQLite mirror of the VM orders and compute instances of projects.
+
+    The first sync of a project pages through all its orders and
+    instances. Later syncs list orders most recently updated first and
+    stop at the first page reaching orders not updated since the previous
+    sync (the watermark, a server-side ``updated_at``) or already stored
+    unchanged, then refresh the instances of the changed orders only.
+    When the API ignores the sort order, the sync notices it and reads all
+    pages instead of stopping early. Queries by name, status and labels
+    are then answered locally.
+
+    Every project is synced at most once per index object until it is
+    marked stale by a write operation of ``T1CloudVM``. The database can
+    be shared by concurrent processes; each operation opens its own
+    connection, so the index can also be used from many threads.
+
+    :param path: Database file path
+    :type path: str
+    :param refresh: Whether the first sync of every project reads all pages
+    :type refresh: bool
+    """
+
+    def __init__(self, path, refresh=False):
+        """
+        Initialize OrdersIndex instance.
+
+        :param path: Database file path
+        :type path: str
+        :param refresh: Whether the first sync of every project reads all pages
+        :type refresh: bool
+        """
+        self.path = path
+        self.refresh = refresh
+        # Sync statistics by scope, see sync
+        self.stats = {}
+        self._synced = set()
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Create the index configured by module parameters.
+
+        :param params: Module parameters with INDEX_OPTIONS
+        :type params: dict
+        :return: Index, None if ``index_path`` is not set
+        :rtype: OrdersIndex or None
+        """
+        if not params.get('index_path'):
+            return None
+        return cls(params['index_path'], refresh=params.get('index_refresh', False))
+
+    @staticmethod
+    def scope(base_url, project_id):
+        """
+        Get the key of a project in the index.
+
+        :rtype: str
+        """
+        return f"{base_url.rstrip('/')}|{project_id}"
+
+    @contextmanager
+    def _connect(self):
+        """
+        Open a connection in autocommit mode, creating the schema on first use.
+        """
+        if not self._schema_ready:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        with closing(sqlite3.connect(self.path, timeout=30, isolation_level=None)) as conn:
+            if not self._schema_ready:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.executescript(SCHEMA)
+                self._schema_ready = True
+            yield conn
+
+    @contextmanager
+    def _transaction(self):
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def mark_stale(self, base_url, project_id, order_ids=()):
+        """
+        Make the next query of a project sync it again, after a write operation.
+
+        The given orders are marked as changed in the index as well, so the
+        next sync of any process fetches them again even if their update
+        time did not move past the watermark.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param order_ids: IDs of the orders written to or finished
+        :type order_ids: iterable
+        """
+        scope = self.scope(base_url, project_id)
+        with self._lock:
+            self._synced.discard(scope)
+        order_ids = list(order_ids)
+        if order_ids:
+            with self._transaction() as conn:
+                conn.executemany("UPDATE orders SET updated_at = '' WHERE scope = ? AND order_id = ?",
+                                 [(scope, order_id) for order_id in order_ids])
+
+    def ensure_synced(self, client):
+        """
+        Sync the project of a client unless already done by this index object.
+
+        :param client: Client of the project
+        :type client: T1CloudVM
+        """
+        scope = self.scope(client.base_url, client.project_id)
+        with self._lock:
+            if scope in self._synced:
+                return
+            scope_lock = self._locks.setdefault(scope, threading.Lock())
+        with scope_lock:
+            if scope in self._synced:
+                return
+            self.sync(client)
+            with self._lock:
+                self._synced.add(scope)
+
+    def sync(self, client):
+        """
+        Bring the mirror of the client's project up to date.
+
+        :param client: Client of the project
+        :type client: T1CloudVM
+        :return: Statistics: 'mode' ('full' or 'incremental'), number of
+            'orders' and 'instances' fetched, and 'pages' of orders read
+        :rtype: dict
+        """
+        scope = self.scope(client.base_url, client.project_id)
+        with self._connect() as conn:
+            row = conn.execute('SELECT watermark FROM sync_state WHERE scope = ?', (scope,)).fetchone()
+        watermark = None if row is None or (self.refresh and scope not in self.stats) else row[0]
+        full = watermark is None
+
+        # Orders at the watermark are fetched again as the timestamps may be coarse;
+        # those stored with the same update time and status have not changed
+        known = {}
+        if not full:
+            with self._connect() as conn:
+                known = {order_id: (updated_at, status) for order_id, updated_at, status in conn.execute(
+                    'SELECT order_id, updated_at, status FROM orders WHERE scope = ? AND updated_at >= ?',
+                    (scope, watermark)
+                )}
+
+        def unchanged(order):
+            return known.get(order.get('id')) == (order.get('updated_at') or '', order.get('status'))
+
+        orders = []
+        pages = 0
+        in_order = True
+        previous = None
+        for batch in client.iter_vm_pages(params=ORDERS_SORT):
+            pages += 1
+            for order in batch:
+                updated_at = order.get('updated_at') or ''
+                if previous is not None and updated_at > previous:
+                    in_order = False
+                previous = updated_at
+            orders.extend(batch)
+            if not full and in_order and batch and ((batch[-1].get('updated_at') or '') < watermark
+                                                    or unchanged(batch[-1])):
+                break
+        if not full:
+            orders = [order for order in orders
+                      if (order.get('updated_at') or '') >= watermark and not unchanged(order)]
+
+        instances = None
+        if full or len(orders) > INSTANCES_RELIST_THRESHOLD:
+            instances = [instance for batch in client.iter_vm_instance_pages() for instance in batch]
+        else:
+            changed_instances = {}
+            for order in orders:
+                changed_instances[order['id']] = self._fetch_instance(client, order)
+
+        new_watermark = max([watermark or ''] + [order.get('updated_at') or '' for order in orders]) or None
+        with self._transaction() as conn:
+            if full:
+                conn.execute('DELETE FROM orders WHERE scope = ?', (scope,))
+                conn.execute('DELETE FROM order_labels WHERE scope = ?', (scope,))
+            for order in orders:
+                self._upsert_order(conn, scope, order)
+            if instances is not None:
+                conn.execute('DELETE FROM instances WHERE scope = ?', (scope,))
+                for instance in instances:
+                    self._insert_instance(conn, scope, instance)
+            else:
+                for order_id, instance in changed_instances.items():
+                    conn.execute('DELETE FROM instances WHERE scope = ? AND order_id = ?', (scope, order_id))
+                    if instance is not None:
+                        self._insert_instance(conn, scope, instance)
+            conn.execute(
+                'INSERT INTO sync_state (scope, watermark, synced_at) VALUES (?, ?, ?) '
+                'ON CONFLICT (scope) DO UPDATE SET watermark = MAX(COALESCE(watermark, \'\'), excluded.watermark), '
+                'synced_at = excluded.synced_at',
+                (scope, new_watermark, time.time())
+            )
+
+        stats = {
+            'mode': 'full' if full else 'incremental',
+            'orders': len(orders),
+            'instances': len(instances) if instances is not None else len(changed_instances),
+            'pages': pages,
+        }
+        self.stats[scope] = stats
+        return stats
+
+    @staticmethod
+    def _fetch_instance(client, order):
+        """
+        Fetch the current compute instance of a changed order, None if it has none.
+        """
+        if order.get('status') in DEPROVISIONED_STATUSES:
+            return None
+        item_id = client.get_vm_instance_item_id(order)
+        if not item_id:
+            return None
+        try:
+            return client.get_vm_instance_by_id(item_id, with_actions=False)
+        except T1CloudAPIError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    @staticmethod
+    def _upsert_order(conn, scope, order):
+        attrs = order.get('attrs', {})
+        cursor = conn.execute(
+            'INSERT INTO orders (scope, order_id, name, status, created_at, updated_at, data) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (scope, order_id) DO UPDATE SET name = excluded.name, status = excluded.status, '
+            'created_at = excluded.created_at, updated_at = excluded.updated_at, data = excluded.data '
+            'WHERE excluded.updated_at >= COALESCE(orders.updated_at, \'\')',
+            (scope, order['id'], attrs.get('name'), order.get('status'), order.get('created_at'),
+             order.get('updated_at') or '', json.dumps(order))
+        )
+        if cursor.rowcount:
+            conn.execute('DELETE FROM order_labels WHERE scope = ? AND order_id = ?', (scope, order['id']))
+            conn.executemany(
+                'INSERT INTO order_labels (scope, order_id, key, value) VALUES (?, ?, ?, ?)',
+                [(scope, order['id'], key, str(value)) for key, value in (attrs.get('labels') or {}).items()]
+            )
+
+    @staticmethod
+    def _insert_instance(conn, scope, instance):
+        conn.execute(
+            'INSERT OR REPLACE INTO instances (scope, item_id, order_id, name, data) VALUES (?, ?, ?, ?, ?)',
+            (scope, instance.get('item_id'), instance.get('order_id'),
+             instance.get('data', {}).get('config', {}).get('name'), json.dumps(instance))
+        )
+
+    def _query(self, sql, params):
+        with self._connect() as conn:
+            return [json.loads(row[0]) for row in conn.execute(sql, params)]
+
+    def get_vm_by_name(self, base_url, project_id, name):
+        """
+        Get the VM order of a name, preferring orders of existing VMs and then the newest.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param name: VM name
+        :type name: str
+        :return: VM order or None if not found
+        :rtype: dict or None
+        """
+        found = self._query(
+            'SELECT data FROM orders WHERE scope = ? AND name = ? '
+            f"ORDER BY status IN ({', '.join('?' * len(DEPROVISIONED_STATUSES))}), created_at DESC LIMIT 1",
+            (self.scope(base_url, project_id), name) + DEPROVISIONED_STATUSES
+        )
+        return found[0] if found else None
+
+    def get_vm_instance_by_name(self, base_url, project_id, name):
+        """
+        Get the compute instance of a VM name.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param name: VM name
+        :type name: str
+        :return: Compute instance or None if not found
+        :rtype: dict or None
+        """
+        found = self._query('SELECT data FROM instances WHERE scope = ? AND name = ? LIMIT 1',
+                            (self.scope(base_url, project_id), name))
+        return found[0] if found else None
+
+    def list_vms(self, base_url, project_id):
+        """
+        Get all VM orders of a project, oldest first.
+
+        :rtype: list
+        """
+        return self._query('SELECT data FROM orders WHERE scope = ? ORDER BY created_at, rowid',
+                           (self.scope(base_url, project_id),))
+
+    def list_vm_instances(self, base_url, project_id):
+        """
+        Get all compute instances of a project.
+
+        :rtype: list
+        """
+        return self._query('SELECT data FROM instances WHERE scope = ? ORDER BY rowid',
+                           (self.scope(base_url, project_id),))
+
+    def find_vms(self, base_url, project_id, status=None, labels=None):
+        """
+        Find VM orders of a project by status and labels.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param status: Order status, or list of statuses
+        :type status: str or list or None
+        :param labels: Labels the VM must have with the same values
+        :type labels: dict or None
+        :return: Matching VM orders, oldest first
+        :rtype: list
+        """
+        sql = 'SELECT data FROM orders o WHERE o.scope = ?'
+        params = [self.scope(base_url, project_id)]
+        if status:
+            statuses = [status] if isinstance(status, str) else list(status)
+            sql += f" AND o.status IN ({', '.join('?' * len(statuses))})"
+            params.extend(statuses)
+        for key, value in (labels or {}).items():
+            sql += (' AND EXISTS (SELECT 1 FROM order_labels l WHERE l.scope = o.scope'
+                    ' AND l.order_id = o.order_id AND l.key = ? AND l.value = ?)')
+            params.extend([key, str(value)])
+        return self._query(sql + ' ORDER BY o.created_at, o.rowid', params)
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+
+from ansible.module_utils.basic import env_fallback
+
+# Module options of the order journal, shared by modules of this collection
+JOURNAL_OPTIONS = dict(
+    journal_path=dict(type='path', fallback=(env_fallback, ['T1_CLOUD_JOURNAL'])),
+)
+
+
+class OrderJournal:
+    """
+    Write-ahead journal of the orders submitted by ``T1CloudVM``.
+
+    Every VM creation and VM action accepted by the order-service is
+    appended to the journal with its order ID, and synced to disk, before
+    the client returns it to the caller for waiting. Orders reaching a
+    final status are marked finished. An interrupted run therefore leaves
+    its in-flight orders in the journal: on a rerun the client resumes
+    waiting on them instead of submitting the same creation or action
+    again, even while a new order is not visible in the orders listing yet.
+
+    Entries are JSON lines of a file shared by all processes, appended
+    under a file lock; finished entries are dropped when the journal is
+    opened. Safe to use from several threads.
+
+    :param path: Journal file path
+    :type path: str
+    """
+
+    def __init__(self, path):
+        """
+        Initialize OrderJournal instance, loading the in-flight orders.
+
+        :param path: Journal file path
+        :type path: str
+        """
+        self.path = os.path.expanduser(path)
+        # Order IDs whose waiting was resumed from a previous run
+        self.resumed = []
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._write_error = None
+        self._load()
+
+    @classmethod
+    def attach(cls, module):
+        """
+        Create the journal of a module run if its ``journal_path`` option is set.
+
+        The IDs of orders resumed from a previous run are added to the
+        module result as ``resumed_orders``.
+
+        :param module: Module with JOURNAL_OPTIONS in its argument spec
+        :type module: AnsibleModule
+        :return: Journal to pass to T1CloudVM, None if no journal is set
+        :rtype: OrderJournal or None
+        """
+        path = module.params.get('journal_path')
+        if not path:
+            return None
+
+        journal = cls(path)
+        exit_json = module.exit_json
+        fail_json = module.fail_json
+
+        def journaled_exit_json(**kwargs):
+            kwargs.update(journal.result(module))
+            exit_json(**kwargs)
+
+        def journaled_fail_json(msg, **kwargs):
+            kwargs.update(journal.result(module))
+            fail_json(msg=msg, **kwargs)
+
+        module.exit_json = journaled_exit_json
+        module.fail_json = journaled_fail_json
+        return journal
+
+    @staticmethod
+    def scope(base_url, project_id):
+        return f"{base_url.rstrip('/')}|{project_id}"
+
+    def _open_lock(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        lock_file = open(self.path + '.lock', 'a')
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    def _load(self):
+        """
+        Read the in-flight orders, rewriting the journal without finished ones.
+        """
+        try:
+            with self._open_lock():
+                entries = []
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            try:
+                                entries.append(json.loads(line))
+                            except ValueError:
+                                # Line cut short by an interrupted write
+                                continue
+                except FileNotFoundError:
+                    return
+
+                for entry in entries:
+                    if entry.get('event') == 'submitted':
+                        self._in_flight[entry['order_id']] = entry
+                    else:
+                        self._in_flight.pop(entry.get('order_id'), None)
+
+                if len(self._in_flight) < len(entries):
+                    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                                    prefix='.t1_cloud_journal_')
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        for entry in self._in_flight.values():
+                            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.path)
+        except OSError as e:
+            self._write_error = str(e)
+
+    def _append(self, entries):
+        """Append entries and sync them to disk, remembering the first failure"""
+        data = ''.join(json.dumps(entry, separators=(',', ':')) + '\n' for entry in entries).encode('utf-8')
+        try:
+            with self._open_lock():
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+                try:
+                    os.write(fd, data)
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+        except OSError as e:
+            if self._write_error is None:
+                self._write_error = str(e)
+
+    def submitted(self, base_url, project_id, kind, order_ids, name=None, vm_id=None, action=None, count=1):
+        """
+        Record orders accepted by the order-service.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param kind: 'create' for VM creations, 'action' for VM actions
+        :type kind: str
+        :param order_ids: IDs of the orders to wait for
+        :type order_ids: list
+        :param name: Name of the created VM (the base name of multi-count orders)
+        :type name: str or None
+        :param vm_id: Order ID of the VM an action was executed on
+        :type vm_id: str or None
+        :param action: Name of the executed action
+        :type action: str or None
+        :param count: Number of VMs ordered at once
+        :type count: int
+        """
+        now = time.time()
+        entries = [
+            {'event': 'submitted', 'scope': self.scope(base_url, project_id), 'kind': kind, 'order_id': order_id,
+             'name': name, 'vm_id': vm_id, 'action': action, 'count': count, 'time': now}
+            for order_id in order_ids if order_id
+        ]
+        with self._lock:
+            for entry in entries:
+                self._in_flight[entry['order_id']] = entry
+            self._append(entries)
+
+    def finished(self, order_ids, status=None):
+        """
+        Record orders that reached a final status or no longer need waiting.
+
+        :param order_ids: Order IDs
+        :type order_ids: iterable
+        :param status: Final status
+        :type status: str or None
+        """
+        now = time.time()
+        with self._lock:
+            entries = [{'event': 'finished', 'order_id': order_id, 'status': status, 'time': now}
+                       for order_id in order_ids if self._in_flight.pop(order_id, None) is not None]
+            if entries:
+                self._append(entries)
+
+    def in_flight(self, base_url, project_id):
+        """
+        Get the IDs of all in-flight orders of a project.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :return: Order IDs
+        :rtype: list
+        """
+        scope = self.scope(base_url, project_id)
+        with self._lock:
+            return [order_id for order_id, entry in self._in_flight.items() if entry['scope'] == scope]
+
+    def in_flight_create(self, base_url, project_id, name, count=1):
+        """
+        Get the in-flight orders of a VM creation submitted earlier.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param name: VM name (the base name of multi-count orders)
+        :type name: str
+        :param count: Number of VMs ordered at once
+        :type count: int
+        :return: Order IDs, empty if the creation is not in flight
+        :rtype: list
+        """
+        scope = self.scope(base_url, project_id)
+        with self._lock:
+            return [order_id for order_id, entry in self._in_flight.items()
+                    if entry['scope'] == scope and entry['kind'] == 'create'
+                    and entry['name'] == name and entry.get('count', 1) == count]
+
+    def in_flight_action(self, base_url, project_id, vm_id, action):
+        """
+        Get the in-flight order of an action submitted earlier on a VM.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param vm_id: Order ID of the VM
+        :type vm_id: str
+        :param action: Action name
+        :type action: str
+        :return: Order ID, None if the action is not in flight
+        :rtype: str or None
+        """
+        scope = self.scope(base_url, project_id)
+        with self._lock:
+            for order_id, entry in self._in_flight.items():
+                if (entry['scope'] == scope and entry['kind'] == 'action'
+                        and entry['vm_id'] == vm_id and entry['action'] == action):
+                    return order_id
+        return None
+
+    def resumed_waiting(self, order_ids):
+        """
+        Record that waiting on in-flight orders of a previous run was resumed.
+
+        :param order_ids: Order IDs
+        :type order_ids: list
+        """
+        with self._lock:
+            self.resumed.extend(order_id for order_id in order_ids if order_id not in self.resumed)
+
+    def result(self, module=None):
+        """
+        Get the module result entries of the journal.
+
+        :param module: Module to warn about journal file errors
+        :type module: AnsibleModule or None
+        :return: 'resumed_orders', empty if no order was resumed
+        :rtype: dict
+        """
+        if self._write_error and module is not None:
+            module.warn(f"Could not write order journal {self.path}: {self._write_error}")
+            self._write_error = None
+        if not self.resumed:
+            return {}
+        return {'resumed_orders': list(self.resumed)}
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from types import SimpleNamespace
+
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+    DEPROVISIONED_STATUSES,
+    VM_SPEC_OPTIONS,
+    build_vm_config,
+)
+
+SUCCESS_STATUSES = ('success', 'deprovisioned')
+
+PLAN_ACTIONS = ('delete', 'create', 'start', 'stop')
+
+
+class VMPlanner:
+    """
+    Desired-state planner for all VMs of a project.
+
+    Fetches the current project state with one orders listing and one
+    instances listing, computes a create/delete/start/stop plan for a list
+    of desired VM specs and applies it with bounded parallelism, respecting
+    dependencies between VMs. The order-service API has no in-place update
+    of VM attributes, so attributes of existing VMs differing from their
+    specs are not planned but collected as ``drift``.
+
+    :param client: T1 Cloud client of the project
+    :type client: T1CloudVM
+    :param parallelism: Maximum number of actions running at the same time
+    :type parallelism: int
+    :param wait: Whether to wait for each order to complete
+    :type wait: bool
+    :param wait_timeout: Maximum time to wait for each order in seconds
+    :type wait_timeout: int
+    :param poll_interval: Delay between order status checks in seconds
+    :type poll_interval: float
+    """
+
+    def __init__(self, client, parallelism=5, wait=True, wait_timeout=600, poll_interval=10):
+        """
+        Initialize VMPlanner instance.
+
+        :param client: T1 Cloud client of the project
+        :type client: T1CloudVM
+        :param parallelism: Maximum number of actions running at the same time
+        :type parallelism: int
+        :param wait: Whether to wait for each order to complete
+        :type wait: bool
+        :param wait_timeout: Maximum time to wait for each order in seconds
+        :type wait_timeout: int
+        :param poll_interval: Delay between order status checks in seconds
+        :type poll_interval: float
+        """
+        self.client = client
+        self.parallelism = max(1, parallelism)
+        self.wait = wait
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        # VM name -> {'order': dict, 'power_state': str}
+        self.current = {}
+        # VM name -> changed fields of the last plan, see _drift
+        self.drift = {}
+
+    def fetch_state(self):
+        """
+        Fetch current VMs of the project with one orders and one instances listing.
+
+        :return: Current VMs by name
+        :rtype: dict
+        """
+        power_states = {}
+        for instance in self.client.list_vm_instances():
+            data = instance.get('data', {})
+            power_states[instance.get('order_id')] = data.get('state', 'unknown')
+
+        current = {}
+        for order in self.client.list_vms():
+            name = order.get('attrs', {}).get('name')
+            if not name or name in current or order.get('status') in DEPROVISIONED_STATUSES:
+                continue
+            power_state = power_states.get(order.get('id'))
+            if power_state is None:
+                # Fall back to order data if the instance is not listed
+                power_state = 'unknown'
+                for item in order.get('attrs', {}).get('preview_items', []):
+                    if item.get('type') == 'instance':
+                        power_state = item.get('data', {}).get('state', 'unknown')
+                        break
+            current[name] = {'order': order, 'power_state': power_state}
+
+        self.current = current
+        return current
+
+    @staticmethod
+    def _drift(spec, order):
+        """
+        Compare explicitly set spec fields with the VM order attributes.
+
+        Fields left unset in the spec or unknown for the order are not compared.
+
+        :return: Changed fields with current and desired values
+        :rtype: dict
+        """
+        attrs = order.get('attrs', {})
+        current = {
+            'description': attrs.get('description', ''),
+            'flavor_id': attrs.get('flavor', {}).get('id'),
+            'disk_size': attrs.get('volumes_config', {}).get('boot_volume', {}).get('size'),
+            'labels': attrs.get('labels', {}),
+        }
+        changes = {}
+        for field, value in current.items():
+            desired = spec.get(field)
+            if desired in (None, '', {}) or value is None or desired == value:
+                continue
+            changes[field] = {'current': value, 'desired': desired}
+        return changes
+
+    @staticmethod
+    def _create_params(spec):
+        """Fill fields left unset in the spec with t1_cloud_vm defaults"""
+        params = dict(spec)
+        for field, option in VM_SPEC_OPTIONS.items():
+            if params.get(field) is None and 'default' in option:
+                params[field] = option['default']
+        return params
+
+    def plan(self, specs, prune=False):
+        """
+        Compute actions converging the project to the desired specs.
+
+        Specs use the options of the t1_cloud_vm module plus ``state`` and
+        ``depends_on`` (names of VMs that must be converged first). Deletes of
+        dependent VMs run before deletes of their dependencies. Attributes of
+        existing VMs that differ from their specs are recorded in ``drift``.
+
+        :param specs: Desired VM specs with defaults applied
+        :type specs: list
+        :param prune: Delete VMs of the project that are not in specs
+        :type prune: bool
+        :return: Ordered list of plan actions
+        :rtype: list
+        """
+        actions = []
+        self.drift = {}
+        specs_by_name = {spec['name']: spec for spec in specs}
+
+        def add(action, name, after=(), **extra):
+            entry = dict(id=len(actions), action=action, name=name, after=list(after), **extra)
+            actions.append(entry)
+            return entry
+
+        for spec in specs:
+            name = spec['name']
+            state = spec.get('state') or 'present'
+            existing = self.current.get(name)
+
+            if state == 'absent':
+                if existing:
+                    add('delete', name, order_id=existing['order']['id'])
+                continue
+
+            if not existing:
+                # A new VM is stopped only once provisioned, even without wait
+                create = add('create', name, config=build_vm_config(SimpleNamespace(params=self._create_params(spec))),
+                             wait=state == 'stopped')
+                if state == 'stopped':
+                    add('stop', name, after=[create['id']])
+                continue
+
+            changes = self._drift(spec, existing['order'])
+            if changes:
+                self.drift[name] = changes
+
+            if state == 'started' and existing['power_state'] == 'off':
+                add('start', name, order_id=existing['order']['id'])
+            elif state == 'stopped' and existing['power_state'] == 'on':
+                add('stop', name, order_id=existing['order']['id'])
+
+        if prune:
+            for name, existing in self.current.items():
+                if name not in specs_by_name:
+                    add('delete', name, order_id=existing['order']['id'])
+
+        # Dependency ordering between VMs
+        by_name = {}
+        for action in actions:
+            by_name.setdefault(action['name'], []).append(action)
+        for spec in specs:
+            for dependency in spec.get('depends_on') or []:
+                for action in by_name.get(spec['name'], []):
+                    for dep_action in by_name.get(dependency, []):
+                        if action['action'] == 'delete' and dep_action['action'] == 'delete':
+                            # Remove dependents before what they depend on
+                            dep_action['after'].append(action['id'])
+                        elif action['action'] != 'delete' and dep_action['action'] != 'delete':
+                            action['after'].append(dep_action['id'])
+
+        self._check_cycles(actions)
+        return actions
+
+    @staticmethod
+    def _check_cycles(actions):
+        """Raise if plan dependencies contain a cycle"""
+        remaining = {a['id']: set(a['after']) for a in actions}
+        while remaining:
+            ready = [aid for aid, after in remaining.items() if not after & remaining.keys()]
+            if not ready:
+                names = sorted({actions[aid]['name'] for aid in remaining})
+                raise Exception(f"Dependency cycle between VMs: {', '.join(names)}")
+            for aid in ready:
+                del remaining[aid]
+
+    @staticmethod
+    def summary(actions):
+        """
+        Count plan actions by type.
+
+        :param actions: Plan actions
+        :type actions: list
+        :return: Number of actions per type
+        :rtype: dict
+        """
+        counts = dict.fromkeys(PLAN_ACTIONS, 0)
+        for action in actions:
+            counts[action['action']] += 1
+        return counts
+
+    def _wait(self, order_id, force=False):
+        if not (self.wait or force):
+            return None
+        order = self.client.wait_for_operation(order_id, self.wait_timeout, self.poll_interval)
+        if order.get('status') not in SUCCESS_STATUSES:
+            raise Exception(f"Order {order_id} finished with status '{order.get('status')}'")
+        return order
+
+    def _item_id(self, name, order_id):
+        existing = self.current.get(name)
+        order = existing['order'] if existing else self.client.get_vm_by_id(order_id)
+        item_id = self.client.get_vm_instance_item_id(order or {})
+        if not item_id:
+            # Orders listing and a just created order may lack preview items
+            order = self.client.get_vm_by_id(order_id)
+            item_id = self.client.get_vm_instance_item_id(order or {})
+        if not item_id:
+            raise Exception(f"Could not find instance item_id for VM {name}")
+        return item_id
+
+    def _execute(self, action):
+        """
+        Execute a single plan action.
+
+        :param action: Plan action
+        :type action: dict
+        :return: Final order or None
+        :rtype: dict or None
+        """
+        name = action['name']
+
+        if action['action'] == 'create':
+            response = self.client.create_vm(action['config'])
+            order_id = response[0].get('id')
+            final_order = self._wait(order_id, force=action.get('wait', False))
+            self.current[name] = {
+                'order': final_order or {'id': order_id},
+                'power_state': 'on',
+            }
+            return final_order or {'id': order_id}
+
+        order_id = action.get('order_id') or self.current[name]['order']['id']
+        action_name = {
+            'delete': 'compute_instance_delete',
+            'start': 'start_compute_vm',
+            'stop': 'stop_compute_vm',
+        }[action['action']]
+        result = self.client.execute_vm_action(order_id, self._item_id(name, order_id), action_name)
+        return self._wait(result.get('id', order_id)) or result
+
+    def apply(self, actions):
+        """
+        Apply plan actions with bounded parallelism and dependency ordering.
+
+        Actions whose dependencies failed are skipped.
+
+        :param actions: Plan actions
+        :type actions: list
+        :return: Result per action, in plan order
+        :rtype: list
+        """
+        results = {}
+        pending = {a['id']: a for a in actions}
+        finished = set()
+        failed = set()
+
+        def outcome(action, status, started, **extra):
+            results[action['id']] = dict(
+                action=action['action'], name=action['name'], status=status,
+                duration=round(time.monotonic() - started, 3) if started else 0, **extra
+            )
+
+        with ThreadPoolExecutor(max_workers=self.parallelism) as pool:
+            running = {}
+            while pending or running:
+                scheduled = True
+                while scheduled:
+                    scheduled = False
+                    for aid, action in list(pending.items()):
+                        if set(action['after']) & failed:
+                            del pending[aid]
+                            failed.add(aid)
+                            outcome(action, 'skipped', None, msg="Dependency failed")
+                            scheduled = True
+                        elif set(action['after']) <= finished:
+                            del pending[aid]
+                            running[pool.submit(self._execute, action)] = (action, time.monotonic())
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    action, started = running.pop(future)
+                    try:
+                        order = future.result()
+                    except Exception as e:
+                        failed.add(action['id'])
+                        outcome(action, 'failed', started, msg=str(e))
+                    else:
+                        finished.add(action['id'])
+                        outcome(action, 'ok', started, order_id=(order or {}).get('id', action.get('order_id')))
+
+        return [results[a['id']] for a in actions]
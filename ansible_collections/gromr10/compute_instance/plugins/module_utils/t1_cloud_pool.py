@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import T1CloudAPIError
+
+# Names of VMs created by one multi-count order: <name>-1 ... <name>-<count>
+POOL_NAME_PATTERN = re.compile(r'^(?P<base>.+)-(?P<index>[1-9][0-9]*)$')
+
+# HTTP status meaning the order-service does not accept count > 1
+MULTI_COUNT_UNSUPPORTED = 422
+
+# Error message of an HTTP 400 answer meaning the same; other 400 answers (flavor, image, quota) are real errors
+MULTI_COUNT_UNSUPPORTED_MESSAGE = re.compile(r'count\b.*\bnot supported|not supported\b.*\bcount\b', re.IGNORECASE)
+
+
+def pool_names(name_prefix, count):
+    """
+    Get names of the VMs of a pool.
+
+    :param name_prefix: Pool name prefix
+    :type name_prefix: str
+    :param count: Pool size
+    :type count: int
+    :return: VM names <name_prefix>-1 ... <name_prefix>-<count>
+    :rtype: list
+    """
+    return [f"{name_prefix}-{index}" for index in range(1, count + 1)]
+
+
+def group_configs(configs):
+    """
+    Group VM configurations that can be ordered together.
+
+    Configurations are grouped when they are identical except for the name
+    and their names are exactly ``<base>-1`` ... ``<base>-<n>``, which is how
+    the order-service names the VMs of a multi-count order. Every other
+    configuration forms a group of its own.
+
+    :param configs: VM configurations (build_vm_config output)
+    :type configs: list
+    :return: Groups with 'config' (named <base> for multi-count groups), 'names' and 'count'
+    :rtype: list
+    """
+    buckets = {}
+    for config in configs:
+        key = json.dumps({k: v for k, v in config.items() if k != 'name'}, sort_keys=True)
+        buckets.setdefault(key, []).append(config)
+
+    groups = []
+    for bucket in buckets.values():
+        names = [config['name'] for config in bucket]
+        matches = [POOL_NAME_PATTERN.match(name) for name in names]
+        bases = {match.group('base') for match in matches if match}
+        if (len(bucket) > 1 and all(matches) and len(bases) == 1
+                and sorted(int(match.group('index')) for match in matches) == list(range(1, len(bucket) + 1))):
+            ordered = sorted(bucket, key=lambda config: int(POOL_NAME_PATTERN.match(config['name']).group('index')))
+            groups.append({
+                'config': dict(ordered[0], name=bases.pop()),
+                'names': [config['name'] for config in ordered],
+                'count': len(bucket),
+            })
+        else:
+            groups.extend({'config': config, 'names': [config['name']], 'count': 1} for config in bucket)
+    return groups
+
+
+class PoolProvisioner:
+    """
+    Provisioner of many VMs at once.
+
+    Identical VM configurations named ``<base>-1`` ... ``<base>-<n>`` are
+    ordered with one multi-count order; the created orders are mapped back to
+    the requested names by the names the order-service gave them, and an
+    order named otherwise fails its VM. Everything else, and every group once the
+    order-service rejects multi-count orders, is ordered with parallel single
+    orders. All orders are awaited with one shared poller.
+
+    :param client: T1 Cloud client of the project
+    :type client: T1CloudVM
+    :param multi_count: Whether to try multi-count orders
+    :type multi_count: bool
+    :param parallelism: Maximum number of orders placed at the same time
+    :type parallelism: int
+    :param wait: Whether to wait for orders to complete
+    :type wait: bool
+    :param wait_timeout: Maximum time to wait for all orders in seconds
+    :type wait_timeout: int
+    :param poll_interval: Delay between poll rounds in seconds
+    :type poll_interval: float
+    """
+
+    def __init__(self, client, multi_count=True, parallelism=5, wait=True, wait_timeout=600, poll_interval=10):
+        """
+        Initialize PoolProvisioner instance.
+
+        :param client: T1 Cloud client of the project
+        :type client: T1CloudVM
+        :param multi_count: Whether to try multi-count orders
+        :type multi_count: bool
+        :param parallelism: Maximum number of orders placed at the same time
+        :type parallelism: int
+        :param wait: Whether to wait for orders to complete
+        :type wait: bool
+        :param wait_timeout: Maximum time to wait for all orders in seconds
+        :type wait_timeout: int
+        :param poll_interval: Delay between poll rounds in seconds
+        :type poll_interval: float
+        """
+        self.client = client
+        self.multi_count = multi_count
+        self.parallelism = max(1, parallelism)
+        self.wait = wait
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        # Orders placed (accepted by the order-service) per kind
+        self.orders_placed = {'multi_count': 0, 'single': 0}
+
+    def _order_group(self, group):
+        """
+        Place one multi-count order for a group.
+
+        :return: Results by requested name, None if multi-count orders are not supported
+        :rtype: dict or None
+        """
+        try:
+            orders = self.client.create_vm(group['config'], count=group['count'])
+        except T1CloudAPIError as e:
+            if e.status_code == MULTI_COUNT_UNSUPPORTED or (
+                    e.status_code == 400 and MULTI_COUNT_UNSUPPORTED_MESSAGE.search(str(e))):
+                return None
+            raise
+        self.orders_placed['multi_count'] += 1
+
+        by_name = {}
+        for order in orders:
+            by_name.setdefault(order.get('attrs', {}).get('name'), order)
+        # Orders named otherwise than requested are reported, never counted as a requested VM
+        renamed = [order for order in orders if order.get('attrs', {}).get('name') not in group['names']]
+        results = {}
+        for name in group['names']:
+            order = by_name.get(name)
+            if order is not None:
+                results[name] = {'name': name, 'order_id': order.get('id'), 'status': 'ordered', 'multi_count': True}
+            elif renamed:
+                order = renamed.pop(0)
+                returned_name = order.get('attrs', {}).get('name')
+                results[name] = {'name': name, 'order_id': order.get('id'), 'returned_name': returned_name,
+                                 'status': 'failed', 'multi_count': True,
+                                 'msg': f"Multi-count order created VM '{returned_name}' instead of '{name}'"}
+            else:
+                results[name] = {'name': name, 'status': 'failed', 'multi_count': True,
+                                 'msg': f"Multi-count order returned {len(orders)} of {group['count']} orders"}
+        return results
+
+    def _order_single(self, config):
+        try:
+            order = self.client.create_vm(config)[0]
+            return {'name': config['name'], 'order_id': order.get('id'), 'status': 'ordered', 'multi_count': False}
+        except Exception as e:
+            return {'name': config['name'], 'status': 'failed', 'multi_count': False, 'msg': str(e)}
+
+    def provision(self, configs):
+        """
+        Order VMs and wait for them.
+
+        :param configs: VM configurations (build_vm_config output)
+        :type configs: list
+        :return: Result per requested VM in input order, with 'name', 'status'
+            (success, failed or ordered when not waiting), 'order_id', 'multi_count' and 'msg'
+        :rtype: list
+        """
+        results = {}
+        singles = []
+
+        for group in group_configs(configs):
+            if group['count'] > 1 and self.multi_count:
+                try:
+                    grouped = self._order_group(group)
+                except Exception as e:
+                    grouped = {name: {'name': name, 'status': 'failed', 'multi_count': True, 'msg': str(e)}
+                               for name in group['names']}
+                if grouped is not None:
+                    results.update(grouped)
+                    continue
+                # Not supported by the order-service, do not try again
+                self.multi_count = False
+            singles.extend(dict(group['config'], name=name) for name in group['names'])
+
+        if singles:
+            with ThreadPoolExecutor(max_workers=self.parallelism) as pool:
+                for result in pool.map(self._order_single, singles):
+                    results[result['name']] = result
+                    if result.get('order_id'):
+                        self.orders_placed['single'] += 1
+
+        ordered = [r for r in results.values() if r['status'] == 'ordered']
+        if self.wait and ordered:
+            orders = self.client.wait_for_operations([r['order_id'] for r in ordered], self.wait_timeout,
+                                                     self.poll_interval)
+            for result in ordered:
+                order = orders.get(result['order_id'])
+                if order is None:
+                    result.update(status='failed', msg=f"Order did not complete within {self.wait_timeout} seconds")
+                elif order.get('status') == 'success':
+                    result['status'] = 'success'
+                else:
+                    result.update(status='failed', msg=f"Order finished with status '{order.get('status')}'")
+
+        return [results[config['name']] for config in configs]
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import cProfile
+import os
+import pstats
+
+from ansible.module_utils.basic import env_fallback
+
+# Module options enabling the profiler, shared by modules of this collection
+PROFILE_OPTIONS = dict(
+    profile=dict(type='bool', default=False, fallback=(env_fallback, ['T1_CLOUD_PROFILE'])),
+    profile_top=dict(type='int', default=20),
+    profile_output=dict(type='path', fallback=(env_fallback, ['T1_CLOUD_PROFILE_OUTPUT'])),
+)
+
+# Categories of self time reported in the profile breakdown
+BREAKDOWN_CATEGORIES = ('json', 'tls', 'network', 'sleep', 'other')
+
+
+def _category(filename, function):
+    """Classify a profiled function by where its self time goes"""
+    if function.startswith('<built-in method time.sleep'):
+        return 'sleep'
+    if '_ssl.' in function or filename.endswith(os.sep + 'ssl.py'):
+        return 'tls'
+    if '_json' in function or os.sep + 'json' + os.sep in filename:
+        return 'json'
+    if '_socket.' in function or filename.endswith((os.sep + 'socket.py', os.sep + 'selectors.py')):
+        return 'network'
+    return 'other'
+
+
+def _location(filename, line, function):
+    """Format a profiled function, dropping the temporary AnsiballZ payload path"""
+    if not line:
+        return function
+    marker = filename.find('ansible_collections' + os.sep)
+    if marker > 0:
+        filename = filename[marker:]
+    return f"{filename}:{line}({function})"
+
+
+class ModuleProfiler:
+    """
+    cProfile wrapper for a module run.
+
+    Attached to an AnsibleModule, it profiles everything up to
+    ``exit_json``/``fail_json`` and adds a ``profile`` summary to the
+    result: total time, self time per category (JSON parsing, TLS, network,
+    sleeping between polls) and the top functions by cumulative time.
+    Runs inside the AnsiballZ payload, so real runs can be profiled.
+
+    :param module: Module to profile
+    :type module: AnsibleModule
+    :param top: Number of functions in the summary
+    :type top: int
+    :param output: Path to write the raw profile to (pstats format), on the managed host
+    :type output: str or None
+    """
+
+    def __init__(self, module, top=20, output=None):
+        """
+        Initialize ModuleProfiler instance.
+
+        :param module: Module to profile
+        :type module: AnsibleModule
+        :param top: Number of functions in the summary
+        :type top: int
+        :param output: Path to write the raw profile to (pstats format), on the managed host
+        :type output: str or None
+        """
+        self.module = module
+        self.top = top
+        self.output = output
+        self._profiler = cProfile.Profile()
+        self._summary = None
+
+    @classmethod
+    def attach(cls, module):
+        """
+        Start profiling a module run if its ``profile`` option is enabled.
+
+        :param module: Module with PROFILE_OPTIONS in its argument spec
+        :type module: AnsibleModule
+        :return: Running profiler or None if profiling is disabled
+        :rtype: ModuleProfiler or None
+        """
+        if not module.params.get('profile'):
+            return None
+
+        profiler = cls(module, top=module.params['profile_top'], output=module.params['profile_output'])
+        exit_json = module.exit_json
+        fail_json = module.fail_json
+
+        def profiled_exit_json(**kwargs):
+            kwargs['profile'] = profiler.stop()
+            exit_json(**kwargs)
+
+        def profiled_fail_json(msg, **kwargs):
+            kwargs['profile'] = profiler.stop()
+            fail_json(msg=msg, **kwargs)
+
+        module.exit_json = profiled_exit_json
+        module.fail_json = profiled_fail_json
+        profiler._profiler.enable()
+        return profiler
+
+    def stop(self):
+        """
+        Stop profiling and summarize the profile.
+
+        :return: Profile summary
+        :rtype: dict
+        """
+        if self._summary is not None:
+            return self._summary
+        self._profiler.disable()
+
+        stats = pstats.Stats(self._profiler)
+        breakdown = dict.fromkeys(BREAKDOWN_CATEGORIES, 0.0)
+        functions = []
+        for (filename, line, function), (_cc, calls, tottime, cumtime, _callers) in stats.stats.items():
+            breakdown[_category(filename, function)] += tottime
+            functions.append({
+                'function': _location(filename, line, function),
+                'calls': calls,
+                'tottime': round(tottime, 6),
+                'cumtime': round(cumtime, 6),
+            })
+        functions.sort(key=lambda f: f['cumtime'], reverse=True)
+
+        self._summary = {
+            'total_time': round(stats.total_tt, 6),
+            'breakdown': {category: round(seconds, 6) for category, seconds in breakdown.items()},
+            'top': functions[:self.top],
+        }
+
+        if self.output:
+            try:
+                stats.dump_stats(self.output)
+                self._summary['output'] = self.output
+            except OSError as e:
+                self.module.warn(f"Could not write profile to {self.output}: {e}")
+
+        return self._summary
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+    DEPROVISIONED_STATUSES,
+    T1CloudVM,
+    runtime_info_from_instances,
+)
+
+
+def merge_project_records(project_id, orders, instances, include_deprovisioned=False):
+    """
+    Merge the orders and compute instances listings of a project into one record per VM.
+
+    :param project_id: Project ID attached to every record
+    :type project_id: str
+    :param orders: Orders listing of the project
+    :type orders: list
+    :param instances: Compute instances listing of the project, None if not queried
+    :type instances: list or None
+    :param include_deprovisioned: Whether to keep orders of deleted VMs
+    :type include_deprovisioned: bool
+    :return: Records with 'project_id', 'name', 'order_id', 'order_status', 'labels',
+        'power_status' and 'runtime_info' (None without an instance)
+    :rtype: list
+    """
+    by_order = {}
+    instances = instances or []
+    for instance, runtime_info in zip(instances, runtime_info_from_instances(instances)):
+        by_order.setdefault(instance.get('order_id'), (instance, runtime_info))
+
+    records = []
+    for order in orders:
+        if order.get('status') in DEPROVISIONED_STATUSES and not include_deprovisioned:
+            continue
+        attrs = order.get('attrs', {})
+        _, runtime_info = by_order.pop(order.get('id'), (None, None))
+        records.append({
+            'project_id': project_id,
+            'name': attrs.get('name'),
+            'order_id': order.get('id'),
+            'order_status': order.get('status'),
+            'labels': attrs.get('labels') or {},
+            'power_status': runtime_info['power_status'] if runtime_info else None,
+            'runtime_info': runtime_info,
+        })
+
+    # Instances whose order is missing from the listing
+    for order_id, (instance, runtime_info) in by_order.items():
+        records.append({
+            'project_id': project_id,
+            'name': runtime_info['name'],
+            'order_id': order_id,
+            'order_status': None,
+            'labels': instance.get('data', {}).get('config', {}).get('labels') or {},
+            'power_status': runtime_info['power_status'],
+            'runtime_info': runtime_info,
+        })
+    return records
+
+
+class MultiProjectClient:
+    """
+    Client querying many projects at once.
+
+    One ``T1CloudVM`` per project, all sharing a single session and
+    connection pool sized for ``parallelism``. The orders and instances
+    listings of all projects are fetched concurrently and merged into one
+    record per VM with the project attached.
+
+    :param api_token: T1 Cloud API token with access to all projects
+    :type api_token: str
+    :param project_ids: Project IDs
+    :type project_ids: list
+    :param base_url: Base URL of the T1 Cloud API
+    :type base_url: str
+    :param parallelism: Maximum number of listings fetched at the same time
+    :type parallelism: int
+    """
+
+    def __init__(self, api_token, project_ids, base_url="https://api.t1.cloud", parallelism=10, **client_kwargs):
+        """
+        Initialize MultiProjectClient instance.
+
+        :param api_token: T1 Cloud API token with access to all projects
+        :type api_token: str
+        :param project_ids: Project IDs
+        :type project_ids: list
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param parallelism: Maximum number of listings fetched at the same time
+        :type parallelism: int
+        :param client_kwargs: Further T1CloudVM arguments
+        """
+        self.parallelism = max(1, parallelism)
+        # Keep the order, drop duplicates
+        self.project_ids = list(dict.fromkeys(project_ids))
+        shared = T1CloudVM(api_token=api_token, project_id=self.project_ids[0] if self.project_ids else None,
+                           base_url=base_url, pool_maxsize=self.parallelism, **client_kwargs)
+        self.clients = {project_id: shared.for_project(project_id) for project_id in self.project_ids}
+
+    def collect(self, include_instances=True, include_deprovisioned=False):
+        """
+        Fetch and merge the listings of all projects.
+
+        :param include_instances: Whether to fetch compute instances for runtime information
+        :type include_instances: bool
+        :param include_deprovisioned: Whether to keep orders of deleted VMs
+        :type include_deprovisioned: bool
+        :return: Records of all projects in project order, and errors by project ID
+        :rtype: tuple
+        """
+        jobs = [(project_id, 'orders') for project_id in self.project_ids]
+        if include_instances:
+            jobs += [(project_id, 'instances') for project_id in self.project_ids]
+
+        def fetch(job):
+            project_id, listing = job
+            client = self.clients[project_id]
+            try:
+                return job, (client.list_vms() if listing == 'orders' else client.list_vm_instances()), None
+            except Exception as e:
+                return job, None, str(e)
+
+        listings = {}
+        errors = {}
+        with ThreadPoolExecutor(max_workers=self.parallelism) as pool:
+            for (project_id, listing), data, error in pool.map(fetch, jobs):
+                if error is not None:
+                    errors.setdefault(project_id, f"Failed to list {listing}: {error}")
+                else:
+                    listings[(project_id, listing)] = data
+
+        records = []
+        for project_id in self.project_ids:
+            if project_id in errors:
+                continue
+            records.extend(merge_project_records(
+                project_id,
+                listings[(project_id, 'orders')],
+                listings.get((project_id, 'instances')) if include_instances else None,
+                include_deprovisioned
+            ))
+        return records, errors
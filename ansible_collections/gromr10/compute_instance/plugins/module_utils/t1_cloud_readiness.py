@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import errno
+import os
+import selectors
+import socket
+import time
+
+# connect_ex results of a non-blocking connect still in progress
+IN_PROGRESS = (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, errno.EALREADY)
+
+
+def wait_for_ports(targets, timeout, connect_timeout=5.0, retry_interval=1.0, clock=time.monotonic):
+    """
+    Wait until TCP ports of many hosts accept connections.
+
+    All hosts are probed at once from a single thread with non-blocking
+    sockets multiplexed by ``selectors``: a host that refuses or does not
+    answer within ``connect_timeout`` is probed again after
+    ``retry_interval``, and a host is done as soon as one connection
+    succeeds. Returns once every host is ready or ``timeout`` has passed.
+
+    :param targets: (host, port) by key, for example by VM name
+    :type targets: dict
+    :param timeout: Maximum time to wait for all hosts in seconds
+    :type timeout: float
+    :param connect_timeout: Maximum time of one connection attempt in seconds
+    :type connect_timeout: float
+    :param retry_interval: Delay in seconds before probing a host again
+    :type retry_interval: float
+    :param clock: Monotonic clock function
+    :type clock: callable
+    :return: By key: 'host', 'port', 'ready', 'time_to_ready' (seconds since
+        the start, None if not ready), 'attempts' and the last 'error'
+    :rtype: dict
+    """
+    start = clock()
+    end = start + timeout
+    results = {
+        key: {'host': host, 'port': port, 'ready': False, 'time_to_ready': None, 'attempts': 0, 'error': None}
+        for key, (host, port) in targets.items()
+    }
+    retry_at = {key: start for key in targets}
+    connecting = {}
+    selector = selectors.DefaultSelector()
+
+    def ready(key):
+        results[key].update(ready=True, time_to_ready=round(clock() - start, 3), error=None)
+
+    def retry(key, error):
+        results[key]['error'] = str(error)
+        retry_at[key] = clock() + retry_interval
+
+    def connect(key):
+        host, port = targets[key]
+        results[key]['attempts'] += 1
+        try:
+            family, socktype, proto, _, address = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+            sock = socket.socket(family, socktype, proto)
+        except OSError as e:
+            retry(key, e)
+            return
+        sock.setblocking(False)
+        err = sock.connect_ex(address)
+        if err in IN_PROGRESS:
+            selector.register(sock, selectors.EVENT_WRITE, key)
+            connecting[key] = (sock, clock() + connect_timeout)
+            return
+        sock.close()
+        if err == 0:
+            ready(key)
+        else:
+            retry(key, OSError(err, os.strerror(err)))
+
+    def finish(key, error=None):
+        sock, _ = connecting.pop(key)
+        selector.unregister(sock)
+        sock.close()
+        if error is None:
+            ready(key)
+        else:
+            retry(key, error)
+
+    try:
+        while retry_at or connecting:
+            now = clock()
+            if now >= end:
+                break
+            for key in [key for key, at in retry_at.items() if at <= now]:
+                del retry_at[key]
+                connect(key)
+            for key in [key for key, (_, expires) in connecting.items() if expires <= now]:
+                finish(key, f"connection timed out after {connect_timeout} seconds")
+
+            wakeups = [end] + list(retry_at.values()) + [expires for _, expires in connecting.values()]
+            wait = max(0.0, min(wakeups) - clock())
+            if not connecting:
+                if retry_at:
+                    time.sleep(wait)
+                continue
+            for selector_key, _ in selector.select(wait):
+                err = selector_key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                finish(selector_key.data, None if err == 0 else OSError(err, os.strerror(err)))
+    finally:
+        for sock, _ in connecting.values():
+            sock.close()
+        selector.close()
+
+    for result in results.values():
+        if not result['ready'] and result['error'] is None:
+            result['error'] = f"no connection within {timeout} seconds"
+    return results
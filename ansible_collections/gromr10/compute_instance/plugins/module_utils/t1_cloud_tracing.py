@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+# Path of the OTLP JSON trace file, tracing is disabled when unset
+TRACE_FILE_ENV = 'T1_CLOUD_TRACE_FILE'
+
+# W3C trace context of the caller, root spans become its children
+TRACEPARENT_ENV = 'TRACEPARENT'
+
+TRACEPARENT_PATTERN = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+SCOPE_NAME = 'gromr10.compute_instance'
+
+
+def _attribute(key, value):
+    """Encode an attribute as an OTLP JSON key-value pair"""
+    if isinstance(value, bool):
+        encoded = {'boolValue': value}
+    elif isinstance(value, int):
+        encoded = {'intValue': str(value)}
+    elif isinstance(value, float):
+        encoded = {'doubleValue': value}
+    else:
+        encoded = {'stringValue': str(value)}
+    return {'key': key, 'value': encoded}
+
+
+class Span:
+    """
+    Single tracing span.
+
+    :param name: Span name
+    :type name: str
+    :param trace_id: Trace ID, 32 hex characters
+    :type trace_id: str
+    :param parent_id: Parent span ID, 16 hex characters, or None for a root span
+    :type parent_id: str or None
+    :param kind: OTLP span kind
+    :type kind: int
+    """
+
+    def __init__(self, name, trace_id, parent_id=None, kind=SPAN_KIND_INTERNAL):
+        """
+        Initialize Span instance.
+
+        :param name: Span name
+        :type name: str
+        :param trace_id: Trace ID, 32 hex characters
+        :type trace_id: str
+        :param parent_id: Parent span ID, 16 hex characters, or None for a root span
+        :type parent_id: str or None
+        :param kind: OTLP span kind
+        :type kind: int
+        """
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = {}
+        self.status = None
+        self.start_time = time.time_ns()
+        self.end_time = None
+
+    def set_attribute(self, key, value):
+        """
+        Set span attribute, None values are ignored.
+
+        :param key: Attribute name
+        :type key: str
+        :param value: Attribute value
+        :type value: str or int or float or bool or None
+        """
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_error(self, message):
+        """
+        Mark span as failed.
+
+        :param message: Error message
+        :type message: str
+        """
+        self.status = {'code': STATUS_ERROR, 'message': message}
+
+    def to_otlp(self):
+        """
+        Encode span in OTLP JSON format.
+
+        :return: OTLP span
+        :rtype: dict
+        """
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_time),
+            'endTimeUnixNano': str(self.end_time),
+            'attributes': [_attribute(k, v) for k, v in self.attributes.items()],
+            'status': self.status or {'code': STATUS_OK},
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Span used while tracing is disabled"""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_error(self, message):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Minimal OpenTelemetry-style tracer with an OTLP JSON file exporter.
+
+    Tracing is enabled by setting ``T1_CLOUD_TRACE_FILE`` (in the
+    environment of the controller for lookups and action plugins, in the
+    task ``environment`` for modules) or by calling ``configure``. Spans
+    nest per thread; when the outermost span of a thread ends, its finished
+    spans are appended to the file as one OTLP ``ExportTraceServiceRequest``
+    per line, so processes of a run can share the file. Root spans join the
+    trace given by the W3C ``TRACEPARENT`` environment variable, if any.
+
+    :param service_name: Value of the ``service.name`` resource attribute
+    :type service_name: str
+    """
+
+    def __init__(self, service_name='t1_cloud'):
+        """
+        Initialize Tracer instance.
+
+        :param service_name: Value of the ``service.name`` resource attribute
+        :type service_name: str
+        """
+        self.service_name = service_name
+        self.path = None
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    def configure(self, path):
+        """
+        Set trace file path, overriding the environment.
+
+        :param path: Trace file path, None to follow the environment again
+        :type path: str or None
+        """
+        self.path = path
+
+    @property
+    def output(self):
+        return self.path or os.environ.get(TRACE_FILE_ENV)
+
+    def _state(self):
+        state = self._local
+        if not hasattr(state, 'stack'):
+            state.stack = []
+            state.finished = []
+        return state
+
+    @contextmanager
+    def span(self, name, kind=SPAN_KIND_INTERNAL, **attributes):
+        """
+        Trace a block of code.
+
+        Exceptions raised in the block mark the span as failed and are re-raised.
+
+        :param name: Span name
+        :type name: str
+        :param kind: OTLP span kind
+        :type kind: int
+        :param attributes: Initial span attributes
+        :return: Context manager yielding the span
+        """
+        output = self.output
+        if not output:
+            yield NOOP_SPAN
+            return
+
+        state = self._state()
+        if state.stack:
+            parent = state.stack[-1]
+            span = Span(name, parent.trace_id, parent.span_id, kind)
+        else:
+            match = TRACEPARENT_PATTERN.match(os.environ.get(TRACEPARENT_ENV, ''))
+            if match:
+                span = Span(name, match.group(1), match.group(2), kind)
+            else:
+                span = Span(name, os.urandom(16).hex(), None, kind)
+        for key, value in attributes.items():
+            span.set_attribute(key, value)
+
+        state.stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            if not isinstance(e, (SystemExit, GeneratorExit)):
+                span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.end_time = time.time_ns()
+            state.stack.pop()
+            state.finished.append(span)
+            if not state.stack:
+                spans, state.finished = state.finished, []
+                self._export(output, spans)
+
+    def _export(self, path, spans):
+        """Append spans to the trace file as one OTLP JSON line"""
+        request = {
+            'resourceSpans': [{
+                'resource': {'attributes': [
+                    _attribute('service.name', self.service_name),
+                    _attribute('process.pid', os.getpid()),
+                ]},
+                'scopeSpans': [{
+                    'scope': {'name': SCOPE_NAME},
+                    'spans': [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+        line = (json.dumps(request, separators=(',', ':')) + '\n').encode('utf-8')
+        try:
+            with self._write_lock:
+                fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+                try:
+                    os.write(fd, line)
+                finally:
+                    os.close(fd)
+        except OSError:
+            # Tracing must never break the traced operation
+            pass
+
+
+# Process-wide tracer shared by plugins and module utilities of this collection
+TRACER = Tracer()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import re
+
+# Compiled once per process instead of on every validate_name() call
+NAME_PATTERN = re.compile(r'^[a-z0-9-]{1,61}$')
+
+USER_DATA_MAX_BYTES = 16384
+
+PUBLIC_IP_BANDWIDTH_MIN = 100
+PUBLIC_IP_BANDWIDTH_MAX = 10000
+PUBLIC_IP_BANDWIDTH_STEP = 100
+
+
+class VMSpecValidator:
+    """
+    Validator for VM specifications (module parameters).
+
+    Validates a single spec or a whole list of specs in one pass and
+    collects every error instead of stopping at the first one.
+
+    :param max_user_data_bytes: Maximum size of user_data in bytes (UTF-8)
+    :type max_user_data_bytes: int
+    """
+
+    def __init__(self, max_user_data_bytes=USER_DATA_MAX_BYTES):
+        """
+        Initialize VMSpecValidator instance.
+
+        :param max_user_data_bytes: Maximum size of user_data in bytes (UTF-8)
+        :type max_user_data_bytes: int
+        """
+        self.max_user_data_bytes = max_user_data_bytes
+        # user_data byte lengths keyed by the string itself, so identical
+        # scripts shared by many specs are encoded at most once
+        self._user_data_sizes = {}
+
+    def user_data_size(self, user_data):
+        """
+        Get size of user_data in bytes when encoded as UTF-8.
+
+        :param user_data: Cloud-init user data
+        :type user_data: str
+        :return: Size in bytes
+        :rtype: int
+        """
+        if not user_data:
+            return 0
+        size = self._user_data_sizes.get(user_data)
+        if size is None:
+            size = len(user_data.encode('utf-8'))
+            self._user_data_sizes[user_data] = size
+        return size
+
+    def user_data_too_large(self, user_data):
+        """
+        Check whether user_data exceeds the byte limit.
+
+        Encoding is skipped when the character count alone decides the
+        answer: UTF-8 uses from 1 to 4 bytes per character.
+
+        :param user_data: Cloud-init user data
+        :type user_data: str
+        :return: True if user_data is too large, False otherwise
+        :rtype: bool
+        """
+        if not user_data:
+            return False
+        length = len(user_data)
+        if length > self.max_user_data_bytes:
+            return True
+        if length * 4 <= self.max_user_data_bytes:
+            return False
+        return self.user_data_size(user_data) > self.max_user_data_bytes
+
+    def validate(self, spec):
+        """
+        Validate a single VM specification.
+
+        :param spec: VM specification (module parameters)
+        :type spec: dict
+        :return: List of error messages, empty if spec is valid
+        :rtype: list
+        """
+        errors = []
+
+        name = spec.get('name')
+        if not isinstance(name, str) or not NAME_PATTERN.match(name):
+            errors.append(
+                f"Invalid VM name '{name}'. "
+                "Name must match pattern: ^[a-z0-9-]{1,61}$"
+            )
+
+        if spec.get('assign_public_ip') and spec.get('create_public_ip'):
+            bandwidth = spec.get('public_ip_bandwidth', 1000)
+            if (not isinstance(bandwidth, int)
+                    or bandwidth < PUBLIC_IP_BANDWIDTH_MIN
+                    or bandwidth > PUBLIC_IP_BANDWIDTH_MAX
+                    or bandwidth % PUBLIC_IP_BANDWIDTH_STEP != 0):
+                errors.append(
+                    "public_ip_bandwidth must be between 100 and 10000 and multiple of 100"
+                )
+
+        if self.user_data_too_large(spec.get('user_data') or ''):
+            errors.append(f"user_data cannot exceed {self.max_user_data_bytes} bytes")
+
+        return errors
+
+    def validate_many(self, specs):
+        """
+        Validate a list of VM specifications in a single pass.
+
+        Duplicate names within the list are reported as well.
+
+        :param specs: List of VM specifications
+        :type specs: list
+        :return: List of error messages prefixed with spec index and name
+        :rtype: list
+        """
+        errors = []
+        seen_names = {}
+
+        for index, spec in enumerate(specs):
+            name = spec.get('name')
+            for error in self.validate(spec):
+                errors.append(f"spec[{index}] ({name}): {error}")
+
+            if name in seen_names:
+                errors.append(
+                    f"spec[{index}] ({name}): duplicate VM name, already used by spec[{seen_names[name]}]"
+                )
+            else:
+                seen_names[name] = index
+
+        return errors
+
+
+def validate_vm_specs(specs, max_user_data_bytes=USER_DATA_MAX_BYTES):
+    """
+    Validate a list of VM specifications.
+
+    :param specs: List of VM specifications
+    :type specs: list
+    :param max_user_data_bytes: Maximum size of user_data in bytes (UTF-8)
+    :type max_user_data_bytes: int
+    :return: List of error messages, empty if all specs are valid
+    :rtype: list
+    """
+    return VMSpecValidator(max_user_data_bytes).validate_many(specs)
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from ansible.module_utils.basic import env_fallback
+
+# Module options of the order watcher, shared by modules of this collection
+WATCH_OPTIONS = dict(
+    order_events_file=dict(type='path', fallback=(env_fallback, ['T1_CLOUD_ORDER_EVENTS_FILE'])),
+)
+
+
+def order_phases(events):
+    """
+    Derive per-phase durations from order status transition events.
+
+    A phase lasts from the event entering a status to the next event of the
+    same order. Time spent in the same status across several waits of one
+    order (for example two power actions) is summed up.
+
+    :param events: Transition events in observation order
+    :type events: list
+    :return: Phase durations in seconds by order ID and status, plus 'total'
+        from the first to the last event of the order
+    :rtype: dict
+    """
+    phases = {}
+    last = {}
+    first = {}
+    for event in events:
+        order_id = event['order_id']
+        durations = phases.setdefault(order_id, {})
+        previous = last.get(order_id)
+        if previous is not None:
+            elapsed = event['time'] - previous['time']
+            durations[previous['status']] = round(durations.get(previous['status'], 0.0) + elapsed, 3)
+        first.setdefault(order_id, event)
+        last[order_id] = event
+
+    for order_id, durations in phases.items():
+        durations['total'] = round(last[order_id]['time'] - first[order_id]['time'], 3)
+    return phases
+
+
+class OrderWatcher:
+    """
+    Recorder of order status transitions.
+
+    The waiters of ``T1CloudVM`` report every polled order status to the
+    watcher, which keeps one event per change (``pending`` -> ``running`` ->
+    ``success``) with a timestamp. Events are appended to ``output`` as JSON
+    lines as soon as they are observed, so long runs can be followed with
+    ``tail -f``. Attached to an AnsibleModule, the events and the phase
+    durations derived from them are added to the module result as
+    ``order_events`` and ``order_phases``, where the
+    ``t1_cloud_order_events`` callback plugin displays them.
+
+    Safe to use from several threads.
+
+    :param output: Path of the JSON lines file, None to keep events in memory only
+    :type output: str or None
+    :param clock: Function returning the current time in seconds since the epoch
+    :type clock: callable
+    """
+
+    def __init__(self, output=None, clock=time.time):
+        """
+        Initialize OrderWatcher instance.
+
+        :param output: Path of the JSON lines file, None to keep events in memory only
+        :type output: str or None
+        :param clock: Function returning the current time in seconds since the epoch
+        :type clock: callable
+        """
+        self.output = output
+        self.clock = clock
+        self.events = []
+        self._statuses = {}
+        self._lock = threading.Lock()
+        self._write_error = None
+
+    @classmethod
+    def attach(cls, module):
+        """
+        Create a watcher adding its events to the result of a module run.
+
+        :param module: Module with WATCH_OPTIONS in its argument spec
+        :type module: AnsibleModule
+        :return: Watcher to pass to T1CloudVM
+        :rtype: OrderWatcher
+        """
+        watcher = cls(output=module.params.get('order_events_file'))
+        exit_json = module.exit_json
+        fail_json = module.fail_json
+
+        def watched_exit_json(**kwargs):
+            kwargs.update(watcher.result(module))
+            exit_json(**kwargs)
+
+        def watched_fail_json(msg, **kwargs):
+            kwargs.update(watcher.result(module))
+            fail_json(msg=msg, **kwargs)
+
+        module.exit_json = watched_exit_json
+        module.fail_json = watched_fail_json
+        return watcher
+
+    def observe(self, order_id, status):
+        """
+        Report a polled order status, recording an event if it changed.
+
+        :param order_id: Order ID
+        :type order_id: str
+        :param status: Order status
+        :type status: str
+        :return: Recorded event, None if the status did not change
+        :rtype: dict or None
+        """
+        with self._lock:
+            previous = self._statuses.get(order_id)
+            if previous == status:
+                return None
+            self._statuses[order_id] = status
+
+            now = self.clock()
+            event = {
+                'order_id': order_id,
+                'status': status,
+                'previous': previous,
+                'timestamp': datetime.fromtimestamp(now, timezone.utc).isoformat(timespec='milliseconds'),
+                'time': now,
+            }
+            self.events.append(event)
+            if self.output:
+                self._write(event)
+            return event
+
+    def _write(self, event):
+        """Append an event to the output file, remembering the first failure"""
+        try:
+            fd = os.open(self.output, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, (json.dumps(event, separators=(',', ':')) + '\n').encode('utf-8'))
+            finally:
+                os.close(fd)
+        except OSError as e:
+            if self._write_error is None:
+                self._write_error = str(e)
+
+    def phases(self):
+        """
+        Get per-phase durations of the watched orders.
+
+        :return: Phase durations in seconds by order ID and status
+        :rtype: dict
+        """
+        with self._lock:
+            return order_phases(self.events)
+
+    def result(self, module=None):
+        """
+        Get the module result entries of the watcher.
+
+        :param module: Module to warn about output file errors
+        :type module: AnsibleModule or None
+        :return: 'order_events' and 'order_phases', empty if no order was watched
+        :rtype: dict
+        """
+        if self._write_error and module is not None:
+            module.warn(f"Could not write order events to {self.output}: {self._write_error}")
+            self._write_error = None
+        if not self.events:
+            return {}
+        return {'order_events': list(self.events), 'order_phases': self.phases()}
@@ -29,18 +29,18 @@ description:
     - Supports full VM lifecycle management including disk configuration and network setup.
 
 options:
-    api_token:
-        description:
-            - T1 Cloud API token for authentication.
-            - Can be obtained from T1 Cloud console.
-        required: true
-        type: str
-        no_log: true
     project_id:
         description:
             - The ID of the project where VM should be created.
         required: true
         type: str
+    base_url:
+        description:
+            - Base URL of the T1 Cloud API.
+            - Can point to a local stand-in backend (for example C(fake_t1_cloud.py)) to rehearse plays offline.
+        required: false
+        type: str
+        default: "https://api.t1.cloud"
     name:
         description:
             - Name of the virtual machine.
@@ -48,217 +48,102 @@ options:
             - Must match pattern ^[a-z][a-z0-9-]{1,61}[a-z0-9]$.
         required: true
         type: str
-    description:
-        description:
-            - Description of the virtual machine.
-        required: false
-        type: str
-        default: ""
-    image_id:
-        description:
-            - ID of the image to use for VM creation.
-            - Required when state is present.
-            - Mutually exclusive with image_name.
-        required: false
-        type: str
-    image_name:
-        description:
-            - Name of the image to use for VM creation.
-            - Required when state is present.
-            - Mutually exclusive with image_id.
-        required: false
-        type: str
-    flavor_id:
-        description:
-            - ID of the flavor (VM configuration) to use.
-            - Required when state is present.
-            - Mutually exclusive with flavor_name.
-        required: false
-        type: str
-    flavor_name:
+    state:
         description:
-            - Name of the flavor (VM configuration) to use.
-            - Required when state is present.
-            - Mutually exclusive with flavor_id.
+            - Desired state of the VM.
         required: false
         type: str
-    flavor_ram:
+        choices: ['present', 'absent', 'started', 'stopped']
+        default: 'present'
+    wait:
         description:
-            - RAM capacity in MB
+            - Whether to wait for operation to complete.
         required: false
-        type: int
-    flavor_vcpus:
+        type: bool
+        default: true
+    wait_timeout:
         description:
-            - Number of processors
+            - Maximum time to wait for operation completion in seconds.
         required: false
         type: int
-    region_id:
-        description:
-            - ID of the region where VM should be created.
-        required: false
-        type: str
-        default: "0c530dd3-eaae-4216-8f9d-9b5710a7cc30"
-    region_name:
-        description:
-            - Name of the region where VM should be created.
-        required: false
-        type: str
-        default: "ru-central1"
-    availability_zone_id:
-        description:
-            - ID of the availability zone where VM should be created.
-        required: false
-        type: str
-        default: "d3p1k01"
-    availability_zone_name:
-        description:
-            - Name of the availability zone where VM should be created.
-        required: false
-        type: str
-        default: "ru-central1-a"
-    disk_size:
+        default: 600
+    poll_interval:
         description:
-            - Size of the boot disk in GB.
+            - Delay in seconds between order status checks while waiting for operation completion.
         required: false
-        type: int
+        type: float
         default: 10
-    disk_type_id:
-        description:
-            - ID of the disk type to use.
-        required: false
-        type: str
-        default: "076482c0-0367-4dee-a16f-2c6673a97f7f"
-    disk_type_name:
-        description:
-            - Name of the disk type to use.
-        required: false
-        type: str
-        default: "POD2_Average"
-    extra_disks:
-        description:
-            - List of additional disks to attach to VM.
-            - Each disk should be a dictionary with name, size, and type.
-        required: false
-        type: list
-        elements: dict
-        default: []
-    network_id:
-        description:
-            - ID of the network to connect VM to.
-            - Required when state is present.
-        required: false
-        type: str
-    subnet_id:
-        description:
-            - ID of the subnet to connect VM to.
-            - Required when state is present.
-        required: false
-        type: str
-    subnet_cidr:
-        description:
-            - CIDR of the subnet.
-        required: false
-        type: str
-        default: "10.128.0.0/24"
-    subnet_name:
+    gather_info:
         description:
-            - Name of the subnet.
+            - Whether to gather runtime information about the VM (IP addresses, power status, etc.).
+            - Uses compute instances API to get current VM state.
         required: false
-        type: str
-        default: "default-ru-central1-a"
-    assign_public_ip:
+        type: bool
+        default: true
+    compress_requests:
         description:
-            - Whether to assign public IP to VM.
+            - Whether to gzip-compress large request bodies (for example VM orders with big I(user_data)).
+            - Bodies smaller than 8 KiB are always sent uncompressed.
+            - Responses are always requested with gzip (and brotli, when available) content encoding.
         required: false
         type: bool
         default: false
-    toggle_shared_network:
+    resolved_vm:
         description:
-            - Specify true if you want to connect the server to a subnet of another project (not the one in which the server is ordered)
+            - VM order already resolved by the controller-side action plugin of this module.
+            - When set, the module skips its own orders listing lookup. An empty dictionary means the VM does not exist.
+            - Set automatically by the action plugin, there is normally no need to pass it explicitly.
         required: false
-        type: bool
-        default: false
-    create_public_ip:
+        type: dict
+    info_cache_ttl:
         description:
-            - Whether to create new public IP or use existing one.
-            - Only used when assign_public_ip is true.
+            - Seconds the action plugin keeps runtime information gathered by I(gather_info) on the controller.
+            - Tasks of the same run that read the same VM within this time get it from the cache instead of the API.
+            - Write operations of this module drop the cached entry of the VM.
+            - Set to C(0) to disable the cache.
         required: false
-        type: bool
-        default: false
-    public_ip_bandwidth:
+        type: float
+        default: 30
+    info_cache_size:
         description:
-            - Bandwidth limit for public IP in Mbps.
-            - Only used when assign_public_ip and create_public_ip are true.
-            - Must be multiple of 100, from 100 to 10000.
+            - Maximum number of VMs kept in the runtime information cache, oldest are evicted first.
         required: false
         type: int
         default: 1000
-    requested_ip:
-        description:
-            - Specific internal IP address to assign to VM.
-            - If not specified, IP will be assigned automatically.
-        required: false
-        type: str
-    security_groups:
-        description:
-            - List of security group IDs to apply to VM.
-        required: false
-        type: list
-        elements: str
-        default: []
-    ssh_keys:
+    state_store_path:
         description:
-            - List of SSH key IDs to add to VM.
-            - Used for Linux VMs.
+            - Path on the controller to a JSON file recording the order ID, instance item ID and last known status
+              of the VMs managed by this module, kept across runs.
+            - When the VM is recorded, the action plugin fetches its order directly by ID and checks that it still
+              belongs to a VM of this name instead of looking the name up in the orders listing.
+              The listing is only queried when the VM is not recorded or its record is stale.
+            - Defaults to the C(T1_CLOUD_STATE_STORE) environment variable of the controller; without either the
+              VM is always looked up in the orders listing.
         required: false
-        type: list
-        elements: str
-        default: []
-    user_data:
+        type: path
+    state_store_refresh:
         description:
-            - Cloud-init user data script.
-            - Maximum 16384 bytes.
-        required: false
-        type: str
-        default: ""
-    preemptible:
-        description:
-            - Whether VM should be preemptible (may be stopped after 24h).
+            - Whether to ignore the record of the VM in I(state_store_path) and look it up in the orders listing,
+              updating the record.
         required: false
         type: bool
         default: false
-    labels:
+    resolved_runtime_info:
         description:
-            - Key-value labels to assign to VM.
+            - Runtime information served from the controller-side cache by the action plugin of this module.
+            - When set, the module returns it as I(runtime_info) instead of querying the compute instances API.
+            - Set automatically by the action plugin, there is normally no need to pass it explicitly.
         required: false
         type: dict
-        default: {}
-    state:
-        description:
-            - Desired state of the VM.
-        required: false
-        type: str
-        choices: ['present', 'absent', 'started', 'stopped']
-        default: 'present'
-    wait:
-        description:
-            - Whether to wait for operation to complete.
-        required: false
-        type: bool
-        default: true
-    wait_timeout:
-        description:
-            - Maximum time to wait for operation completion in seconds.
-        required: false
-        type: int
-        default: 600
-    gather_info:
-        description:
-            - Whether to gather runtime information about the VM (IP addresses, power status, etc.).
-            - Uses compute instances API to get current VM state.
-        required: false
-        type: bool
-        default: true
+
+extends_documentation_fragment:
+    - gromr10.compute_instance.t1_cloud_auth
+    - gromr10.compute_instance.t1_cloud_vm_spec
+    - gromr10.compute_instance.t1_cloud_index
+    - gromr10.compute_instance.t1_cloud_profile
+    - gromr10.compute_instance.t1_cloud_watch
+    - gromr10.compute_instance.t1_cloud_journal
+    - gromr10.compute_instance.t1_cloud_deadline
 
 author:
     - T1 Cloud Module Contributors
@@ -266,6 +151,11 @@ author:
 requirements:
     - python >= 3.6
     - requests
+
+notes:
+    - Set the C(T1_CLOUD_TRACE_FILE) environment variable of the task (C(environment) keyword) to append
+      tracing spans of API requests and order status polls to that file on the managed host, in OTLP JSON format.
+      Spans join the trace given by a W3C C(TRACEPARENT) environment variable.
 '''
 
 EXAMPLES = r'''
@@ -504,583 +394,94 @@ runtime_info:
             "name": "ru-central1-a"
         }
     }
+profile:
+    description:
+        - Profile summary of the module run.
+        - I(breakdown) is the self time in seconds spent in JSON parsing, TLS, network I/O,
+          sleeping between status polls and everything else.
+    type: dict
+    returned: when I(profile) is enabled
+    sample: {
+        "total_time": 12.84,
+        "breakdown": {"json": 0.021, "tls": 0.310, "network": 1.402, "sleep": 10.004, "other": 1.103},
+        "top": [
+            {"function": "ansible_collections/gromr10/compute_instance/plugins/module_utils/t1_cloud.py:339(wait_for_operation)", "calls": 1, "tottime": 0.001, "cumtime": 11.2}
+        ],
+        "output": "/tmp/t1_cloud_vm.prof"
+    }
+order_events:
+    description:
+        - Order status transitions observed while waiting, with the previous status, an ISO 8601 timestamp
+          and the time in seconds since the epoch.
+        - Displayed by the C(gromr10.compute_instance.t1_cloud_order_events) callback plugin.
+    type: list
+    elements: dict
+    returned: when the module waited for orders
+    sample: [
+        {"order_id": "15b92322-144f-4eec-9746-0d830f61647d", "status": "pending", "previous": null,
+         "timestamp": "2025-01-15T10:30:00.120+00:00", "time": 1736937000.12},
+        {"order_id": "15b92322-144f-4eec-9746-0d830f61647d", "status": "running", "previous": "pending",
+         "timestamp": "2025-01-15T10:30:20.310+00:00", "time": 1736937020.31}
+    ]
+order_phases:
+    description: Seconds spent in each order status by order ID, derived from I(order_events), and the observed C(total).
+    type: dict
+    returned: when the module waited for orders
+    sample: {"15b92322-144f-4eec-9746-0d830f61647d": {"pending": 20.19, "running": 95.4, "total": 115.59}}
+resumed_orders:
+    description: IDs of orders submitted by an interrupted earlier run that were waited on instead of submitted again.
+    type: list
+    elements: str
+    returned: when I(journal_path) is set and orders were resumed
+    sample: ["15b92322-144f-4eec-9746-0d830f61647d"]
+time_breakdown:
+    description:
+        - Where the time of the run went when a I(deadline) is set, in seconds per category
+          (C(requests), C(polling), C(controller), C(other)), with the budget and the elapsed time.
+        - Concurrent requests are counted in full, so the categories may add up to more than the elapsed time.
+    type: dict
+    returned: on failure when I(deadline) is set
+    sample: {"budget": 300, "elapsed": 300.02, "requests": 41.7, "polling": 250.0, "controller": 1.2, "other": 7.12}
 changed:
     description: Whether the VM state was changed
     type: bool
     returned: always
 '''
 
-import time
-import re
-import json
-from urllib.parse import urljoin
-
-try:
-    import requests
-    HAS_REQUESTS = True
-except ImportError:
-    HAS_REQUESTS = False
-    requests = None
-
 from ansible.module_utils.basic import AnsibleModule
-
-
-class T1CloudVM:
-    """
-    Class for managing T1 Cloud VMs via REST API.
-
-    :param api_token: T1 Cloud API token
-    :type api_token: str
-    :param project_id: Project ID where VM should be managed
-    :type project_id: str
-    """
-
-    def __init__(self, api_token, project_id, base_url="https://api.t1.cloud"):
-        """
-        Initialize T1CloudVM instance.
-
-        :param api_token: T1 Cloud API token for authentication
-        :type api_token: str
-        :param project_id: Project ID where VM operations will be performed
-        :type project_id: str
-        """
-        self.api_token = api_token
-        self.project_id = project_id
-        self.base_url = base_url.rstrip('/')
-        self.headers = {
-            'Authorization': f'Bearer {self.api_token}',
-            'Content-Type': 'application/json',
-            'Accept': 'application/json',
-            'User-Agent': 'ansible-t1-cloud/1.0.0'
-        }
-
-        if requests is not None:
-            self.session = requests.Session()
-            self.session.headers.update(self.headers)
-
-            # Configure retry strategy
-            from requests.adapters import HTTPAdapter
-            from urllib3.util import Retry
-
-            retry_strategy = Retry(
-                total=3,
-                status_forcelist=[429, 500, 502, 503, 504],
-                backoff_factor=1
-            )
-
-            adapter = HTTPAdapter(max_retries=retry_strategy)
-            self.session.mount("http://", adapter)
-            self.session.mount("https://", adapter)
-        else:
-            raise Exception("requests library is required")
-
-    def _make_request(self, method, endpoint, data=None, params=None, timeout=30):
-        """
-        Make HTTP request to T1 Cloud API.
-
-        :param method: HTTP method (GET, POST, DELETE, etc.)
-        :type method: str
-        :param endpoint: API endpoint path
-        :type endpoint: str
-        :param data: Request body data
-        :type data: dict or None
-        :param params: URL query parameters
-        :type params: dict or None
-        :return: Response object or None
-        :rtype: requests.Response or None
-        """
-        url = urljoin(self.base_url, endpoint)
-
-        try:
-            if requests is None:
-                raise Exception("requests library is not available")
-
-            response = self.session.request(
-                method=method,
-                url=url,
-                json=data,
-                params=params,
-                timeout=timeout
-            )
-            response.raise_for_status()
-            return response
-        except requests.exceptions.RequestException as e: # type: ignore
-            response_json = None
-            if isinstance(e.response, requests.Response): # type: ignore
-              try:
-                  response_json = e.response.json()
-                  error_message = response_json.get('message', response.text)
-              except (ValueError, json.JSONDecodeError):
-                  error_message = response.text or f"HTTP {response.status_code}"
-            raise Exception(f"API request failed: {str(e)}\n Error message:{str(error_message)}")
-
-    def get_vm_by_name(self, name):
-        """
-        Get VM information by name.
-
-        :param name: VM name to search for
-        :type name: str
-        :return: VM information or None if not found
-        :rtype: dict or None
-        """
-        endpoint = f"/order-service/api/v1/projects/{self.project_id}/orders"
-        params = {
-            "per_page": 100,
-            "f[product_name][]": "compute_instance"
-        }
-
-        response = self._make_request('GET', endpoint, params=params)
-        if response and response.status_code == 200:
-            data = response.json()
-            orders = data.get('list', [])
-            for order in orders:
-                if order.get('attrs', {}).get('name') == name:
-                    return order
-        return None
-
-    def get_vm_by_id(self, vm_id):
-        """
-        Get VM information by ID.
-
-        :param vm_id: VM ID to search for
-        :type vm_id: str
-        :return: VM information or None if not found
-        :rtype: dict or None
-        """
-        endpoint = f"/order-service/api/v1/projects/{self.project_id}/orders/{vm_id}"
-
-        response = self._make_request('GET', endpoint)
-        if response and response.status_code == 200:
-            return response.json()
-        return None
-
-    def create_vm(self, vm_config):
-        """
-        Create a new virtual machine.
-
-        :param vm_config: VM configuration dictionary
-        :type vm_config: dict
-        :return: Created VM information
-        :rtype: dict
-        """
-        endpoint = f"/order-service/api/v1/projects/{self.project_id}/orders"
-
-        order_data = {
-            "order": {
-                "project_name": f"{self.project_id}",
-                "product_name": "compute_instance",
-                "product_id": "e6fa78c9-2ee1-4f9e-b86c-5d7246f38526",  # OpenStack VM product ID
-                "count": 1,
-                "attrs": vm_config
-            }
-        }
-
-        response = self._make_request('POST', endpoint, data=order_data)
-        if response and response.status_code in [200, 201]:
-            return response.json()
-        else:
-            raise Exception(f"Failed to create VM: {response.text if response else 'No response'}")
-
-    def delete_vm(self, vm_id):
-        """
-        Delete a virtual machine.
-
-        :param vm_id: ID of the VM to delete
-        :type vm_id: str
-        :return: Deletion operation result
-        :rtype: dict
-        """
-        vm_order = self.get_vm_by_id(vm_id)
-        if not vm_order:
-            raise Exception(f"VM with ID {vm_id} not found")
-
-        item_id = self.get_vm_instance_item_id(vm_order)
-        if not item_id:
-            raise Exception(f"Could not find instance item_id for VM {vm_id}")
-
-        return self.execute_vm_action(vm_id, item_id, "compute_instance_delete")
-
-    def wait_for_operation(self, order_id, timeout=600):
-        """
-        Wait for operation to complete.
-
-        :param order_id: ID of the order to wait for
-        :type order_id: str
-        :param timeout: Maximum time to wait in seconds
-        :type timeout: int
-        :return: Final operation status
-        :rtype: dict
-        """
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            endpoint = f"/order-service/api/v1/projects/{self.project_id}/orders/{order_id}"
-            response = self._make_request('GET', endpoint)
-
-            if response and response.status_code == 200:
-                order = response.json()
-                status = order.get('status', 'unknown')
-
-                if status in ['success', 'failure', 'creation_error', 'validation_error']:
-                    return order
-                elif status in ['deprovisioned', 'deprovisioned_error']:
-                    return order
-
-            time.sleep(10)  # Wait 10 seconds before next check
-
-        raise Exception(f"Operation timeout after {timeout} seconds")
-
-    def get_vm_status(self, vm_id):
-        """
-        Get current VM status.
-
-        :param vm_id: VM ID to check
-        :type vm_id: str
-        :return: VM status information
-        :rtype: dict
-        """
-        endpoint = f"/order-service/api/v1/projects/{self.project_id}/compute/instances/{vm_id}"
-
-        response = self._make_request('GET', endpoint)
-        if response and response.status_code == 200:
-            return response.json()
-        return None
-
-    def get_vm_instances(self, filters=None):
-        """
-        Get list of VM instances from compute service.
-
-        :param filters: Optional filters for the request
-        :type filters: dict or None
-        :return: List of VM instances or None
-        :rtype: list or None
-        """
-        endpoint = f"/order-service/api/v1/projects/{self.project_id}/compute/instances"
-        params = filters or {}
-
-        response = self._make_request('GET', endpoint, params=params)
-        if response and response.status_code == 200:
-            data = response.json()
-            return data.get('list', [])
-        return None
-
-    def get_vm_instance_by_id(self, instance_id, with_actions=True, with_children=False):
-        """
-        Get detailed VM instance information by ID.
-
-        :param instance_id: VM instance ID
-        :type instance_id: str
-        :param with_actions: Include available actions
-        :type with_actions: bool
-        :param with_children: Include child resources
-        :type with_children: bool
-        :return: VM instance details or None
-        :rtype: dict or None
-        """
-        endpoint = f"/order-service/api/v1/projects/{self.project_id}/compute/instances/{instance_id}"
-        params = {
-            "with_actions": str(with_actions).lower(),
-            "with_children": str(with_children).lower()
-        }
-
-        response = self._make_request('GET', endpoint, params=params)
-        if response and response.status_code == 200:
-            return response.json()
-        return None
-
-    def get_vm_instance_by_name(self, name):
-        """
-        Get VM instance information by name from compute service.
-
-        :param name: VM name to search for
-        :type name: str
-        :return: VM instance information or None
-        :rtype: dict or None
-        """
-        instances = self.get_vm_instances({"name": name})
-        if instances:
-            for instance in instances:
-                if instance.get('data', {}).get('config', {}).get('name') == name:
-                    return instance
-        return None
-
-    def get_vm_runtime_info(self, vm_name_or_id):
-        """
-        Get comprehensive runtime information about VM including IP addresses,
-        power status, and other dynamic parameters.
-
-        :param vm_name_or_id: VM name or instance ID
-        :type vm_name_or_id: str
-        :return: Dictionary with runtime information
-        :rtype: dict
-        """
-        # First try to get by name from compute instances
-        instance = self.get_vm_instance_by_name(vm_name_or_id)
-
-        # If not found by name, try as instance ID
-        if not instance:
-            instance = self.get_vm_instance_by_id(vm_name_or_id)
-
-        if not instance:
-            return None
-
-        config = instance.get('data', {}).get('config', {})
-
-        # Extract runtime information
-        runtime_info = {
-            'instance_id': config.get('id'),
-            'name': config.get('name'),
-            'status': instance.get('data', {}).get('state', 'unknown'),
-            'power_status': instance.get('data', {}).get('state', 'unknown'),
-            'description': config.get('description', ''),
-            'created_at': instance.get('created_row_dt'),
-            'order_id': instance.get('order_id'),
-            'item_id': instance.get('item_id'),
-            'ip_addresses': {},
-            'flavor': config.get('flavor', {}),
-            'image': config.get('source_image', {}),
-            'availability_zone': config.get('availability_zone', {}),
-            'volumes': [],
-            'network_interfaces': []
-        }
-
-        # Extract IP addresses from addresses field
-        addresses = config.get('addresses', {})
-        for network_name, ips in addresses.items():
-            runtime_info['ip_addresses'][network_name] = []
-            for ip_info in ips:
-                ip_data = {
-                    'addr': ip_info.get('addr'),
-                    'version': ip_info.get('version'),
-                    'type': ip_info.get('OS-EXT-IPS:type'),
-                    'mac_addr': ip_info.get('OS-EXT-IPS-MAC:mac_addr')
-                }
-                runtime_info['ip_addresses'][network_name].append(ip_data)
-
-        # Extract primary IP addresses
-        runtime_info['primary_ipv4'] = config.get('accessIPv4', '')
-        runtime_info['primary_ipv6'] = config.get('accessIPv6', '')
-
-        return runtime_info
-
-    def get_vm_instance_item_id(self, vm_order):
-        """
-        Get instance item_id from VM order.
-
-        :param vm_order: VM order data
-        :type vm_order: dict
-        :return: Instance item_id or None
-        :rtype: str or None
-        """
-        preview_items = vm_order.get('attrs', {}).get('preview_items', [])
-        for item in preview_items:
-            if item.get('type') == 'instance':
-                return item.get('item_id')
-        return None
-
-    def execute_vm_action(self, vm_id, item_id, action_name, attrs=None):
-        """
-        Execute action on VM.
-
-        :param vm_id: VM order ID
-        :type vm_id: str
-        :param item_id: VM instance item ID
-        :type item_id: str
-        :param action_name: Action to execute
-        :type action_name: str
-        :param attrs: Additional attributes for action
-        :type attrs: dict or None
-        :return: Action result
-        :rtype: dict
-        """
-        endpoint = f"/order-service/api/v1/projects/{self.project_id}/orders/{vm_id}/actions/{action_name}"
-
-        action_data = {
-            "item_id": item_id,
-            "order": {
-                "attrs": attrs or {}
-            }
-        }
-
-        response = self._make_request('PATCH', endpoint, data=action_data)
-        if response and response.status_code in [200, 201]:
-            return response.json()
-        else:
-            raise Exception(f"Failed to execute action '{action_name}': {response.text if response else 'No response'}")
-
-    def start_vm(self, vm_id):
-        """
-        Start a virtual machine.
-
-        :param vm_id: ID of the VM to start
-        :type vm_id: str
-        :return: Operation result
-        :rtype: dict
-        """
-        vm_order = self.get_vm_by_id(vm_id)
-        if not vm_order:
-            raise Exception(f"VM with ID {vm_id} not found")
-
-        item_id = self.get_vm_instance_item_id(vm_order)
-        if not item_id:
-            raise Exception(f"Could not find instance item_id for VM {vm_id}")
-
-        return self.execute_vm_action(vm_id, item_id, "start_compute_vm")
-
-    def stop_vm(self, vm_id):
-        """
-        Stop a virtual machine.
-
-        :param vm_id: ID of the VM to stop
-        :type vm_id: str
-        :return: Operation result
-        :rtype: dict
-        """
-        vm_order = self.get_vm_by_id(vm_id)
-        if not vm_order:
-            raise Exception(f"VM with ID {vm_id} not found")
-
-        item_id = self.get_vm_instance_item_id(vm_order)
-        if not item_id:
-            raise Exception(f"Could not find instance item_id for VM {vm_id}")
-
-        return self.execute_vm_action(vm_id, item_id, "stop_compute_vm")
-
-
-def build_vm_config(module):
-    """
-    Build VM configuration from module parameters.
-
-    :param module: Ansible module instance
-    :type module: AnsibleModule
-    :return: VM configuration dictionary
-    :rtype: dict
-    """
-    params = module.params
-
-    config = {
-        "name": params['name'],
-        "description": params['description'],
-        "region": {
-            "id": params['region_id'],
-            "name": params['region_name'],
-            "description": ""
-        },
-        "availability_zone": {
-            "id": params['availability_zone_id'],
-            "name": params['availability_zone_name'],
-            "description": ""
-        }
-    }
-
-    # Image configuration
-    if params['image_id']:
-        config["image"] = {
-            "id": params['image_id'],
-            "name": params.get('image_name', ''),
-            "os_distro": "windows",
-        }
-    elif params['image_name']:
-        # In real implementation, we would need to look up image ID by name
-        config["image"] = {
-            "id": "",  # Would be resolved by API call
-            "name": params['image_name'],
-            "os_distro": "windows",
-        }
-
-    # Flavor configuration
-    if params['flavor_id']:
-        config["flavor"] = {
-            "id": params['flavor_id'],
-            "name": params.get('flavor_name', ''),
-            "ram": params.get('flavor_ram', 4096),  # Default values
-            "vcpus": params.get('flavor_vcpus', 2),  # Default values
-            "gpus": 0
-        }
-    elif params['flavor_name']:
-        config["flavor"] = {
-            "id": "",  # Would be resolved by API call
-            "name": params['flavor_name'],
-            "ram": params.get('flavor_ram', 4096),  # Default values
-            "vcpus": params.get('flavor_vcpus', 2),  # Default values
-            "gpus": 0
-        }
-
-    config["volumes_config"] = {}
-    # Disk configuration
-    config["volumes_config"] = {
-        "boot_volume": {
-            "size": params['disk_size'],
-            "volume_type": {
-                "id": params['disk_type_id'],
-                "name": params['disk_type_name'],
-                "extra_specs": {}
-            }
-        },
-        "extra_volumes": []
-    }
-
-    # Extra disks
-    if params['extra_disks']:
-        config["volumes_config"]["extra_volumes"] = []
-        for disk in params['extra_disks']:
-            extra_disk = {
-                "name": disk.get('name', 'extra-disk'),
-                "size": disk['size'],
-                "volume_type": {
-                    "id": disk.get('type_id', 'cb4724f6-e53e-4632-ac78-f83c4332add3'),
-                    "name": disk.get('type_name', 'ceph_hdd'),
-                    "extra_specs": {}
-                }
-            }
-            config["volumes_config"]["extra_volumes"].append(extra_disk)
-
-    # Network configuration
-    config["network_configuration"] = {
-        "subnet": {
-            "id": params['subnet_id'],
-            "cidr": params['subnet_cidr'],
-            "name": params['subnet_name']
-        },
-        "set_ip_address": bool(params['requested_ip']),
-        "toggle_shared_network": bool(params['toggle_shared_network']),
-        "use_external_network": False
-    }
-
-    if params['requested_ip']:
-        config["network_configuration"]["requested_ip"] = params['requested_ip']
-
-    # Public IP configuration
-    config["add_public_ip"] = params['assign_public_ip']
-    if params['assign_public_ip']:
-        config["create_public_ip"] = params['create_public_ip']
-        if params['create_public_ip']:
-            config["public_ip_bandwidth"] = params['public_ip_bandwidth']
-
-    # Security groups
-    if params['security_groups']:
-        config["security_groups"] = [
-            {"id": sg_id, "name": "default"} for sg_id in params['security_groups']
-        ]
-
-    # SSH keys
-    if params['ssh_keys']:
-        config["ssh_keys"] = params['ssh_keys']
-
-    # User data
-    config["add_user_data"] = bool(params['user_data'])
-    if params['user_data']:
-        config["user_data"] = params['user_data']
-
-    # Other settings
-    config["preemptible"] = params['preemptible']
-    config["add_placement_policy"] = False
-
-    # Add labels if provided
-    if params['labels']:
-        config["labels"] = params['labels']
-
-    return config
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+    AUTH_OPTIONS,
+    FINAL_ORDER_STATUSES,
+    HAS_REQUESTS,
+    VM_SPEC_OPTIONS,
+    T1CloudVM,
+    build_vm_config,
+    check_api_token,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_deadline import (
+    DEADLINE_OPTIONS,
+    Deadline,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_index import (
+    INDEX_OPTIONS,
+    OrdersIndex,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_journal import (
+    JOURNAL_OPTIONS,
+    OrderJournal,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_profile import (
+    PROFILE_OPTIONS,
+    ModuleProfiler,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_validation import (
+    NAME_PATTERN,
+    VMSpecValidator,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_watch import (
+    WATCH_OPTIONS,
+    OrderWatcher,
+)
 
 
 def validate_name(name):
@@ -1092,8 +493,7 @@ def validate_name(name):
     :return: True if valid, False otherwise
     :rtype: bool
     """
-    pattern = r'^[a-z0-9-]{1,61}$'
-    return bool(re.match(pattern, name))
+    return bool(NAME_PATTERN.match(name))
 
 
 def main():
@@ -1104,42 +504,28 @@ def main():
         raise ImportError("The 'requests' library is required for this module")
 
     argument_spec = dict(
-        api_token=dict(type='str', required=True, no_log=True),
+        api_token=dict(type='str', no_log=True),
+        **AUTH_OPTIONS,
         project_id=dict(type='str', required=True),
-        name=dict(type='str', required=True),
-        description=dict(type='str', default=''),
-        image_id=dict(type='str', default=''),
-        image_name=dict(type='str', default=''),
-        flavor_id=dict(type='str'),
-        flavor_name=dict(type='str'),
-        flavor_ram=dict(type='int'),   # Объём оперативной памяти в МБ
-        flavor_vcpus=dict(type='int'), # Количество процессоров
-        region_id=dict(type='str', default='0c530dd3-eaae-4216-8f9d-9b5710a7cc30'),
-        region_name=dict(type='str', default='ru-central1'),
-        availability_zone_id=dict(type='str', default='d3p1k01'),
-        availability_zone_name=dict(type='str', default='ru-central1-a'),
-        disk_size=dict(type='int', default=10),
-        disk_type_id=dict(type='str', default='076482c0-0367-4dee-a16f-2c6673a97f7f'),
-        disk_type_name=dict(type='str', default='POD2_Average'),
-        extra_disks=dict(type='list', elements='dict', default=[]),
-        network_id=dict(type='str'),
-        subnet_id=dict(type='str'),
-        subnet_cidr=dict(type='str', default='10.128.0.0/24'),
-        subnet_name=dict(type='str', default='default-ru-central1-a'),
-        toggle_shared_network=dict(type='bool', default=False),
-        assign_public_ip=dict(type='bool', default=False),
-        create_public_ip=dict(type='bool', default=False),
-        public_ip_bandwidth=dict(type='int', default=1000),
-        requested_ip=dict(type='str', default=''),
-        security_groups=dict(type='list', elements='str', default=[]),
-        ssh_keys=dict(type='list', elements='str', default=[]),
-        user_data=dict(type='str', default=''),
-        preemptible=dict(type='bool', default=False),
-        labels=dict(type='dict', default={}),
+        base_url=dict(type='str', default='https://api.t1.cloud'),
+        **VM_SPEC_OPTIONS,
         state=dict(type='str', choices=['present', 'absent', 'started', 'stopped'], default='present'),
         wait=dict(type='bool', default=True),
         wait_timeout=dict(type='int', default=600),
-        gather_info=dict(type='bool', default=True)
+        poll_interval=dict(type='float', default=10),
+        gather_info=dict(type='bool', default=True),
+        compress_requests=dict(type='bool', default=False),
+        resolved_vm=dict(type='dict'),
+        info_cache_ttl=dict(type='float', default=30),
+        info_cache_size=dict(type='int', default=1000),
+        state_store_path=dict(type='path'),
+        state_store_refresh=dict(type='bool', default=False),
+        **INDEX_OPTIONS,
+        resolved_runtime_info=dict(type='dict'),
+        **PROFILE_OPTIONS,
+        **WATCH_OPTIONS,
+        **JOURNAL_OPTIONS,
+        **DEADLINE_OPTIONS
     )
 
     required_if = [
@@ -1157,29 +543,34 @@ def main():
         supports_check_mode=True
     )
 
-    # Validate VM name
-    if not validate_name(module.params['name']):
-        module.fail_json(
-            msg=f"Invalid VM name '{module.params['name']}'. "
-                "Name must match pattern: ^[a-z0-9-]{{1,61}}$"
-        )
+    # Opt-in profiling, the summary is added to the result on exit
+    ModuleProfiler.attach(module)
+    check_api_token(module)
+
+    # Order status transitions observed while waiting are added to the result
+    watcher = OrderWatcher.attach(module)
 
-    # Validate bandwidth
-    if module.params['assign_public_ip'] and module.params['create_public_ip']:
-        bandwidth = module.params['public_ip_bandwidth']
-        if bandwidth < 100 or bandwidth > 10000 or bandwidth % 100 != 0:
-            module.fail_json(
-                msg="public_ip_bandwidth must be between 100 and 10000 and multiple of 100"
-            )
+    # Optional end-to-end time budget, failures then report where the time went
+    deadline = Deadline.attach(module)
 
-    # Validate user_data size
-    if len(module.params['user_data']) > 16384:
-        module.fail_json(msg="user_data cannot exceed 16384 bytes")
+    # Orders of an interrupted earlier run are resumed instead of submitted again
+    journal = OrderJournal.attach(module)
+
+    # Validate name, bandwidth and user_data size, reporting all errors at once
+    errors = VMSpecValidator().validate(module.params)
+    if errors:
+        module.fail_json(msg="; ".join(errors))
 
     try:
         client = T1CloudVM(
             api_token=module.params['api_token'],
-            project_id=module.params['project_id']
+            project_id=module.params['project_id'],
+            base_url=module.params['base_url'],
+            compress_requests=module.params['compress_requests'],
+            watcher=watcher,
+            journal=journal,
+            deadline=deadline,
+            index=OrdersIndex.from_params(module.params)
         )
 
         result = {
@@ -1189,10 +580,30 @@ def main():
         }
 
         vm_name = module.params['name']
-        current_vm = client.get_vm_by_name(vm_name)
+        if module.params['resolved_vm'] is not None:
+            # Resolved on the controller by the action plugin
+            current_vm = module.params['resolved_vm'] or None
+        else:
+            current_vm = client.get_vm_by_name(vm_name)
 
         if module.params['state'] == 'present':
-            if current_vm:
+            resume = (current_vm and journal is not None and not module.check_mode and module.params['wait']
+                      and current_vm.get('id') in journal.in_flight_create(client.base_url, client.project_id, vm_name))
+            if resume and current_vm.get('status') in FINAL_ORDER_STATUSES:
+                # Created without waiting by an earlier run and finished since, nothing left to resume
+                journal.finished([current_vm['id']], current_vm.get('status'))
+                resume = False
+            if resume:
+                # Created by an interrupted earlier run, wait for it as that run would have
+                journal.resumed_waiting([current_vm['id']])
+                result['order_id'] = current_vm['id']
+                result['vm'] = client.wait_for_operation(
+                    result['order_id'],
+                    module.params['wait_timeout'],
+                    module.params['poll_interval']
+                )
+                result['changed'] = True
+            elif current_vm:
                 # VM exists, check if update needed
                 result['vm'] = current_vm
                 result['changed'] = False
@@ -1206,7 +617,8 @@ def main():
                     if module.params['wait']:
                         final_order = client.wait_for_operation(
                             result['order_id'],
-                            module.params['wait_timeout']
+                            module.params['wait_timeout'],
+                            module.params['poll_interval']
                         )
                         result['vm'] = final_order
                     else:
@@ -1230,8 +642,9 @@ def main():
             if not vm_id:
                 module.fail_json(msg=f"Could not get VM ID for '{vm_name}'")
 
-            # Get current VM status from compute instances API for accurate runtime info
-            runtime_info = client.get_vm_runtime_info(vm_name)
+            # Get current VM status from compute instances API for accurate runtime info,
+            # never from the orders index: a guest shutdown does not update the order
+            runtime_info = client.get_vm_runtime_info(vm_name, live=True)
             current_power_state = 'unknown'
 
             if runtime_info:
@@ -1251,7 +664,8 @@ def main():
                     if not module.check_mode:
                         action_result = client.start_vm(vm_id)
                         if module.params['wait']:
-                            client.wait_for_operation(action_result.get('id', vm_id), module.params['wait_timeout'])
+                            client.wait_for_operation(action_result.get('id', vm_id), module.params['wait_timeout'],
+                                                      module.params['poll_interval'])
                     result['changed'] = True
                 else:
                     result['changed'] = False
@@ -1260,7 +674,8 @@ def main():
                     if not module.check_mode:
                         action_result = client.stop_vm(vm_id)
                         if module.params['wait']:
-                            client.wait_for_operation(action_result.get('id', vm_id), module.params['wait_timeout'])
+                            client.wait_for_operation(action_result.get('id', vm_id), module.params['wait_timeout'],
+                                                      module.params['poll_interval'])
                     result['changed'] = True
                 else:
                     result['changed'] = False
@@ -1269,13 +684,17 @@ def main():
 
         # Get runtime information if requested and VM exists
         if result.get('vm') and module.params.get('gather_info', True) and not result.get('runtime_info'):
-            try:
-                runtime_info = client.get_vm_runtime_info(vm_name)
-                if runtime_info:
-                    result['runtime_info'] = runtime_info
-            except Exception:
-                # Don't fail if runtime info unavailable, just continue
-                pass
+            if module.params['resolved_runtime_info'] and not result['changed']:
+                # Served from the controller-side cache by the action plugin
+                result['runtime_info'] = module.params['resolved_runtime_info']
+            else:
+                try:
+                    runtime_info = client.get_vm_runtime_info(vm_name)
+                    if runtime_info:
+                        result['runtime_info'] = runtime_info
+                except Exception:
+                    # Don't fail if runtime info unavailable, just continue
+                    pass
 
         module.exit_json(**result)
 
@@ -0,0 +1,397 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: t1_cloud_vm_fleet
+
+short_description: Converge all virtual machines of a T1 Cloud project to a desired state
+
+version_added: "1.1.0"
+
+description:
+    - Takes a list of desired VM specifications, fetches the current project state once
+      (one orders listing and one instances listing) and computes a plan of create, delete,
+      start and stop actions.
+    - Applies the plan with bounded parallelism, respecting dependencies between VMs.
+    - In check mode only the plan and its summary are returned.
+    - The order-service API has no in-place update of VM attributes, so drift of
+      C(description), C(flavor_id), C(disk_size) and C(labels) of existing VMs is not planned;
+      it is returned as I(drift) with a warning, and does not make the task changed.
+
+options:
+    project_id:
+        description:
+            - The ID of the project to converge.
+        required: true
+        type: str
+    base_url:
+        description:
+            - Base URL of the T1 Cloud API.
+        required: false
+        type: str
+        default: "https://api.t1.cloud"
+    vms:
+        description:
+            - Desired VMs of the project.
+            - Each item accepts the VM options of M(gromr10.compute_instance.t1_cloud_vm)
+              (C(name), C(image_id), C(flavor_id), C(subnet_id), C(disk_size), C(user_data), C(labels), ...)
+              with the same defaults, plus the suboptions below.
+            - C(description), C(flavor_id), C(disk_size) and C(labels) of existing VMs are
+              compared only when set explicitly.
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description:
+                    - Name of the virtual machine.
+                required: true
+                type: str
+            state:
+                description:
+                    - Desired state of the VM.
+                type: str
+                choices: ['present', 'absent', 'started', 'stopped']
+                default: 'present'
+            depends_on:
+                description:
+                    - Names of VMs that must be converged before this one.
+                    - When deleting, this VM is deleted before the VMs it depends on.
+                type: list
+                elements: str
+                default: []
+    prune:
+        description:
+            - Whether to delete VMs of the project that are not listed in I(vms).
+        required: false
+        type: bool
+        default: false
+    parallelism:
+        description:
+            - Maximum number of actions executed at the same time.
+        required: false
+        type: int
+        default: 5
+    wait:
+        description:
+            - Whether to wait for each order to complete.
+            - Dependent actions start only after the orders they depend on completed when enabled.
+            - A new VM with C(state=stopped) is always waited for before it is stopped.
+        required: false
+        type: bool
+        default: true
+    wait_timeout:
+        description:
+            - Maximum time to wait for each order in seconds.
+        required: false
+        type: int
+        default: 600
+    poll_interval:
+        description:
+            - Delay in seconds between order status checks.
+        required: false
+        type: float
+        default: 10
+    compress_requests:
+        description:
+            - Whether to gzip-compress large request bodies.
+        required: false
+        type: bool
+        default: false
+
+extends_documentation_fragment:
+    - gromr10.compute_instance.t1_cloud_auth
+    - gromr10.compute_instance.t1_cloud_watch
+    - gromr10.compute_instance.t1_cloud_journal
+    - gromr10.compute_instance.t1_cloud_deadline
+
+author:
+    - T1 Cloud Module Contributors
+
+requirements:
+    - python >= 3.6
+    - requests
+
+notes:
+    - Set the C(T1_CLOUD_TRACE_FILE) environment variable of the task (C(environment) keyword) to append
+      tracing spans of API requests and order status polls to that file on the managed host, in OTLP JSON format.
+      Spans join the trace given by a W3C C(TRACEPARENT) environment variable.
+'''
+
+EXAMPLES = r'''
+# Converge a small web stack, database first
+- name: Converge project VMs
+  gromr10.compute_instance.t1_cloud_vm_fleet:
+    api_token: "{{ t1_api_token }}"
+    project_id: "proj-gxvcuy3t6kg5vrf"
+    parallelism: 10
+    vms:
+      - name: "db-01"
+        image_id: "d0179cb4-bfad-4b8f-836f-9cfc02143560"
+        flavor_id: "3b259b39-6e73-41d5-b98e-b93c0bf31e95"
+        subnet_id: "d0a5e4c0-1323-483d-8f5a-0e797a0fdd85"
+        disk_size: 50
+      - name: "web-01"
+        image_id: "d0179cb4-bfad-4b8f-836f-9cfc02143560"
+        flavor_id: "3b259b39-6e73-41d5-b98e-b93c0bf31e95"
+        subnet_id: "d0a5e4c0-1323-483d-8f5a-0e797a0fdd85"
+        depends_on: ["db-01"]
+      - name: "old-web"
+        state: absent
+  register: fleet
+
+# Show what would change without changing anything
+- name: Plan project VMs
+  gromr10.compute_instance.t1_cloud_vm_fleet:
+    api_token: "{{ t1_api_token }}"
+    project_id: "proj-gxvcuy3t6kg5vrf"
+    prune: true
+    vms: "{{ desired_vms }}"
+  check_mode: true
+  register: fleet_plan
+
+- name: Display plan summary
+  debug:
+    var: fleet_plan.summary
+'''
+
+RETURN = r'''
+plan:
+    description: Planned actions in plan order.
+    type: list
+    elements: dict
+    returned: always
+    sample: [
+        {"action": "create", "name": "db-01", "after": []},
+        {"action": "create", "name": "web-01", "after": ["db-01"]},
+        {"action": "delete", "name": "old-web", "after": []}
+    ]
+summary:
+    description: Number of planned actions per type.
+    type: dict
+    returned: always
+    sample: {"create": 2, "delete": 1, "start": 0, "stop": 0}
+drift:
+    description: Attributes of existing VMs that differ from their specs and cannot be updated in place, by VM name.
+    type: dict
+    returned: always
+    sample: {"web-01": {"flavor_id": {"current": "3b259b39-6e73-41d5-b98e-b93c0bf31e95",
+                                      "desired": "1c7a9b2e-3f4d-4e5a-8b6c-7d8e9f0a1b2c"}}}
+results:
+    description: Outcome of each planned action, in plan order.
+    type: list
+    elements: dict
+    returned: when not in check mode
+    sample: [
+        {"action": "create", "name": "db-01", "status": "ok", "duration": 95.2, "order_id": "15b92322-144f-4eec-9746-0d830f61647d"},
+        {"action": "create", "name": "web-01", "status": "skipped", "duration": 0, "msg": "Dependency failed"}
+    ]
+order_events:
+    description:
+        - Order status transitions observed while waiting, with the previous status, an ISO 8601 timestamp
+          and the time in seconds since the epoch.
+        - Displayed by the C(gromr10.compute_instance.t1_cloud_order_events) callback plugin.
+    type: list
+    elements: dict
+    returned: when the module waited for orders
+    sample: [
+        {"order_id": "15b92322-144f-4eec-9746-0d830f61647d", "status": "pending", "previous": null,
+         "timestamp": "2025-01-15T10:30:00.120+00:00", "time": 1736937000.12},
+        {"order_id": "15b92322-144f-4eec-9746-0d830f61647d", "status": "running", "previous": "pending",
+         "timestamp": "2025-01-15T10:30:20.310+00:00", "time": 1736937020.31}
+    ]
+order_phases:
+    description: Seconds spent in each order status by order ID, derived from I(order_events), and the observed C(total).
+    type: dict
+    returned: when the module waited for orders
+    sample: {"15b92322-144f-4eec-9746-0d830f61647d": {"pending": 20.19, "running": 95.4, "total": 115.59}}
+resumed_orders:
+    description: IDs of orders submitted by an interrupted earlier run that were waited on instead of submitted again.
+    type: list
+    elements: str
+    returned: when I(journal_path) is set and orders were resumed
+    sample: ["15b92322-144f-4eec-9746-0d830f61647d"]
+time_breakdown:
+    description:
+        - Where the time of the run went when a I(deadline) is set, in seconds per category
+          (C(requests), C(polling), C(controller), C(other)), with the budget and the elapsed time.
+        - Concurrent requests are counted in full, so the categories may add up to more than the elapsed time.
+    type: dict
+    returned: on failure when I(deadline) is set
+    sample: {"budget": 300, "elapsed": 300.02, "requests": 41.7, "polling": 250.0, "controller": 1.2, "other": 7.12}
+changed:
+    description: Whether any VM was changed (or would be, in check mode).
+    type: bool
+    returned: always
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+    AUTH_OPTIONS,
+    HAS_REQUESTS,
+    VM_SPEC_OPTIONS,
+    T1CloudVM,
+    check_api_token,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_deadline import (
+    DEADLINE_OPTIONS,
+    Deadline,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_journal import (
+    JOURNAL_OPTIONS,
+    OrderJournal,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_planner import VMPlanner
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_validation import VMSpecValidator
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_watch import (
+    WATCH_OPTIONS,
+    OrderWatcher,
+)
+
+
+def describe_plan(actions):
+    """
+    Convert plan actions to module output, without VM configurations.
+
+    :param actions: Plan actions
+    :type actions: list
+    :return: Plan entries
+    :rtype: list
+    """
+    plan = []
+    for action in actions:
+        entry = {
+            'action': action['action'],
+            'name': action['name'],
+            'after': sorted({actions[aid]['name'] for aid in action['after'] if actions[aid]['name'] != action['name']}),
+        }
+        plan.append(entry)
+    return plan
+
+
+def main():
+    """
+    Main module execution function.
+    """
+    if not HAS_REQUESTS:
+        raise ImportError("The 'requests' library is required for this module")
+
+    vm_options = dict(
+        VM_SPEC_OPTIONS,
+        # No defaults for fields compared with existing VMs, so only
+        # explicitly set values are reported as drift
+        description=dict(type='str'),
+        disk_size=dict(type='int'),
+        labels=dict(type='dict'),
+        state=dict(type='str', choices=['present', 'absent', 'started', 'stopped'], default='present'),
+        depends_on=dict(type='list', elements='str', default=[]),
+    )
+
+    argument_spec = dict(
+        api_token=dict(type='str', no_log=True),
+        **AUTH_OPTIONS,
+        project_id=dict(type='str', required=True),
+        base_url=dict(type='str', default='https://api.t1.cloud'),
+        vms=dict(type='list', elements='dict', required=True, options=vm_options),
+        prune=dict(type='bool', default=False),
+        parallelism=dict(type='int', default=5),
+        wait=dict(type='bool', default=True),
+        wait_timeout=dict(type='int', default=600),
+        poll_interval=dict(type='float', default=10),
+        compress_requests=dict(type='bool', default=False),
+        **WATCH_OPTIONS,
+        **JOURNAL_OPTIONS,
+        **DEADLINE_OPTIONS
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True
+    )
+    check_api_token(module)
+    watcher = OrderWatcher.attach(module)
+    deadline = Deadline.attach(module)
+    journal = OrderJournal.attach(module)
+
+    # Validate all VM specs at once, reporting every error
+    errors = VMSpecValidator().validate_many(module.params['vms'])
+    if errors:
+        module.fail_json(msg="Invalid VM specifications: " + "; ".join(errors), errors=errors)
+
+    try:
+        client = T1CloudVM(
+            api_token=module.params['api_token'],
+            project_id=module.params['project_id'],
+            base_url=module.params['base_url'],
+            compress_requests=module.params['compress_requests'],
+            pool_maxsize=max(1, module.params['parallelism']),
+            watcher=watcher,
+            journal=journal,
+            deadline=deadline
+        )
+
+        planner = VMPlanner(
+            client,
+            parallelism=module.params['parallelism'],
+            wait=module.params['wait'],
+            wait_timeout=module.params['wait_timeout'],
+            poll_interval=module.params['poll_interval']
+        )
+        if module.params['wait'] and not module.check_mode:
+            # Orders an interrupted earlier run left in flight complete before the current state is read
+            client.resume_in_flight(module.params['wait_timeout'], module.params['poll_interval'])
+
+        planner.fetch_state()
+        actions = planner.plan(module.params['vms'], prune=module.params['prune'])
+
+        result = {
+            'changed': bool(actions),
+            'plan': describe_plan(actions),
+            'summary': VMPlanner.summary(actions),
+            'drift': planner.drift,
+        }
+
+        drifted = sorted(planner.drift)
+        if drifted:
+            module.warn(
+                "Attributes of existing VMs differ from the desired state and cannot be updated in place: "
+                + ", ".join(drifted)
+            )
+
+        if module.check_mode:
+            module.exit_json(**result)
+
+        result['results'] = planner.apply(actions)
+        result['changed'] = any(r['status'] == 'ok' for r in result['results'])
+
+        failed = [r for r in result['results'] if r['status'] in ('failed', 'skipped')]
+        if failed:
+            module.fail_json(
+                msg=f"{len(failed)} of {len(actions)} planned actions failed or were skipped",
+                **result
+            )
+
+        module.exit_json(**result)
+
+    except Exception as e:
+        module.fail_json(msg=f"T1 Cloud API error: {str(e)}")
+
+
+if __name__ == '__main__':
+    main()
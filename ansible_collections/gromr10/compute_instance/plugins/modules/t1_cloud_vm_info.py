@@ -0,0 +1,211 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: t1_cloud_vm_info
+
+short_description: Gather information about T1 Cloud virtual machines of many projects
+
+version_added: "1.1.0"
+
+description:
+    - Lists the VM orders and compute instances of all given projects in one task.
+    - Listings of all projects are fetched concurrently over one shared connection pool and merged
+      into one record per VM, with the project ID attached.
+    - Suited for cross-project audits, where a looped task would run once per project.
+
+options:
+    project_ids:
+        description:
+            - IDs of the projects to query.
+            - Required unless I(project_id) is set.
+        required: false
+        type: list
+        elements: str
+    project_id:
+        description:
+            - ID of the project to query when I(project_ids) is not set.
+            - Lets the module take the project of the C(group/gromr10.compute_instance.t1_cloud) C(module_defaults).
+        required: false
+        type: str
+    base_url:
+        description:
+            - Base URL of the T1 Cloud API.
+        required: false
+        type: str
+        default: "https://api.t1.cloud"
+    parallelism:
+        description:
+            - Maximum number of listings fetched at the same time.
+        required: false
+        type: int
+        default: 10
+    gather_runtime_info:
+        description:
+            - Whether to list compute instances for the runtime information (power status, IP addresses, ...) of every VM.
+            - Without it only the orders listing of every project is queried.
+        required: false
+        type: bool
+        default: true
+    include_deprovisioned:
+        description:
+            - Whether to include orders of deleted VMs.
+        required: false
+        type: bool
+        default: false
+
+extends_documentation_fragment:
+    - gromr10.compute_instance.t1_cloud_auth
+    - gromr10.compute_instance.t1_cloud_index
+
+author:
+    - T1 Cloud Module Contributors
+
+requirements:
+    - python >= 3.6
+    - requests
+
+notes:
+    - The API token, given or obtained from the service account credentials, must have access to all projects.
+    - Projects that cannot be listed are reported in I(projects) and as warnings; the module fails only
+      when no project could be listed.
+'''
+
+EXAMPLES = r'''
+- name: Audit VMs of all projects
+  gromr10.compute_instance.t1_cloud_vm_info:
+    api_token: "{{ t1_api_token }}"
+    project_ids: "{{ t1_project_ids }}"
+    parallelism: 20
+  register: audit
+
+- name: Display running VMs per project
+  debug:
+    msg: "{{ audit.vms | selectattr('power_status', 'equalto', 'on') | groupby('project_id') }}"
+'''
+
+RETURN = r'''
+vms:
+    description: VMs of all projects, in project order.
+    type: list
+    elements: dict
+    returned: always
+    sample: [
+        {"project_id": "proj-gxvcuy3t6kg5vrf", "name": "web-01", "order_id": "15b92322-144f-4eec-9746-0d830f61647d",
+         "order_status": "success", "labels": {"role": "web"}, "power_status": "on",
+         "runtime_info": {"instance_id": "14a0cc6f-c8da-4dc2-80f6-b370637d6f1c", "primary_ipv4": "10.0.1.15"}}
+    ]
+projects:
+    description:
+        - Number of VMs per project, and the error for projects that could not be listed.
+        - With I(index_path), how the mirror of the project was synced as C(index_sync), with C(mode) (C(full) or
+          C(incremental)), number of C(orders) and C(instances) fetched and C(pages) of orders read.
+    type: dict
+    returned: always
+    sample: {"proj-gxvcuy3t6kg5vrf": {"vms": 12, "index_sync": {"mode": "incremental", "orders": 2, "instances": 2, "pages": 1}},
+             "proj-abc": {"vms": 0, "error": "Failed to list orders: ..."}}
+changed:
+    description: Always false, the module only reads.
+    type: bool
+    returned: always
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+    AUTH_OPTIONS,
+    HAS_REQUESTS,
+    check_api_token,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_index import (
+    INDEX_OPTIONS,
+    OrdersIndex,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_projects import MultiProjectClient
+
+
+def main():
+    """
+    Main module execution function.
+    """
+    if not HAS_REQUESTS:
+        raise ImportError("The 'requests' library is required for this module")
+
+    argument_spec = dict(
+        api_token=dict(type='str', no_log=True),
+        **AUTH_OPTIONS,
+        project_ids=dict(type='list', elements='str'),
+        project_id=dict(type='str'),
+        base_url=dict(type='str', default='https://api.t1.cloud'),
+        parallelism=dict(type='int', default=10),
+        gather_runtime_info=dict(type='bool', default=True),
+        include_deprovisioned=dict(type='bool', default=False),
+        **INDEX_OPTIONS
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True
+    )
+    check_api_token(module)
+
+    project_ids = module.params['project_ids'] or ([module.params['project_id']] if module.params['project_id'] else [])
+    if not project_ids:
+        module.fail_json(msg="project_ids or project_id is required")
+
+    index = OrdersIndex.from_params(module.params)
+    try:
+        client = MultiProjectClient(
+            api_token=module.params['api_token'],
+            project_ids=project_ids,
+            base_url=module.params['base_url'],
+            parallelism=module.params['parallelism'],
+            index=index
+        )
+        vms, errors = client.collect(
+            include_instances=module.params['gather_runtime_info'],
+            include_deprovisioned=module.params['include_deprovisioned']
+        )
+    except Exception as e:
+        module.fail_json(msg=f"T1 Cloud API error: {str(e)}")
+
+    projects = {project_id: {'vms': 0} for project_id in client.project_ids}
+    for vm in vms:
+        projects[vm['project_id']]['vms'] += 1
+    for project_id, error in errors.items():
+        projects[project_id]['error'] = error
+
+    if index is not None:
+        for project_id in projects:
+            stats = index.stats.get(OrdersIndex.scope(module.params['base_url'], project_id))
+            if stats:
+                projects[project_id]['index_sync'] = stats
+
+    result = {'changed': False, 'vms': vms, 'projects': projects}
+
+    if len(errors) == len(projects):
+        module.fail_json(msg=f"Failed to list all {len(projects)} projects: {next(iter(errors.values()))}", **result)
+
+    for project_id, error in errors.items():
+        module.warn(f"Project {project_id}: {error}")
+
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
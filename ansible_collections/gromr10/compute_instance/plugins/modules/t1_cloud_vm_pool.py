@@ -0,0 +1,345 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: t1_cloud_vm_pool
+
+short_description: Provision a pool of identical T1 Cloud virtual machines
+
+version_added: "1.1.0"
+
+description:
+    - Ensures that a project has the VMs C(<name_prefix>-1) ... C(<name_prefix>-<count>), all with the same configuration.
+    - Missing VMs are ordered with a single multi-count order when the whole pool is missing and the
+      order-service accepts orders with a count greater than 1; the created orders are mapped back to the pool names.
+    - Otherwise, or when the order-service rejects multi-count orders, missing VMs are ordered with parallel single orders.
+    - All orders are awaited with one shared poller.
+    - All VMs of the pool are created with the VM options of M(gromr10.compute_instance.t1_cloud_vm) below
+      (C(image_id), C(flavor_id), C(subnet_id), C(disk_size), C(user_data), C(labels), ...), with the same defaults.
+
+options:
+    project_id:
+        description:
+            - The ID of the project where the pool is created.
+        required: true
+        type: str
+    base_url:
+        description:
+            - Base URL of the T1 Cloud API.
+        required: false
+        type: str
+        default: "https://api.t1.cloud"
+    name_prefix:
+        description:
+            - Prefix of the pool VM names, VMs are named C(<name_prefix>-<index>) with index starting at 1.
+        required: true
+        type: str
+    count:
+        description:
+            - Number of VMs in the pool.
+        required: true
+        type: int
+    multi_count:
+        description:
+            - Whether to order a missing pool with one multi-count order.
+            - Falls back to single orders when the order-service rejects a count greater than 1 (HTTP 422, or
+              HTTP 400 saying the count is not supported); other errors fail the VMs of the order.
+        required: false
+        type: bool
+        default: true
+    parallelism:
+        description:
+            - Maximum number of single orders placed at the same time.
+        required: false
+        type: int
+        default: 5
+    wait:
+        description:
+            - Whether to wait for all orders to complete.
+        required: false
+        type: bool
+        default: true
+    wait_timeout:
+        description:
+            - Maximum time to wait for all orders in seconds.
+        required: false
+        type: int
+        default: 600
+    poll_interval:
+        description:
+            - Delay in seconds between poll rounds of the shared poller.
+        required: false
+        type: float
+        default: 10
+    compress_requests:
+        description:
+            - Whether to gzip-compress large request bodies.
+        required: false
+        type: bool
+        default: false
+
+extends_documentation_fragment:
+    - gromr10.compute_instance.t1_cloud_auth
+    - gromr10.compute_instance.t1_cloud_vm_spec
+    - gromr10.compute_instance.t1_cloud_watch
+    - gromr10.compute_instance.t1_cloud_journal
+    - gromr10.compute_instance.t1_cloud_deadline
+
+author:
+    - T1 Cloud Module Contributors
+
+requirements:
+    - python >= 3.6
+    - requests
+
+notes:
+    - Existing pool VMs are not compared with the requested configuration, and VMs beyond I(count) are left untouched.
+'''
+
+EXAMPLES = r'''
+# 50 identical workers: worker-1 ... worker-50
+- name: Provision worker pool
+  gromr10.compute_instance.t1_cloud_vm_pool:
+    api_token: "{{ t1_api_token }}"
+    project_id: "proj-gxvcuy3t6kg5vrf"
+    name_prefix: "worker"
+    count: 50
+    image_id: "d0179cb4-bfad-4b8f-836f-9cfc02143560"
+    flavor_id: "3b259b39-6e73-41d5-b98e-b93c0bf31e95"
+    subnet_id: "d0a5e4c0-1323-483d-8f5a-0e797a0fdd85"
+    labels:
+      role: "worker"
+  register: pool
+
+- name: Display created workers
+  debug:
+    msg: "{{ pool.vms | selectattr('changed') | map(attribute='name') | list }}"
+'''
+
+RETURN = r'''
+vms:
+    description:
+        - Pool VMs in index order.
+        - A VM of a multi-count order that the order-service named otherwise than requested is C(failed),
+          with the name it got in C(returned_name).
+    type: list
+    elements: dict
+    returned: always
+    sample: [
+        {"name": "worker-1", "changed": false, "status": "exists", "order_id": "15b92322-144f-4eec-9746-0d830f61647d"},
+        {"name": "worker-2", "changed": true, "status": "success", "order_id": "2b6fd7e1-1a0c-4d6c-9b7e-6f3a8c1d2e4f",
+         "multi_count": false}
+    ]
+summary:
+    description: Number of pool VMs per outcome and of orders placed.
+    type: dict
+    returned: always
+    sample: {"requested": 50, "existing": 0, "created": 50, "failed": 0, "multi_count_orders": 1, "single_orders": 0}
+order_events:
+    description:
+        - Order status transitions observed while waiting, with the previous status, an ISO 8601 timestamp
+          and the time in seconds since the epoch.
+        - Displayed by the C(gromr10.compute_instance.t1_cloud_order_events) callback plugin.
+    type: list
+    elements: dict
+    returned: when the module waited for orders
+    sample: [
+        {"order_id": "15b92322-144f-4eec-9746-0d830f61647d", "status": "pending", "previous": null,
+         "timestamp": "2025-01-15T10:30:00.120+00:00", "time": 1736937000.12},
+        {"order_id": "15b92322-144f-4eec-9746-0d830f61647d", "status": "running", "previous": "pending",
+         "timestamp": "2025-01-15T10:30:20.310+00:00", "time": 1736937020.31}
+    ]
+order_phases:
+    description: Seconds spent in each order status by order ID, derived from I(order_events), and the observed C(total).
+    type: dict
+    returned: when the module waited for orders
+    sample: {"15b92322-144f-4eec-9746-0d830f61647d": {"pending": 20.19, "running": 95.4, "total": 115.59}}
+resumed_orders:
+    description: IDs of orders submitted by an interrupted earlier run that were waited on instead of submitted again.
+    type: list
+    elements: str
+    returned: when I(journal_path) is set and orders were resumed
+    sample: ["15b92322-144f-4eec-9746-0d830f61647d"]
+time_breakdown:
+    description:
+        - Where the time of the run went when a I(deadline) is set, in seconds per category
+          (C(requests), C(polling), C(controller), C(other)), with the budget and the elapsed time.
+        - Concurrent requests are counted in full, so the categories may add up to more than the elapsed time.
+    type: dict
+    returned: on failure when I(deadline) is set
+    sample: {"budget": 300, "elapsed": 300.02, "requests": 41.7, "polling": 250.0, "controller": 1.2, "other": 7.12}
+changed:
+    description: Whether any VM was ordered (or would be, in check mode).
+    type: bool
+    returned: always
+'''
+
+from types import SimpleNamespace
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+    AUTH_OPTIONS,
+    DEPROVISIONED_STATUSES,
+    HAS_REQUESTS,
+    VM_SPEC_OPTIONS,
+    T1CloudVM,
+    build_vm_config,
+    check_api_token,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_deadline import (
+    DEADLINE_OPTIONS,
+    Deadline,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_journal import (
+    JOURNAL_OPTIONS,
+    OrderJournal,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_pool import (
+    PoolProvisioner,
+    pool_names,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_validation import VMSpecValidator
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_watch import (
+    WATCH_OPTIONS,
+    OrderWatcher,
+)
+
+
+def main():
+    """
+    Main module execution function.
+    """
+    if not HAS_REQUESTS:
+        raise ImportError("The 'requests' library is required for this module")
+
+    vm_options = {key: value for key, value in VM_SPEC_OPTIONS.items() if key != 'name'}
+
+    argument_spec = dict(
+        api_token=dict(type='str', no_log=True),
+        **AUTH_OPTIONS,
+        project_id=dict(type='str', required=True),
+        base_url=dict(type='str', default='https://api.t1.cloud'),
+        name_prefix=dict(type='str', required=True),
+        count=dict(type='int', required=True),
+        **vm_options,
+        multi_count=dict(type='bool', default=True),
+        parallelism=dict(type='int', default=5),
+        wait=dict(type='bool', default=True),
+        wait_timeout=dict(type='int', default=600),
+        poll_interval=dict(type='float', default=10),
+        compress_requests=dict(type='bool', default=False),
+        **WATCH_OPTIONS,
+        **JOURNAL_OPTIONS,
+        **DEADLINE_OPTIONS
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=[['image_id', 'image_name']],
+        supports_check_mode=True
+    )
+    check_api_token(module)
+    watcher = OrderWatcher.attach(module)
+    deadline = Deadline.attach(module)
+    journal = OrderJournal.attach(module)
+
+    if module.params['count'] < 1:
+        module.fail_json(msg="count must be at least 1")
+
+    names = pool_names(module.params['name_prefix'], module.params['count'])
+    specs = [dict(module.params, name=name) for name in names]
+
+    errors = VMSpecValidator().validate_many(specs)
+    if errors:
+        module.fail_json(msg="Invalid pool specification: " + "; ".join(errors[:5]), errors=errors)
+
+    try:
+        client = T1CloudVM(
+            api_token=module.params['api_token'],
+            project_id=module.params['project_id'],
+            base_url=module.params['base_url'],
+            compress_requests=module.params['compress_requests'],
+            pool_maxsize=max(1, module.params['parallelism']),
+            watcher=watcher,
+            journal=journal,
+            deadline=deadline
+        )
+
+        if module.params['wait'] and not module.check_mode:
+            # Orders an interrupted earlier run left in flight complete before the current state is read
+            client.resume_in_flight(module.params['wait_timeout'], module.params['poll_interval'])
+
+        existing = {}
+        for order in client.list_vms():
+            if order.get('status') in DEPROVISIONED_STATUSES:
+                continue
+            existing.setdefault(order.get('attrs', {}).get('name'), order)
+
+        vms = {}
+        missing = []
+        for spec in specs:
+            order = existing.get(spec['name'])
+            if order:
+                vms[spec['name']] = {'name': spec['name'], 'changed': False, 'status': 'exists',
+                                     'order_id': order.get('id')}
+            else:
+                missing.append(spec)
+                vms[spec['name']] = {'name': spec['name'], 'changed': True, 'status': 'pending'}
+
+        provisioned = []
+        orders_placed = {'multi_count': 0, 'single': 0}
+        if missing and not module.check_mode:
+            provisioner = PoolProvisioner(
+                client,
+                multi_count=module.params['multi_count'],
+                parallelism=module.params['parallelism'],
+                wait=module.params['wait'],
+                wait_timeout=module.params['wait_timeout'],
+                poll_interval=module.params['poll_interval']
+            )
+            provisioned = provisioner.provision([build_vm_config(SimpleNamespace(params=spec)) for spec in missing])
+            orders_placed = provisioner.orders_placed
+            for vm in provisioned:
+                vms[vm['name']].update(vm)
+
+        failed = [vm for vm in vms.values() if vm['status'] == 'failed']
+        result = {
+            'changed': bool(missing),
+            'vms': [vms[name] for name in names],
+            'summary': {
+                'requested': len(names),
+                'existing': len(names) - len(missing),
+                'created': sum(1 for vm in provisioned if vm['status'] != 'failed'),
+                'failed': len(failed),
+                'multi_count_orders': orders_placed['multi_count'],
+                'single_orders': orders_placed['single'],
+            },
+        }
+
+        if failed:
+            module.fail_json(msg=f"Failed to provision {len(failed)} of {len(missing)} VMs", **result)
+
+        module.exit_json(**result)
+
+    except Exception as e:
+        module.fail_json(msg=f"T1 Cloud API error: {str(e)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: t1_cloud_vm_power
+
+short_description: Start or stop all T1 Cloud virtual machines matching a selector
+
+version_added: "1.1.0"
+
+description:
+    - Selects VMs of a project by labels and/or name pattern from a single compute instances listing.
+    - Issues C(start_compute_vm) or C(stop_compute_vm) actions concurrently for the VMs not yet
+      in the desired power state and waits for all of them with one shared poller.
+    - Suited for bulk operations such as stopping and starting hundreds of VMs for cost saving,
+      where a looped M(gromr10.compute_instance.t1_cloud_vm) task would look up and wait for every VM in turn.
+
+options:
+    project_id:
+        description:
+            - The ID of the project containing the VMs.
+        required: true
+        type: str
+    base_url:
+        description:
+            - Base URL of the T1 Cloud API.
+        required: false
+        type: str
+        default: "https://api.t1.cloud"
+    state:
+        description:
+            - Desired power state of the selected VMs.
+        required: true
+        type: str
+        choices: ['started', 'stopped']
+    labels:
+        description:
+            - Select VMs having all these labels with the same values.
+        required: false
+        type: dict
+    name_pattern:
+        description:
+            - Select VMs whose names match this shell-style pattern (for example C(web-*)).
+        required: false
+        type: str
+    parallelism:
+        description:
+            - Maximum number of power actions issued at the same time.
+        required: false
+        type: int
+        default: 10
+    wait:
+        description:
+            - Whether to wait for all actions to complete.
+        required: false
+        type: bool
+        default: true
+    wait_timeout:
+        description:
+            - Maximum time to wait for all actions in seconds.
+        required: false
+        type: int
+        default: 600
+    poll_interval:
+        description:
+            - Delay in seconds between poll rounds of the shared poller.
+        required: false
+        type: float
+        default: 10
+
+extends_documentation_fragment:
+    - gromr10.compute_instance.t1_cloud_auth
+    - gromr10.compute_instance.t1_cloud_watch
+    - gromr10.compute_instance.t1_cloud_journal
+    - gromr10.compute_instance.t1_cloud_deadline
+
+author:
+    - T1 Cloud Module Contributors
+
+requirements:
+    - python >= 3.6
+    - requests
+
+notes:
+    - At least one of I(labels) and I(name_pattern) is required. When both are set, VMs must match both.
+    - VMs in a transitional power state are left untouched.
+'''
+
+EXAMPLES = r'''
+# Nightly cost saving
+- name: Stop all development VMs
+  gromr10.compute_instance.t1_cloud_vm_power:
+    api_token: "{{ t1_api_token }}"
+    project_id: "proj-gxvcuy3t6kg5vrf"
+    labels:
+      environment: "development"
+    state: stopped
+    parallelism: 20
+
+- name: Start web VMs again
+  gromr10.compute_instance.t1_cloud_vm_power:
+    api_token: "{{ t1_api_token }}"
+    project_id: "proj-gxvcuy3t6kg5vrf"
+    name_pattern: "web-*"
+    state: started
+  register: power
+
+- name: Display VMs that were started
+  debug:
+    msg: "{{ power.vms | selectattr('changed') | map(attribute='name') | list }}"
+'''
+
+RETURN = r'''
+vms:
+    description: Selected VMs and the outcome of their power action.
+    type: list
+    elements: dict
+    returned: always
+    sample: [
+        {"name": "web-01", "order_id": "15b92322-144f-4eec-9746-0d830f61647d",
+         "item_id": "14a0cc6f-c8da-4dc2-80f6-b370637d6f1c", "power_state": "off",
+         "changed": true, "status": "success"},
+        {"name": "web-02", "order_id": "2b6fd7e1-1a0c-4d6c-9b7e-6f3a8c1d2e4f",
+         "item_id": "7c1e2f3a-4b5c-4d6e-8f9a-0b1c2d3e4f5a", "power_state": "on",
+         "changed": false, "status": "unchanged"}
+    ]
+summary:
+    description: Number of selected VMs per outcome.
+    type: dict
+    returned: always
+    sample: {"matched": 2, "changed": 1, "unchanged": 1, "failed": 0}
+order_events:
+    description:
+        - Order status transitions observed while waiting, with the previous status, an ISO 8601 timestamp
+          and the time in seconds since the epoch.
+        - Displayed by the C(gromr10.compute_instance.t1_cloud_order_events) callback plugin.
+    type: list
+    elements: dict
+    returned: when the module waited for orders
+    sample: [
+        {"order_id": "15b92322-144f-4eec-9746-0d830f61647d", "status": "pending", "previous": null,
+         "timestamp": "2025-01-15T10:30:00.120+00:00", "time": 1736937000.12},
+        {"order_id": "15b92322-144f-4eec-9746-0d830f61647d", "status": "running", "previous": "pending",
+         "timestamp": "2025-01-15T10:30:20.310+00:00", "time": 1736937020.31}
+    ]
+order_phases:
+    description: Seconds spent in each order status by order ID, derived from I(order_events), and the observed C(total).
+    type: dict
+    returned: when the module waited for orders
+    sample: {"15b92322-144f-4eec-9746-0d830f61647d": {"pending": 20.19, "running": 95.4, "total": 115.59}}
+resumed_orders:
+    description: IDs of orders submitted by an interrupted earlier run that were waited on instead of submitted again.
+    type: list
+    elements: str
+    returned: when I(journal_path) is set and orders were resumed
+    sample: ["15b92322-144f-4eec-9746-0d830f61647d"]
+time_breakdown:
+    description:
+        - Where the time of the run went when a I(deadline) is set, in seconds per category
+          (C(requests), C(polling), C(controller), C(other)), with the budget and the elapsed time.
+        - Concurrent requests are counted in full, so the categories may add up to more than the elapsed time.
+    type: dict
+    returned: on failure when I(deadline) is set
+    sample: {"budget": 300, "elapsed": 300.02, "requests": 41.7, "polling": 250.0, "controller": 1.2, "other": 7.12}
+changed:
+    description: Whether any VM power state was changed (or would be, in check mode).
+    type: bool
+    returned: always
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+    AUTH_OPTIONS,
+    HAS_REQUESTS,
+    T1CloudVM,
+    check_api_token,
+    select_instances,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_deadline import (
+    DEADLINE_OPTIONS,
+    Deadline,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_journal import (
+    JOURNAL_OPTIONS,
+    OrderJournal,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_watch import (
+    WATCH_OPTIONS,
+    OrderWatcher,
+)
+
+POWER_ACTIONS = {
+    'started': ('start_compute_vm', 'off', 'on'),
+    'stopped': ('stop_compute_vm', 'on', 'off'),
+}
+
+
+def main():
+    """
+    Main module execution function.
+    """
+    if not HAS_REQUESTS:
+        raise ImportError("The 'requests' library is required for this module")
+
+    argument_spec = dict(
+        api_token=dict(type='str', no_log=True),
+        **AUTH_OPTIONS,
+        project_id=dict(type='str', required=True),
+        base_url=dict(type='str', default='https://api.t1.cloud'),
+        state=dict(type='str', required=True, choices=['started', 'stopped']),
+        labels=dict(type='dict'),
+        name_pattern=dict(type='str'),
+        parallelism=dict(type='int', default=10),
+        wait=dict(type='bool', default=True),
+        wait_timeout=dict(type='int', default=600),
+        poll_interval=dict(type='float', default=10),
+        **WATCH_OPTIONS,
+        **JOURNAL_OPTIONS,
+        **DEADLINE_OPTIONS
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_one_of=[['labels', 'name_pattern']],
+        supports_check_mode=True
+    )
+    check_api_token(module)
+    watcher = OrderWatcher.attach(module)
+    deadline = Deadline.attach(module)
+    journal = OrderJournal.attach(module)
+
+    parallelism = max(1, module.params['parallelism'])
+    action_name, from_state, to_state = POWER_ACTIONS[module.params['state']]
+
+    try:
+        client = T1CloudVM(
+            api_token=module.params['api_token'],
+            project_id=module.params['project_id'],
+            base_url=module.params['base_url'],
+            pool_maxsize=parallelism,
+            watcher=watcher,
+            journal=journal,
+            deadline=deadline
+        )
+
+        if module.params['wait'] and not module.check_mode:
+            # Orders an interrupted earlier run left in flight complete before the current state is read
+            client.resume_in_flight(module.params['wait_timeout'], module.params['poll_interval'])
+
+        vms = []
+        for instance in select_instances(client.list_vm_instances(), module.params['labels'],
+                                         module.params['name_pattern']):
+            power_state = instance.get('data', {}).get('state', 'unknown')
+            vms.append({
+                'name': instance.get('data', {}).get('config', {}).get('name'),
+                'order_id': instance.get('order_id'),
+                'item_id': instance.get('item_id'),
+                'power_state': power_state,
+                'changed': power_state == from_state,
+                'status': 'pending' if power_state == from_state else 'unchanged',
+            })
+        to_change = [vm for vm in vms if vm['changed']]
+
+        if not module.check_mode and to_change:
+            def power_action(vm):
+                try:
+                    result = client.execute_vm_action(vm['order_id'], vm['item_id'], action_name)
+                    vm['order_id'] = result.get('id', vm['order_id'])
+                    vm['status'] = 'submitted'
+                except Exception as e:
+                    vm.update(changed=False, status='failed', msg=str(e))
+
+            with ThreadPoolExecutor(max_workers=parallelism) as pool:
+                list(pool.map(power_action, to_change))
+
+            submitted = [vm for vm in to_change if vm['status'] == 'submitted']
+            if module.params['wait'] and submitted:
+                orders = client.wait_for_operations(
+                    [vm['order_id'] for vm in submitted],
+                    module.params['wait_timeout'],
+                    module.params['poll_interval']
+                )
+                for vm in submitted:
+                    order = orders.get(vm['order_id'])
+                    if order is None:
+                        vm.update(status='failed', msg=f"Action did not complete within {module.params['wait_timeout']} seconds")
+                    elif order.get('status') == 'success':
+                        vm.update(status='success', power_state=to_state)
+                    else:
+                        vm.update(status='failed', msg=f"Action finished with order status '{order.get('status')}'")
+
+        failed = [vm for vm in vms if vm['status'] == 'failed']
+        result = {
+            'changed': any(vm['changed'] for vm in vms),
+            'vms': vms,
+            'summary': {
+                'matched': len(vms),
+                'changed': sum(1 for vm in vms if vm['changed']),
+                'unchanged': sum(1 for vm in vms if vm['status'] == 'unchanged'),
+                'failed': len(failed),
+            },
+        }
+
+        if failed:
+            module.fail_json(msg=f"Power action failed for {len(failed)} of {len(to_change)} VMs", **result)
+
+        module.exit_json(**result)
+
+    except Exception as e:
+        module.fail_json(msg=f"T1 Cloud API error: {str(e)}")
+
+
+if __name__ == '__main__':
+    main()
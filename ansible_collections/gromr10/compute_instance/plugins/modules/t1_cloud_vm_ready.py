@@ -0,0 +1,324 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: t1_cloud_vm_ready
+
+short_description: Wait until many T1 Cloud virtual machines accept connections
+
+version_added: "1.1.0"
+
+description:
+    - Waits after provisioning until the SSH port (or another TCP port) of many VMs accepts connections.
+    - The addresses of all selected VMs are taken from a single compute instances listing and probed
+      at once with non-blocking sockets from one task, each VM being done as soon as it is reachable.
+    - Replaces a looped C(wait_for) task, which probes one VM after another per fork.
+
+options:
+    project_id:
+        description:
+            - The ID of the project containing the VMs.
+            - Required unless I(addresses) is set.
+        required: false
+        type: str
+    base_url:
+        description:
+            - Base URL of the T1 Cloud API.
+        required: false
+        type: str
+        default: "https://api.t1.cloud"
+    names:
+        description:
+            - Names of the VMs to wait for.
+        required: false
+        type: list
+        elements: str
+    labels:
+        description:
+            - Wait for VMs having all these labels with the same values.
+        required: false
+        type: dict
+    name_pattern:
+        description:
+            - Wait for VMs whose names match this shell-style pattern (for example C(web-*)).
+        required: false
+        type: str
+    addresses:
+        description:
+            - Hosts to probe by VM name, without listing the VMs through the API.
+            - For example the I(runtime_info.primary_ipv4) of registered M(gromr10.compute_instance.t1_cloud_vm) results.
+        required: false
+        type: dict
+    address:
+        description:
+            - Address of the VM to probe.
+            - C(floating) is the first floating (public) IP address of the VM.
+        required: false
+        type: str
+        choices: ['primary_ipv4', 'primary_ipv6', 'floating']
+        default: primary_ipv4
+    port:
+        description:
+            - TCP port to probe.
+        required: false
+        type: int
+        default: 22
+    timeout:
+        description:
+            - Maximum time to wait for all VMs in seconds.
+        required: false
+        type: int
+        default: 300
+    connect_timeout:
+        description:
+            - Maximum time of one connection attempt in seconds.
+        required: false
+        type: float
+        default: 5
+    retry_interval:
+        description:
+            - Delay in seconds before probing a VM that is not reachable yet again.
+        required: false
+        type: float
+        default: 1
+    deadline:
+        description:
+            - End-to-end time budget of the module run in seconds, including the instances listing
+              and, for tasks going through an action plugin, the time spent on the controller.
+            - Caps I(timeout) to the remaining budget.
+            - Can also be set with the C(T1_CLOUD_DEADLINE) environment variable of the managed host.
+        required: false
+        type: float
+
+extends_documentation_fragment:
+    - gromr10.compute_instance.t1_cloud_auth
+    - gromr10.compute_instance.t1_cloud_deadline
+
+author:
+    - T1 Cloud Module Contributors
+
+requirements:
+    - python >= 3.6
+    - requests
+
+notes:
+    - One of I(names), I(labels), I(name_pattern) and I(addresses) is required. When several selectors are set,
+      VMs must match all of them.
+    - The probes are run from the host executing the module, usually the controller.
+    - A VM is ready once a TCP connection to I(port) succeeds; the connection is closed without sending any data.
+    - Selected VMs that are not running are reported as not ready without being probed.
+'''
+
+EXAMPLES = r'''
+- name: Create web VMs
+  gromr10.compute_instance.t1_cloud_vm_pool:
+    api_token: "{{ t1_api_token }}"
+    project_id: "proj-gxvcuy3t6kg5vrf"
+    name_prefix: "web"
+    count: 20
+    image_id: "2be0c61e-7772-46ed-8ecd-f2b8632f151a"
+    flavor_id: "3b259b39-6e73-41d5-b98e-b93c0bf31e95"
+
+- name: Wait for SSH on all web VMs
+  gromr10.compute_instance.t1_cloud_vm_ready:
+    api_token: "{{ t1_api_token }}"
+    project_id: "proj-gxvcuy3t6kg5vrf"
+    name_pattern: "web-*"
+    timeout: 600
+  register: ready
+
+- name: Display the slowest VM
+  debug:
+    msg: "{{ ready.vms | sort(attribute='time_to_ready') | last }}"
+
+- name: Wait for HTTP on addresses of registered results
+  gromr10.compute_instance.t1_cloud_vm_ready:
+    addresses: "{{ dict(created.results | map(attribute='vm.attrs.name') | zip(created.results | map(attribute='runtime_info.primary_ipv4'))) }}"
+    port: 80
+'''
+
+RETURN = r'''
+vms:
+    description: Selected VMs and their readiness.
+    type: list
+    elements: dict
+    returned: always
+    sample: [
+        {"name": "web-1", "address": "10.9.60.12", "port": 22, "ready": true, "time_to_ready": 41.207, "attempts": 9},
+        {"name": "web-2", "address": "10.9.60.13", "port": 22, "ready": false, "time_to_ready": null, "attempts": 60,
+         "msg": "[Errno 111] Connection refused"}
+    ]
+summary:
+    description: Number of selected VMs, of ready VMs and of VMs not ready.
+    type: dict
+    returned: always
+    sample: {"matched": 2, "ready": 1, "not_ready": 1}
+time_breakdown:
+    description:
+        - Where the time of the run went when a I(deadline) is set, in seconds per category
+          (C(requests), C(readiness), C(controller), C(other)), with the budget and the elapsed time.
+    type: dict
+    returned: on failure when I(deadline) is set
+    sample: {"budget": 300, "elapsed": 300.02, "requests": 0.4, "readiness": 298.3, "controller": 1.2, "other": 0.12}
+changed:
+    description: Always false, the module only probes.
+    type: bool
+    returned: always
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+    AUTH_OPTIONS,
+    HAS_REQUESTS,
+    T1CloudVM,
+    check_api_token,
+    runtime_info_from_instances,
+    select_instances,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_deadline import (
+    DEADLINE_OPTIONS,
+    Deadline,
+    tracked,
+)
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_readiness import wait_for_ports
+
+
+def vm_address(runtime_info, address):
+    """
+    Get the address of a VM to probe from its runtime information.
+
+    :param runtime_info: Runtime information of the VM
+    :type runtime_info: dict
+    :param address: 'primary_ipv4', 'primary_ipv6' or 'floating'
+    :type address: str
+    :return: Address, None if the VM has none
+    :rtype: str or None
+    """
+    if address != 'floating':
+        return runtime_info.get(address) or None
+    for ips in runtime_info.get('ip_addresses', {}).values():
+        for ip in ips:
+            if ip.get('type') == 'floating' and ip.get('addr'):
+                return ip['addr']
+    return None
+
+
+def main():
+    """
+    Main module execution function.
+    """
+    if not HAS_REQUESTS:
+        raise ImportError("The 'requests' library is required for this module")
+
+    argument_spec = dict(
+        api_token=dict(type='str', no_log=True),
+        **AUTH_OPTIONS,
+        project_id=dict(type='str'),
+        base_url=dict(type='str', default='https://api.t1.cloud'),
+        names=dict(type='list', elements='str'),
+        labels=dict(type='dict'),
+        name_pattern=dict(type='str'),
+        addresses=dict(type='dict'),
+        address=dict(type='str', default='primary_ipv4', choices=['primary_ipv4', 'primary_ipv6', 'floating']),
+        port=dict(type='int', default=22),
+        timeout=dict(type='int', default=300),
+        connect_timeout=dict(type='float', default=5),
+        retry_interval=dict(type='float', default=1),
+        **DEADLINE_OPTIONS
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_one_of=[['names', 'labels', 'name_pattern', 'addresses']],
+        supports_check_mode=True
+    )
+    params = module.params
+    deadline = Deadline.attach(module)
+
+    try:
+        vms = []
+        if params['addresses']:
+            for name, host in params['addresses'].items():
+                if params['names'] and name not in params['names']:
+                    continue
+                vms.append({'name': name, 'address': host or None, 'power_status': None})
+        else:
+            check_api_token(module)
+            if not params['project_id']:
+                module.fail_json(msg="project_id is required unless addresses is set")
+            client = T1CloudVM(
+                api_token=params['api_token'],
+                project_id=params['project_id'],
+                base_url=params['base_url'],
+                deadline=deadline
+            )
+            found = set()
+            selected = select_instances(client.list_vm_instances(), params['labels'], params['name_pattern'])
+            for runtime_info in runtime_info_from_instances(selected):
+                if params['names'] and runtime_info['name'] not in params['names']:
+                    continue
+                found.add(runtime_info['name'])
+                vms.append({'name': runtime_info['name'], 'address': vm_address(runtime_info, params['address']),
+                            'power_status': runtime_info['power_status']})
+            for name in params['names'] or []:
+                if name not in found:
+                    vms.append({'name': name, 'address': None, 'power_status': None, 'msg': "VM not found"})
+
+        targets = {}
+        for index, vm in enumerate(vms):
+            vm.update(port=params['port'], ready=False, time_to_ready=None, attempts=0)
+            power_status = vm.pop('power_status')
+            if 'msg' in vm:
+                continue
+            if power_status not in (None, 'on'):
+                vm['msg'] = f"VM is not running (power status '{power_status}')"
+            elif not vm['address']:
+                vm['msg'] = f"VM has no {params['address']} address"
+            else:
+                targets[index] = (vm['address'], params['port'])
+
+        timeout = params['timeout']
+        if deadline is not None and targets:
+            timeout = round(deadline.timeout(timeout, f"waiting for port {params['port']}"), 3)
+        with tracked(deadline, 'readiness'):
+            probes = wait_for_ports(targets, timeout, params['connect_timeout'], params['retry_interval'])
+        for index, probe in probes.items():
+            vms[index].update(ready=probe['ready'], time_to_ready=probe['time_to_ready'], attempts=probe['attempts'])
+            if not probe['ready']:
+                vms[index]['msg'] = probe['error']
+
+        not_ready = [vm for vm in vms if not vm['ready']]
+        result = {
+            'changed': False,
+            'vms': vms,
+            'summary': {'matched': len(vms), 'ready': len(vms) - len(not_ready), 'not_ready': len(not_ready)},
+        }
+
+        if not_ready:
+            module.fail_json(msg=f"{len(not_ready)} of {len(vms)} VMs not reachable on port {params['port']} "
+                                 f"within {timeout} seconds", **result)
+
+        module.exit_json(**result)
+
+    except Exception as e:
+        module.fail_json(msg=f"T1 Cloud API error: {str(e)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import time
+
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import AUTH_OPTIONS
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_auth import (
+    DEFAULT_AUTH_ENDPOINT,
+    get_auth_client,
+)
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_info_cache import (
+    RuntimeInfoCache,
+    default_info_cache_path,
+)
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_registry import REGISTRY
+
+display = Display()
+
+DEFAULT_BASE_URL = "https://api.t1.cloud"
+
+
+def resolve_api_token(module_args):
+    """
+    Replace service account credentials in module arguments with an access token.
+
+    Credentials (``client_id``/``client_secret`` or ``key_file``, usually set
+    once for the ``gromr10.compute_instance.t1_cloud`` action group through
+    ``module_defaults``) never reach the managed host. The token comes from
+    the shared authorization client of the endpoint, cached per
+    (client_id, scope) in memory and in the run-wide token cache directory,
+    so only the first task of a run requests one.
+
+    :param module_args: Task arguments, modified in place
+    :type module_args: dict
+    :return: The module arguments
+    :rtype: dict
+    :raises: Exception if the token cannot be obtained
+    """
+    credentials = {name: module_args.pop(name, None) for name in AUTH_OPTIONS}
+    if module_args.get('api_token'):
+        return module_args
+
+    if credentials['key_file'] and (credentials['client_id'] or credentials['client_secret']):
+        raise Exception("Use either 'key_file' or 'client_id'/'client_secret', not both")
+
+    scope = credentials['auth_scope'] or 'openid'
+    auth_client = get_auth_client(credentials['auth_endpoint'] or DEFAULT_AUTH_ENDPOINT)
+    if credentials['key_file']:
+        token_info = auth_client.get_token_from_file(credentials['key_file'], scope)
+    elif credentials['client_id'] and credentials['client_secret']:
+        token_info = auth_client.get_token_with_credentials(credentials['client_id'], credentials['client_secret'],
+                                                            scope)
+    else:
+        # Let the module report the missing api_token
+        return module_args
+
+    module_args['api_token'] = token_info['access_token']
+    return module_args
+
+
+def credentials_token_provider(module_args):
+    """
+    Build a token provider from the service account credentials of a task.
+
+    Controller-side clients use it to request a fresh token once when the
+    token resolved by ``resolve_api_token`` is rejected with HTTP 401.
+
+    :param module_args: Task arguments, not modified
+    :type module_args: dict
+    :return: Callable returning a fresh access token, None with an explicit
+        api_token or without credentials
+    :rtype: callable or None
+    """
+    if module_args.get('api_token'):
+        return None
+
+    scope = module_args.get('auth_scope') or 'openid'
+    auth_client = get_auth_client(module_args.get('auth_endpoint') or DEFAULT_AUTH_ENDPOINT)
+    if module_args.get('key_file'):
+        return auth_client.key_file_token_provider(module_args['key_file'], scope)
+    if module_args.get('client_id') and module_args.get('client_secret'):
+        return auth_client.token_provider(module_args['client_id'], module_args['client_secret'], scope)
+    return None
+
+
+class T1CloudActionBase(ActionBase):
+    """
+    Action plugin base for the modules of this collection.
+
+    Resolves the API token on the controller from service account
+    credentials (see ``resolve_api_token``) before running the module, keeps
+    a token provider for the controller-side clients of subclasses, and
+    drops controller-side caches of the project (VM orders snapshot and
+    runtime information) when the module changed or may have changed VMs.
+
+    Time spent here counts against the task's ``deadline`` and is passed
+    to the module as ``deadline_spent``.
+    """
+
+    _supports_check_mode = True
+    _supports_async = True
+
+    def run(self, tmp=None, task_vars=None):
+        """
+        Run the action plugin.
+
+        :param tmp: Deprecated temporary directory parameter
+        :param task_vars: Task variables
+        :type task_vars: dict or None
+        :return: Module result
+        :rtype: dict
+        """
+        self._start_time = time.monotonic()
+        if task_vars is None:
+            task_vars = dict()
+
+        result = super(T1CloudActionBase, self).run(tmp, task_vars)
+        del tmp
+
+        try:
+            self._token_provider = credentials_token_provider(self._task.args)
+            module_args = resolve_api_token(self._task.args.copy())
+        except Exception as e:
+            result.update(failed=True, msg=f"T1 Cloud authentication failed: {str(e)}")
+            return result
+
+        result.update(self._run_module(module_args, task_vars))
+        return result
+
+    def _run_module(self, module_args, task_vars):
+        """
+        Execute the module and keep controller-side caches consistent.
+
+        :param module_args: Module arguments with the resolved API token
+        :type module_args: dict
+        :param task_vars: Task variables
+        :type task_vars: dict
+        :return: Module result
+        :rtype: dict
+        """
+        result = self._execute(module_args, task_vars)
+        if result.get('changed') or result.get('failed') or self._task.async_val:
+            self._invalidate_project(module_args)
+        return result
+
+    def _execute(self, module_args, task_vars):
+        """
+        Execute the module, passing the controller-side time to its deadline.
+
+        :param module_args: Module arguments
+        :type module_args: dict
+        :param task_vars: Task variables
+        :type task_vars: dict
+        :return: Module result
+        :rtype: dict
+        """
+        if module_args.get('deadline') and 'deadline_spent' not in module_args:
+            module_args['deadline_spent'] = {'controller': round(time.monotonic() - self._start_time, 3)}
+
+        return self._execute_module(
+            module_name=self._task.action,
+            module_args=module_args,
+            task_vars=task_vars,
+            wrap_async=self._task.async_val
+        )
+
+    @staticmethod
+    def _invalidate_project(module_args):
+        """
+        Drop the controller-side caches of the project(s) a module wrote to.
+
+        :param module_args: Module arguments
+        :type module_args: dict
+        """
+        base_url = module_args.get('base_url') or DEFAULT_BASE_URL
+        project_ids = [module_args['project_id']] if module_args.get('project_id') else []
+        for project_id in project_ids:
+            if module_args.get('api_token'):
+                REGISTRY.invalidate(base_url, project_id, module_args['api_token'])
+            RuntimeInfoCache(default_info_cache_path()).invalidate(base_url, project_id)
@@ -0,0 +1,480 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+from ansible import constants as C
+from ansible.utils.display import Display
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_tracing import TRACER
+
+display = Display()
+
+DEFAULT_AUTH_ENDPOINT = "https://auth.t1.cloud/auth/realms/Portal/protocol/openid-connect/token"
+
+# Renew tokens in background once 75% of their lifetime has passed
+DEFAULT_REFRESH_AHEAD = 0.75
+
+
+class T1CloudAuth:
+    """
+    Class for obtaining access tokens from T1 Cloud authorization service.
+
+    Tokens are cached in memory and, when ``cache_dir`` is set, in files
+    shared by all processes using the same directory. Once a cached token
+    has lived for ``refresh_ahead`` of its lifetime it is renewed in a
+    background thread while the current token keeps being served.
+
+    Parsed service account key files are cached in memory next to the
+    tokens, keyed by path and validated by modification time and inode,
+    so repeated lookups with the same key file only ``stat`` it.
+
+    :param endpoint: T1 Cloud authorization endpoint URL
+    :type endpoint: str
+    :param refresh_ahead: Fraction of token lifetime after which it is renewed in background
+    :type refresh_ahead: float
+    :param cache_dir: Directory for the shared token cache, None to cache in memory only
+    :type cache_dir: str or None
+    """
+
+    def __init__(self, endpoint=DEFAULT_AUTH_ENDPOINT, refresh_ahead=DEFAULT_REFRESH_AHEAD, cache_dir=None):
+        """
+        Initialize T1CloudAuth instance.
+
+        :param endpoint: Authorization service endpoint URL
+        :type endpoint: str
+        :param refresh_ahead: Fraction of token lifetime after which it is renewed in background
+        :type refresh_ahead: float
+        :param cache_dir: Directory for the shared token cache, None to cache in memory only
+        :type cache_dir: str or None
+        """
+        self.endpoint = endpoint
+        self.refresh_ahead = refresh_ahead
+        self.cache_dir = cache_dir
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'Accept': 'application/json'
+        })
+        # Token cache to avoid unnecessary requests
+        self._token_cache = {}
+        self._lock = threading.Lock()
+        # Cache keys with a background refresh in flight
+        self._refreshing = set()
+        # Parsed key files: path -> ((st_mtime_ns, st_ino, st_dev), client_id, client_secret)
+        self._key_cache = {}
+        # Parsed token cache files: path -> ((st_mtime_ns, st_ino), token_info)
+        self._token_file_cache = {}
+
+    def _is_token_expired(self, token_info):
+        """
+        Check if cached token is expired.
+
+        :param token_info: Token information dictionary
+        :type token_info: dict
+        :return: True if token is expired, False otherwise
+        :rtype: bool
+        """
+        if not token_info or 'expires_at' not in token_info:
+            return True
+
+        # Add 5 minute buffer before actual expiration
+        buffer_time = 300  # 5 minutes
+        return datetime.now() >= (token_info['expires_at'] - timedelta(seconds=buffer_time))
+
+    def _is_refresh_due(self, token_info, refresh_ahead=None):
+        """
+        Check if cached token has passed the refresh-ahead point of its lifetime.
+
+        :param token_info: Token information dictionary
+        :type token_info: dict
+        :param refresh_ahead: Fraction of token lifetime, the refresh_ahead of the client if None
+        :type refresh_ahead: float or None
+        :return: True if token should be renewed in background, False otherwise
+        :rtype: bool
+        """
+        if refresh_ahead is None:
+            refresh_ahead = self.refresh_ahead
+        if not refresh_ahead or 'expires_at' not in token_info:
+            return False
+        lifetime = timedelta(seconds=token_info.get('expires_in', 3600))
+        obtained_at = token_info.get('obtained_at', token_info['expires_at'] - lifetime)
+        return datetime.now() >= obtained_at + lifetime * refresh_ahead
+
+    def _cache_file(self, cache_key):
+        digest = hashlib.sha256(f"{self.endpoint}|{cache_key}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"t1_cloud_token_{digest[:32]}.json")
+
+    def _load_cached_token(self, cache_key):
+        """
+        Get token from memory cache, falling back to the shared cache file.
+
+        :param cache_key: Token cache key
+        :type cache_key: str
+        :return: Token information or None
+        :rtype: dict or None
+        """
+        with self._lock:
+            token_info = self._token_cache.get(cache_key)
+        if self.cache_dir is None:
+            return token_info
+
+        path = self._cache_file(cache_key)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return token_info
+        version = (stat.st_mtime_ns, stat.st_ino)
+
+        # The file is parsed again only when another process replaced it
+        with self._lock:
+            cached = self._token_file_cache.get(path)
+        if cached is not None and cached[0] == version:
+            stored_info = cached[1]
+        else:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                stored_info = dict(
+                    stored,
+                    expires_at=datetime.fromtimestamp(stored['expires_at']),
+                    obtained_at=datetime.fromtimestamp(stored['obtained_at'])
+                )
+            except (OSError, ValueError, KeyError, TypeError):
+                return token_info
+            with self._lock:
+                self._token_file_cache[path] = (version, stored_info)
+
+        # Another process may have stored a newer token
+        if token_info is None or stored_info['expires_at'] > token_info['expires_at']:
+            token_info = stored_info
+            with self._lock:
+                self._token_cache[cache_key] = token_info
+        return token_info
+
+    def _store_token(self, cache_key, token_info):
+        """
+        Store token in memory cache and in the shared cache file.
+
+        :param cache_key: Token cache key
+        :type cache_key: str
+        :param token_info: Token information dictionary
+        :type token_info: dict
+        """
+        with self._lock:
+            self._token_cache[cache_key] = token_info
+        if self.cache_dir is None:
+            return
+
+        path = self._cache_file(cache_key)
+        stored = dict(
+            token_info,
+            expires_at=token_info['expires_at'].timestamp(),
+            obtained_at=token_info['obtained_at'].timestamp()
+        )
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.t1_cloud_token_')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(stored, f)
+            # Stat before the rename, which keeps inode and mtime, so a file
+            # replaced meanwhile by another process is not mistaken for ours
+            stat = os.stat(tmp_path)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self._token_file_cache[path] = ((stat.st_mtime_ns, stat.st_ino), token_info)
+        except OSError as e:
+            display.vvv(f"Could not write shared token cache {path}: {e}")
+
+    def _refresh_in_background(self, cache_key, client_id, client_secret, scope, grant_type):
+        """
+        Renew token in a background thread, at most one refresh per cache key at a time.
+        """
+        with self._lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        def refresh():
+            try:
+                self._request_token(cache_key, client_id, client_secret, scope, grant_type)
+            except Exception as e:
+                display.vvv(f"Background token refresh for client_id {client_id} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cache_key)
+
+        display.vvv(f"Refreshing token ahead of expiration for client_id: {client_id}")
+        threading.Thread(target=refresh, name='t1-cloud-token-refresh', daemon=True).start()
+
+    def get_token_with_credentials(self, client_id, client_secret, scope="openid", grant_type="client_credentials",
+                                   force_refresh=False, refresh_ahead=None):
+        """
+        Get access token using service account credentials.
+
+        :param client_id: Service account client ID
+        :type client_id: str
+        :param client_secret: Service account client secret
+        :type client_secret: str
+        :param scope: OAuth2 scope
+        :type scope: str
+        :param grant_type: OAuth2 grant type
+        :type grant_type: str
+        :param force_refresh: Ignore cached token and request a new one
+        :type force_refresh: bool
+        :param refresh_ahead: Fraction of token lifetime after which it is renewed in background,
+            the refresh_ahead of the client if None
+        :type refresh_ahead: float or None
+        :return: Access token information
+        :rtype: dict
+        :raises: Exception if token retrieval fails
+        """
+        with TRACER.span('T1CloudAuth.get_token_with_credentials',
+                         **{'t1.client_id': client_id, 't1.force_refresh': force_refresh}) as span:
+            # Check cache first
+            cache_key = f"{client_id}:{scope}:{grant_type}"
+            if not force_refresh:
+                cached_token = self._load_cached_token(cache_key)
+                if not self._is_token_expired(cached_token):
+                    display.vvv(f"Using cached token for client_id: {client_id}")
+                    span.set_attribute('t1.token.cached', True)
+                    if self._is_refresh_due(cached_token, refresh_ahead):
+                        span.set_attribute('t1.token.refresh_ahead', True)
+                        self._refresh_in_background(cache_key, client_id, client_secret, scope, grant_type)
+                    return cached_token
+
+            span.set_attribute('t1.token.cached', False)
+            return self._request_token(cache_key, client_id, client_secret, scope, grant_type)
+
+    def _request_token(self, cache_key, client_id, client_secret, scope, grant_type):
+        """
+        Request a new access token and store it in the cache.
+
+        :return: Access token information
+        :rtype: dict
+        :raises: Exception if token retrieval fails
+        """
+        try:
+            # Prepare request data
+            data = {
+                'client_id': client_id,
+                'client_secret': client_secret,
+                'grant_type': grant_type,
+                'scope': scope
+            }
+
+            display.vvv(f"Requesting token for client_id: {client_id}")
+
+            response = self.session.post(
+                self.endpoint,
+                data=urlencode(data),
+                timeout=30
+            )
+            response.raise_for_status()
+
+            result = response.json()
+
+            if 'access_token' not in result:
+                raise Exception("No access_token in response")
+
+            # Prepare token info
+            obtained_at = datetime.now()
+            token_info = {
+                'access_token': result['access_token'],
+                'token_type': result.get('token_type', 'Bearer'),
+                'expires_in': result.get('expires_in', 3600),
+                'scope': result.get('scope', scope),
+                'obtained_at': obtained_at,
+                'expires_at': obtained_at + timedelta(seconds=result.get('expires_in', 3600))
+            }
+
+            # Cache the token
+            self._store_token(cache_key, token_info)
+
+            display.vvv(f"Successfully obtained token, expires in {token_info['expires_in']} seconds")
+            return token_info
+
+        except requests.exceptions.HTTPError as e:
+            error_msg = f"HTTP error {e.response.status_code}"
+            try:
+                error_details = e.response.json()
+                if 'error_description' in error_details:
+                    error_msg += f": {error_details['error_description']}"
+                elif 'error' in error_details:
+                    error_msg += f": {error_details['error']}"
+            except:
+                error_msg += f": {e.response.text}"
+            raise Exception(error_msg)
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Failed to get access token: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error processing token request: {str(e)}")
+
+    def token_provider(self, client_id, client_secret, scope="openid", grant_type="client_credentials"):
+        """
+        Build a callable returning a freshly requested access token, suitable
+        for the ``token_provider`` of T1CloudVM (retry on HTTP 401).
+
+        :return: Callable without arguments returning an access token
+        :rtype: callable
+        """
+        def provider():
+            return self.get_token_with_credentials(
+                client_id, client_secret, scope, grant_type, force_refresh=True
+            )['access_token']
+        return provider
+
+    def key_file_token_provider(self, key_file_path, scope="openid", grant_type="client_credentials"):
+        """
+        Build a callable returning a freshly requested access token for the
+        service account of a key file (see ``token_provider``).
+
+        :param key_file_path: Path to service account key file
+        :type key_file_path: str
+        :return: Callable without arguments returning an access token
+        :rtype: callable
+        """
+        def provider():
+            client_id, client_secret = self._load_key_file(key_file_path)
+            return self.get_token_with_credentials(
+                client_id, client_secret, scope, grant_type, force_refresh=True
+            )['access_token']
+        return provider
+
+    def get_token_from_file(self, key_file_path, scope="openid", grant_type="client_credentials", refresh_ahead=None):
+        """
+        Get access token using service account key file.
+
+        :param key_file_path: Path to service account key file
+        :type key_file_path: str
+        :param scope: OAuth2 scope
+        :type scope: str
+        :param grant_type: OAuth2 grant type
+        :type grant_type: str
+        :param refresh_ahead: Fraction of token lifetime after which it is renewed in background,
+            the refresh_ahead of the client if None
+        :type refresh_ahead: float or None
+        :return: Access token information
+        :rtype: dict
+        :raises: Exception if token retrieval fails
+        """
+        client_id, client_secret = self._load_key_file(key_file_path)
+        return self.get_token_with_credentials(client_id, client_secret, scope, grant_type, refresh_ahead=refresh_ahead)
+
+    def _load_key_file(self, key_file_path):
+        """
+        Get credentials of a service account key file, parsing it only when it changed.
+
+        :param key_file_path: Path to service account key file
+        :type key_file_path: str
+        :return: Client ID and client secret
+        :rtype: tuple
+        :raises: Exception if the key file is missing or invalid
+        """
+        try:
+            stat = os.stat(key_file_path)
+        except FileNotFoundError:
+            raise Exception(f"Service account key file not found: {key_file_path}")
+        except OSError as e:
+            raise Exception(f"Error reading service account key file: {str(e)}")
+        version = (stat.st_mtime_ns, stat.st_ino, stat.st_dev)
+
+        with self._lock:
+            cached = self._key_cache.get(key_file_path)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+
+        try:
+            # Read service account key file
+            with open(key_file_path, 'r', encoding='utf-8') as f:
+                key_data = json.load(f)
+
+            # Extract required fields
+            client_id = key_data.get('client_id')
+            client_secret = key_data.get('client_secret')
+
+            if not client_id or not client_secret:
+                raise Exception("Service account key file must contain 'client_id' and 'client_secret' fields")
+
+            # Validate client_id format, once per key file version
+            if not client_id.startswith('sa_proj-'):
+                display.warning(f"Client ID format may be incorrect: {client_id}. Expected format: sa_proj-<uuid>")
+
+        except FileNotFoundError:
+            raise Exception(f"Service account key file not found: {key_file_path}")
+        except json.JSONDecodeError:
+            raise Exception(f"Invalid JSON in service account key file: {key_file_path}")
+        except Exception as e:
+            if "Service account key file" in str(e) or "client_id" in str(e):
+                raise
+            raise Exception(f"Error reading service account key file: {str(e)}")
+
+        with self._lock:
+            self._key_cache[key_file_path] = (version, client_id, client_secret)
+        return client_id, client_secret
+
+
+# Shared T1CloudAuth instances, one per endpoint, so lookups and action plugins
+# running in the same controller process reuse one session and token cache
+_AUTH_CLIENTS = {}
+_AUTH_CLIENTS_LOCK = threading.Lock()
+
+
+def default_token_cache_dir():
+    """
+    Get directory of the shared token cache.
+
+    Ansible creates its local temporary directory once per run in the main
+    process and removes it on exit. Worker processes running tasks inherit
+    it, so tokens cached there are shared by all tasks of a run and never
+    outlive it.
+
+    :return: Token cache directory
+    :rtype: str
+    """
+    return os.path.join(C.DEFAULT_LOCAL_TMP, 't1_cloud')
+
+
+def get_auth_client(endpoint=DEFAULT_AUTH_ENDPOINT):
+    """
+    Get shared T1CloudAuth instance for authorization endpoint.
+
+    The instance is shared by all callers, which pass settings such as
+    ``refresh_ahead`` with each token request instead of changing it.
+
+    :param endpoint: Authorization service endpoint URL
+    :type endpoint: str
+    :return: Shared T1CloudAuth instance
+    :rtype: T1CloudAuth
+    """
+    with _AUTH_CLIENTS_LOCK:
+        auth_client = _AUTH_CLIENTS.get(endpoint)
+        if auth_client is None:
+            auth_client = T1CloudAuth(endpoint=endpoint, cache_dir=default_token_cache_dir())
+            _AUTH_CLIENTS[endpoint] = auth_client
+        return auth_client
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from ansible.utils.display import Display
+from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_auth import default_token_cache_dir
+
+display = Display()
+
+DEFAULT_INFO_CACHE_TTL = 30
+DEFAULT_INFO_CACHE_SIZE = 1000
+
+
+class RuntimeInfoCache:
+    """
+    TTL and size-bounded cache of VM runtime information.
+
+    Stores the output of ``T1CloudVM.get_vm_runtime_info`` per
+    (base_url, project_id, VM name). When ``path`` is set, entries live in a
+    JSON file guarded by a file lock, so all worker processes of a run share
+    them; otherwise they are kept in memory. Reads take a shared lock and
+    never rewrite the file; expired entries are dropped, and the oldest
+    evicted, when an entry is stored.
+
+    :param path: Cache file path, None to cache in memory only
+    :type path: str or None
+    :param ttl: Seconds an entry stays valid
+    :type ttl: float
+    :param max_entries: Maximum number of entries, oldest are evicted first
+    :type max_entries: int
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_INFO_CACHE_TTL, max_entries=DEFAULT_INFO_CACHE_SIZE):
+        """
+        Initialize RuntimeInfoCache instance.
+
+        :param path: Cache file path, None to cache in memory only
+        :type path: str or None
+        :param ttl: Seconds an entry stays valid
+        :type ttl: float
+        :param max_entries: Maximum number of entries, oldest are evicted first
+        :type max_entries: int
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        # key -> {'stored_at': float, 'info': dict}, oldest first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(base_url, project_id, name):
+        return f"{base_url.rstrip('/')}|{project_id}|{name}"
+
+    @contextmanager
+    def _entries_locked(self, write=True):
+        """
+        Lock the cache and yield its entries, saving them afterwards if ``write``.
+
+        The file lock is exclusive to write and shared to read.
+        """
+        with self._lock:
+            if self.path is None:
+                yield self._entries
+                return
+
+            try:
+                os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+                lock_file = open(self.path + '.lock', 'a')
+            except OSError as e:
+                display.vvv(f"Runtime info cache {self.path} unavailable: {e}")
+                yield OrderedDict()
+                return
+
+            with lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if write else fcntl.LOCK_SH)
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        entries = json.load(f, object_pairs_hook=OrderedDict)
+                except (OSError, ValueError):
+                    entries = OrderedDict()
+
+                yield entries
+
+                if write:
+                    self._save(entries)
+
+    def _save(self, entries):
+        directory = os.path.dirname(self.path)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.t1_cloud_info_')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            display.vvv(f"Could not write runtime info cache {self.path}: {e}")
+
+    def _expired(self, entry, now):
+        return now - entry['stored_at'] > self.ttl
+
+    def get(self, base_url, project_id, name):
+        """
+        Get cached runtime information of a VM.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param name: VM name
+        :type name: str
+        :return: Runtime information or None if not cached or expired
+        :rtype: dict or None
+        """
+        key = self._key(base_url, project_id, name)
+        with self._entries_locked(write=False) as entries:
+            entry = entries.get(key)
+            if entry is None or self._expired(entry, time.time()):
+                return None
+            return entry['info']
+
+    def put(self, base_url, project_id, name, info):
+        """
+        Store runtime information of a VM, evicting expired and oldest entries.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param name: VM name
+        :type name: str
+        :param info: Runtime information
+        :type info: dict
+        """
+        key = self._key(base_url, project_id, name)
+        now = time.time()
+        with self._entries_locked() as entries:
+            entries[key] = {'stored_at': now, 'info': info}
+            entries.move_to_end(key)
+            for stale in [k for k, entry in entries.items() if self._expired(entry, now)]:
+                del entries[stale]
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def invalidate(self, base_url, project_id, name=None):
+        """
+        Drop cached runtime information after a write operation.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param name: VM name, None to drop all VMs of the project
+        :type name: str or None
+        """
+        if name is not None:
+            prefix = self._key(base_url, project_id, name)
+        else:
+            prefix = self._key(base_url, project_id, '')
+        with self._entries_locked() as entries:
+            for key in [k for k in entries if (k == prefix if name is not None else k.startswith(prefix))]:
+                del entries[key]
+
+
+def default_info_cache_path():
+    """
+    Get path of the runtime info cache shared by all tasks of a run.
+
+    :return: Cache file path
+    :rtype: str
+    """
+    return os.path.join(default_token_cache_dir(), 'runtime_info.json')
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+import time
+
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import T1CloudVM
+
+
+class ClientRegistry:
+    """
+    Controller-side registry of authenticated T1 Cloud clients.
+
+    Keeps one T1CloudVM client (and HTTP session) per
+    (base_url, project_id, api_token) together with a short-lived snapshot
+    of the project's VM orders, so tasks running in the same controller
+    process (for example all items of a looped task) share connections and
+    resolve VM names from a single orders listing.
+
+    :param listing_ttl: Seconds an orders snapshot stays valid
+    :type listing_ttl: float
+    """
+
+    def __init__(self, listing_ttl=30):
+        """
+        Initialize ClientRegistry instance.
+
+        :param listing_ttl: Seconds an orders snapshot stays valid
+        :type listing_ttl: float
+        """
+        self.listing_ttl = listing_ttl
+        self._clients = {}
+        # key -> (fetched_at, {vm_name: order})
+        self._listings = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(base_url, project_id, api_token):
+        return (base_url.rstrip('/'), project_id, api_token)
+
+    def get_client(self, base_url, project_id, api_token, token_provider=None):
+        """
+        Get client for base URL, project and token, creating it on first use.
+
+        A token provider given later is attached to a client created without one.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param api_token: T1 Cloud API token
+        :type api_token: str
+        :param token_provider: Callable returning a fresh API token on HTTP 401
+        :type token_provider: callable or None
+        :return: Shared client
+        :rtype: T1CloudVM
+        """
+        key = self._key(base_url, project_id, api_token)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = T1CloudVM(api_token=api_token, project_id=project_id, base_url=base_url,
+                                   token_provider=token_provider)
+                self._clients[key] = client
+            elif client.token_provider is None:
+                client.token_provider = token_provider
+            return client
+
+    def resolve_vm(self, base_url, project_id, api_token, name, token_provider=None):
+        """
+        Resolve VM order by name from the cached orders snapshot.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param api_token: T1 Cloud API token
+        :type api_token: str
+        :param name: VM name
+        :type name: str
+        :param token_provider: Callable returning a fresh API token on HTTP 401
+        :type token_provider: callable or None
+        :return: VM order or None if not found
+        :rtype: dict or None
+        """
+        key = self._key(base_url, project_id, api_token)
+        with self._lock:
+            cached = self._listings.get(key)
+        if cached is None or time.monotonic() - cached[0] > self.listing_ttl:
+            client = self.get_client(base_url, project_id, api_token, token_provider=token_provider)
+            orders = {}
+            for order in client.list_vms():
+                orders.setdefault(order.get('attrs', {}).get('name'), order)
+            cached = (time.monotonic(), orders)
+            with self._lock:
+                self._listings[key] = cached
+        return cached[1].get(name)
+
+    def update_vm(self, base_url, project_id, api_token, name, order):
+        """
+        Update the orders snapshot after a write operation on one VM.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param api_token: T1 Cloud API token
+        :type api_token: str
+        :param name: VM name
+        :type name: str
+        :param order: Current VM order, None if the VM was deleted
+        :type order: dict or None
+        """
+        with self._lock:
+            cached = self._listings.get(self._key(base_url, project_id, api_token))
+            if cached is None:
+                return
+            if order:
+                cached[1][name] = order
+            else:
+                cached[1].pop(name, None)
+
+    def invalidate(self, base_url, project_id, api_token):
+        """
+        Drop the orders snapshot after a write operation.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param api_token: T1 Cloud API token
+        :type api_token: str
+        """
+        with self._lock:
+            self._listings.pop(self._key(base_url, project_id, api_token), None)
+
+
+# Process-wide registry shared by action plugins of this collection
+REGISTRY = ClientRegistry()
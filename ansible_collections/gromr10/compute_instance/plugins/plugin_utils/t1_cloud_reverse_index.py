@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fcntl
+import json
+import os
+import tempfile
+import time
+
+from ansible.utils.display import Display
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import runtime_info_from_instances
+
+display = Display()
+
+# Controller environment variable with the reverse index cache path, used when the lookup does not set one
+REVERSE_INDEX_ENV = 'T1_CLOUD_REVERSE_INDEX'
+
+DEFAULT_REVERSE_INDEX_TTL = 300
+
+REVERSE_INDEX_VERSION = 1
+
+# Fields instances can be found by
+INDEXED_FIELDS = ('ip', 'mac', 'label', 'flavor', 'availability_zone', 'name', 'instance_id', 'order_id')
+
+# Alternative names of indexed fields
+FIELD_ALIASES = {'az': 'availability_zone', 'zone': 'availability_zone', 'labels': 'label', 'id': 'instance_id'}
+
+
+def _normalize(field, value):
+    """Get the form of a value that is indexed and looked up"""
+    value = str(value).strip()
+    return value.lower() if field == 'mac' else value
+
+
+class InstanceReverseIndex:
+    """
+    Reverse indexes of the compute instances of a project.
+
+    Maps IP addresses, MAC addresses, labels (both ``key=value`` and
+    ``key``), flavor and availability zone (name and ID), VM name and IDs to
+    the instances having them, so each lookup is a dict access instead of a
+    scan of the instances listing. Instances are kept as the runtime
+    information records of ``runtime_info_from_instances`` with the
+    instance ``labels`` and ``project_id`` added.
+
+    :param records: Runtime information records with 'labels'
+    :type records: list
+    """
+
+    def __init__(self, records=(), built_at=None):
+        """
+        Initialize InstanceReverseIndex instance.
+
+        :param records: Runtime information records with 'labels'
+        :type records: list
+        :param built_at: Time the records were listed, now by default
+        :type built_at: float or None
+        """
+        self.built_at = time.time() if built_at is None else built_at
+        # instance_id -> record, in listing order
+        self.records = {}
+        # field -> value -> [instance_id]
+        self._maps = {field: {} for field in INDEXED_FIELDS}
+        for record in records:
+            self.add(record)
+
+    @classmethod
+    def from_instances(cls, instances, project_id=None):
+        """
+        Build the index of a compute instances listing.
+
+        :param instances: Compute instances from the compute instances API
+        :type instances: list
+        :param project_id: Project ID added to every record
+        :type project_id: str or None
+        :rtype: InstanceReverseIndex
+        """
+        records = runtime_info_from_instances(instances)
+        for instance, record in zip(instances, records):
+            record['labels'] = ((instance.get('data') or {}).get('config') or {}).get('labels') or {}
+            record['project_id'] = project_id
+        return cls(records)
+
+    def _keys(self, record):
+        """Yield the (field, value) pairs a record is found by"""
+        for ips in record.get('ip_addresses', {}).values():
+            for ip in ips:
+                if ip.get('addr'):
+                    yield 'ip', ip['addr']
+                if ip.get('mac_addr'):
+                    yield 'mac', ip['mac_addr']
+        for address in (record.get('primary_ipv4'), record.get('primary_ipv6')):
+            if address:
+                yield 'ip', address
+        for key, value in (record.get('labels') or {}).items():
+            yield 'label', key
+            yield 'label', f"{key}={value}"
+        for field in ('flavor', 'availability_zone'):
+            for attribute in ('name', 'id'):
+                if (record.get(field) or {}).get(attribute):
+                    yield field, record[field][attribute]
+        for field in ('name', 'instance_id', 'order_id'):
+            if record.get(field):
+                yield field, record[field]
+
+    def add(self, record):
+        """
+        Add or replace the record of an instance.
+
+        :param record: Runtime information record with 'labels'
+        :type record: dict
+        """
+        instance_id = record.get('instance_id')
+        if instance_id in self.records:
+            self.remove(instance_id)
+        self.records[instance_id] = record
+        for field, value in self._keys(record):
+            ids = self._maps[field].setdefault(_normalize(field, value), [])
+            if instance_id not in ids:
+                ids.append(instance_id)
+
+    def remove(self, instance_id):
+        """
+        Drop the record of an instance.
+
+        :param instance_id: Instance ID
+        :type instance_id: str
+        """
+        record = self.records.pop(instance_id, None)
+        if record is None:
+            return
+        for field, value in self._keys(record):
+            value = _normalize(field, value)
+            ids = self._maps[field].get(value)
+            if ids and instance_id in ids:
+                ids.remove(instance_id)
+                if not ids:
+                    del self._maps[field][value]
+
+    @staticmethod
+    def field(name):
+        """
+        Get the indexed field of a field name or alias.
+
+        :param name: Field name, for example 'ip' or 'az'
+        :type name: str
+        :rtype: str
+        :raises: ValueError if the field is not indexed
+        """
+        field = FIELD_ALIASES.get(name, name)
+        if field not in INDEXED_FIELDS:
+            raise ValueError(f"Unknown field '{name}', expected one of: {', '.join(INDEXED_FIELDS)}")
+        return field
+
+    def find(self, field, value):
+        """
+        Find the instances having a value of a field.
+
+        :param field: Field name or alias, see INDEXED_FIELDS
+        :type field: str
+        :param value: Value, ``key`` or ``key=value`` for labels
+        :type value: str
+        :return: Matching records in listing order
+        :rtype: list
+        :raises: ValueError if the field is not indexed
+        """
+        field = self.field(field)
+        return [self.records[instance_id] for instance_id in self._maps[field].get(_normalize(field, value), ())]
+
+    def find_all(self, queries):
+        """
+        Find the instances matching all of several (field, value) queries.
+
+        :param queries: (field, value) pairs, all instances if empty
+        :type queries: list
+        :return: Matching records in listing order
+        :rtype: list
+        :raises: ValueError if a field is not indexed
+        """
+        matches = None
+        for field, value in queries:
+            ids = {record['instance_id'] for record in self.find(field, value)}
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+        return [record for instance_id, record in self.records.items() if matches is None or instance_id in matches]
+
+    def __len__(self):
+        return len(self.records)
+
+    @staticmethod
+    def _scope(base_url, project_id):
+        return f"{base_url.rstrip('/')}|{project_id}"
+
+    @classmethod
+    def load(cls, path, base_url, project_id, max_age=DEFAULT_REVERSE_INDEX_TTL):
+        """
+        Load the index of a project saved by an earlier run.
+
+        :param path: Cache file path
+        :type path: str
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param max_age: Seconds a saved index stays valid
+        :type max_age: float
+        :return: Index, None if not saved, expired or unreadable
+        :rtype: InstanceReverseIndex or None
+        """
+        try:
+            with open(os.path.expanduser(path), 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if saved.get('version') != REVERSE_INDEX_VERSION:
+            return None
+        entry = (saved.get('projects') or {}).get(cls._scope(base_url, project_id))
+        if not entry or time.time() - entry.get('built_at', 0) > max_age:
+            return None
+        return cls(entry.get('records') or [], built_at=entry['built_at'])
+
+    def save(self, path, base_url, project_id):
+        """
+        Save the index of a project for later runs, next to those of other projects.
+
+        :param path: Cache file path
+        :type path: str
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        """
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(os.path.abspath(path))
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            with open(path + '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        saved = json.load(f)
+                    if saved.get('version') != REVERSE_INDEX_VERSION:
+                        saved = {}
+                except (OSError, ValueError):
+                    saved = {}
+
+                projects = saved.get('projects') or {}
+                projects[self._scope(base_url, project_id)] = {
+                    'built_at': self.built_at,
+                    'records': list(self.records.values()),
+                }
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.t1_cloud_reverse_index_')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'version': REVERSE_INDEX_VERSION, 'projects': projects}, f)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            display.warning(f"Could not write T1 Cloud reverse index {path}: {e}")
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from ansible.utils.display import Display
+from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+    DEPROVISIONED_STATUSES,
+    T1CloudAPIError,
+)
+
+display = Display()
+
+# Controller environment variable with the state store path, used when the task does not set one
+STATE_STORE_ENV = 'T1_CLOUD_STATE_STORE'
+
+
+def order_item_id(order):
+    """
+    Get the compute instance item ID from the preview items of a VM order.
+
+    :param order: VM order
+    :type order: dict
+    :return: Item ID or None if the order has no instance yet
+    :rtype: str or None
+    """
+    for item in order.get('attrs', {}).get('preview_items') or []:
+        if item.get('type') == 'instance' and item.get('item_id'):
+            return item['item_id']
+    return None
+
+
+class VMStateStore:
+    """
+    Persistent controller-side store of the IDs of VMs managed by this collection.
+
+    Maps (base_url, project_id, VM name) to the order ID, instance item ID
+    and last known status, so later runs fetch the order directly by ID
+    instead of paging through the orders listing to find it by name.
+    Entries are kept in a JSON file guarded by a file lock, shared by all
+    worker processes and kept across runs.
+
+    :param path: State file path
+    :type path: str
+    """
+
+    def __init__(self, path):
+        """
+        Initialize VMStateStore instance.
+
+        :param path: State file path
+        :type path: str
+        """
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_args(cls, module_args):
+        """
+        Create the state store configured for a task.
+
+        :param module_args: Module arguments with an optional ``state_store_path``
+        :type module_args: dict
+        :return: State store, None if neither the task nor ``T1_CLOUD_STATE_STORE`` sets a path
+        :rtype: VMStateStore or None
+        """
+        path = module_args.get('state_store_path') or os.environ.get(STATE_STORE_ENV)
+        return cls(path) if path else None
+
+    @staticmethod
+    def _key(base_url, project_id, name):
+        return f"{base_url.rstrip('/')}|{project_id}|{name}"
+
+    @contextmanager
+    def _entries_locked(self, write=True):
+        """
+        Lock the store and yield its entries, saving them afterwards if ``write``.
+        """
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), mode=0o700, exist_ok=True)
+                lock_file = open(self.path + '.lock', 'a')
+            except OSError as e:
+                display.warning(f"T1 Cloud state store {self.path} unavailable: {e}")
+                yield {}
+                return
+
+            with lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        entries = json.load(f)
+                except (OSError, ValueError):
+                    entries = {}
+
+                yield entries
+
+                if write:
+                    self._save(entries)
+
+    def _save(self, entries):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.t1_cloud_state_')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            display.warning(f"Could not write T1 Cloud state store {self.path}: {e}")
+
+    def get(self, base_url, project_id, name):
+        """
+        Get the stored IDs of a VM.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param name: VM name
+        :type name: str
+        :return: Entry with 'order_id', 'item_id', 'status', 'power_status'
+            and 'updated_at', or None if not stored
+        :rtype: dict or None
+        """
+        with self._entries_locked(write=False) as entries:
+            return entries.get(self._key(base_url, project_id, name))
+
+    def put(self, base_url, project_id, name, order_id, item_id=None, status=None, power_status=None):
+        """
+        Store the IDs and last known status of a VM.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param name: VM name
+        :type name: str
+        :param order_id: Order ID
+        :type order_id: str
+        :param item_id: Compute instance item ID, the stored one is kept if None
+        :type item_id: str or None
+        :param status: Order status
+        :type status: str or None
+        :param power_status: Power status of the instance, the stored one is kept if None
+        :type power_status: str or None
+        """
+        key = self._key(base_url, project_id, name)
+        with self._entries_locked() as entries:
+            previous = entries.get(key) or {}
+            if previous.get('order_id') != order_id:
+                previous = {}
+            entries[key] = {
+                'order_id': order_id,
+                'item_id': item_id or previous.get('item_id'),
+                'status': status,
+                'power_status': power_status or previous.get('power_status'),
+                'updated_at': time.time(),
+            }
+
+    def remove(self, base_url, project_id, name):
+        """
+        Forget a VM, for example after it was deleted.
+
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param name: VM name
+        :type name: str
+        """
+        key = self._key(base_url, project_id, name)
+        with self._entries_locked() as entries:
+            entries.pop(key, None)
+
+    def resolve_vm(self, client, base_url, project_id, name):
+        """
+        Resolve the VM order by its stored order ID.
+
+        The order is fetched directly by ID and checked to still belong to
+        a VM of that name that was not deleted; anything else counts as a
+        miss, dropping the stale entry, so the caller falls back to the
+        orders listing.
+
+        :param client: Client of the project
+        :type client: T1CloudVM
+        :param base_url: Base URL of the T1 Cloud API
+        :type base_url: str
+        :param project_id: Project ID
+        :type project_id: str
+        :param name: VM name
+        :type name: str
+        :return: Current VM order, None on a miss
+        :rtype: dict or None
+        """
+        entry = self.get(base_url, project_id, name)
+        if not entry:
+            return None
+
+        try:
+            order = client.get_vm_by_id(entry['order_id'])
+        except T1CloudAPIError as e:
+            if e.status_code != 404:
+                raise
+            order = None
+        if (not order or order.get('attrs', {}).get('name') != name
+                or order.get('status') in DEPROVISIONED_STATUSES):
+            self.remove(base_url, project_id, name)
+            return None
+        return order
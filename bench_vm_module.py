@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark script for t1_cloud_vm Ansible module.
+This script measures client-side costs of the module without calling the real T1 Cloud API.
+"""
+
+import gzip
+import json
+import sys
+import timeit
+import tracemalloc
+
+try:
+    from ansible_collections.gromr10.compute_instance.plugins.modules.t1_cloud_vm import T1CloudVM
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+        runtime_info_from_instance,
+        runtime_info_from_instances,
+    )
+    from fake_t1_cloud import FakeT1Cloud
+except ImportError as e:
+    print(f"✗ Failed to import module: {e}")
+    sys.exit(1)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def make_order(index):
+    """Build an order resembling an item of the orders listing"""
+    instance_id = f"14a0cc6f-c8da-4dc2-80f6-{index:012d}"
+    return {
+        "id": f"15b92322-144f-4eec-9746-{index:012d}",
+        "created_at": "2025-09-01T10:08:11+03:00",
+        "updated_at": "2025-09-06T12:03:44+03:00",
+        "status": "success",
+        "label": "Виртуальная машина",
+        "category": "instance",
+        "category_v2": "compute-instance",
+        "deletable": True,
+        "project_name": "proj-gxvcuy3t6kg5vrf",
+        "product_id": "e6fa78c9-2ee1-4f9e-b86c-5d7246f38526",
+        "product_name": "compute_instance",
+        "attrs": {
+            "name": f"bench-vm-{index}",
+            "description": "Benchmark virtual machine",
+            "image": {
+                "id": "d0179cb4-bfad-4b8f-836f-9cfc02143560",
+                "name": "osmax-astra-1-7-5-orel-gui-2025-05-19",
+                "os_distro": "astra",
+                "os_version": "1.7.5 Орёл"
+            },
+            "flavor": {
+                "id": "3b259b39-6e73-41d5-b98e-b93c0bf31e95",
+                "name": "b5.large.2",
+                "ram": 4096,
+                "vcpus": 2,
+                "gpus": 0
+            },
+            "availability_zone": {"id": "d3p1k01", "name": "ru-central1-a"},
+            "volumes_config": {
+                "boot_volume": {
+                    "size": 30,
+                    "volume_type": {"id": "7ced5dc4-848a-4c02-bb76-8a3a9b7fff7f", "name": "POD2_Average"}
+                }
+            },
+            "network_configuration": {
+                "subnet": {"id": "d0a5e4c0-1323-483d-8f5a-0e797a0fdd85", "cidr": "10.9.60.0/24", "name": "10-9-60-0-24"}
+            },
+            "preview_items": [
+                {
+                    "type": "instance",
+                    "item_id": instance_id,
+                    "data": {
+                        "state": "on",
+                        "config": {
+                            "id": instance_id,
+                            "name": f"bench-vm-{index}",
+                            "addresses": {
+                                "10-9-60-0-24": [{
+                                    "addr": f"10.9.{index // 250 % 250}.{index % 250 + 2}",
+                                    "version": 4,
+                                    "OS-EXT-IPS:type": "fixed",
+                                    "OS-EXT-IPS-MAC:mac_addr": f"02:78:a5:{index >> 16 & 255:02x}:{index >> 8 & 255:02x}:{index & 255:02x}"
+                                }]
+                            }
+                        }
+                    }
+                }
+            ]
+        }
+    }
+
+
+def make_listing(count):
+    """Build an orders listing response body"""
+    return json.dumps({"list": [make_order(i) for i in range(count)], "meta": {"total_count": count}}).encode('utf-8')
+
+
+def make_instances_listing(count):
+    """Build a compute instances listing response body, flavors and zones repeat like in real projects"""
+    instances = []
+    for i in range(count):
+        instance = make_order(i)["attrs"]["preview_items"][0]
+        config = instance["data"]["config"]
+        config.update(
+            description="Benchmark virtual machine",
+            flavor={"id": f"3b259b39-6e73-41d5-b98e-b93c0bf31e9{i % 4}", "name": f"b5.large.{i % 4 + 1}",
+                    "ram": 4096 * (i % 4 + 1), "vcpus": 2, "gpus": 0},
+            source_image={"id": "d0179cb4-bfad-4b8f-836f-9cfc02143560", "name": "osmax-astra-1-7-5-orel-gui-2025-05-19"},
+            availability_zone={"id": f"d3p1k0{i % 3 + 1}", "name": f"ru-central1-{'abc'[i % 3]}"},
+            accessIPv4=config["addresses"]["10-9-60-0-24"][0]["addr"],
+        )
+        instance.update(order_id=f"15b92322-144f-4eec-9746-{i:012d}", created_row_dt="2025-09-01T10:08:11+03:00")
+        instances.append(instance)
+    return json.dumps({"list": instances, "meta": {"total_count": count}}).encode('utf-8')
+
+
+def bench(func, number):
+    """Return average run time of func in milliseconds"""
+    return timeit.timeit(func, number=number) / number * 1000
+
+
+def bench_response_encodings(count=500, number=20):
+    """Measure bytes on the wire and decode cost of an orders listing per content encoding"""
+    print(f"\n--- Orders listing with {count} orders: response encodings ---")
+
+    raw = make_listing(count)
+    encodings = [("identity", raw, lambda: json.loads(raw))]
+
+    gzipped = gzip.compress(raw, compresslevel=6)
+    encodings.append(("gzip", gzipped, lambda: json.loads(gzip.decompress(gzipped))))
+
+    if brotli is not None:
+        brotlied = brotli.compress(raw, quality=5)
+        encodings.append(("br", brotlied, lambda: json.loads(brotli.decompress(brotlied))))
+    else:
+        print("  (brotli not installed, skipping 'br')")
+
+    print(f"  {'encoding':<10} {'bytes':>10} {'ratio':>7} {'decode ms':>10}")
+    for name, body, decode in encodings:
+        print(f"  {name:<10} {len(body):>10} {len(body) / len(raw):>7.3f} {bench(decode, number):>10.2f}")
+
+
+def bench_request_compression(user_data_size=16384, number=200):
+    """Measure create_vm request body size and encode cost with and without compression"""
+    print(f"\n--- create_vm body with {user_data_size} bytes of user_data: request compression ---")
+
+    user_data = ("#cloud-config\nruncmd:\n" + "  - echo 'provisioning step' >> /var/log/bench.log\n" * 400)[:user_data_size]
+    order_data = {"order": {"count": 1, "attrs": make_order(0)["attrs"]}}
+    order_data["order"]["attrs"]["user_data"] = user_data
+
+    print(f"  {'mode':<10} {'bytes':>10} {'encode ms':>10}")
+    for mode, compress in (("plain", False), ("gzip", True)):
+        client = T1CloudVM(api_token="dummy_token", project_id="proj-bench", compress_requests=compress)
+        body, _ = client._encode_body(order_data)
+        print(f"  {mode:<10} {len(body):>10} {bench(lambda: client._encode_body(order_data), number):>10.3f}")
+
+
+def bench_fake_backend_listing(count=100, number=20):
+    """Measure orders listing lookups against the local fake backend per response encoding"""
+    print(f"\n--- get_vm_by_name over {count} orders on fake backend ---")
+
+    with FakeT1Cloud() as fake:
+        for i in range(count):
+            attrs = make_order(i)["attrs"]
+            fake.add_vm("proj-bench", attrs.pop("name"), **attrs)
+
+        print(f"  {'encoding':<10} {'bytes/req':>10} {'ms/req':>10}")
+        for encoding in ("identity", "gzip"):
+            client = T1CloudVM(api_token="dummy_token", project_id="proj-bench", base_url=fake.base_url)
+            client.session.headers['Accept-Encoding'] = encoding
+            client.get_vm_by_name("warm-up")
+            fake.reset_stats()
+            elapsed = bench(lambda: client.get_vm_by_name(f"bench-vm-{count - 1}"), number)
+            print(f"  {encoding:<10} {fake.bytes_sent // number:>10} {elapsed:>10.2f}")
+
+
+def bench_runtime_info(count=5000, number=5):
+    """Measure runtime information extraction of a compute instances listing, per instance and batched"""
+    print(f"\n--- Runtime information of {count} compute instances ---")
+
+    raw = make_instances_listing(count)
+    extractors = (
+        ("per-vm", lambda instances: [runtime_info_from_instance(instance) for instance in instances]),
+        ("batch", runtime_info_from_instances),
+    )
+
+    print(f"  {'extractor':<10} {'ms':>10} {'retained KiB':>13} {'peak KiB':>10}")
+    for name, extract in extractors:
+        instances = json.loads(raw)["list"]
+        elapsed = bench(lambda: extract(instances), number)
+
+        # Memory kept by the records once the decoded listing is dropped, as in an info module result
+        tracemalloc.start()
+        instances = json.loads(raw)["list"]
+        records = extract(instances)
+        del instances
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del records
+        print(f"  {name:<10} {elapsed:>10.2f} {retained // 1024:>13} {peak // 1024:>10}")
+
+
+def main():
+    """Run all benchmarks"""
+    print("T1 Cloud VM Module Benchmarks")
+    print("=" * 40)
+
+    bench_response_encodings()
+    bench_request_compression()
+    bench_fake_backend_listing()
+    bench_runtime_info()
+
+    print("\n" + "=" * 40)
+    print("Benchmarks completed!")
+
+
+if __name__ == '__main__':
+    main()
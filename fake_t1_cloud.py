@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fake T1 Cloud backend for offline plays, tests and benchmarks.
+
+Implements the subset of the order-service API used by the t1_cloud_vm module
+(orders, order actions and compute instances) as a local HTTP server and
+simulates order lifecycles with configurable durations and failure rates.
+
+Usage from Python (tests, benchmarks):
+
+    with FakeT1Cloud(provision_duration=0.2) as fake:
+        client = T1CloudVM(api_token="dummy", project_id="proj-test", base_url=fake.base_url)
+
+Usage from a playbook (set base_url of t1_cloud_vm to the printed URL):
+
+    python fake_t1_cloud.py --port 8080 --provision-duration 5 --failure-rate 0.1
+"""
+
+import argparse
+import gzip
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PRODUCT_ID = "e6fa78c9-2ee1-4f9e-b86c-5d7246f38526"
+
+AUTH_PATH = '/auth/realms/Portal/protocol/openid-connect/token'
+
+PREFIX = r'^/order-service/api/v1/projects/(?P<project>[^/]+)'
+ROUTES = [
+    ('GET', re.compile(PREFIX + r'/orders$'), 'list_orders'),
+    ('POST', re.compile(PREFIX + r'/orders$'), 'create_order'),
+    ('GET', re.compile(PREFIX + r'/orders/(?P<order_id>[^/]+)$'), 'get_order'),
+    ('PATCH', re.compile(PREFIX + r'/orders/(?P<order_id>[^/]+)/actions/(?P<action>[^/]+)$'), 'order_action'),
+    ('GET', re.compile(PREFIX + r'/compute/instances$'), 'list_instances'),
+    ('GET', re.compile(PREFIX + r'/compute/instances/(?P<instance_id>[^/]+)$'), 'get_instance'),
+]
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class FakeT1Cloud:
+    """
+    In-process fake of the T1 Cloud order-service API.
+
+    :param provision_duration: Seconds for a create order to reach a final status
+    :type provision_duration: float
+    :param action_duration: Seconds for a start/stop/delete action to complete
+    :type action_duration: float
+    :param failure_rate: Probability (0..1) that an order or action fails
+    :type failure_rate: float
+    :param latency: Extra seconds added to every response
+    :type latency: float
+    :param tokens: Accepted bearer tokens, any token is accepted if None.
+        Tokens issued by the fake authorization endpoint are added to them.
+    :type tokens: list or None
+    :param token_lifetime: expires_in of issued tokens in seconds
+    :type token_lifetime: int
+    :param seed: Seed for the failure random generator
+    :type seed: int or None
+    :param multi_count: Accept orders with count greater than 1, rejected with HTTP 422 otherwise
+    :type multi_count: bool
+    :param multi_count_name: Format of the VM names of multi-count orders, with ``name`` and ``index``
+    :type multi_count_name: str
+    :param rate_limit: Requests per second served before answering HTTP 429 with Retry-After,
+        with bursts of up to one second of requests; unlimited if None
+    :type rate_limit: float or None
+    """
+
+    def __init__(self, provision_duration=1.0, action_duration=0.5, failure_rate=0.0,
+                 latency=0.0, tokens=None, token_lifetime=3600, seed=None, multi_count=True,
+                 host='127.0.0.1', port=0, rate_limit=None, multi_count_name='{name}-{index}'):
+        self.provision_duration = provision_duration
+        self.action_duration = action_duration
+        self.failure_rate = failure_rate
+        self.latency = latency
+        self.tokens = set(tokens) if tokens is not None else None
+        self.token_lifetime = token_lifetime
+        self.multi_count = multi_count
+        self.multi_count_name = multi_count_name
+        self.rate_limit = rate_limit
+        self.host = host
+        self.port = port
+
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._orders = {}
+        self._instances = {}
+        # Pending status transitions: order_id -> [(due_time, status, callback)]
+        self._transitions = {}
+        # Token bucket of the rate limit: (available requests, time of the last refill)
+        self._bucket = (float(rate_limit or 0), time.monotonic())
+
+        self.requests = []
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+        self._server = None
+        self._thread = None
+
+    # Server lifecycle
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Start serving in a background thread and return the base URL"""
+        handler = type('FakeT1CloudHandler', (_Handler,), {'backend': self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """Stop the server"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def auth_url(self):
+        return self.base_url + AUTH_PATH
+
+    def revoke_tokens(self):
+        """Stop accepting all previously issued tokens"""
+        with self._lock:
+            self.tokens = set()
+
+    def reset_stats(self):
+        """Forget recorded requests and byte counters"""
+        with self._lock:
+            self.requests = []
+            self.bytes_sent = 0
+            self.bytes_received = 0
+
+    def throttle(self):
+        """
+        Take one request from the rate limit bucket.
+
+        :return: 0 if the request is served, otherwise seconds until it would be
+        :rtype: float
+        """
+        if not self.rate_limit:
+            return 0
+        with self._lock:
+            tokens, refilled = self._bucket
+            now = time.monotonic()
+            tokens = min(float(self.rate_limit), tokens + (now - refilled) * self.rate_limit)
+            if tokens >= 1:
+                self._bucket = (tokens - 1, now)
+                return 0
+            self._bucket = (tokens, now)
+            return (1 - tokens) / self.rate_limit
+
+    def request_count(self, method=None, route=None):
+        """Count recorded requests, optionally filtered by method and route name"""
+        with self._lock:
+            return sum(
+                1 for r in self.requests
+                if (method is None or r['method'] == method) and (route is None or r['route'] == route)
+            )
+
+    # Data management
+
+    def add_vm(self, project_id, name, state='on', **attrs):
+        """
+        Add an already provisioned VM to the fake project.
+
+        :return: Order of the VM
+        :rtype: dict
+        """
+        with self._lock:
+            order = self._new_order(project_id, dict(attrs, name=name))
+            order['status'] = 'success'
+            self._provision(order, state)
+            return order
+
+    def _new_order(self, project_id, attrs):
+        order_id = str(uuid.uuid4())
+        order = {
+            "id": order_id,
+            "created_at": _now_iso(),
+            "updated_at": _now_iso(),
+            "status": "pending",
+            "label": "Виртуальная машина",
+            "category": "instance",
+            "category_v2": "compute-instance",
+            "deletable": True,
+            "project_name": project_id,
+            "product_id": PRODUCT_ID,
+            "product_name": "compute_instance",
+            "attrs": dict(attrs, preview_items=[]),
+        }
+        self._orders[order_id] = order
+        return order
+
+    def _provision(self, order, state='on'):
+        attrs = order['attrs']
+        item_id = str(uuid.uuid4())
+        index = len(self._instances)
+        addr = attrs.get('network_configuration', {}).get('requested_ip') or \
+            f"10.{index // 62500 % 250}.{index // 250 % 250}.{index % 250 + 2}"
+        subnet = attrs.get('network_configuration', {}).get('subnet', {}).get('name') or 'default-ru-central1-a'
+        instance = {
+            "order_id": order['id'],
+            "item_id": item_id,
+            "project_name": order['project_name'],
+            "created_row_dt": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f'),
+            "data": {
+                "state": state,
+                "config": {
+                    "id": item_id,
+                    "name": attrs.get('name'),
+                    "description": attrs.get('description', ''),
+                    "addresses": {
+                        subnet: [{
+                            "addr": addr,
+                            "version": 4,
+                            "OS-EXT-IPS:type": "fixed",
+                            "OS-EXT-IPS-MAC:mac_addr": f"02:78:a5:{index >> 16 & 255:02x}:{index >> 8 & 255:02x}:{index & 255:02x}",
+                        }]
+                    },
+                    "accessIPv4": addr,
+                    "accessIPv6": "",
+                    "flavor": attrs.get('flavor', {}),
+                    "source_image": attrs.get('image', {}),
+                    "availability_zone": attrs.get('availability_zone', {}),
+                    "labels": attrs.get('labels', {}),
+                },
+            },
+        }
+        self._instances[item_id] = instance
+        attrs['preview_items'] = [{"type": "instance", "item_id": item_id, "data": instance['data']}]
+
+    def _schedule(self, order, duration, final_status, on_success=None):
+        """Schedule pending -> running -> final status transitions for an order"""
+        failed = self._random.random() < self.failure_rate
+        start = time.monotonic()
+        order['status'] = 'pending'
+        order['updated_at'] = _now_iso()
+        self._transitions[order['id']] = [
+            (start + duration / 2, 'running', None),
+            (start + duration, 'failure' if failed else final_status, None if failed else on_success),
+        ]
+
+    def _advance(self, order):
+        """Apply transitions of an order that are due"""
+        pending = self._transitions.get(order['id'])
+        now = time.monotonic()
+        while pending and pending[0][0] <= now:
+            _, status, callback = pending.pop(0)
+            order['status'] = status
+            order['updated_at'] = _now_iso()
+            if callback:
+                callback(order)
+        if pending is not None and not pending:
+            del self._transitions[order['id']]
+
+    def _project_orders(self, project_id):
+        for order in self._orders.values():
+            if order['project_name'] == project_id:
+                self._advance(order)
+                yield order
+
+    def _instance_for(self, order):
+        for item in order['attrs'].get('preview_items', []):
+            if item.get('type') == 'instance':
+                return self._instances.get(item.get('item_id'))
+        return None
+
+    # Route handlers, each returns (status, body)
+
+    def list_orders(self, project, query, body):
+        orders = list(self._project_orders(project))
+        product = query.get('f[product_name][]')
+        if product:
+            orders = [o for o in orders if o['product_name'] == product]
+        sort = query.get('sort')
+        if sort in ('created_at', 'updated_at'):
+            orders.sort(key=lambda o: o[sort], reverse=query.get('order') == 'desc')
+        return 200, self._paginate(orders, query)
+
+    def create_order(self, project, query, body):
+        order_request = (body or {}).get('order', {})
+        count = int(order_request.get('count', 1))
+        if count > 1 and not self.multi_count:
+            return 422, {"message": "count greater than 1 is not supported for this product"}
+        attrs = order_request.get('attrs', {})
+        created = []
+        for index in range(1, count + 1):
+            # Multi-count orders name their VMs <name>-1 ... <name>-<count> by default
+            name = self.multi_count_name.format(name=attrs.get('name'), index=index)
+            order = self._new_order(project, dict(attrs, name=name) if count > 1 else attrs)
+            self._schedule(order, self.provision_duration, 'success', self._provision)
+            created.append(order)
+        return 201, created
+
+    def get_order(self, project, query, body, order_id):
+        order = self._orders.get(order_id)
+        if not order or order['project_name'] != project:
+            return 404, {"message": f"Order {order_id} not found"}
+        self._advance(order)
+        return 200, order
+
+    def order_action(self, project, query, body, order_id, action):
+        order = self._orders.get(order_id)
+        if not order or order['project_name'] != project:
+            return 404, {"message": f"Order {order_id} not found"}
+        self._advance(order)
+        instance = self._instance_for(order)
+        if instance is None or instance['item_id'] != (body or {}).get('item_id'):
+            return 422, {"message": f"Item {(body or {}).get('item_id')} not found in order {order_id}"}
+
+        if action == 'start_compute_vm':
+            self._schedule(order, self.action_duration, 'success',
+                           lambda o: instance['data'].update(state='on'))
+        elif action == 'stop_compute_vm':
+            self._schedule(order, self.action_duration, 'success',
+                           lambda o: instance['data'].update(state='off'))
+        elif action == 'compute_instance_delete':
+            self._schedule(order, self.action_duration, 'deprovisioned',
+                           lambda o: self._instances.pop(instance['item_id'], None))
+        else:
+            return 400, {"message": f"Unknown action {action}"}
+        return 200, order
+
+    def list_instances(self, project, query, body):
+        for order in self._project_orders(project):
+            pass
+        instances = [i for i in self._instances.values() if i['project_name'] == project]
+        name = query.get('name')
+        if name:
+            instances = [i for i in instances if i['data']['config']['name'] == name]
+        return 200, self._paginate(instances, query)
+
+    def get_instance(self, project, query, body, instance_id):
+        for order in self._project_orders(project):
+            pass
+        instance = self._instances.get(instance_id)
+        if not instance or instance['project_name'] != project:
+            return 404, {"message": f"Instance {instance_id} not found"}
+        return 200, instance
+
+    @staticmethod
+    def _paginate(items, query):
+        per_page = int(query.get('per_page', 100))
+        page = int(query.get('page', 1))
+        start = (page - 1) * per_page
+        return {"list": items[start:start + per_page], "meta": {"total_count": len(items)}}
+
+    def issue_token(self, body):
+        if not (body or {}).get('client_id') or not (body or {}).get('client_secret'):
+            return 401, {"error": "invalid_client", "error_description": "Invalid client credentials"}
+        token = uuid.uuid4().hex
+        if self.tokens is not None:
+            self.tokens.add(token)
+        return 200, {
+            "access_token": token,
+            "token_type": "Bearer",
+            "expires_in": self.token_lifetime,
+            "scope": body.get('scope', 'openid'),
+        }
+
+    def handle(self, method, path, query, headers, body):
+        """Dispatch a request, return (status, body, route name)"""
+        if method == 'POST' and path == AUTH_PATH:
+            with self._lock:
+                status, data = self.issue_token(body)
+            return status, data, 'issue_token'
+
+        if self.tokens is not None:
+            auth = headers.get('Authorization', '')
+            if not auth.startswith('Bearer ') or auth[len('Bearer '):] not in self.tokens:
+                return 401, {"message": "Unauthorized"}, 'auth'
+
+        for route_method, pattern, handler_name in ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                with self._lock:
+                    status, data = getattr(self, handler_name)(query=query, body=body, **match.groupdict())
+                return status, data, handler_name
+        return 404, {"message": f"No route for {method} {path}"}, 'unknown'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, avoid delayed-ACK stalls on keep-alive
+    disable_nagle_algorithm = True
+    backend = None
+
+    def _dispatch(self):
+        split = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(split.query).items()}
+
+        raw = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        received = len(raw)
+        if raw and self.headers.get('Content-Encoding') == 'gzip':
+            raw = gzip.decompress(raw)
+        if raw and self.headers.get('Content-Type', '').startswith('application/x-www-form-urlencoded'):
+            body = {k: v[-1] for k, v in parse_qs(raw.decode('utf-8')).items()}
+        else:
+            body = json.loads(raw) if raw else None
+
+        if self.backend.latency:
+            time.sleep(self.backend.latency)
+
+        retry_after = self.backend.throttle()
+        if retry_after:
+            status, data, route = 429, {"message": "Too many requests"}, 'rate_limited'
+        else:
+            status, data, route = self.backend.handle(self.command, split.path, query, self.headers, body)
+
+        payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '') and len(payload) > 1024
+        if gzipped:
+            payload = gzip.compress(payload, compresslevel=6)
+
+        # Record before responding, so clients never observe a missing entry
+        with self.backend._lock:
+            self.backend.bytes_received += received
+            self.backend.bytes_sent += len(payload)
+            self.backend.requests.append({
+                'method': self.command, 'path': split.path, 'route': route, 'status': status
+            })
+
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            if retry_after:
+                self.send_header('Retry-After', str(math.ceil(retry_after)))
+            if gzipped:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up waiting (request timeout), nothing left to answer
+            self.close_connection = True
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake T1 Cloud API server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--provision-duration', type=float, default=5.0)
+    parser.add_argument('--action-duration', type=float, default=2.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--rate-limit', type=float,
+                        help="requests per second served before answering HTTP 429")
+    parser.add_argument('--no-multi-count', dest='multi_count', action='store_false',
+                        help="reject orders with count greater than 1")
+    args = parser.parse_args()
+
+    fake = FakeT1Cloud(
+        provision_duration=args.provision_duration,
+        action_duration=args.action_duration,
+        failure_rate=args.failure_rate,
+        latency=args.latency,
+        seed=args.seed,
+        multi_count=args.multi_count,
+        rate_limit=args.rate_limit,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Fake T1 Cloud API listening on {fake.start()}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fork-scaling load test for the t1_cloud_vm Ansible module.
+
+Runs the module entry point the way Ansible forks do, one Python process per
+task reading its arguments from a file (like AnsiballZ), with 1, 4, 16 and 64
+tasks at a time against the local fake T1 Cloud API, optionally rate limited.
+Reports throughput, task latency percentiles and the share of requests
+answered with HTTP 429 per level, to size ``forks`` against the API limits.
+
+    python load_vm_module.py --rate-limit 50
+    python load_vm_module.py --workers 1,8,32 --tasks 128 --state stopped --json results.json --plot scaling.png
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_t1_cloud import FakeT1Cloud
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+MODULES_DIR = os.path.join(ROOT, 'ansible_collections', 'gromr10', 'compute_instance', 'plugins', 'modules')
+
+PROJECT_ID = 'proj-load'
+
+# Failure messages of requests still answered with HTTP 429 after the last retry
+THROTTLED_MARKERS = ('too many 429 error responses', '429 Client Error')
+
+
+def percentile(values, fraction):
+    """Return the value below which the given fraction of sorted values fall (nearest rank)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def run_task(module, args, env):
+    """Run one module invocation in its own interpreter, return (seconds, result)"""
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump({'ANSIBLE_MODULE_ARGS': args}, f)
+    start = time.monotonic()
+    try:
+        process = subprocess.run([sys.executable, os.path.join(MODULES_DIR, f'{module}.py'), f.name],
+                                 capture_output=True, text=True, env=env)
+    finally:
+        os.unlink(f.name)
+    elapsed = time.monotonic() - start
+    try:
+        result = json.loads(process.stdout)
+    except ValueError:
+        result = {'failed': True, 'msg': (process.stderr or process.stdout).strip()[-300:]}
+    return elapsed, result
+
+
+def run_level(workers, tasks, module='t1_cloud_vm', state='present', vms=50, rate_limit=None,
+              latency=0.0, action_duration=0.5, module_args=None):
+    """
+    Run tasks with a number of parallel workers against a fresh fake API.
+
+    :return: Metrics of the level: workers, tasks, failed, seconds, throughput (tasks/s),
+        latency percentiles p50/p90/p99 and max (s), requests, requests/s, 429 count and rate,
+        tasks failed because retries on HTTP 429 ran out
+    :rtype: dict
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    with FakeT1Cloud(rate_limit=rate_limit, latency=latency, action_duration=action_duration) as fake:
+        for i in range(vms):
+            fake.add_vm(PROJECT_ID, f'load-{i}', state='off' if state == 'started' else 'on')
+        base = dict(api_token='dummy_token', project_id=PROJECT_ID, base_url=fake.base_url,
+                    poll_interval=0.2, **(module_args or {}))
+        task_args = [dict(base, name=f'load-{i % vms}', state=state) for i in range(tasks)]
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda args: run_task(module, args, env), task_args))
+        wall = time.monotonic() - start
+
+        requests = len(fake.requests)
+        throttled = fake.request_count(route='rate_limited')
+
+    latencies = [elapsed for elapsed, _ in results]
+    failures = [result.get('msg') for _, result in results if result.get('failed')]
+    return {
+        'workers': workers,
+        'tasks': tasks,
+        'failed': len(failures),
+        'failed_throttled': sum(1 for msg in failures if any(marker in str(msg) for marker in THROTTLED_MARKERS)),
+        'first_failure': failures[0] if failures else None,
+        'seconds': round(wall, 3),
+        'throughput': round(tasks / wall, 2),
+        'p50': round(percentile(latencies, 0.5), 3),
+        'p90': round(percentile(latencies, 0.9), 3),
+        'p99': round(percentile(latencies, 0.99), 3),
+        'max': round(max(latencies), 3),
+        'requests': requests,
+        'requests_per_second': round(requests / wall, 1),
+        'throttled': throttled,
+        'throttled_rate': round(throttled / requests, 4) if requests else 0.0,
+    }
+
+
+def print_table(levels):
+    """Print the metrics of all levels as a table"""
+    print(f"  {'workers':>7} {'tasks/s':>8} {'p50 s':>7} {'p90 s':>7} {'p99 s':>7} {'req/s':>7} "
+          f"{'429 %':>6} {'failed':>6} {'on 429':>6}")
+    for level in levels:
+        print(f"  {level['workers']:>7} {level['throughput']:>8.2f} {level['p50']:>7.2f} {level['p90']:>7.2f} "
+              f"{level['p99']:>7.2f} {level['requests_per_second']:>7.1f} {level['throttled_rate'] * 100:>6.1f} "
+              f"{level['failed']:>6} {level['failed_throttled']:>6}")
+
+
+def plot(levels, path):
+    """Plot throughput, latency percentiles and the 429 rate by number of workers"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("  (matplotlib not installed, skipping the plot)")
+        return
+
+    workers = [level['workers'] for level in levels]
+    figure, (throughput, latency, throttled) = plt.subplots(1, 3, figsize=(15, 4))
+    throughput.plot(workers, [level['throughput'] for level in levels], marker='o')
+    throughput.set(title='Throughput', xlabel='workers', ylabel='tasks/s', xscale='log')
+    for name in ('p50', 'p90', 'p99'):
+        latency.plot(workers, [level[name] for level in levels], marker='o', label=name)
+    latency.set(title='Task latency', xlabel='workers', ylabel='seconds', xscale='log')
+    latency.legend()
+    throttled.plot(workers, [level['throttled_rate'] * 100 for level in levels], marker='o', color='tab:red')
+    throttled.set(title='HTTP 429', xlabel='workers', ylabel='% of requests', xscale='log')
+    figure.tight_layout()
+    figure.savefig(path)
+    print(f"  Plot written to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fork-scaling load test of the t1_cloud_vm module")
+    parser.add_argument('--workers', default='1,4,16,64',
+                        help="comma-separated numbers of parallel module runs (forks)")
+    parser.add_argument('--tasks', type=int, default=64, help="module runs per level")
+    parser.add_argument('--state', default='present', choices=['present', 'started', 'stopped'],
+                        help="state of the t1_cloud_vm tasks, on VMs that exist")
+    parser.add_argument('--vms', type=int, default=50, help="VMs in the fake project")
+    parser.add_argument('--rate-limit', type=float, help="requests per second served by the fake API")
+    parser.add_argument('--latency', type=float, default=0.0, help="extra seconds per fake API response")
+    parser.add_argument('--action-duration', type=float, default=0.5, help="seconds for power actions to complete")
+    parser.add_argument('--module-arg', action='append', default=[], metavar='KEY=VALUE',
+                        help="extra module argument (JSON value), for example deadline=30")
+    parser.add_argument('--json', help="write the metrics to this JSON file")
+    parser.add_argument('--plot', help="write a PNG plot to this file (needs matplotlib)")
+    args = parser.parse_args()
+
+    module_args = {}
+    for item in args.module_arg:
+        key, _, value = item.partition('=')
+        try:
+            module_args[key] = json.loads(value)
+        except ValueError:
+            module_args[key] = value
+
+    print("T1 Cloud VM Module Fork Scaling")
+    print("=" * 40)
+    print(f"  {args.tasks} '{args.state}' tasks per level, {args.vms} VMs, "
+          f"rate limit {args.rate_limit or 'none'} req/s, latency {args.latency}s\n")
+
+    levels = []
+    for workers in (int(value) for value in args.workers.split(',')):
+        level = run_level(workers, args.tasks, state=args.state, vms=args.vms, rate_limit=args.rate_limit,
+                          latency=args.latency, action_duration=args.action_duration, module_args=module_args)
+        levels.append(level)
+        if level['first_failure']:
+            print(f"  {workers} workers: {level['failed']} failed, first: {level['first_failure']}")
+
+    print_table(levels)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(levels, f, indent=2)
+    if args.plot:
+        plot(levels, args.plot)
+
+
+if __name__ == '__main__':
+    main()
@@ -17,11 +17,27 @@ try:
     from ansible_collections.gromr10.compute_instance.plugins.lookup.t1_cloud_iam_token import (
         T1CloudAuth,
     )
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_validation import (
+        VMSpecValidator,
+        validate_vm_specs,
+    )
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_deadline import (
+        Deadline,
+        DeadlineExceeded,
+    )
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_watch import OrderWatcher
+    from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_auth import get_auth_client
+    from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_info_cache import RuntimeInfoCache
+    from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_registry import ClientRegistry
+    from fake_t1_cloud import FakeT1Cloud
     print("✓ Module imports successfully")
 except ImportError as e:
     print(f"✗ Failed to import module: {e}")
     sys.exit(1)
 
+# Recorded HTTP interactions replayed by test_http_fixtures
+HTTP_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'http')
+
 def test_vm_name_validation():
     """Test VM name validation function"""
     print("\n--- Testing VM name validation ---")
@@ -53,6 +69,52 @@ def test_vm_name_validation():
         else:
             print(f"✗ '{name}' should be invalid but validation passed")
 
+def test_vm_spec_validation():
+    """Test bulk validation of VM specifications"""
+    print("\n--- Testing bulk VM spec validation ---")
+
+    specs = [
+        {'name': 'web-01', 'user_data': '#cloud-config'},
+        {'name': 'Web_02', 'assign_public_ip': True, 'create_public_ip': True, 'public_ip_bandwidth': 150},
+        {'name': 'web-01', 'user_data': 'ж' * 8193},  # 16386 bytes in UTF-8
+        {'name': 'web-03', 'user_data': 'x' * 16384},
+    ]
+
+    errors = validate_vm_specs(specs)
+    if len(errors) == 4:
+        print("✓ All errors reported in a single pass")
+    else:
+        print(f"✗ Expected 4 errors, got {len(errors)}: {errors}")
+
+    if any(e.startswith("spec[1] (Web_02): Invalid VM name") for e in errors):
+        print("✓ Invalid name reported with spec index")
+    else:
+        print("✗ Invalid name not reported")
+
+    if any("spec[1]" in e and "public_ip_bandwidth" in e for e in errors):
+        print("✓ Invalid bandwidth reported")
+    else:
+        print("✗ Invalid bandwidth not reported")
+
+    if any("spec[2]" in e and "duplicate VM name" in e for e in errors):
+        print("✓ Duplicate name reported")
+    else:
+        print("✗ Duplicate name not reported")
+
+    if any("spec[2]" in e and "user_data" in e for e in errors) and not any("spec[3]" in e for e in errors):
+        print("✓ user_data size checked in bytes, not characters")
+    else:
+        print("✗ user_data byte size not checked correctly")
+
+    validator = VMSpecValidator()
+    shared_user_data = 'ё' * 5000
+    for i in range(100):
+        validator.validate({'name': f'vm-{i}', 'user_data': shared_user_data})
+    if len(validator._user_data_sizes) == 1:
+        print("✓ Shared user_data encoded only once")
+    else:
+        print("✗ Shared user_data encoded more than once")
+
 def test_vm_config_builder():
     """Test VM configuration builder"""
     print("\n--- Testing VM configuration builder ---")
@@ -146,6 +208,39 @@ def test_vm_client_initialization():
     except Exception as e:
         print(f"✗ Failed to initialize VM client: {e}")
 
+def test_request_compression():
+    """Test request body compression and response encoding negotiation"""
+    print("\n--- Testing request/response compression ---")
+
+    import gzip
+
+    client = T1CloudVM(api_token="dummy_token", project_id="proj-test123", compress_requests=True)
+
+    if 'gzip' in client.session.headers.get('Accept-Encoding', ''):
+        print("✓ gzip response encoding negotiated")
+    else:
+        print("✗ gzip response encoding not negotiated")
+
+    small_body, small_headers = client._encode_body({"order": {"attrs": {"name": "test-vm"}}})
+    if not small_headers and json.loads(small_body) == {"order": {"attrs": {"name": "test-vm"}}}:
+        print("✓ Small request body sent uncompressed")
+    else:
+        print("✗ Small request body should not be compressed")
+
+    data = {"order": {"attrs": {"name": "test-vm", "user_data": "#cloud-config\n" * 2000}}}
+    body, headers = client._encode_body(data)
+    if headers.get('Content-Encoding') == 'gzip' and json.loads(gzip.decompress(body)) == data:
+        print(f"✓ Large request body gzip-compressed ({len(body)} bytes)")
+    else:
+        print("✗ Large request body not compressed correctly")
+
+    plain_client = T1CloudVM(api_token="dummy_token", project_id="proj-test123")
+    _, headers = plain_client._encode_body(data)
+    if not headers:
+        print("✓ Request compression is opt-in")
+    else:
+        print("✗ Request compression should be disabled by default")
+
 def test_vm_config_with_extra_disks():
     """Test VM configuration with additional disks"""
     print("\n--- Testing VM configuration with extra disks ---")
@@ -373,6 +468,1556 @@ def test_vm_runtime_info_parsing():
     except Exception as e:
         print(f"✗ Failed to test runtime info parsing: {e}")
 
+def test_runtime_info_batch():
+    """Test batched runtime information extraction of a compute instances listing"""
+    print("\n--- Testing batched runtime info extraction ---")
+
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import (
+        runtime_info_from_instance,
+        runtime_info_from_instances,
+    )
+
+    try:
+        instances = json.loads(json.dumps([
+            {
+                "data": {
+                    "state": "on" if i % 2 else "off",
+                    "config": {
+                        "id": f"instance-{i}",
+                        "name": f"batch-{i}",
+                        "addresses": {"10-9-60-0-24": [{"addr": f"10.9.60.{i}", "version": 4,
+                                                        "OS-EXT-IPS:type": "fixed",
+                                                        "OS-EXT-IPS-MAC:mac_addr": f"02:78:a5:7d:97:{i:02x}"}]},
+                        "accessIPv4": f"10.9.60.{i}",
+                        "flavor": {"id": "flavor-1", "name": "b5.large.2", "vcpus": 2, "ram": 4096},
+                        "source_image": {"id": "image-1", "name": "astra"},
+                        "availability_zone": {"id": "d3p1k01", "name": "ru-central1-a"},
+                    },
+                },
+                "order_id": f"order-{i}",
+                "item_id": f"instance-{i}",
+            }
+            for i in range(20)
+        ] + [{"data": {}}]))
+
+        records = runtime_info_from_instances(instances)
+        if records == [runtime_info_from_instance(instance) for instance in instances]:
+            print("✓ Batch records equal per-instance records")
+        else:
+            print("✗ Batch records differ from per-instance records")
+
+        if (all(record['flavor'] is records[0]['flavor'] for record in records[:20])
+                and all(record['availability_zone'] is records[0]['availability_zone'] for record in records[:20])):
+            print("✓ Equal flavors and availability zones shared between records")
+        else:
+            print("✗ Equal flavors and availability zones not shared")
+
+        networks = [next(iter(record['ip_addresses'])) for record in records[:20]]
+        if all(network is networks[0] for network in networks) and records[2]['power_status'] is records[4]['status']:
+            print("✓ Network names and power states interned")
+        else:
+            print("✗ Network names and power states not interned")
+
+        if records[-1]['power_status'] == 'unknown' and records[-1]['ip_addresses'] == {}:
+            print("✓ Instance without data handled")
+        else:
+            print(f"✗ Unexpected record of an instance without data: {records[-1]}")
+    except Exception as e:
+        print(f"✗ Failed to test batched runtime info extraction: {e}")
+
+def run_module(args, module=None):
+    """Run a module's main() in-process (t1_cloud_vm by default) and return its JSON result"""
+    import io
+    import contextlib
+    from ansible.module_utils import basic
+    from ansible_collections.gromr10.compute_instance.plugins.modules import t1_cloud_vm
+
+    module = module or t1_cloud_vm
+
+    basic._ANSIBLE_ARGS = json.dumps({'ANSIBLE_MODULE_ARGS': args}).encode('utf-8')
+    if hasattr(basic, '_ANSIBLE_PROFILE'):
+        basic._ANSIBLE_PROFILE = 'legacy'
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        try:
+            module.main()
+        except SystemExit:
+            pass
+    return json.loads(stdout.getvalue())
+
+def test_fake_backend_lifecycle():
+    """Test full VM lifecycle against the local fake backend"""
+    print("\n--- Testing VM lifecycle against fake backend ---")
+
+    try:
+        with FakeT1Cloud(provision_duration=0.2, action_duration=0.1) as fake:
+            base_args = {
+                'api_token': 'dummy_token',
+                'project_id': 'proj-test123',
+                'base_url': fake.base_url,
+                'name': 'fake-vm',
+                'poll_interval': 0.05,
+            }
+
+            result = run_module(dict(base_args, image_id='d0179cb4-bfad-4b8f-836f-9cfc02143560',
+                                     flavor_id='3b259b39-6e73-41d5-b98e-b93c0bf31e95',
+                                     subnet_id='d0a5e4c0-1323-483d-8f5a-0e797a0fdd85'))
+            if result.get('changed') and result.get('vm', {}).get('status') == 'success':
+                print("✓ VM created and order reached 'success'")
+            else:
+                print(f"✗ VM creation failed: {result}")
+
+            if result.get('runtime_info', {}).get('power_status') == 'on':
+                print("✓ Runtime info gathered from fake backend")
+            else:
+                print("✗ Runtime info not gathered")
+
+            result = run_module(dict(base_args, image_id='d0179cb4-bfad-4b8f-836f-9cfc02143560'))
+            if not result.get('changed'):
+                print("✓ Existing VM not recreated")
+            else:
+                print("✗ Existing VM should not be recreated")
+
+            result = run_module(dict(base_args, state='stopped'))
+            if result.get('changed') and run_module(dict(base_args, state='present'))['runtime_info']['power_status'] == 'off':
+                print("✓ VM stopped")
+            else:
+                print(f"✗ VM not stopped: {result}")
+
+            result = run_module(dict(base_args, state='absent'))
+            if result.get('changed') and fake.request_count('PATCH', 'order_action') == 2:
+                print("✓ VM deleted")
+            else:
+                print(f"✗ VM not deleted: {result}")
+
+        with FakeT1Cloud(provision_duration=0.1, failure_rate=1.0) as fake:
+            client = T1CloudVM(api_token="dummy_token", project_id="proj-test123", base_url=fake.base_url)
+            order_id = client.create_vm({"name": "doomed-vm"}).pop()['id']
+            if client.wait_for_operation(order_id, timeout=5, poll_interval=0.05)['status'] == 'failure':
+                print("✓ Configured failure rate simulated")
+            else:
+                print("✗ Failure rate not simulated")
+
+    except Exception as e:
+        print(f"✗ Failed to run lifecycle against fake backend: {e}")
+
+def test_module_profiling():
+    """Test opt-in profiling of a module run"""
+    print("\n--- Testing module profiling ---")
+
+    import pstats
+    import tempfile
+
+    try:
+        with FakeT1Cloud(provision_duration=0.2) as fake, tempfile.TemporaryDirectory() as tmp_dir:
+            args = {
+                'api_token': 'dummy_token',
+                'project_id': 'proj-test123',
+                'base_url': fake.base_url,
+                'name': 'profiled-vm',
+                'image_id': 'd0179cb4-bfad-4b8f-836f-9cfc02143560',
+                'poll_interval': 0.05,
+                'profile': True,
+                'profile_top': 5,
+                'profile_output': os.path.join(tmp_dir, 'module.prof'),
+            }
+
+            result = run_module(args)
+            profile = result.get('profile', {})
+            if len(profile.get('top', [])) == 5 and profile.get('breakdown', {}).get('sleep', 0) > 0:
+                print("✓ Profile summary returned with polling time")
+            else:
+                print(f"✗ Unexpected profile summary: {profile}")
+
+            if pstats.Stats(profile['output']).total_calls > 0:
+                print("✓ Raw profile written")
+            else:
+                print("✗ Raw profile not written")
+
+            os.environ['T1_CLOUD_PROFILE'] = '1'
+            try:
+                result = run_module({k: v for k, v in args.items() if not k.startswith('profile')})
+            finally:
+                del os.environ['T1_CLOUD_PROFILE']
+            if 'profile' in result and 'profile' not in run_module(dict(args, profile=False)):
+                print("✓ Profiling enabled through environment")
+            else:
+                print("✗ Profiling not controlled by environment")
+
+    except Exception as e:
+        print(f"✗ Failed to test module profiling: {e}")
+
+def test_tracing():
+    """Test OTLP JSON tracing of lookup, client and waiter"""
+    print("\n--- Testing tracing spans ---")
+
+    import tempfile
+    from ansible_collections.gromr10.compute_instance.plugins.lookup.t1_cloud_iam_token import LookupModule
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_tracing import TRACER
+
+    trace_id = 'a' * 32
+    try:
+        with FakeT1Cloud(tokens=[], provision_duration=0.2) as fake, tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'trace.jsonl')
+            TRACER.configure(path)
+            os.environ['TRACEPARENT'] = f"00-{trace_id}-{'b' * 16}-01"
+            try:
+                token = LookupModule().run(['service_account'], client_id='sa_proj-test', client_secret='secret',
+                                           endpoint=fake.auth_url)[0]
+                client = T1CloudVM(api_token=token, project_id='proj-test123', base_url=fake.base_url)
+                order_id = client.create_vm({'name': 'traced-vm'}).pop()['id']
+                client.wait_for_operation(order_id, timeout=5, poll_interval=0.05)
+            finally:
+                TRACER.configure(None)
+                del os.environ['TRACEPARENT']
+
+            with open(path) as f:
+                spans = [span for line in f
+                         for resource in json.loads(line)['resourceSpans']
+                         for scope in resource['scopeSpans']
+                         for span in scope['spans']]
+
+        by_name = {}
+        for span in spans:
+            by_name.setdefault(span['name'], []).append(span)
+        expected = ['t1_cloud_iam_token.LookupModule.run', 'T1CloudAuth.get_token_with_credentials',
+                    'T1CloudVM._make_request', 'T1CloudVM.wait_for_operation', 'T1CloudVM.wait_for_operation.poll']
+        if all(name in by_name for name in expected) and all(s['traceId'] == trace_id for s in spans):
+            print("✓ Spans exported for lookup, token request, API requests and polls")
+        else:
+            print(f"✗ Missing spans: {sorted(by_name)}")
+
+        ids = {span['spanId']: span for span in spans}
+        lookup_child = by_name['T1CloudAuth.get_token_with_credentials'][0]
+        polls = by_name['T1CloudVM.wait_for_operation.poll']
+        poll_requests = [s for s in by_name['T1CloudVM._make_request'] if ids.get(s.get('parentSpanId'), {}).get('name') == 'T1CloudVM.wait_for_operation.poll']
+        if ids[lookup_child['parentSpanId']]['name'] == expected[0] and len(poll_requests) == len(polls):
+            print("✓ Spans nested under their callers")
+        else:
+            print("✗ Spans not nested under their callers")
+
+        last_poll = {a['key']: a['value'] for a in polls[-1]['attributes']}
+        if last_poll['t1.order_id']['stringValue'] == order_id and last_poll['t1.order.status']['stringValue'] == 'success':
+            print("✓ Poll spans carry order ID and status")
+        else:
+            print(f"✗ Unexpected poll attributes: {last_poll}")
+
+    except Exception as e:
+        print(f"✗ Failed to test tracing: {e}")
+
+def test_order_watcher():
+    """Test order status transition events and phase durations"""
+    print("\n--- Testing order watcher ---")
+
+    import tempfile
+
+    clock = iter([100.0, 112.5, 160.0]).__next__
+    watcher = OrderWatcher(clock=clock)
+    for status in ['pending', 'pending', 'running', 'running', 'success']:
+        watcher.observe('order-1', status)
+    if [(e['previous'], e['status']) for e in watcher.events] == [(None, 'pending'), ('pending', 'running'), ('running', 'success')]:
+        print("✓ Only status transitions recorded")
+    else:
+        print(f"✗ Unexpected events: {watcher.events}")
+
+    if watcher.phases() == {'order-1': {'pending': 12.5, 'running': 47.5, 'total': 60.0}}:
+        print("✓ Phase durations derived from events")
+    else:
+        print(f"✗ Unexpected phases: {watcher.phases()}")
+
+    try:
+        with FakeT1Cloud(provision_duration=0.2) as fake, tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'events.jsonl')
+            watcher = OrderWatcher(output=path)
+            client = T1CloudVM(api_token='dummy_token', project_id='proj-test123', base_url=fake.base_url,
+                               watcher=watcher)
+            order_ids = [order['id'] for order in client.create_vm({'name': 'watched'}, count=3)]
+            client.wait_for_operations(order_ids, timeout=5, poll_interval=0.05)
+
+            with open(path) as f:
+                written = [json.loads(line) for line in f]
+
+        statuses = {order_id: [e['status'] for e in watcher.events if e['order_id'] == order_id] for order_id in order_ids}
+        if all(s == ['pending', 'running', 'success'] for s in statuses.values()) and written == watcher.events:
+            print("✓ Shared poller transitions written as JSON lines")
+        else:
+            print(f"✗ Unexpected watched transitions: {statuses}")
+
+        if watcher.result().keys() == {'order_events', 'order_phases'} and OrderWatcher().result() == {}:
+            print("✓ Module result entries only for watched orders")
+        else:
+            print("✗ Unexpected watcher module result")
+    except Exception as e:
+        print(f"✗ Failed to test order watcher: {e}")
+
+def test_deadline():
+    """Test end-to-end deadline across requests, retries and waits"""
+    print("\n--- Testing end-to-end deadline ---")
+
+    import time
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import T1CloudAPIError
+
+    now = [0.0]
+    deadline = Deadline(10, spent={'controller': 2.0}, clock=lambda: now[0])
+    now[0] = 5.0
+    if deadline.remaining() == 3.0 and deadline.timeout(30) == 3.0 and deadline.timeout(1) == 1:
+        print("✓ Timeouts shrink to the remaining budget")
+    else:
+        print(f"✗ Unexpected remaining budget: {deadline.remaining()}")
+
+    request_timeout = deadline.request_timeout(30)
+    now[0] = 6.5
+    if request_timeout.read_timeout == 3.0 and request_timeout.clone().read_timeout == 1.5:
+        print("✓ Request timeout fitted into the remaining budget again for each attempt")
+    else:
+        print(f"✗ Retry timeout not recomputed: {request_timeout.clone().read_timeout}")
+
+    try:
+        with FakeT1Cloud(rate_limit=1) as fake:
+            T1CloudVM(api_token='dummy_token', project_id='proj-test123', base_url=fake.base_url).list_vms()
+            client = T1CloudVM(api_token='dummy_token', project_id='proj-test123', base_url=fake.base_url,
+                               deadline=Deadline(0.5))
+            start = time.monotonic()
+            try:
+                client.list_vms()
+                print("✗ Rate limited request finished within the deadline")
+            except (DeadlineExceeded, T1CloudAPIError) as e:
+                if time.monotonic() - start < 0.4 and fake.request_count(route='rate_limited') == 1:
+                    print("✓ No retry when the Retry-After delay does not fit the deadline")
+                else:
+                    print(f"✗ Slept past the deadline for Retry-After: {e}")
+
+        with FakeT1Cloud(latency=1.0) as fake:
+            client = T1CloudVM(api_token='dummy_token', project_id='proj-test123', base_url=fake.base_url,
+                               deadline=Deadline(0.3))
+            start = time.monotonic()
+            try:
+                client.list_vms()
+                print("✗ Slow request finished within the deadline")
+            except DeadlineExceeded as e:
+                if time.monotonic() - start < 0.9 and e.breakdown['requests'] > 0:
+                    print("✓ Slow request and its retries cut at the deadline")
+                else:
+                    print(f"✗ Deadline not enforced promptly: {e}")
+
+        with FakeT1Cloud(provision_duration=5) as fake:
+            start = time.monotonic()
+            result = run_module({
+                'api_token': 'dummy_token',
+                'project_id': 'proj-test123',
+                'base_url': fake.base_url,
+                'name': 'slow-vm',
+                'image_id': 'd0179cb4-bfad-4b8f-836f-9cfc02143560',
+                'flavor_id': '3b259b39-6e73-41d5-b98e-b93c0bf31e95',
+                'poll_interval': 0.2,
+                'deadline': 0.6,
+                'deadline_spent': {'controller': 0.1},
+            })
+            duration = time.monotonic() - start
+        breakdown = result.get('time_breakdown', {})
+        if (result.get('failed') and 'Deadline of 0.6 seconds exceeded' in result.get('msg', '') and duration < 1.5
+                and breakdown.get('polling', 0) > 0 and breakdown.get('controller') == 0.1):
+            print("✓ Module fails promptly with a time breakdown")
+        else:
+            print(f"✗ Unexpected deadline result after {duration:.1f}s: {result.get('msg')} {breakdown}")
+    except Exception as e:
+        print(f"✗ Failed to test deadline: {e}")
+
+def test_client_registry():
+    """Test controller-side client registry"""
+    print("\n--- Testing controller-side client registry ---")
+
+    if get_auth_client() is get_auth_client():
+        print("✓ Auth client shared per endpoint")
+    else:
+        print("✗ Auth client not shared")
+
+    try:
+        with FakeT1Cloud() as fake:
+            for i in range(3):
+                fake.add_vm('proj-test123', f'registry-vm-{i}')
+
+            registry = ClientRegistry()
+            context = (fake.base_url, 'proj-test123', 'dummy_token')
+
+            if registry.get_client(*context) is registry.get_client(*context):
+                print("✓ One client per (base_url, project_id, token)")
+            else:
+                print("✗ Client not reused")
+
+            found = [registry.resolve_vm(*context, f'registry-vm-{i}') for i in range(3)]
+            missing = registry.resolve_vm(*context, 'no-such-vm')
+            if all(found) and missing is None and fake.request_count('GET', 'list_orders') == 1:
+                print("✓ VM names resolved from a single orders listing")
+            else:
+                print(f"✗ Expected one listing, got {fake.request_count('GET', 'list_orders')}")
+
+            registry.invalidate(*context)
+            registry.resolve_vm(*context, 'registry-vm-0')
+            if fake.request_count('GET', 'list_orders') == 2:
+                print("✓ Orders snapshot refreshed after invalidation")
+            else:
+                print("✗ Orders snapshot not refreshed after invalidation")
+
+    except Exception as e:
+        print(f"✗ Failed to test client registry: {e}")
+
+def test_token_refresh():
+    """Test token refresh-ahead, shared token cache and retry on HTTP 401"""
+    print("\n--- Testing token refresh-ahead and retry on 401 ---")
+
+    import builtins
+    import tempfile
+    import time
+    from datetime import timedelta
+    from unittest import mock
+
+    try:
+        with FakeT1Cloud(tokens=[], token_lifetime=1000) as fake:
+            auth = T1CloudAuth(endpoint=fake.auth_url, refresh_ahead=0.5)
+            first = auth.get_token_with_credentials('sa_proj-test', 'secret')
+
+            # Age the cached token past half of its lifetime, still far from expiry
+            first['obtained_at'] -= timedelta(seconds=600)
+            first['expires_at'] -= timedelta(seconds=600)
+
+            served = auth.get_token_with_credentials('sa_proj-test', 'secret')
+            if served['access_token'] == first['access_token']:
+                print("✓ Cached token served while refresh runs in background")
+            else:
+                print("✗ Caller waited for token refresh")
+
+            for _ in range(100):
+                if not auth._refreshing:
+                    break
+                time.sleep(0.01)
+            renewed = auth.get_token_with_credentials('sa_proj-test', 'secret')
+            if renewed['access_token'] != first['access_token'] and fake.request_count('POST', 'issue_token') == 2:
+                print("✓ Token renewed ahead of expiration")
+            else:
+                print("✗ Token not renewed ahead of expiration")
+
+            with tempfile.TemporaryDirectory() as cache_dir:
+                T1CloudAuth(endpoint=fake.auth_url, cache_dir=cache_dir).get_token_with_credentials('sa_proj-test', 'secret')
+                fake.reset_stats()
+                T1CloudAuth(endpoint=fake.auth_url, cache_dir=cache_dir).get_token_with_credentials('sa_proj-test', 'secret')
+                if fake.request_count('POST', 'issue_token') == 0:
+                    print("✓ Token shared through cache directory")
+                else:
+                    print("✗ Token not shared through cache directory")
+
+            shared = get_auth_client(fake.auth_url)
+            shared.get_token_with_credentials('sa_proj-shared', 'secret')
+            real_open = builtins.open
+            with mock.patch.object(builtins, 'open', side_effect=real_open) as opened:
+                for _ in range(5):
+                    shared.get_token_with_credentials('sa_proj-shared', 'secret')
+                token_reads = [c for c in opened.call_args_list
+                               if c.args and 't1_cloud_token_' in os.path.basename(str(c.args[0]))]
+            if not token_reads:
+                print("✓ Shared token cache file not parsed again while unchanged")
+            else:
+                print(f"✗ Shared token cache file read {len(token_reads)} times")
+
+            other = T1CloudAuth(endpoint=fake.auth_url, cache_dir=shared.cache_dir)
+            newer = other.get_token_with_credentials('sa_proj-shared', 'secret', force_refresh=True)
+            if shared.get_token_with_credentials('sa_proj-shared', 'secret')['access_token'] == newer['access_token']:
+                print("✓ Token stored by another process picked up after the cache file changed")
+            else:
+                print("✗ Replaced shared token cache file not read again")
+
+            from ansible_collections.gromr10.compute_instance.plugins.lookup.t1_cloud_iam_token import LookupModule
+            LookupModule().run(['service_account'], client_id='sa_proj-shared', client_secret='secret', endpoint=fake.auth_url,
+                               refresh_ahead=0.1)
+            aged = dict(newer, obtained_at=newer['obtained_at'] - timedelta(seconds=600))
+            if (shared.refresh_ahead == 0.75 and shared._is_refresh_due(aged, 0.5)
+                    and not shared._is_refresh_due(aged)):
+                print("✓ refresh_ahead applied per token request, shared client left unchanged")
+            else:
+                print(f"✗ Shared client refresh_ahead changed to {shared.refresh_ahead}")
+
+            fake.revoke_tokens()
+            fake.reset_stats()
+            client = T1CloudVM(api_token=renewed['access_token'], project_id='proj-test123', base_url=fake.base_url,
+                               token_provider=auth.token_provider('sa_proj-test', 'secret'))
+            client.get_vm_by_name('test-vm')
+            if fake.request_count(route='auth') == 1 and fake.request_count('POST', 'issue_token') == 1:
+                print("✓ Request retried once with a fresh token after HTTP 401")
+            else:
+                print("✗ Request not retried after HTTP 401")
+
+    except Exception as e:
+        print(f"✗ Failed to test token refresh: {e}")
+
+def test_thread_safety():
+    """Stress test one client shared by a thread pool, with the token revoked mid-run"""
+    print("\n--- Testing thread-safe client under concurrency ---")
+
+    import logging
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    class PoolFullHandler(logging.Handler):
+        def __init__(self):
+            super(PoolFullHandler, self).__init__()
+            self.discarded = 0
+
+        def emit(self, record):
+            if 'pool is full' in record.getMessage():
+                self.discarded += 1
+
+    workers = 32
+    handler = PoolFullHandler()
+    pool_logger = logging.getLogger('urllib3.connectionpool')
+    previous_level = pool_logger.level
+    pool_logger.addHandler(handler)
+    pool_logger.setLevel(logging.WARNING)
+    try:
+        with FakeT1Cloud(tokens=[], action_duration=0.2) as fake:
+            auth = T1CloudAuth(endpoint=fake.auth_url)
+            provider = auth.token_provider('sa_proj-stress', 'secret')
+            for project in ('proj-stress-a', 'proj-stress-b'):
+                for i in range(20):
+                    fake.add_vm(project, f'{project}-{i}')
+
+            client = T1CloudVM(api_token=provider(), project_id='proj-stress-a', base_url=fake.base_url,
+                               token_provider=provider, pool_maxsize=workers)
+            clients = {'proj-stress-a': client, 'proj-stress-b': client.for_project('proj-stress-b')}
+            fake.reset_stats()
+            revoked = threading.Event()
+
+            def operation(i):
+                if i == 150 and not revoked.is_set():
+                    revoked.set()
+                    fake.revoke_tokens()
+                project = 'proj-stress-a' if i % 2 else 'proj-stress-b'
+                name = f'{project}-{i % 20}'
+                kind = i % 3
+                if kind == 0:
+                    found = clients[project].get_vm_by_name(name)
+                    return found is not None and found['attrs']['name'] == name
+                if kind == 1:
+                    info = clients[project].get_vm_runtime_info(name)
+                    return info is not None and info['name'] == name and info['power_status'] == 'on'
+                return len(clients[project].list_vm_instances()) == 20
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(operation, range(600)))
+            if all(results):
+                print(f"✓ {len(results)} concurrent operations on two projects returned the right VMs")
+            else:
+                print(f"✗ {results.count(False)} of {len(results)} concurrent operations returned wrong VMs")
+
+            if fake.request_count('POST', 'issue_token') == 1 and clients['proj-stress-b'].api_token == client.api_token:
+                print("✓ Token refreshed once for all threads and shared by project clients")
+            else:
+                print(f"✗ Token refreshed {fake.request_count('POST', 'issue_token')} times")
+
+            orders = [client.get_vm_by_name(f'proj-stress-a-{i}')['id'] for i in range(20)]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                actions = list(pool.map(client.stop_vm, orders))
+            client.wait_for_operations([action.get('id') for action in actions], timeout=30, poll_interval=0.1)
+            states = {client.get_vm_runtime_info(f'proj-stress-a-{i}')['power_status'] for i in range(20)}
+            if states == {'off'}:
+                print("✓ Concurrent power actions all applied")
+            else:
+                print(f"✗ Power states after concurrent stops: {states}")
+
+            if handler.discarded == 0:
+                print(f"✓ Connection pool sized for {workers} threads, no connection discarded")
+            else:
+                print(f"✗ {handler.discarded} connections discarded by a full pool")
+    except Exception as e:
+        print(f"✗ Failed to stress test thread-safe client: {e}")
+    finally:
+        pool_logger.removeHandler(handler)
+        pool_logger.setLevel(previous_level)
+
+def test_key_file_cache():
+    """Test that parsed key files are cached until the file changes"""
+    print("\n--- Testing key file cache ---")
+
+    import builtins
+    import tempfile
+    from unittest import mock
+    from ansible_collections.gromr10.compute_instance.plugins.plugin_utils import t1_cloud_auth
+
+    try:
+        with FakeT1Cloud(tokens=[]) as fake, tempfile.TemporaryDirectory() as tmp_dir:
+            key_file = os.path.join(tmp_dir, 'key.json')
+            with open(key_file, 'w') as f:
+                json.dump({'client_id': 'legacy-id', 'client_secret': 'secret'}, f)
+
+            auth = T1CloudAuth(endpoint=fake.auth_url)
+            real_open = builtins.open
+            with mock.patch.object(builtins, 'open', side_effect=real_open) as opened, \
+                    mock.patch.object(t1_cloud_auth.display, 'warning') as warning:
+                tokens = [auth.get_token_from_file(key_file)['access_token'] for _ in range(3)]
+                key_reads = [c for c in opened.call_args_list if c.args and c.args[0] == key_file]
+
+            if len(key_reads) == 1 and warning.call_count == 1 and len(set(tokens)) == 1:
+                print("✓ Key file parsed and validated once for repeated lookups")
+            else:
+                print(f"✗ Key file read {len(key_reads)} times, {warning.call_count} warnings")
+
+            with open(key_file, 'w') as f:
+                json.dump({'client_id': 'sa_proj-rotated', 'client_secret': 'rotated'}, f)
+            os.utime(key_file, ns=(0, os.stat(key_file).st_mtime_ns + 1000))
+            auth.get_token_from_file(key_file)
+            if auth._key_cache[key_file][1] == 'sa_proj-rotated':
+                print("✓ Rotated key file parsed again")
+            else:
+                print("✗ Stale key material served after key file change")
+    except Exception as e:
+        print(f"✗ Failed to test key file cache: {e}")
+
+def test_action_group():
+    """Test controller-side token resolution of the t1_cloud action group"""
+    print("\n--- Testing action group token resolution ---")
+
+    from ansible_collections.gromr10.compute_instance.plugins.modules import t1_cloud_vm_info
+    from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_action import resolve_api_token
+
+    defaults = {'client_id': 'group-id', 'client_secret': 'group-secret', 'project_id': 'proj-group'}
+    try:
+        with FakeT1Cloud(tokens=[]) as fake:
+            tokens = []
+            for name in ('vm-a', 'vm-b', 'vm-c'):
+                module_args = resolve_api_token(dict(defaults, auth_endpoint=fake.auth_url, name=name))
+                tokens.append(module_args.get('api_token'))
+
+            if (fake.request_count('POST', 'issue_token') == 1 and len(set(tokens)) == 1 and tokens[0]
+                    and not {'client_id', 'client_secret', 'auth_endpoint'} & set(module_args)):
+                print("✓ Token requested once and credentials kept on the controller")
+            else:
+                print(f"✗ {fake.request_count('POST', 'issue_token')} token requests, module args: {sorted(module_args)}")
+
+            module_args = resolve_api_token({'api_token': 'explicit', 'client_id': 'group-id',
+                                             'client_secret': 'group-secret', 'auth_endpoint': fake.auth_url})
+            if module_args == {'api_token': 'explicit'} and fake.request_count('POST', 'issue_token') == 1:
+                print("✓ Explicit api_token takes precedence over group credentials")
+            else:
+                print(f"✗ Explicit api_token not used: {module_args}")
+
+        from types import SimpleNamespace
+        from ansible.playbook.play_context import PlayContext
+        from ansible.playbook.task import Task
+        from ansible_collections.gromr10.compute_instance.plugins.action.t1_cloud_vm import ActionModule
+
+        class CapturingAction(ActionModule):
+            def _execute(self, module_args, task_vars):
+                self.module_args = module_args
+                return {'changed': False}
+
+        with FakeT1Cloud(tokens=[]) as fake:
+            order = fake.add_vm('proj-action', 'vm-action', 'on')
+            task_args = {'client_id': 'action-id', 'client_secret': 'action-secret', 'auth_endpoint': fake.auth_url,
+                         'base_url': fake.base_url, 'project_id': 'proj-action', 'name': 'vm-action'}
+            resolve_api_token(dict(task_args))
+            fake.revoke_tokens()
+
+            task = Task()
+            task.action = 'gromr10.compute_instance.t1_cloud_vm'
+            task.args = task_args
+            action = CapturingAction(task, SimpleNamespace(_shell=SimpleNamespace(tmpdir='/tmp')), PlayContext(),
+                                     None, None)
+            result = action.run(task_vars={})
+            resolved_vm = action.module_args.get('resolved_vm') or {}
+            if (not result.get('failed') and resolved_vm.get('id') == order['id']
+                    and fake.request_count('POST', 'issue_token') == 2):
+                print("✓ Action plugin renews a rejected cached token and resolves the VM")
+            else:
+                print(f"✗ Action plugin did not recover from HTTP 401: {result}, resolved {resolved_vm}, "
+                      f"{fake.request_count('POST', 'issue_token')} token requests")
+
+        try:
+            resolve_api_token({'client_id': 'group-id', 'client_secret': 'group-secret', 'key_file': '/tmp/key.json'})
+            print("✗ key_file together with client credentials accepted")
+        except Exception:
+            print("✓ key_file together with client credentials rejected")
+
+        result = run_module({'project_id': 'proj-group'}, t1_cloud_vm_info)
+        if result.get('failed') and 'api_token' in result.get('msg', ''):
+            print("✓ Missing credentials reported by the module")
+        else:
+            print(f"✗ Missing credentials not reported: {result.get('msg')}")
+    except Exception as e:
+        print(f"✗ Failed to test action group: {e}")
+
+def test_state_store():
+    """Test resolving VMs by their recorded order IDs"""
+    print("\n--- Testing VM state store ---")
+
+    import tempfile
+    import time
+    from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_state import (
+        VMStateStore,
+        order_item_id,
+    )
+
+    try:
+        with FakeT1Cloud(action_duration=0.1) as fake, tempfile.TemporaryDirectory() as tmp_dir:
+            context = (fake.base_url, 'proj-state')
+            client = T1CloudVM(api_token='dummy_token', project_id='proj-state', base_url=fake.base_url)
+            for i in range(250):
+                fake.add_vm('proj-state', f'vm-{i}')
+            kept = fake.add_vm('proj-state', 'vm-kept')
+            deleted = fake.add_vm('proj-state', 'vm-deleted', state='off')
+
+            writer = VMStateStore(os.path.join(tmp_dir, 'state', 'vms.json'))
+            writer.put(*context, 'vm-kept', kept['id'], item_id=order_item_id(kept), status='success')
+            writer.put(*context, 'vm-deleted', deleted['id'], status='success')
+            writer.put(*context, 'vm-renamed', kept['id'], status='success')
+            writer.put(*context, 'vm-gone', 'no-such-order', status='success')
+            client.delete_vm(deleted['id'])
+
+            store = VMStateStore(writer.path)
+            fake.reset_stats()
+            order = store.resolve_vm(client, *context, 'vm-kept')
+            if (order and order['id'] == kept['id'] and fake.request_count('GET', 'get_order') == 1
+                    and fake.request_count('GET', 'list_orders') == 0
+                    and store.get(*context, 'vm-kept')['item_id'] == order_item_id(kept)):
+                print("✓ Recorded VM fetched by order ID without the orders listing")
+            else:
+                print(f"✗ Recorded VM not resolved directly: {fake.request_count('GET', 'list_orders')} listings")
+
+            time.sleep(0.3)
+            misses = [store.resolve_vm(client, *context, name) for name in ('vm-deleted', 'vm-renamed', 'vm-gone', 'vm-new')]
+            if misses == [None] * 4 and all(store.get(*context, name) is None for name in ('vm-deleted', 'vm-renamed', 'vm-gone')):
+                print("✓ Deleted, renamed and unknown orders treated as misses and forgotten")
+            else:
+                print(f"✗ Stale records served: {[bool(m) for m in misses]}")
+    except Exception as e:
+        print(f"✗ Failed to test state store: {e}")
+
+def test_orders_index():
+    """Test incremental sync of the local orders index"""
+    print("\n--- Testing local orders index ---")
+
+    import tempfile
+    import time
+    from unittest import mock
+    from ansible_collections.gromr10.compute_instance.plugins.modules import t1_cloud_vm_info
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils import t1_cloud_index
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_index import OrdersIndex
+
+    try:
+        with FakeT1Cloud(action_duration=0.1) as fake, tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'index', 'orders.db')
+            for i in range(450):
+                fake.add_vm('proj-index', f'vm-{i}', state='on' if i % 2 else 'off', labels={'team': f't{i % 3}'})
+
+            client = T1CloudVM(api_token='dummy_token', project_id='proj-index', base_url=fake.base_url,
+                               index=OrdersIndex(path))
+            if client.get_vm_by_name('vm-7')['attrs']['name'] == 'vm-7' and client.get_vm_by_name('vm-x') is None:
+                print("✓ First lookup synced all orders into the index")
+            else:
+                print("✗ Lookup through the index failed")
+
+            # Updated orders must be seen as newer than the others
+            time.sleep(1.1)
+            client.stop_vm(client.get_vm_by_name('vm-9')['id'])
+            time.sleep(0.2)
+
+            fake.reset_stats()
+            client = T1CloudVM(api_token='dummy_token', project_id='proj-index', base_url=fake.base_url,
+                               index=OrdersIndex(path))
+            instance = client.get_vm_instance_by_name('vm-9')
+            client.get_vm_by_name('vm-10')
+            stats = client.index.stats[OrdersIndex.scope(fake.base_url, 'proj-index')]
+            if (instance['data']['state'] == 'off' and stats == {'mode': 'incremental', 'orders': 1, 'instances': 1, 'pages': 1}
+                    and len(fake.requests) == 2):
+                print("✓ Later run fetched only the changed order and its instance")
+            else:
+                print(f"✗ Unexpected incremental sync: {stats}, {len(fake.requests)} requests")
+
+            labelled = client.index.find_vms(fake.base_url, 'proj-index', status='success', labels={'team': 't1'})
+            if len(labelled) == 150 and all(o['attrs']['labels']['team'] == 't1' for o in labelled):
+                print("✓ Orders found by status and label locally")
+            else:
+                print(f"✗ Found {len(labelled)} orders by label")
+
+            statuses = t1_cloud_index.DEPROVISIONED_STATUSES + ('deprovisioning_archived',)
+            with mock.patch.object(t1_cloud_index, 'DEPROVISIONED_STATUSES', statuses):
+                found = client.index.get_vm_by_name(fake.base_url, 'proj-index', 'vm-9')
+            if found and found['attrs']['name'] == 'vm-9':
+                print("✓ Name lookup binds one placeholder per deprovisioned status")
+            else:
+                print("✗ Name lookup with more deprovisioned statuses failed")
+
+            # An API ignoring the sort order must not end the sync early
+            fake.add_vm('proj-index', 'vm-new')
+            fake.reset_stats()
+            with mock.patch.object(t1_cloud_index, 'ORDERS_SORT', {}):
+                client = T1CloudVM(api_token='dummy_token', project_id='proj-index', base_url=fake.base_url,
+                                   index=OrdersIndex(path))
+                found = client.get_vm_by_name('vm-new')
+            if found and fake.request_count('GET', 'list_orders') == 5:
+                print("✓ Unsorted listing read in full")
+            else:
+                print(f"✗ Unsorted listing: {fake.request_count('GET', 'list_orders')} pages, found {bool(found)}")
+
+            args = {'api_token': 'dummy_token', 'project_ids': ['proj-index'], 'base_url': fake.base_url, 'index_path': path}
+            fake.reset_stats()
+            result = run_module(args, t1_cloud_vm_info)
+            if (len(result.get('vms', [])) == 451 and len(fake.requests) == 1
+                    and result['projects']['proj-index']['index_sync']['mode'] == 'incremental'):
+                print("✓ Info module served from the index")
+            else:
+                print(f"✗ Info module made {len(fake.requests)} requests: {result.get('projects')}")
+
+            # A guest shutdown changes the instance but not its order
+            order = client.get_vm_by_name('vm-11')
+            fake._instance_for(fake._orders[order['id']])['data']['state'] = 'off'
+            fake.reset_stats()
+            result = run_module({'api_token': 'dummy_token', 'project_id': 'proj-index', 'base_url': fake.base_url,
+                                 'index_path': path, 'name': 'vm-11', 'state': 'started', 'wait': False})
+            if result.get('changed') and fake.request_count('PATCH', 'order_action') == 1:
+                print("✓ Power state read from the compute API, not from the index")
+            else:
+                print(f"✗ Stale power state of the index used: {result.get('msg', '')} "
+                      f"{fake.request_count('PATCH', 'order_action')} actions")
+    except Exception as e:
+        print(f"✗ Failed to test orders index: {e}")
+
+def test_runtime_info_cache():
+    """Test controller-side runtime info cache"""
+    print("\n--- Testing runtime info cache ---")
+
+    import tempfile
+    import time
+
+    context = ('https://api.t1.cloud', 'proj-test123')
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            path = os.path.join(cache_dir, 'runtime_info.json')
+            writer = RuntimeInfoCache(path, ttl=30, max_entries=2)
+            reader = RuntimeInfoCache(path, ttl=30, max_entries=2)
+
+            writer.put(*context, 'vm-a', {'power_status': 'on'})
+            if reader.get(*context, 'vm-a') == {'power_status': 'on'} and reader.get(*context, 'vm-b') is None:
+                print("✓ Runtime info shared through cache file")
+            else:
+                print("✗ Runtime info not shared through cache file")
+
+            writer.put(*context, 'vm-b', {'power_status': 'off'})
+            before = os.stat(path)
+            reader.get(*context, 'vm-a')
+            after = os.stat(path)
+            if (before.st_ino, before.st_mtime_ns) == (after.st_ino, after.st_mtime_ns):
+                print("✓ Cache hit served without rewriting the cache file")
+            else:
+                print("✗ Cache file rewritten on a cache hit")
+
+            writer.put(*context, 'vm-c', {'power_status': 'on'})
+            if reader.get(*context, 'vm-a') is None and reader.get(*context, 'vm-b') and reader.get(*context, 'vm-c'):
+                print("✓ Oldest entry evicted")
+            else:
+                print("✗ Size bound not applied")
+
+            writer.invalidate(*context, 'vm-b')
+            if reader.get(*context, 'vm-b') is None and reader.get(*context, 'vm-c'):
+                print("✓ Entry dropped on invalidation")
+            else:
+                print("✗ Entry not dropped on invalidation")
+
+            writer.invalidate(*context)
+            if reader.get(*context, 'vm-c') is None:
+                print("✓ Project entries dropped on invalidation")
+            else:
+                print("✗ Project entries not dropped on invalidation")
+
+        cache = RuntimeInfoCache(ttl=0.05)
+        cache.put(*context, 'vm-a', {'power_status': 'on'})
+        time.sleep(0.1)
+        if cache.get(*context, 'vm-a') is None:
+            print("✓ Expired entry not served")
+        else:
+            print("✗ Expired entry served")
+
+    except Exception as e:
+        print(f"✗ Failed to test runtime info cache: {e}")
+
+def test_vm_power():
+    """Test bulk power management by label selector"""
+    print("\n--- Testing bulk power management ---")
+
+    from ansible_collections.gromr10.compute_instance.plugins.modules import t1_cloud_vm_power
+
+    try:
+        with FakeT1Cloud(action_duration=0.2) as fake:
+            for i in range(12):
+                fake.add_vm('proj-test123', f'dev-vm-{i}', labels={'environment': 'development'})
+            for i in range(3):
+                fake.add_vm('proj-test123', f'prod-vm-{i}', labels={'environment': 'production'})
+
+            args = {
+                'api_token': 'dummy_token',
+                'project_id': 'proj-test123',
+                'base_url': fake.base_url,
+                'labels': {'environment': 'development'},
+                'state': 'stopped',
+                'poll_interval': 0.05,
+            }
+
+            result = run_module(dict(args, _ansible_check_mode=True), t1_cloud_vm_power)
+            if result.get('summary', {}).get('changed') == 12 and fake.request_count('PATCH') == 0:
+                print("✓ Check mode selects VMs by labels without acting")
+            else:
+                print(f"✗ Unexpected check mode result: {result.get('summary')}")
+
+            fake.reset_stats()
+            result = run_module(args, t1_cloud_vm_power)
+            if (result.get('changed') and all(vm['status'] == 'success' for vm in result['vms'])
+                    and fake.request_count('GET', 'list_instances') == 1
+                    and fake.request_count('PATCH', 'order_action') == 12):
+                print("✓ Matching VMs stopped from a single listing")
+            else:
+                print(f"✗ VMs not stopped: {result.get('summary')}")
+
+            polls = fake.request_count('GET', 'list_orders') + fake.request_count('GET', 'get_order')
+            if 0 < polls <= 12:
+                print("✓ Actions awaited by one shared poller")
+            else:
+                print(f"✗ Expected shared polling, got {polls} poll requests")
+
+            states = {i['data']['config']['name']: i['data']['state']
+                      for i in T1CloudVM(api_token='dummy_token', project_id='proj-test123',
+                                         base_url=fake.base_url).list_vm_instances()}
+            if all(state == 'off' for name, state in states.items() if name.startswith('dev-')) and \
+                    all(state == 'on' for name, state in states.items() if name.startswith('prod-')):
+                print("✓ Only selected VMs changed power state")
+            else:
+                print(f"✗ Unexpected power states: {states}")
+
+            result = run_module(args, t1_cloud_vm_power)
+            if not result.get('changed') and result['summary']['unchanged'] == 12:
+                print("✓ Already stopped VMs left unchanged")
+            else:
+                print("✗ Stopped VMs acted on again")
+
+            result = run_module(dict(args, labels=None, name_pattern='dev-vm-1*', state='started'), t1_cloud_vm_power)
+            if sorted(vm['name'] for vm in result.get('vms', []) if vm['changed']) == ['dev-vm-1', 'dev-vm-10', 'dev-vm-11']:
+                print("✓ VMs selected by name pattern started")
+            else:
+                print(f"✗ Unexpected name pattern selection: {result.get('vms')}")
+
+    except Exception as e:
+        print(f"✗ Failed to test bulk power management: {e}")
+
+def test_vm_pool():
+    """Test pool provisioning with multi-count orders and fallback to single orders"""
+    print("\n--- Testing pool provisioning ---")
+
+    from ansible_collections.gromr10.compute_instance.plugins.modules import t1_cloud_vm_pool
+
+    args = {
+        'api_token': 'dummy_token',
+        'project_id': 'proj-test123',
+        'name_prefix': 'worker',
+        'count': 5,
+        'image_id': 'd0179cb4-bfad-4b8f-836f-9cfc02143560',
+        'flavor_id': '3b259b39-6e73-41d5-b98e-b93c0bf31e95',
+        'poll_interval': 0.05,
+    }
+
+    try:
+        with FakeT1Cloud(provision_duration=0.2) as fake:
+            result = run_module(dict(args, base_url=fake.base_url), t1_cloud_vm_pool)
+            names = [vm['name'] for vm in result.get('vms', [])]
+            if (result.get('summary', {}).get('multi_count_orders') == 1
+                    and fake.request_count('POST', 'create_order') == 1
+                    and all(vm['status'] == 'success' for vm in result['vms'])
+                    and names == [f'worker-{i}' for i in range(1, 6)]):
+                print("✓ Identical pool VMs ordered with one multi-count order")
+            else:
+                print(f"✗ Unexpected pool result: {result.get('summary')}")
+
+            client = T1CloudVM(api_token='dummy_token', project_id='proj-test123', base_url=fake.base_url)
+            if all(client.get_vm_by_id(vm['order_id'])['attrs']['name'] == vm['name'] for vm in result['vms']):
+                print("✓ Created orders mapped back to requested names")
+            else:
+                print("✗ Created orders not mapped to requested names")
+
+            result = run_module(dict(args, base_url=fake.base_url, count=7), t1_cloud_vm_pool)
+            summary = result.get('summary', {})
+            if summary.get('existing') == 5 and summary.get('single_orders') == 2 and summary.get('multi_count_orders') == 0:
+                print("✓ Pool grown with single orders for the missing VMs")
+            else:
+                print(f"✗ Unexpected pool growth: {summary}")
+
+        with FakeT1Cloud(provision_duration=0.2, multi_count=False) as fake:
+            result = run_module(dict(args, base_url=fake.base_url), t1_cloud_vm_pool)
+            summary = result.get('summary', {})
+            if summary.get('single_orders') == 5 and summary.get('created') == 5 and not result.get('failed'):
+                print("✓ Fallback to parallel single orders when multi-count is rejected")
+            else:
+                print(f"✗ No fallback to single orders: {result}")
+
+        from unittest import mock
+        from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud import T1CloudAPIError
+        with FakeT1Cloud(provision_duration=0.2) as fake:
+            quota_error = T1CloudAPIError("API request failed: 400 Client Error\n Error message:quota exceeded", 400)
+            with mock.patch.object(T1CloudVM, 'create_vm', side_effect=quota_error) as create_vm:
+                result = run_module(dict(args, base_url=fake.base_url), t1_cloud_vm_pool)
+            if (result.get('failed') and create_vm.call_count == 1 and result['summary']['single_orders'] == 0
+                    and all('quota exceeded' in vm.get('msg', '') for vm in result['vms'])):
+                print("✓ Other HTTP 400 errors of multi-count orders reported, not retried as single orders")
+            else:
+                print(f"✗ HTTP 400 of a multi-count order retried: {create_vm.call_count} orders, {result.get('summary')}")
+
+        with FakeT1Cloud(provision_duration=0.2, multi_count_name='{name}-{index:02d}') as fake:
+            result = run_module(dict(args, base_url=fake.base_url), t1_cloud_vm_pool)
+            vms = result.get('vms', [])
+            if (result.get('failed') and result['summary']['created'] == 0 and len(vms) == 5
+                    and all(vm['status'] == 'failed' for vm in vms)
+                    and [vm.get('returned_name') for vm in vms] == [f'worker-0{i}' for i in range(1, 6)]):
+                print("✓ VMs the order-service named otherwise reported failed with the returned name")
+            else:
+                print(f"✗ Renamed multi-count orders accepted: {vms}")
+
+    except Exception as e:
+        print(f"✗ Failed to test pool provisioning: {e}")
+
+def test_order_journal():
+    """Test resuming orders of an interrupted run from the write-ahead journal"""
+    print("\n--- Testing order journal ---")
+
+    import tempfile
+    import time
+    from ansible_collections.gromr10.compute_instance.plugins.modules import t1_cloud_vm, t1_cloud_vm_pool
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_journal import OrderJournal
+
+    args = {
+        'api_token': 'dummy_token',
+        'project_id': 'proj-journal',
+        'image_id': 'd0179cb4-bfad-4b8f-836f-9cfc02143560',
+        'flavor_id': '3b259b39-6e73-41d5-b98e-b93c0bf31e95',
+        'poll_interval': 0.05,
+    }
+
+    try:
+        with FakeT1Cloud(provision_duration=0.5, action_duration=0.3) as fake, tempfile.TemporaryDirectory() as tmp_dir:
+            args.update(base_url=fake.base_url, journal_path=os.path.join(tmp_dir, 'journal', 'orders.jsonl'))
+
+            # Interrupted run: orders placed, never waited for
+            result = run_module(dict(args, name_prefix='web', count=4, wait=False), t1_cloud_vm_pool)
+            placed = sorted(vm['order_id'] for vm in result.get('vms', []))
+            journal = OrderJournal(args['journal_path'])
+            if len(placed) == 4 and sorted(journal.in_flight(fake.base_url, 'proj-journal')) == placed:
+                print("✓ Submitted orders recorded before waiting")
+            else:
+                print(f"✗ Journal does not hold the submitted orders: {journal.in_flight(fake.base_url, 'proj-journal')}")
+
+            fake.reset_stats()
+            result = run_module(dict(args, name_prefix='web', count=4), t1_cloud_vm_pool)
+            statuses = {order['status'] for order in T1CloudVM(
+                api_token='dummy_token', project_id='proj-journal', base_url=fake.base_url).list_vms()}
+            if (sorted(result.get('resumed_orders', [])) == placed and fake.request_count('POST', 'create_order') == 0
+                    and statuses == {'success'}
+                    and not OrderJournal(args['journal_path']).in_flight(fake.base_url, 'proj-journal')):
+                print("✓ Rerun waited for the in-flight orders without ordering again")
+            else:
+                print(f"✗ Rerun did not resume: {result.get('resumed_orders')}, {statuses}")
+
+            # A creation not visible in the listing yet is not ordered twice
+            client = T1CloudVM(api_token='dummy_token', project_id='proj-journal', base_url=fake.base_url,
+                               journal=OrderJournal(args['journal_path']))
+            order_id = client.create_vm({'name': 'db-1'})[0]['id']
+            fake.reset_stats()
+            again = client.create_vm({'name': 'db-1'})
+            if again[0]['id'] == order_id and fake.request_count('POST', 'create_order') == 0:
+                print("✓ Journaled creation returned instead of submitted again")
+            else:
+                print("✗ Journaled creation submitted again")
+
+            result = run_module(dict(args, name='db-1'), t1_cloud_vm)
+            if (result.get('resumed_orders') == [order_id] and result.get('changed')
+                    and result.get('vm', {}).get('status') == 'success'):
+                print("✓ t1_cloud_vm waited for the creation of the interrupted run")
+            else:
+                print(f"✗ t1_cloud_vm did not resume the creation: {result}")
+
+            client.stop_vm(order_id)
+            fake.reset_stats()
+            result = run_module(dict(args, name='db-1', state='stopped'), t1_cloud_vm)
+            if (result.get('resumed_orders') == [order_id] and fake.request_count('PATCH', 'order_action') == 0
+                    and client.get_vm_runtime_info('db-1')['power_status'] == 'off'):
+                print("✓ In-flight power action waited for instead of submitted again")
+            else:
+                print(f"✗ Power action not resumed: {result.get('resumed_orders')}, "
+                      f"{fake.request_count('PATCH', 'order_action')} actions")
+
+            # A creation run without waiting, finished before the next run
+            result = run_module(dict(args, name='db-2', wait=False), t1_cloud_vm)
+            time.sleep(0.7)
+            rerun = run_module(dict(args, name='db-2'), t1_cloud_vm)
+            if (result.get('changed') and not rerun.get('changed') and 'resumed_orders' not in rerun
+                    and not OrderJournal(args['journal_path']).in_flight_create(fake.base_url, 'proj-journal', 'db-2')):
+                print("✓ Finished creation of a run without waiting not resumed")
+            else:
+                print(f"✗ Finished creation resumed: {rerun}")
+    except Exception as e:
+        print(f"✗ Failed to test order journal: {e}")
+
+def _http_fixture_scenarios():
+    """Module state paths covered by the HTTP fixture regression tests"""
+    from ansible_collections.gromr10.compute_instance.plugins.modules import (
+        t1_cloud_vm,
+        t1_cloud_vm_fleet,
+        t1_cloud_vm_info,
+        t1_cloud_vm_pool,
+        t1_cloud_vm_power,
+    )
+
+    project = 'proj-fixtures'
+    orders = f'/order-service/api/v1/projects/{project}/orders'
+    instances = f'/order-service/api/v1/projects/{project}/compute/instances'
+    image = {'image_id': 'd0179cb4-bfad-4b8f-836f-9cfc02143560', 'flavor_id': '3b259b39-6e73-41d5-b98e-b93c0bf31e95'}
+    vm = dict(image, api_token='dummy_token', project_id=project, poll_interval=0.05)
+
+    def add(*names, **kwargs):
+        return lambda fake: [fake.add_vm(project, name, **kwargs) for name in names]
+
+    # name, module, args, setup, requests expected by route (polls excluded), time budget in seconds
+    return [
+        ('vm_present_create', t1_cloud_vm, dict(vm, name='app-1'), None,
+         {f'GET {orders}': 1, f'POST {orders}': 1}, 1.5),
+        ('vm_present_existing', t1_cloud_vm, dict(vm, name='app-1'), add('app-1'),
+         {f'GET {orders}': 1, f'GET {instances}': 1}, 0.5),
+        ('vm_stopped', t1_cloud_vm, dict(vm, name='app-1', state='stopped'), add('app-1'),
+         {f'GET {orders}': 1, f'PATCH {orders}/{{id}}/actions/stop_compute_vm': 1}, 1.5),
+        ('vm_started', t1_cloud_vm, dict(vm, name='app-1', state='started'), add('app-1', state='off'),
+         {f'GET {orders}': 1, f'PATCH {orders}/{{id}}/actions/start_compute_vm': 1}, 1.5),
+        ('vm_absent', t1_cloud_vm, dict(vm, name='app-1', state='absent'), add('app-1'),
+         {f'GET {orders}': 1, f'PATCH {orders}/{{id}}/actions/compute_instance_delete': 1}, 0.5),
+        ('power_stopped', t1_cloud_vm_power,
+         {'api_token': 'dummy_token', 'project_id': project, 'poll_interval': 0.05, 'labels': {'tier': 'web'},
+          'state': 'stopped'},
+         add(*[f'web-{i}' for i in range(6)], labels={'tier': 'web'}),
+         {f'GET {instances}': 1, f'PATCH {orders}/{{id}}/actions/stop_compute_vm': 6}, 1.5),
+        # Orders of the pool are polled through the orders listing
+        ('pool_create', t1_cloud_vm_pool, dict(vm, name_prefix='worker', count=3), None,
+         {f'POST {orders}': 1}, 1.5),
+        ('fleet_converge', t1_cloud_vm_fleet,
+         {'api_token': 'dummy_token', 'project_id': project, 'poll_interval': 0.05, 'prune': True,
+          'vms': [dict(image, name='db-1', state='stopped'), dict(image, name='app-2')]},
+         add('db-1', 'app-1'),
+         {f'GET {orders}': 1, f'GET {instances}': 1, f'POST {orders}': 1,
+          f'PATCH {orders}/{{id}}/actions/stop_compute_vm': 1,
+          f'PATCH {orders}/{{id}}/actions/compute_instance_delete': 1}, 2.0),
+        ('info', t1_cloud_vm_info, {'api_token': 'dummy_token', 'project_ids': [project]},
+         add(*[f'app-{i}' for i in range(5)]),
+         {f'GET {orders}': 1, f'GET {instances}': 1}, 0.5),
+    ]
+
+def record_http_fixtures(names=None):
+    """Record the HTTP fixtures of the module state paths against the fake backend"""
+    from unittest import mock
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils import t1_cloud_fixtures
+
+    for name, module, args, setup, _, _ in _http_fixture_scenarios():
+        if names is not None and name not in names:
+            continue
+        path = os.path.join(HTTP_FIXTURES_DIR, f'{name}.jsonl')
+        if os.path.exists(path):
+            os.remove(path)
+        with FakeT1Cloud(provision_duration=0.3, action_duration=0.2) as fake:
+            if setup:
+                setup(fake)
+            with mock.patch.dict(os.environ, {t1_cloud_fixtures.RECORD_ENV: path}):
+                result = run_module(dict(args, base_url=fake.base_url), module)
+        if result.get('failed'):
+            raise Exception(f"Recording {name} failed: {result.get('msg')}")
+
+def test_http_fixtures():
+    """Test request counts and time budgets of module state paths replayed from HTTP fixtures"""
+    print("\n--- Testing replay of HTTP fixtures ---")
+
+    import tempfile
+    import time
+    from unittest import mock
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils import t1_cloud_fixtures
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_fixtures import (
+        HTTPFixture,
+        ReplayAdapter,
+        redact,
+    )
+
+    try:
+        scenarios = _http_fixture_scenarios()
+        missing = [name for name, *_ in scenarios if not os.path.exists(os.path.join(HTTP_FIXTURES_DIR, f'{name}.jsonl'))]
+        if missing:
+            print(f"✗ Missing fixtures (record them with record_http_fixtures()): {', '.join(missing)}")
+
+        for name, module, args, _, routes, budget in scenarios:
+            if name in missing:
+                continue
+            fixture = HTTPFixture(os.path.join(HTTP_FIXTURES_DIR, f'{name}.jsonl'))
+            with mock.patch.object(t1_cloud_fixtures, 'http_adapter', lambda **kwargs: ReplayAdapter(fixture)):
+                start = time.monotonic()
+                result = run_module(dict(args, base_url='http://t1-cloud.invalid'), module)
+                elapsed = time.monotonic() - start
+            counts = {route: fixture.replayed.get(route, 0) for route in routes}
+            if result.get('failed') or counts != routes or fixture.unused() or elapsed > budget:
+                print(f"✗ {name}: {result.get('msg', '')} requests {counts} (expected {routes}), "
+                      f"{fixture.unused()} recorded responses unused, {elapsed:.2f}s of {budget}s")
+            else:
+                print(f"✓ {name}: {sum(fixture.replayed.values())} requests in {elapsed:.2f}s (budget {budget}s)")
+
+        # Recorded latency is replayed, scaled by T1_CLOUD_HTTP_REPLAY_LATENCY
+        path = os.path.join(HTTP_FIXTURES_DIR, 'vm_present_existing.jsonl')
+        slow = HTTPFixture(path)
+        for interaction in slow.interactions:
+            interaction['elapsed'] = 0.2
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            slow.save(os.path.join(tmp_dir, 'slow.jsonl'))
+            env = {t1_cloud_fixtures.REPLAY_ENV: os.path.join(tmp_dir, 'slow.jsonl'),
+                   t1_cloud_fixtures.REPLAY_LATENCY_ENV: '0.5'}
+            with mock.patch.dict(os.environ, env):
+                start = time.monotonic()
+                result = run_module(dict(_http_fixture_scenarios()[1][2], base_url='http://t1-cloud.invalid'))
+                elapsed = time.monotonic() - start
+        if not result.get('failed') and 0.1 * len(slow.interactions) <= elapsed < 0.2 * len(slow.interactions):
+            print(f"✓ Recorded latency replayed at half speed ({elapsed:.2f}s)")
+        else:
+            print(f"✗ Latency not scaled: {elapsed:.2f}s for {len(slow.interactions)} requests, {result.get('msg', '')}")
+
+        # Clients of parallel module runs record into the same file without losing interactions
+        from concurrent.futures import ThreadPoolExecutor
+        with FakeT1Cloud() as fake, tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'parallel.jsonl')
+            with mock.patch.dict(os.environ, {t1_cloud_fixtures.RECORD_ENV: path}):
+                clients = [T1CloudVM(api_token='dummy_token', project_id='proj-record', base_url=fake.base_url)
+                           for _ in range(4)]
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(lambda client: [client.list_vms() for _ in range(10)], clients))
+            appended = HTTPFixture(path)
+        if len(appended.interactions) == 40 == fake.request_count('GET', 'list_orders'):
+            print("✓ Interactions of parallel clients appended to one fixture file")
+        else:
+            print(f"✗ {len(appended.interactions)} of {fake.request_count('GET', 'list_orders')} interactions recorded")
+
+        recorded = ''.join(open(os.path.join(HTTP_FIXTURES_DIR, f'{name}.jsonl')).read()
+                           for name, *_ in scenarios if name not in missing)
+        token = redact({'access_token': 'abc', 'client_secret': 'abc', 'items': [{'token': 'abc'}], 'name': 'vm'})
+        if 'dummy_token' not in recorded and token == {'access_token': 'REDACTED', 'client_secret': 'REDACTED',
+                                                        'items': [{'token': 'REDACTED'}], 'name': 'vm'}:
+            print("✓ Tokens redacted from fixtures")
+        else:
+            print("✗ Tokens left in fixtures")
+    except Exception as e:
+        print(f"✗ Failed to test HTTP fixtures: {e}")
+
+def test_load_harness():
+    """Test the fork-scaling harness and the rate limit of the fake backend"""
+    print("\n--- Testing fork-scaling harness ---")
+
+    import load_vm_module
+
+    try:
+        with FakeT1Cloud(rate_limit=5) as fake:
+            client = T1CloudVM(api_token='dummy_token', project_id='proj-load', base_url=fake.base_url)
+            for _ in range(8):
+                client.list_vms()
+            if fake.request_count(route='rate_limited') and fake.request_count(route='list_orders') == 8:
+                print("✓ Requests over the rate limit answered with 429 and retried")
+            else:
+                print(f"✗ Rate limit not applied: {fake.request_count(route='rate_limited')} throttled")
+
+            fake.reset_stats()
+            orders = [fake.add_vm('proj-load', f'throttled-{i}')['id'] for i in range(8)]
+            actions = [client.stop_vm(order_id) for order_id in orders]
+            if all(action.get('id') for action in actions) and fake.request_count(route='rate_limited'):
+                print("✓ POST requests answered with 429 retried after Retry-After")
+            else:
+                print(f"✗ POST requests not retried on 429: {fake.request_count(route='rate_limited')} throttled")
+
+        level = load_vm_module.run_level(2, 4, vms=4, rate_limit=3)
+        if (level['failed'] == 0 and level['throttled'] > 0 and level['tasks'] == 4
+                and level['p50'] <= level['p90'] <= level['p99'] <= level['max']):
+            print(f"✓ Module runs measured: {level['throughput']} tasks/s, {level['throttled_rate']:.0%} throttled")
+        else:
+            print(f"✗ Unexpected load test level: {level}")
+    except Exception as e:
+        print(f"✗ Failed to test fork-scaling harness: {e}")
+
+def test_reverse_index_lookup():
+    """Test reverse indexes of instances and the t1_cloud_vm_find lookup"""
+    print("\n--- Testing reverse index lookup ---")
+
+    import tempfile
+    from ansible_collections.gromr10.compute_instance.plugins.lookup import t1_cloud_vm_find
+    from ansible_collections.gromr10.compute_instance.plugins.plugin_utils.t1_cloud_reverse_index import (
+        InstanceReverseIndex,
+    )
+
+    try:
+        with FakeT1Cloud() as fake, tempfile.TemporaryDirectory() as tmp:
+            for i in range(6):
+                fake.add_vm('proj-find', f'find-{i}',
+                            labels={'role': 'db' if i % 2 else 'web', 'env': 'prod' if i < 4 else 'dev'},
+                            flavor={'id': f'flavor-{i % 2}', 'name': 'b5.large.2' if i % 2 else 'b5.small.1'},
+                            availability_zone={'id': 'd3p1k01', 'name': 'ru-central1-a'})
+            client = T1CloudVM(api_token='dummy_token', project_id='proj-find', base_url=fake.base_url)
+            instances = client.list_vm_instances()
+            config = next(instance for instance in instances
+                          if instance['data']['config']['name'] == 'find-3')['data']['config']
+            ip = config['accessIPv4']
+            mac = next(iter(config['addresses'].values()))[0]['OS-EXT-IPS-MAC:mac_addr']
+
+            index = InstanceReverseIndex.from_instances(instances, project_id='proj-find')
+            if ([r['name'] for r in index.find('ip', ip)] == ['find-3']
+                    and [r['name'] for r in index.find('mac', mac.upper())] == ['find-3']):
+                print("✓ VM found by IP and MAC address")
+            else:
+                print("✗ VM not found by IP and MAC address")
+
+            found = index.find_all([('label', 'role=db'), ('label', 'env=prod'), ('flavor', 'b5.large.2'),
+                                    ('az', 'ru-central1-a')])
+            if [r['name'] for r in found] == ['find-1', 'find-3'] and len(index.find('label', 'role')) == 6:
+                print("✓ VMs found by labels, flavor and availability zone")
+            else:
+                print(f"✗ Unexpected VMs found by labels, flavor and zone: {[r['name'] for r in found]}")
+
+            index.remove(found[0]['instance_id'])
+            if not index.find('name', 'find-1') and len(index) == 5:
+                print("✓ Removed VM dropped from the indexes")
+            else:
+                print("✗ Removed VM still indexed")
+
+            lookup = t1_cloud_vm_find.LookupModule()
+            cache_path = os.path.join(tmp, 'reverse_index.json')
+            args = dict(api_token='dummy_token', project_id='proj-find', base_url=fake.base_url, cache_path=cache_path)
+            fake.reset_stats()
+            first = lookup.run([ip], **args)
+            t1_cloud_vm_find._INDEXES.clear()
+            second = lookup.run(['label=env=dev'], **args)
+            if ([r['name'] for r in first] == ['find-3'] and [r['name'] for r in second] == ['find-4', 'find-5']
+                    and fake.request_count(route='list_instances') == 1):
+                print("✓ Lookup served the next run from the saved indexes")
+            else:
+                print(f"✗ Unexpected lookup results or {fake.request_count(route='list_instances')} listings")
+
+            lookup.run(['name=find-0'], refresh=True, **args)
+            if fake.request_count(route='list_instances') == 2:
+                print("✓ Lookup refreshed the indexes on request")
+            else:
+                print("✗ Lookup did not refresh the indexes")
+
+            try:
+                lookup.run(['color=red'], **args)
+                print("✗ Unknown field accepted")
+            except Exception as e:
+                print(f"✓ Unknown field rejected: {e}")
+    except Exception as e:
+        print(f"✗ Failed to test reverse index lookup: {e}")
+
+def test_vm_info():
+    """Test multi-project fan-out of the info module"""
+    print("\n--- Testing multi-project info ---")
+
+    import time
+    from ansible_collections.gromr10.compute_instance.plugins.modules import t1_cloud_vm_info
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_projects import MultiProjectClient
+
+    projects = [f'proj-audit{i}' for i in range(8)]
+    try:
+        with FakeT1Cloud(latency=0.2) as fake:
+            for index, project_id in enumerate(projects):
+                for vm in range(index % 3 + 1):
+                    fake.add_vm(project_id, f'vm-{index}-{vm}', state='on' if vm else 'off', labels={'team': f't{index}'})
+
+            client = MultiProjectClient('dummy_token', projects, base_url=fake.base_url)
+            if len({id(c.session) for c in client.clients.values()}) == 1:
+                print("✓ Project clients share one session")
+            else:
+                print("✗ Project clients use separate sessions")
+
+            start = time.monotonic()
+            result = run_module({'api_token': 'dummy_token', 'project_ids': projects, 'base_url': fake.base_url,
+                                 'parallelism': 16}, t1_cloud_vm_info)
+            duration = time.monotonic() - start
+
+        vms = result.get('vms', [])
+        expected = sum(index % 3 + 1 for index in range(len(projects)))
+        if (len(vms) == expected and fake.request_count('GET', 'list_orders') == len(projects)
+                and all(vm['name'].startswith(f"vm-{projects.index(vm['project_id'])}-") for vm in vms)
+                and all(vm['runtime_info'] and vm['runtime_info']['order_id'] == vm['order_id'] for vm in vms)):
+            print("✓ Orders and instances of all projects merged with the project attached")
+        else:
+            print(f"✗ Unexpected merged records: {len(vms)} of {expected}")
+
+        # 16 listings at 0.2 s each take 3.2 s when fetched one after another
+        if duration < 1.5 and result['projects'][projects[2]] == {'vms': 3}:
+            print("✓ Projects listed concurrently")
+        else:
+            print(f"✗ Listing took {duration:.1f}s: {result.get('projects')}")
+    except Exception as e:
+        print(f"✗ Failed to test multi-project info: {e}")
+
+def test_vm_ready():
+    """Test concurrent TCP readiness probes against local sockets"""
+    print("\n--- Testing VM readiness waiter ---")
+
+    import socket
+    import threading
+    import time
+    from ansible_collections.gromr10.compute_instance.plugins.modules import t1_cloud_vm_ready
+    from ansible_collections.gromr10.compute_instance.plugins.module_utils.t1_cloud_readiness import wait_for_ports
+
+    def bound_socket(host='127.0.0.1', port=0):
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        return sock
+
+    sockets = []
+    try:
+        # Up from the start, up after 0.5 s (bound but not listening until then) and never up
+        up = bound_socket()
+        up.listen()
+        late = [bound_socket() for _ in range(20)]
+        never = bound_socket()
+        sockets = [up, never] + late
+        timer = threading.Timer(0.5, lambda: [sock.listen() for sock in late])
+        timer.start()
+
+        targets = {'up': up.getsockname(), 'never': never.getsockname()}
+        targets.update({f'late-{i}': sock.getsockname() for i, sock in enumerate(late)})
+        start = time.monotonic()
+        probes = wait_for_ports(targets, timeout=1.5, retry_interval=0.1)
+        duration = time.monotonic() - start
+        timer.join()
+
+        late_times = [probes[f'late-{i}']['time_to_ready'] for i in range(len(late))]
+        if (probes['up']['ready'] and probes['up']['time_to_ready'] < 0.2 and probes['up']['attempts'] == 1
+                and all(t is not None and 0.5 <= t < 0.8 for t in late_times)):
+            print("✓ Every host reported ready as soon as its port opened")
+        else:
+            print(f"✗ Unexpected readiness: up {probes['up']}, late {late_times}")
+
+        if not probes['never']['ready'] and 'refused' in probes['never']['error'] and 1.4 < duration < 1.8:
+            print("✓ Unreachable host reported after the timeout with the last error")
+        else:
+            print(f"✗ Unreachable host: {probes['never']} after {duration:.2f}s")
+
+        listener = bound_socket('127.0.0.2')
+        listener.listen()
+        refusing = bound_socket('127.0.0.3', listener.getsockname()[1])
+        sockets += [listener, refusing]
+        with FakeT1Cloud() as fake:
+            fake.add_vm('proj-ready', 'vm-a', network_configuration={'requested_ip': '127.0.0.2'})
+            fake.add_vm('proj-ready', 'vm-b', network_configuration={'requested_ip': '127.0.0.3'})
+            fake.add_vm('proj-ready', 'vm-c', state='off', network_configuration={'requested_ip': '127.0.0.2'})
+            result = run_module({'api_token': 'dummy_token', 'project_id': 'proj-ready', 'base_url': fake.base_url,
+                                 'names': ['vm-a', 'vm-b', 'vm-c', 'vm-x'], 'port': listener.getsockname()[1],
+                                 'timeout': 1, 'retry_interval': 0.1}, t1_cloud_vm_ready)
+
+        vms = {vm['name']: vm for vm in result.get('vms', [])}
+        if (result.get('failed') and result['summary'] == {'matched': 4, 'ready': 1, 'not_ready': 3}
+                and vms['vm-a']['ready'] and vms['vm-a']['address'] == '127.0.0.2'
+                and 'refused' in vms['vm-b']['msg'] and vms['vm-b']['attempts'] > 1
+                and 'not running' in vms['vm-c']['msg'] and vms['vm-c']['attempts'] == 0
+                and vms['vm-x']['msg'] == 'VM not found'):
+            print("✓ Module probes listed VMs and reports the ones not ready")
+        else:
+            print(f"✗ Unexpected module result: {result}")
+    except Exception as e:
+        print(f"✗ Failed to test VM readiness: {e}")
+    finally:
+        for sock in sockets:
+            sock.close()
+
+def test_vm_planner():
+    """Test desired-state planning and parallel apply of the fleet module"""
+    print("\n--- Testing fleet planner against fake backend ---")
+
+    from ansible_collections.gromr10.compute_instance.plugins.modules import t1_cloud_vm_fleet
+
+    try:
+        with FakeT1Cloud(provision_duration=0.2, action_duration=0.1) as fake:
+            fake.add_vm('proj-test123', 'keep-vm', state='off')
+            fake.add_vm('proj-test123', 'old-vm')
+            fake.add_vm('proj-test123', 'stray-vm')
+
+            image = {'image_id': 'd0179cb4-bfad-4b8f-836f-9cfc02143560',
+                     'flavor_id': '3b259b39-6e73-41d5-b98e-b93c0bf31e95',
+                     'subnet_id': 'd0a5e4c0-1323-483d-8f5a-0e797a0fdd85'}
+            args = {
+                'api_token': 'dummy_token',
+                'project_id': 'proj-test123',
+                'base_url': fake.base_url,
+                'poll_interval': 0.05,
+                'prune': True,
+                'vms': [
+                    dict(image, name='db-vm'),
+                    dict(image, name='web-vm', depends_on=['db-vm']),
+                    {'name': 'keep-vm', 'state': 'started'},
+                    {'name': 'old-vm', 'state': 'absent'},
+                ],
+            }
+
+            result = run_module(dict(args, _ansible_check_mode=True), t1_cloud_vm_fleet)
+            expected = {'create': 2, 'delete': 2, 'start': 1, 'stop': 0}
+            if result.get('summary') == expected and 'results' not in result and fake.request_count('POST') == 0:
+                print("✓ Plan computed in check mode without changes")
+            else:
+                print(f"✗ Unexpected plan: {result}")
+
+            if fake.request_count('GET', 'list_orders') == 1 and fake.request_count('GET', 'list_instances') == 1:
+                print("✓ Project state fetched with one listing per resource")
+            else:
+                print("✗ Project state fetched with extra listings")
+
+            result = run_module(args, t1_cloud_vm_fleet)
+            statuses = {r['name'] + ':' + r['action']: r['status'] for r in result.get('results', [])}
+            if result.get('changed') and not result.get('failed') and set(statuses.values()) == {'ok'}:
+                print("✓ Plan applied")
+            else:
+                print(f"✗ Plan not applied: {result}")
+
+            routes = [r['route'] for r in fake.requests]
+            second_create = [i for i, route in enumerate(routes) if route == 'create_order'][1]
+            if 'get_order' in routes[:second_create] and 'web-vm:create' in statuses:
+                print("✓ Dependent VM created after its dependency")
+            else:
+                print("✗ Dependency order not respected")
+
+            result = run_module(args, t1_cloud_vm_fleet)
+            if not result.get('changed') and sum(result.get('summary', {}).values()) == 0:
+                print("✓ Converged project has an empty plan")
+            else:
+                print(f"✗ Second run not idempotent: {result.get('summary')}")
+
+            drifted = dict(args, vms=args['vms'][:2] + [{'name': 'keep-vm', 'description': 'resized'}])
+            result = run_module(drifted, t1_cloud_vm_fleet)
+            if not result.get('changed') and not result.get('plan') and 'keep-vm' in result.get('drift', {}):
+                print("✓ Drift reported, not planned or counted as a change")
+            else:
+                print(f"✗ Unexpected result for drifted VM: {result}")
+
+        with FakeT1Cloud(provision_duration=0.3, action_duration=0.1) as fake:
+            vms = [dict(args['vms'][0], name='cold-vm', state='stopped')]
+            result = run_module(dict(args, base_url=fake.base_url, prune=False, wait=False, vms=vms), t1_cloud_vm_fleet)
+            statuses = [r['action'] + ':' + r['status'] for r in result.get('results', [])]
+            if not result.get('failed') and statuses == ['create:ok', 'stop:ok']:
+                print("✓ New stopped VM provisioned before it is stopped without wait")
+            else:
+                print(f"✗ Stop of a provisioning VM: {result.get('msg')} {result.get('results')}")
+
+        with FakeT1Cloud(provision_duration=0.1, failure_rate=1.0) as fake:
+            result = run_module(dict(args, base_url=fake.base_url, prune=False, vms=args['vms'][:2]), t1_cloud_vm_fleet)
+            statuses = [r['status'] for r in result.get('results', [])]
+            if result.get('failed') and statuses == ['failed', 'skipped']:
+                print("✓ Dependents of a failed VM skipped")
+            else:
+                print(f"✗ Unexpected results on failure: {statuses}")
+
+    except Exception as e:
+        print(f"✗ Failed to test fleet planner: {e}")
+
 def test_vm_creation():
     """Test VM creation"""
     print("\n--- Testing VM creation ---")
@@ -454,10 +2099,35 @@ def main():
     print("=" * 40)
 
     test_vm_name_validation()
+    test_vm_spec_validation()
     test_vm_config_builder()
     test_vm_client_initialization()
+    test_request_compression()
     test_vm_config_with_extra_disks()
     test_vm_runtime_info_parsing()
+    test_runtime_info_batch()
+    test_fake_backend_lifecycle()
+    test_module_profiling()
+    test_tracing()
+    test_order_watcher()
+    test_deadline()
+    test_client_registry()
+    test_token_refresh()
+    test_thread_safety()
+    test_key_file_cache()
+    test_action_group()
+    test_runtime_info_cache()
+    test_state_store()
+    test_orders_index()
+    test_vm_power()
+    test_vm_pool()
+    test_order_journal()
+    test_http_fixtures()
+    test_load_harness()
+    test_reverse_index_lookup()
+    test_vm_info()
+    test_vm_ready()
+    test_vm_planner()
     # test_vm_creation() # uncomment only when you need to test actual API calls
 
     print("\n" + "=" * 40)